@@ -0,0 +1,156 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the startup time and the peak RSS of loading an ndarray cache,
+by reading the shards and by mapping them into memory.
+
+A cache of random parameters is generated unless it exists, e.g.
+
+    python3 ndarray_cache_load_bench.py --cache-dir /tmp/ndarray-cache --size-mb 2048
+
+Each loader runs in a fresh process, so that the page cache is the only state
+shared between the runs. Drop the page cache before running to measure a cold start.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import time
+
+import numpy as np
+
+import tvm
+from tvm.contrib import tvmjs
+
+
+def generate_cache(cache_dir, size_mb, num_params, encode_format):
+    """Dump a cache of random float32 parameters of the given total size"""
+    numel = size_mb * 2**20 // 4 // num_params
+    rng = np.random.default_rng(0)
+    params = {f"param_{i}": rng.standard_normal(numel, dtype="float32") for i in range(num_params)}
+    tvmjs.dump_ndarray_cache(params, cache_dir, encode_format=encode_format)
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _load(cache_dir, loader, num_workers, read_ahead, touch, queue):
+    """Load the cache in the current process and report the elapsed time and the RSS growth"""
+    rss_before = _peak_rss_mb()
+    tic = time.perf_counter()
+    phases = None
+    if loader.startswith("runtime"):
+        phases = json.loads(
+            tvm.get_global_func("vm.builtin.ndarray_cache.load")(
+                cache_dir,
+                tvm.cpu().device_type,
+                0,
+                loader != "runtime",
+                loader == "runtime-mmap-prefetch",
+                read_ahead,
+            )
+        )
+        params = tvm.get_global_func("vm.builtin.param_array_from_cache")("param", -1)
+    else:
+        params, _ = tvmjs.load_ndarray_cache(
+            cache_dir,
+            tvm.cpu(),
+            use_mmap=loader == "tvmjs-mmap",
+            num_workers=num_workers or None,
+            read_ahead=read_ahead,
+        )
+        params = list(params.values())
+    load_sec = time.perf_counter() - tic
+    if touch:
+        # Read every parameter once, as the first inference does
+        checksum = sum(float(param.numpy().sum()) for param in params)
+    else:
+        checksum = 0.0
+    touch_sec = time.perf_counter() - tic
+    queue.put((load_sec, touch_sec, _peak_rss_mb() - rss_before, phases, checksum))
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cache-dir", type=str, required=True, help="The path to the cache.")
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--num-params", type=int, default=64)
+    parser.add_argument("--encode-format", type=str, default="raw", choices=["raw", "f32-to-bf16"])
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=0,
+        help="The number of threads decoding a shard in tvmjs. Defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        type=int,
+        default=2,
+        help="The number of shards read concurrently ahead of the one being copied.",
+    )
+    parser.add_argument(
+        "--loaders",
+        type=str,
+        nargs="+",
+        default=["runtime", "runtime-mmap", "runtime-mmap-prefetch", "tvmjs", "tvmjs-mmap"],
+    )
+    parser.add_argument(
+        "--no-touch",
+        action="store_true",
+        help="Do not read the parameters after loading them.",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.cache_dir, "ndarray-cache.json")):
+        tic = time.perf_counter()
+        generate_cache(args.cache_dir, args.size_mb, args.num_params, args.encode_format)
+        print(f"Generate {args.size_mb} MiB cache: {time.perf_counter() - tic:.2f} s")
+
+    ctx = multiprocessing.get_context("spawn")
+    for loader in args.loaders:
+        queue = ctx.Queue()
+        proc = ctx.Process(
+            target=_load,
+            args=(
+                args.cache_dir,
+                loader,
+                args.num_workers,
+                args.read_ahead,
+                not args.no_touch,
+                queue,
+            ),
+        )
+        proc.start()
+        load_sec, touch_sec, peak_rss_mb, phases, _ = queue.get()
+        proc.join()
+        print(
+            f"{loader}: load {load_sec * 1000:.1f} ms, "
+            f"load + first read {touch_sec * 1000:.1f} ms, peak RSS growth {peak_rss_mb:.1f} MiB"
+        )
+        if phases is not None:
+            print(
+                "  read {read_sec:.3f} s (waited {read_wait_sec:.3f} s), "
+                "decode {decode_sec:.3f} s, copy {copy_sec:.3f} s, "
+                "{num_shards} shard(s), read-ahead {read_ahead}".format(**phases)
+            )
+
+
+if __name__ == "__main__":
+    main()
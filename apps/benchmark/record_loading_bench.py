@@ -0,0 +1,117 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the serial and the parallel loading of AutoTVM tuning logs.
+
+A log with the given number of records is generated unless it exists, e.g.
+
+    python3 record_loading_bench.py --log /tmp/records.log --num-records 1000000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from tvm import autotvm
+from tvm.autotvm.measure import MeasureInput, MeasureResult
+from tvm.autotvm.record import encode, load_from_file, load_from_file_parallel, measure_str_key
+from tvm.autotvm.task import ApplyHistoryBest
+from tvm.testing.autotvm import get_sample_task
+
+
+def generate_log(path, num_records, num_workloads):
+    """Write a log of random records of a few sample workloads"""
+    rows = []
+    for i in range(num_workloads):
+        task, target = get_sample_task(n=32 * (i + 1))
+        for j in range(min(len(task.config_space), 64)):
+            inp = MeasureInput(target, task, task.config_space.get(j))
+            rows.append(json.loads(encode(inp, MeasureResult((1.0,), 0, 0.0, 0.0))))
+    rng = random.Random(0)
+    with open(path, "w") as file:
+        for _ in range(num_records):
+            row = rng.choice(rows)
+            row["result"] = [[rng.uniform(1e-4, 1e-2)], 0 if rng.random() > 0.05 else 1, 1.0, 0.0]
+            file.write(json.dumps(row) + "\n")
+
+
+def pick_best_serial(in_file, out_file):
+    """The serial implementation of autotvm.record.pick_best"""
+    context = list(load_from_file(in_file))
+    best_context = ApplyHistoryBest(context)
+    best_set = set()
+    for inp, _ in best_context.best_by_model.values():
+        best_set.add(measure_str_key(inp))
+    for inp, _ in best_context.best_by_targetkey.values():
+        best_set.add(measure_str_key(inp))
+    with open(out_file, "w") as fout:
+        for inp, res in context:
+            if measure_str_key(inp) in best_set:
+                fout.write(encode(inp, res) + "\n")
+                best_set.remove(measure_str_key(inp))
+
+
+def timeit(name, func):
+    tic = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - tic
+    print(f"{name}: {elapsed:.2f} s")
+    return elapsed
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log", type=str, required=True, help="The path to the log file.")
+    parser.add_argument("--num-records", type=int, default=1000000)
+    parser.add_argument("--num-workloads", type=int, default=8)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--chunk-bytes", type=int, default=1 << 24)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.log):
+        timeit(
+            f"Generate {args.num_records} records",
+            lambda: generate_log(args.log, args.num_records, args.num_workloads),
+        )
+    print(f"Log size: {os.path.getsize(args.log) / 2**20:.1f} MiB")
+
+    serial = timeit("load_from_file", lambda: sum(1 for _ in load_from_file(args.log)))
+    parallel = timeit(
+        "load_from_file_parallel",
+        lambda: sum(
+            1
+            for _ in load_from_file_parallel(
+                args.log, max_workers=args.max_workers, chunk_bytes=args.chunk_bytes
+            )
+        ),
+    )
+    print(f"Speedup: {serial / parallel:.2f}x")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        serial_out = os.path.join(tmp_dir, "serial.log")
+        parallel_out = os.path.join(tmp_dir, "parallel.log")
+        serial = timeit("pick_best (serial)", lambda: pick_best_serial(args.log, serial_out))
+        parallel = timeit("pick_best", lambda: autotvm.record.pick_best(args.log, parallel_out))
+        print(f"Speedup: {serial / parallel:.2f}x")
+        with open(serial_out) as serial_file, open(parallel_out) as parallel_file:
+            assert serial_file.read() == parallel_file.read(), "The best records mismatch"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the dispatch overhead per instruction of the Relax VM interpreter,
+with and without linking the instructions ahead of time, e.g.
+
+    python3 relax_vm_dispatch_bench.py --num-calls 512 --num-args 4
+
+The benchmarked function chains calls to a builtin which only returns its first
+argument, so that the time of a call is dominated by the interpreter.
+"""
+import argparse
+
+import numpy as np
+
+import tvm
+from tvm import relax
+
+
+def build_chain(num_calls, num_args):
+    """Build a function of num_calls calls, each taking the previous result and num_args - 1
+    parameters"""
+    sinfo = relax.TensorStructInfo((1,), "float32")
+    params = [relax.Var(f"x{i}", sinfo) for i in range(num_args)]
+    builder = relax.BlockBuilder()
+    with builder.function("main", params):
+        result = params[0]
+        for _ in range(num_calls):
+            result = builder.emit(
+                relax.call_pure_packed("vm.builtin.copy", result, *params[1:], sinfo_args=sinfo)
+            )
+        builder.emit_func_output(result)
+    return builder.get()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-calls", type=int, default=512)
+    parser.add_argument("--num-args", type=int, default=4)
+    parser.add_argument("--number", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    mod = build_chain(args.num_calls, args.num_args)
+    executable = relax.build(mod, tvm.target.Target("llvm", host="llvm"), exec_mode="bytecode")
+    inputs = [tvm.nd.array(np.zeros(1, "float32")) for _ in range(args.num_args)]
+    for prelink in [False, True]:
+        machine = relax.VirtualMachine(executable, tvm.cpu(), prelink=prelink)
+        machine.set_input("main", *inputs)
+        res = machine.time_evaluator(
+            "invoke_stateful", tvm.cpu(), number=args.number, repeat=args.repeat
+        )("main")
+        per_instr_ns = res.median * 1e9 / args.num_calls
+        print(
+            f"prelink={prelink}: {res.median * 1e6:.2f} us per run, "
+            f"{per_instr_ns:.1f} ns per call instruction"
+        )
+
+
+if __name__ == "__main__":
+    main()
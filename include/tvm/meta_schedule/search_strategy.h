@@ -205,6 +205,8 @@ class SearchStrategy : public runtime::ObjectRef {
    * \param genetic_mutate_prob The probability of mutation.
    * \param genetic_max_fail_count The maximum number to try evolving the given trace.
    * \param eps_greedy The ratio to select samples in a greedy fashion via their predicted score.
+   * \param init_warm_start_ratio The ratio of samples in initial population that are replayed from
+   * the tuning records of similar workloads in the database.
    */
   TVM_DLL static SearchStrategy EvolutionarySearch(int population_size,         //
                                                    double init_measured_ratio,  //
@@ -213,7 +215,8 @@ class SearchStrategy : public runtime::ObjectRef {
                                                    int genetic_num_iters,       //
                                                    double genetic_mutate_prob,  //
                                                    int genetic_max_fail_count,  //
-                                                   double eps_greedy);
+                                                   double eps_greedy,           //
+                                                   double init_warm_start_ratio);
 
   TVM_DEFINE_MUTABLE_OBJECT_REF_METHODS(SearchStrategy, ObjectRef, SearchStrategyNode);
 };
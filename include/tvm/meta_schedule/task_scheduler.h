@@ -31,7 +31,12 @@
 #include <tvm/runtime/packed_func.h>
 #include <tvm/support/random_engine.h>
 
+#include <chrono>
+#include <deque>
+#include <future>
 #include <string>
+#include <unordered_set>
+#include <utility>
 #include <vector>
 
 namespace tvm {
@@ -139,6 +144,24 @@ class TaskSchedulerNode : public runtime::Object {
   Optional<CostModel> cost_model_;
   /*! \brief The number of remaining tasks to be tuned. */
   int remaining_tasks_;
+  /*!
+   * \brief The maximum number of tasks whose measure candidates are built in the background while
+   * the others are measured on the devices. When positive, the updates of the cost model run in
+   * the background as well. 0 means building, measuring and updating are not overlapped.
+   */
+  int pipeline_depth = 0;
+  /*! \brief The tasks being built in the background, and their building results, in order. */
+  std::deque<std::pair<int, std::shared_future<Array<BuilderResult>>>> pending_builds_;
+  /*! \brief The tasks whose measure candidates are being measured on the devices. */
+  std::unordered_set<int> measuring_tasks_;
+  /*! \brief The time when the tuning starts. */
+  std::chrono::steady_clock::time_point tune_start_time_;
+  /*! \brief The time when the tuning ends, or the default value if it is ongoing. */
+  std::chrono::steady_clock::time_point tune_end_time_;
+  /*! \brief The time since when the devices are busy, valid if `measuring_tasks_` is not empty */
+  std::chrono::steady_clock::time_point device_busy_since_;
+  /*! \brief The total time in seconds when the devices are busy, excluding the ongoing period. */
+  double device_busy_seconds_ = 0.0;
 
   /*! \brief The default destructor. */
   virtual ~TaskSchedulerNode() = default;
@@ -150,6 +173,13 @@ class TaskSchedulerNode : public runtime::Object {
     v->Visit("database_", &database_);
     v->Visit("cost_model_", &cost_model_);
     v->Visit("remaining_tasks_", &remaining_tasks_);
+    v->Visit("pipeline_depth", &pipeline_depth);
+    // `pending_builds_` is not visited
+    // `measuring_tasks_` is not visited
+    // `tune_start_time_` is not visited
+    // `tune_end_time_` is not visited
+    // `device_busy_since_` is not visited
+    // `device_busy_seconds_` is not visited
   }
 
   /*!
@@ -198,6 +228,12 @@ class TaskSchedulerNode : public runtime::Object {
   void TouchTask(int task_id);
   /*! \brief Print out a human-readable format of the tuning statistics. */
   void PrintTuningStatistics();
+  /*!
+   * \brief The device utilization, i.e. the fraction of the tuning time in which any measure
+   * candidate is being measured on the devices.
+   * \return The device utilization in [0, 1].
+   */
+  double DeviceUtilization() const;
 
   static constexpr const char* _type_key = "meta_schedule.TaskScheduler";
   TVM_DECLARE_BASE_OBJECT_INFO(TaskSchedulerNode, Object);
@@ -264,19 +300,37 @@ class TaskScheduler : public runtime::ObjectRef {
   /*!
    * \brief Create a task scheduler that fetches tasks in a round-robin fashion.
    * \param logger The tuning task's logging function.
+   * \param pipeline_depth The maximum number of tasks built in the background while measuring.
    * \return The task scheduler created.
    */
-  TVM_DLL static TaskScheduler RoundRobin(PackedFunc logger);
+  TVM_DLL static TaskScheduler RoundRobin(PackedFunc logger, int pipeline_depth);
   /*!
    * \brief Create a task scheduler that fetches tasks in a gradient based fashion.
    * \param logger The tuning task's logging function.
    * \param alpha The parameter alpha to control gradient computation.
    * \param window_size The parameter to control backward window size.
    * \param seed The random seed.
+   * \param pipeline_depth The maximum number of tasks built in the background while measuring.
    * \return The task scheduler created.
    */
   TVM_DLL static TaskScheduler GradientBased(PackedFunc logger, double alpha, int window_size,
-                                             support::LinearCongruentialEngine::TRandState seed);
+                                             support::LinearCongruentialEngine::TRandState seed,
+                                             int pipeline_depth);
+  /*!
+   * \brief Create a task scheduler that allocates the trials to each task in proportion to its
+   * share in the end-to-end latency measured by a profiler, and its estimated headroom.
+   * \param logger The tuning task's logging function.
+   * \param profile The total duration of the calls to each function, keyed by the task name.
+   * \param window_size The backward window size to estimate the headroom of a task.
+   * \param min_headroom The headroom that a task is assumed to have at the least.
+   * \param seed The random seed.
+   * \param pipeline_depth The maximum number of tasks built in the background while measuring.
+   * \return The task scheduler created.
+   */
+  TVM_DLL static TaskScheduler ProfileGuided(PackedFunc logger, Map<String, FloatImm> profile,
+                                             int window_size, double min_headroom,
+                                             support::LinearCongruentialEngine::TRandState seed,
+                                             int pipeline_depth);
   /*!
    * \brief Create a task scheduler with customized methods on the python-side.
    * \param logger The tuning task's logging function.
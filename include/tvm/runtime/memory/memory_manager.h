@@ -42,6 +42,7 @@ namespace memory {
 enum AllocatorType {
   kNaive = 1,
   kPooled,
+  kBuddy,
 };
 
 struct Buffer {
@@ -124,6 +125,13 @@ class MemoryManager {
    * \return The memory allocator.
    */
   TVM_DLL static Allocator* GetAllocator(Device dev, AllocatorType type);
+  /*!
+   * \brief Find an allocator given the context, without creating it.
+   * \param dev The TVM device
+   * \param type The allocator type
+   * \return The memory allocator, or nullptr if it has not been created yet.
+   */
+  TVM_DLL static Allocator* FindAllocator(Device dev, AllocatorType type);
   /*! \brief Clear the allocators. */
   static void Clear();
 
@@ -136,6 +144,46 @@ class MemoryManager {
       allocators_;
 };
 
+/*!
+ * \brief The tracker of the allocations of the memory manager, which records the live and peak
+ * memory, the allocation counts by size and the allocation sites of each allocator, when enabled.
+ * When disabled, the overhead of each allocation is checking a flag.
+ */
+class AllocationTracker {
+ public:
+  /*! \brief Whether the allocations are tracked. */
+  TVM_DLL static bool Enabled();
+  /*!
+   * \brief Enable or disable tracking. The statistics are kept when disabled.
+   * \param enabled Whether to track the allocations.
+   */
+  TVM_DLL static void SetEnabled(bool enabled);
+  /*! \brief Record an allocation from an allocator of the memory manager. */
+  TVM_DLL static void OnAlloc(const Buffer& buffer);
+  /*! \brief Record the free of an allocation. */
+  TVM_DLL static void OnFree(const Buffer& buffer);
+  /*! \brief Clear the statistics, and forget the allocations tracked so far. */
+  TVM_DLL static void Reset();
+};
+
+/*!
+ * \brief Attribute the allocations in the scope to a site, e.g. a VM instruction,
+ * when the allocations are tracked.
+ */
+class AllocationSiteScope {
+ public:
+  TVM_DLL explicit AllocationSiteScope(std::string site);
+  TVM_DLL ~AllocationSiteScope();
+  AllocationSiteScope(const AllocationSiteScope&) = delete;
+  AllocationSiteScope& operator=(const AllocationSiteScope&) = delete;
+  /*! \brief The site of the innermost scope of the current thread, or nullptr if none. */
+  TVM_DLL static const std::string* Current();
+
+ private:
+  std::string site_;
+  const std::string* prev_;
+};
+
 /*! \brief An object representing a storage allocation. */
 class StorageObj : public Object {
  public:
@@ -152,6 +200,7 @@ class StorageObj : public Object {
 
   ~StorageObj() {
     if (allocator) {
+      AllocationTracker::OnFree(buffer);
       allocator->Free(buffer);
     }
   }
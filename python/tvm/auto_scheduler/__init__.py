@@ -18,11 +18,13 @@
 """ Namespace for TVM Auto-scheduler. """
 
 from . import (
+    binary_record,
     compute_dag,
     dispatcher,
     feature,
     loop_state,
     measure,
+    measure_cache,
     measure_record,
     relay_integration,
     search_policy,
@@ -33,6 +35,7 @@ from . import (
 )
 
 # Shortcut
+from .binary_record import BinaryRecordFile, convert_record_file
 from .compute_dag import (
     ComputeDAG,
     LayoutRewriteOption,
@@ -49,6 +52,7 @@ from .measure import (
     RPCRunner,
     register_task_input_check_func,
 )
+from .measure_cache import MeasureCache
 from .measure_record import (
     RecordReader,
     RecordToFile,
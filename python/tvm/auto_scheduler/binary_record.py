@@ -0,0 +1,473 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+A compact binary format of measurement records (tuning logs).
+
+The JSON lines written by `save_records` repeat the workload key, the target and the
+names of the transform steps in every record. The binary format interns these strings,
+encodes the numbers in the transform steps as varints, and keeps a trailing index of the
+best record of each workload, so that the best records can be loaded without scanning
+the whole file.
+
+The file is a header followed by a sequence of frames. Each frame is a type byte,
+the varint length of its payload and the payload:
+
+- "S": the definition of the next interned string, in UTF-8.
+- "R": a measurement record, i.e., the JSON object of the record encoded with the
+  interned strings and varints.
+- "T": the trailing index, which holds all the interned strings and the offset of the best
+  record of each (workload key, target) pair. It ends with its own offset and a magic
+  number, which are the last 16 bytes of the file.
+
+New records are appended by overwriting the trailing index. If the index is lost, e.g. the
+process is killed while appending, it is rebuilt from the string and record frames.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from tvm.target import Target
+
+from . import _ffi_api
+from .utils import calc_workload_dis_factor, decode_workload_key
+
+logger = logging.getLogger("auto_scheduler")
+
+MAGIC = b"TVMASREC"
+INDEX_MAGIC = b"TVMASIDX"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sI")
+_FOOTER = struct.Struct("<Q8s")
+_FLOAT = struct.Struct("<d")
+
+_FRAME_STRING = ord("S")
+_FRAME_RECORD = ord("R")
+_FRAME_INDEX = ord("T")
+
+# The type tags of the encoded JSON values
+_NULL, _FALSE, _TRUE, _INT, _FLOAT64, _STR, _LIST, _DICT = range(8)
+
+
+def _write_varint(buf, value):
+    while value >= 0x80:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _write_frame(buf, frame_type, payload):
+    buf.append(frame_type)
+    _write_varint(buf, len(payload))
+    buf += payload
+
+
+def is_binary_record_file(filename):
+    """Check whether a file is a binary record file.
+
+    Parameters
+    ----------
+    filename : str
+        The file name.
+
+    Returns
+    -------
+    ret : bool
+        Whether the file starts with the magic number of binary record files.
+    """
+    if not os.path.isfile(filename):
+        return False
+    with open(filename, "rb") as fin:
+        return fin.read(len(MAGIC)) == MAGIC
+
+
+class BinaryRecordFile:
+    """A measurement record file in the binary format.
+
+    Parameters
+    ----------
+    filename : str
+        The file name. The file is created by the first `append` if it does not exist.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.strings = []  # string id -> string
+        self.string_ids = {}  # string -> string id
+        # (workload key id, target id) -> (the best cost, the offset of the best record)
+        self.index = {}
+        self.num_records = 0
+        # the offset of the trailing index, where new records are appended
+        self.end_offset = _HEADER.size
+        self._data = None
+        if os.path.isfile(filename) and os.path.getsize(filename) > 0:
+            self._open()
+
+    def _open(self):
+        with open(self.filename, "rb") as fin:
+            self._data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.filename} is not a binary record file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported version of binary record file: {version}")
+        if not self._load_index():
+            logger.warning("The index of %s is broken. Rebuild it from the records.", self.filename)
+            self._rebuild_index()
+
+    def _load_index(self):
+        """Load the trailing index. Return False if it is missing or broken."""
+        data = self._data
+        if len(data) < _HEADER.size + _FOOTER.size:
+            return False
+        offset, magic = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        if magic != INDEX_MAGIC or not _HEADER.size <= offset < len(data):
+            return False
+        if data[offset] != _FRAME_INDEX:
+            return False
+        length, pos = _read_varint(data, offset + 1)
+        if pos + length != len(data):
+            return False
+
+        num_strings, pos = _read_varint(data, pos)
+        for _ in range(num_strings):
+            length, pos = _read_varint(data, pos)
+            self._intern(bytes(data[pos : pos + length]).decode("utf-8"))
+            pos += length
+        num_entries, pos = _read_varint(data, pos)
+        for _ in range(num_entries):
+            workload_id, pos = _read_varint(data, pos)
+            target_id, pos = _read_varint(data, pos)
+            (cost,) = _FLOAT.unpack_from(data, pos)
+            record_offset, pos = _read_varint(data, pos + _FLOAT.size)
+            self.index[(workload_id, target_id)] = (cost, record_offset)
+        self.num_records, pos = _read_varint(data, pos)
+        self.end_offset = offset
+        return True
+
+    def _rebuild_index(self):
+        """Rebuild the index by scanning the frames"""
+        self.strings, self.string_ids, self.index = [], {}, {}
+        self.num_records = 0
+        self.end_offset = _HEADER.size
+        for frame_type, offset, payload in self._frames(rebuild=True):
+            if frame_type == _FRAME_STRING:
+                self._intern(bytes(payload).decode("utf-8"))
+            elif frame_type == _FRAME_RECORD:
+                self._update_index(self._decode(payload), offset)
+
+    def _frames(self, rebuild=False):
+        """Iterate over the frames as (type, offset, payload)"""
+        data = self._data
+        pos = _HEADER.size
+        end = len(data) if rebuild else self.end_offset
+        while pos < end:
+            offset = pos
+            frame_type = data[pos]
+            if frame_type not in (_FRAME_STRING, _FRAME_RECORD, _FRAME_INDEX):
+                break
+            try:
+                length, pos = _read_varint(data, pos + 1)
+            except IndexError:
+                break
+            if pos + length > end:
+                break
+            yield frame_type, offset, data[pos : pos + length]
+            pos += length
+            if rebuild and frame_type != _FRAME_INDEX:
+                self.end_offset = pos
+
+    def _intern(self, string):
+        string_id = self.string_ids.get(string, None)
+        if string_id is None:
+            string_id = self.string_ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+    def _update_index(self, record, offset):
+        self.num_records += 1
+        task, res = record["i"][0], record["r"]
+        if res[1] != 0:  # MeasureErrorNo.NO_ERROR
+            return
+        cost = float(np.mean(res[0]))
+        key = (self.string_ids[task[0]], self.string_ids[task[1]])
+        if key not in self.index or cost < self.index[key][0]:
+            self.index[key] = (cost, offset)
+
+    def _encode(self, value, buf, new_strings):
+        if value is None:
+            buf.append(_NULL)
+        elif isinstance(value, bool):
+            buf.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            buf.append(_INT)
+            _write_varint(buf, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif isinstance(value, float):
+            buf.append(_FLOAT64)
+            buf += _FLOAT.pack(value)
+        elif isinstance(value, str):
+            buf.append(_STR)
+            if value not in self.string_ids:
+                new_strings.append(value)
+            _write_varint(buf, self._intern(value))
+        elif isinstance(value, list):
+            buf.append(_LIST)
+            _write_varint(buf, len(value))
+            for item in value:
+                self._encode(item, buf, new_strings)
+        elif isinstance(value, dict):
+            buf.append(_DICT)
+            _write_varint(buf, len(value))
+            for key, item in value.items():
+                self._encode(key, buf, new_strings)
+                self._encode(item, buf, new_strings)
+        else:
+            raise ValueError(f"Cannot encode {type(value)} in a binary record")
+
+    def _decode_value(self, data, pos):
+        tag = data[pos]
+        pos += 1
+        if tag == _INT:
+            value, pos = _read_varint(data, pos)
+            return (value >> 1) if not value & 1 else -((value + 1) >> 1), pos
+        if tag == _STR:
+            string_id, pos = _read_varint(data, pos)
+            return self.strings[string_id], pos
+        if tag == _LIST:
+            length, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(length):
+                item, pos = self._decode_value(data, pos)
+                items.append(item)
+            return items, pos
+        if tag == _FLOAT64:
+            return _FLOAT.unpack_from(data, pos)[0], pos + _FLOAT.size
+        if tag == _DICT:
+            length, pos = _read_varint(data, pos)
+            items = {}
+            for _ in range(length):
+                key, pos = self._decode_value(data, pos)
+                items[key], pos = self._decode_value(data, pos)
+            return items, pos
+        if tag in (_NULL, _FALSE, _TRUE):
+            return (None, False, True)[tag], pos
+        raise ValueError(f"Invalid value tag {tag} in {self.filename}")
+
+    def _decode(self, payload):
+        return self._decode_value(payload, 0)[0]
+
+    def _read_record(self, offset):
+        data = self._data
+        assert data[offset] == _FRAME_RECORD
+        length, pos = _read_varint(data, offset + 1)
+        return self._decode(data[pos : pos + length])
+
+    def append_json(self, records):
+        """Append records to the file.
+
+        Parameters
+        ----------
+        records : Iterable[Dict]
+            The JSON objects of the records, i.e., the decoded lines of a JSON log file.
+        """
+        buf = bytearray()
+        if self.end_offset == _HEADER.size:
+            buf += _HEADER.pack(MAGIC, VERSION)
+        base = self.end_offset - len(buf)
+        new_strings = []
+        for record in records:
+            payload = bytearray()
+            self._encode(record, payload, new_strings)
+            for string in new_strings:
+                _write_frame(buf, _FRAME_STRING, string.encode("utf-8"))
+            new_strings.clear()
+            offset = base + len(buf)
+            _write_frame(buf, _FRAME_RECORD, payload)
+            self._update_index(record, offset)
+        end_offset = base + len(buf)
+
+        # write the trailing index
+        payload = bytearray()
+        _write_varint(payload, len(self.strings))
+        for string in self.strings:
+            encoded = string.encode("utf-8")
+            _write_varint(payload, len(encoded))
+            payload += encoded
+        _write_varint(payload, len(self.index))
+        for (workload_id, target_id), (cost, offset) in self.index.items():
+            _write_varint(payload, workload_id)
+            _write_varint(payload, target_id)
+            payload += _FLOAT.pack(cost)
+            _write_varint(payload, offset)
+        _write_varint(payload, self.num_records)
+        payload += _FOOTER.pack(end_offset, INDEX_MAGIC)
+        _write_frame(buf, _FRAME_INDEX, payload)
+
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        with open(self.filename, "r+b" if os.path.isfile(self.filename) else "wb") as fout:
+            fout.seek(base)
+            fout.write(buf)
+            fout.truncate()
+        self._open()
+
+    def append(self, inputs, results):
+        """Append measurement records to the file.
+
+        Parameters
+        ----------
+        inputs: List[MeasureInputs]
+            The MeasureInputs to be written.
+        results: List[MeasureResults]
+            The MeasureResults to be written.
+        """
+        self.append_json(
+            json.loads(_ffi_api.WriteMeasureRecords(inp, res)) for inp, res in zip(inputs, results)
+        )
+
+    def iter_json(self):
+        """Iterate over the JSON objects of all records in the order they are written."""
+        if self._data is None:
+            return
+        for frame_type, _, payload in self._frames():
+            if frame_type == _FRAME_RECORD:
+                yield self._decode(payload)
+
+    def _load_record(self, record):
+        inp, res = _ffi_api.ReadMeasureRecord(json.dumps(record))
+        return inp, res
+
+    def __iter__(self):
+        for record in self.iter_json():
+            yield self._load_record(record)
+
+    def __len__(self):
+        return self.num_records
+
+    def best_records(self):
+        """Load the best record of each (workload key, target) pair from the index.
+
+        Returns
+        -------
+        records : List[Tuple[MeasureInput, MeasureResult]]
+            The best records in the order they are written.
+        """
+        offsets = sorted(offset for _, offset in self.index.values())
+        return [self._load_record(self._read_record(offset)) for offset in offsets]
+
+    def load_best_record(self, workload_key=None, target=None, include_compatible=False):
+        """Return the best measurement pair by looking up the index.
+        See `auto_scheduler.load_best_record` for the parameters."""
+        best_cost = 1e30
+        best_offset = None
+        target_kinds = {}
+        for (workload_id, target_id), (cost, offset) in self.index.items():
+            if target:
+                if target_id not in target_kinds:
+                    target_kinds[target_id] = Target(self.strings[target_id]).kind.name
+                if target_kinds[target_id] != target.kind.name:
+                    continue
+
+            if workload_key is not None:
+                dis_f = calc_workload_dis_factor(
+                    decode_workload_key(workload_key),
+                    decode_workload_key(self.strings[workload_id]),
+                )
+                if dis_f == float("inf"):
+                    continue
+                if not include_compatible and dis_f != 1:
+                    continue
+                cost *= dis_f
+
+            # break the ties by the order of the records, as a linear scan does
+            if cost < best_cost or (cost == best_cost and offset < best_offset):
+                best_cost = cost
+                best_offset = offset
+
+        if best_offset is None:
+            return None, None
+        return self._load_record(self._read_record(best_offset))
+
+    def close(self):
+        """Close the file."""
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+
+def convert_record_file(in_file, out_file):
+    """Convert a JSON record file to the binary format, or convert it back.
+    The direction is decided by the format of the input file.
+    The converted records are appended to the output file if it exists.
+
+    Parameters
+    ----------
+    in_file : str
+        The input file.
+    out_file : str
+        The output file.
+
+    Returns
+    -------
+    num_records : int
+        The number of converted records.
+    """
+    dirname = os.path.dirname(os.path.abspath(out_file))
+    if not os.path.exists(dirname):
+        os.makedirs(dirname)
+
+    if is_binary_record_file(in_file):
+        reader = BinaryRecordFile(in_file)
+        with open(out_file, "a") as fout:
+            for record in reader.iter_json():
+                fout.write(json.dumps(record) + "\n")
+        reader.close()
+        return len(reader)
+
+    writer = BinaryRecordFile(out_file)
+    num_records = 0
+    batch = []
+    with open(in_file, "r") as fin:
+        for line in fin:
+            if not line.strip() or line[0] in ("#", " "):
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= 65536:
+                writer.append_json(batch)
+                num_records += len(batch)
+                batch = []
+    if batch or num_records == 0:
+        writer.append_json(batch)
+        num_records += len(batch)
+    writer.close()
+    return num_records
@@ -17,6 +17,8 @@
 # pylint: disable=invalid-name
 
 """Cost model based on xgboost"""
+import base64
+import json
 import multiprocessing
 import logging
 from typing import Dict
@@ -110,8 +112,18 @@ class XGBModel(PythonBasedModel):
     adaptive_training: bool = False
         Whether to use adaptive training, which reduces the training frequency when there are
         too many logs.
+    incremental_training: bool = False
+        Whether to update the booster with only the new measurement records.
+        The booster is re-trained on the whole dataset only when the number of records
+        has doubled since the last full training.
+    artifact_file: Optional[str]
+        If is not None, export the model artifact (see `export`) to this file after every update.
     """
 
+    # The format name and version of the artifacts written by `export`
+    ARTIFACT_FORMAT = "tvm.auto_scheduler.XGBModel"
+    ARTIFACT_VERSION = 1
+
     def __init__(
         self,
         verbose_eval=25,
@@ -119,6 +131,8 @@ class XGBModel(PythonBasedModel):
         seed=None,
         model_file=None,
         adaptive_training=False,
+        incremental_training=False,
+        artifact_file=None,
     ):
         global xgb
         try:
@@ -151,6 +165,9 @@ class XGBModel(PythonBasedModel):
         self.verbose_eval = verbose_eval
         self.model_file = model_file
         self.adaptive_training = adaptive_training
+        self.incremental_training = incremental_training
+        self.incremental_num_boost_round = 100
+        self.artifact_file = artifact_file
 
         super().__init__()
 
@@ -160,9 +177,16 @@ class XGBModel(PythonBasedModel):
         self.last_train_length = 0
         self.inputs_feature_cache = []
 
+        # (workload_key, target) -> the min cost used to normalize the throughputs
+        self.min_costs = {}
+        # the number of samples the booster was fully trained on, and trained on in total
+        self.last_full_train_length = 0
+        self.num_trained_samples = 0
+
     def update(self, inputs, results):
         """Update the cost model according to new measurement results (training data).
-        XGBoost does not support incremental training, so we re-train a new model every time.
+        XGBoost does not support incremental training, so we re-train a new model every time,
+        unless `incremental_training` is enabled.
         Parameters
         ----------
         inputs : List[MeasureInput]
@@ -186,6 +210,22 @@ class XGBModel(PythonBasedModel):
             return
         self.last_train_length = len(self.inputs)
 
+        if not (
+            self.incremental_training
+            and self.bst is not None
+            and len(self.inputs) < 2 * self.last_full_train_length
+            and self._train_incrementally()
+        ):
+            self._train_fully()
+
+        # Update the model file if it has been set
+        if self.model_file:
+            self.save(self.model_file)
+        if self.artifact_file:
+            self.export(self.artifact_file)
+
+    def _train_fully(self):
+        """Train a new booster on all the measurement records"""
         # extract feature
         n_cached = len(self.inputs_feature_cache)
         features, normalized_throughputs, task_ids = get_per_store_features_from_measure_pairs(
@@ -218,9 +258,70 @@ class XGBModel(PythonBasedModel):
             ],
         )
 
-        # Update the model file if it has been set
-        if self.model_file:
-            self.save(self.model_file)
+        # The throughputs are normalized by the min costs of this dataset only
+        self.min_costs = {}
+        self._normalize_throughputs(self.inputs, self.results)
+        self.last_full_train_length = self.num_trained_samples = len(self.inputs)
+
+    def _train_incrementally(self):
+        """Continue training the booster on the measurement records that are not trained yet.
+
+        Returns
+        -------
+        success: bool
+            Whether the booster is updated. It is False when some of the new records
+            cannot be used, in which case the booster should be re-trained fully.
+        """
+        n_cached = len(self.inputs_feature_cache)
+        new_inputs, new_results = self.inputs[n_cached:], self.results[n_cached:]
+        features, _, task_ids = get_per_store_features_from_measure_pairs(new_inputs, new_results)
+        if len(features) != len(new_inputs):
+            return False
+        self.inputs_feature_cache = list(self.inputs_feature_cache) + list(features)
+
+        # Normalize the new throughputs consistently with the ones the booster was trained on
+        normalized_throughputs = self._normalize_throughputs(new_inputs, new_results)
+        dtrain = pack_sum_xgbmatrix(
+            features, normalized_throughputs, task_ids, normalized_throughputs
+        )
+
+        # The best score of the previous training is evaluated on another dataset
+        self.bst.set_attr(best_score=None, best_iteration=None, best_msg=None)
+        self.bst = xgb.train(
+            self.xgb_params,
+            dtrain,
+            num_boost_round=self.incremental_num_boost_round,
+            xgb_model=self.bst,
+            obj=pack_sum_square_error,
+            callbacks=[
+                CustomCallback(
+                    stopping_rounds=10,
+                    metric="tr-p-rmse",
+                    fevals=[pack_sum_rmse, pack_sum_average_peak_score(self.plan_size)],
+                    evals=[(dtrain, "tr")],
+                    maximize=False,
+                    verbose_eval=self.verbose_eval,
+                )
+            ],
+        )
+        self.num_trained_samples += len(new_inputs)
+        return True
+
+    def _normalize_throughputs(self, inputs, results):
+        """Update the min costs with the measurement records,
+        and return their throughputs normalized by the min costs.
+        This follows the normalization of `get_per_store_features_from_measure_pairs`.
+        """
+        keys = [(inp.task.workload_key, str(inp.task.target)) for inp in inputs]
+        costs = np.array(
+            [np.mean([x.value for x in res.costs]) if res.costs else 1e10 for res in results],
+            dtype=np.float32,
+        )
+        for key, cost in zip(keys, costs):
+            if cost < self.min_costs.get(key, float("inf")):
+                self.min_costs[key] = float(cost)
+        min_costs = np.array([self.min_costs[key] for key in keys], dtype=np.float32)
+        return min_costs / costs
 
     def predict(self, task, states):
         """Predict the scores of states
@@ -344,6 +445,53 @@ class XGBModel(PythonBasedModel):
         self.bst.load_model(file_name)
         self.num_warmup_sample = -1
 
+    def export(self, file_name: str):
+        """Export the model to a versioned artifact, which holds the booster together
+        with the state used to normalize the throughputs of the training data.
+        The artifact can be loaded by `load_artifact` to start another tuning from this model.
+
+        Parameters
+        ----------
+        file_name: str
+            The filename
+        """
+        artifact = {
+            "format": self.ARTIFACT_FORMAT,
+            "version": self.ARTIFACT_VERSION,
+            "xgb_params": self.xgb_params,
+            "num_samples": self.num_trained_samples,
+            "min_costs": [[key[0], key[1], cost] for key, cost in self.min_costs.items()],
+            "booster": base64.b64encode(bytes(self.bst.save_raw())).decode("ascii"),
+        }
+        with open(file_name, "w") as fout:
+            json.dump(artifact, fout)
+
+    def load_artifact(self, file_name: str):
+        """Load the model from an artifact exported by `export`
+
+        Parameters
+        ----------
+        file_name: str
+            The filename
+        """
+        with open(file_name, "r") as fin:
+            artifact = json.load(fin)
+        if artifact.get("format") != self.ARTIFACT_FORMAT:
+            raise ValueError(f"{file_name} is not an artifact of XGBModel")
+        if artifact.get("version") != self.ARTIFACT_VERSION:
+            raise ValueError(
+                f"Unsupported version of XGBModel artifact: {artifact.get('version')}. "
+                f"Expected: {self.ARTIFACT_VERSION}"
+            )
+
+        self.bst = xgb.Booster(self.xgb_params)
+        self.bst.load_model(bytearray(base64.b64decode(artifact["booster"])))
+        self.min_costs = {
+            (workload_key, target): cost for workload_key, target, cost in artifact["min_costs"]
+        }
+        self.last_full_train_length = self.num_trained_samples = artifact["num_samples"]
+        self.num_warmup_sample = -1
+
 
 def feature_to_pack_sum_xgbmatrix(xs):
     """Convert an extracted multi-stage feature vector to a xgbmatrx in pack-sum format
@@ -32,6 +32,7 @@ import numpy as np
 from tvm.contrib.utils import tempdir
 from tvm.tir.expr import FloatImm
 from .cost_model import RandomModel, XGBModel
+from .binary_record import BinaryRecordFile, is_binary_record_file
 from .measure import LocalRPCMeasureContext
 from .measure_record import RecordToFile, load_records
 from .search_policy import PreloadMeasuredStates, SketchPolicy
@@ -208,7 +209,11 @@ class ApplyHistoryBest(DispatchContext):
                 rec = str(rec)
 
             if isinstance(rec, str):
-                rec = load_records(rec)
+                if n_lines is None and is_binary_record_file(rec):
+                    # Only the best records are needed, which are indexed by the binary file
+                    rec = BinaryRecordFile(rec).best_records()
+                else:
+                    rec = load_records(rec)
                 joint_records += rec
             else:
                 if rec is not None:
@@ -31,6 +31,7 @@ get the measurement results. The flow of data structures is
 We implement these in python to utilize python's multiprocessing and error handling.
 """
 
+import functools
 import logging
 import multiprocessing
 import os
@@ -76,10 +77,19 @@ class BuildFunc:
         The name of registered build function.
     build_func: callable = tar.tar
         The callable of registered build function.
+    measure_cache: Optional[MeasureCache] = None
+        The cache of measurement results consulted before building programs.
     """
 
     name = "default"
     build_func = tar.tar
+    measure_cache = None
+
+
+# The cache entries of the programs built by the last call of LocalBuilder, which are consumed
+# by the runners. BuildResult handle -> (build result, measure input, measure_cache, program key,
+# target, cached costs). The entry keeps the build result alive, so that its handle is not reused.
+_measure_cache_entries = {}
 
 
 @tvm._ffi.register_object("auto_scheduler.MeasureCallback")
@@ -326,9 +336,19 @@ class LocalBuilder(ProgramBuilder):
         If is 'default', use default build function
         If is 'ndk', use function for android ndk
         If is callable, use it as custom build function, expect lib_format field.
+    measure_cache: Optional[MeasureCache]
+        The cache of measurement results shared across tasks and tuning runs.
+        The programs with cached results are neither compiled nor run again,
+        and the results of newly measured programs are saved to the cache by the runner.
     """
 
-    def __init__(self, timeout=15, n_parallel=multiprocessing.cpu_count(), build_func="default"):
+    def __init__(
+        self,
+        timeout=15,
+        n_parallel=multiprocessing.cpu_count(),
+        build_func="default",
+        measure_cache=None,
+    ):
         if build_func == "default":
             BuildFunc.name = "default"
             BuildFunc.build_func = tar.tar
@@ -340,6 +360,7 @@ class LocalBuilder(ProgramBuilder):
             BuildFunc.build_func = build_func
         else:
             raise ValueError("Invalid build_func" + build_func)
+        BuildFunc.measure_cache = measure_cache
 
         self.__init_handle_by_constructor__(
             _ffi_api.LocalBuilder, timeout, n_parallel, BuildFunc.name
@@ -605,7 +626,7 @@ class MeasureErrorNo(object):
     UNKNOWN_ERROR = 8  # Unknown error
 
 
-def _local_build_worker(inp_serialized, build_func, verbose):
+def _local_build_worker(inp_serialized, build_func, verbose, measure_cache=None):
     tic = time.time()
     inp = MeasureInput.deserialize(inp_serialized)
     task = inp.task
@@ -614,6 +635,7 @@ def _local_build_worker(inp_serialized, build_func, verbose):
     error_no = MeasureErrorNo.NO_ERROR
     error_msg = None
     args = []
+    cache_entry = None
 
     try:
         sch, args = task.compute_dag.apply_steps_from_state(
@@ -624,7 +646,20 @@ def _local_build_worker(inp_serialized, build_func, verbose):
         error_no = MeasureErrorNo.INSTANTIATION_ERROR
         error_msg = make_traceback_info()
 
-    if error_no == 0:
+    if error_no == 0 and measure_cache is not None:
+        try:
+            # Lower the schedule in advance to look up the cache by the hash of the program
+            with transform.PassContext().current():
+                sch = build_module.lower(sch, args, name="default_function")
+            key = measure_cache.make_key(sch)
+            cache_entry = (key, str(task.target), measure_cache.load(key, str(task.target)))
+        # pylint: disable=broad-except
+        except Exception:
+            error_no = MeasureErrorNo.COMPILE_HOST
+            error_msg = make_traceback_info()
+
+    filename = ""
+    if error_no == 0 and (cache_entry is None or cache_entry[2] is None):
         dirname = tempfile.mkdtemp()
         filename = os.path.join(dirname, "tmp_func." + build_func.output_format)
 
@@ -636,8 +671,6 @@ def _local_build_worker(inp_serialized, build_func, verbose):
         except Exception:
             error_no = MeasureErrorNo.COMPILE_HOST
             error_msg = make_traceback_info()
-    else:
-        filename = ""
 
     if verbose >= 1:
         if error_no == MeasureErrorNo.NO_ERROR:
@@ -645,7 +678,7 @@ def _local_build_worker(inp_serialized, build_func, verbose):
         else:
             print(".E", end="", flush=True)  # Build error
 
-    return filename, args, error_no, error_msg, time.time() - tic
+    return filename, args, error_no, error_msg, time.time() - tic, cache_entry
 
 
 def local_build_worker(args):
@@ -654,17 +687,18 @@ def local_build_worker(args):
 
     Parameters
     ----------
-    args: Tuple[MeasureInput, callable, int]
-        inputs, build-func, verbose args passed to local_builder_build
+    args: Tuple[MeasureInput, callable, int, Optional[MeasureCache]]
+        inputs, build-func, verbose, measure-cache args passed to local_builder_build
 
     Returns
     -------
-    res : BuildResult
-        The build result of this Builder thread.
+    res : Tuple
+        The fields of the build result of this Builder thread,
+        followed by its entry in the measure cache.
     """
-    inp, build_func, verbose = args
+    inp, build_func, verbose, measure_cache = args
 
-    return _local_build_worker(inp, build_func, verbose)
+    return _local_build_worker(inp, build_func, verbose, measure_cache)
 
 
 @tvm._ffi.register_func("auto_scheduler.local_builder.build")
@@ -697,14 +731,27 @@ def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbo
     executor = PopenPoolExecutor(
         n_parallel, timeout, reset_global_scope, (AutotvmGlobalScope.current,)
     )
+    measure_cache = BuildFunc.measure_cache
+    # The entries not consumed by a runner, e.g. if the measurement is aborted, are dropped
+    _measure_cache_entries.clear()
     tuple_res = executor.map_with_error_catching(
-        local_build_worker, [(i.serialize(), BuildFunc.build_func, verbose) for i in inputs]
+        local_build_worker,
+        [(i.serialize(), BuildFunc.build_func, verbose, measure_cache) for i in inputs],
     )
 
     results = []
-    for res in tuple_res:
+    for inp, res in zip(inputs, tuple_res):
         if res.status == StatusKind.COMPLETE:
-            results.append(BuildResult(*res.value))
+            *fields, cache_entry = res.value
+            build_res = BuildResult(*fields)
+            results.append(build_res)
+            if cache_entry is not None:
+                _measure_cache_entries[build_res.handle.value] = (
+                    build_res,
+                    inp,
+                    measure_cache,
+                    *cache_entry,
+                )
         elif res.status == StatusKind.TIMEOUT:
             if verbose >= 1:
                 print(".T", end="", flush=True)  # Build timeout
@@ -947,7 +994,51 @@ def _timed_eval_func(
     return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
 
 
+def _consult_measure_cache(run_func):
+    """Wrap a run function of the runners to reuse the cached measurement results of the
+    programs built by LocalBuilder, and to save the results of the newly measured ones."""
+
+    @functools.wraps(run_func)
+    def _wrapped_run_func(inputs, build_results, *args, **kwargs):
+        entries = []
+        for inp, res in zip(inputs, build_results):
+            entry = _measure_cache_entries.pop(res.handle.value, None)
+            # Only use the entry of the same build result of the same input
+            if entry is not None and not (entry[0].same_as(res) and entry[1].same_as(inp)):
+                entry = None
+            entries.append(entry[2:] if entry is not None else None)
+        if all(entry is None for entry in entries):
+            return run_func(inputs, build_results, *args, **kwargs)
+
+        # only run the programs without cached results
+        todo = [i for i, entry in enumerate(entries) if entry is None or entry[3] is None]
+        measure_results = [None] * len(inputs)
+        if todo:
+            run_results = run_func(
+                [inputs[i] for i in todo], [build_results[i] for i in todo], *args, **kwargs
+            )
+            for i, res in zip(todo, run_results):
+                measure_results[i] = res
+                if entries[i] is not None and res.error_no == MeasureErrorNo.NO_ERROR:
+                    measure_cache, key, target, _ = entries[i]
+                    measure_cache.save(key, target, [cost.value for cost in res.costs])
+
+        for i, entry in enumerate(entries):
+            if measure_results[i] is None:
+                measure_results[i] = MeasureResult(
+                    entry[3],
+                    MeasureErrorNo.NO_ERROR,
+                    "",
+                    build_results[i].time_cost,
+                    time.time(),
+                )
+        return measure_results
+
+    return _wrapped_run_func
+
+
 @tvm._ffi.register_func("auto_scheduler.local_runner.run")
+@_consult_measure_cache
 def local_run(
     inputs,
     build_results,
@@ -1210,6 +1301,7 @@ def _rpc_run_worker(args):
 
 
 @tvm._ffi.register_func("auto_scheduler.rpc_runner.run")
+@_consult_measure_cache
 def rpc_runner_run(
     inputs,
     build_results,
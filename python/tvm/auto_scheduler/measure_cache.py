@@ -0,0 +1,170 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+A content-addressed cache of measurement results shared across tasks and tuning runs.
+
+The same program is often measured again under different search tasks, e.g., the same
+conv2d appears in many networks but is registered with a different workload key.
+The cache is keyed by the hash of the lowered TIR and the target, so that a program is
+measured only once on each device, no matter which task it comes from.
+"""
+
+import contextlib
+import hashlib
+import json
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS measure_results (
+    program_hash TEXT NOT NULL,
+    target TEXT NOT NULL,
+    device_key TEXT NOT NULL,
+    costs TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    PRIMARY KEY (program_hash, target, device_key)
+);
+"""
+
+
+class MeasureCache:
+    """A measurement result cache backed by a SQLite file, which can be shared by
+    concurrent tuning processes.
+
+    Only the results of successful measurements are cached. The results are stored per
+    device key, so that the programs measured on one kind of device are never reused for
+    another one. The results of a device expire after `max_age` seconds, e.g.,
+    after the device or its software stack has been upgraded.
+
+    Parameters
+    ----------
+    path : str
+        The path to the cache file.
+    device_key : str = "local"
+        The key of the device the cached results are measured on.
+        It is usually the key of the device registered in the RPC tracker.
+    max_age : Optional[float]
+        The maximum age (in second) of the reused results. If None, the results never expire.
+    timeout : float = 60
+        How long to wait for the lock held by another process before raising an error.
+
+    Examples
+    --------
+    .. code-block:: python
+
+      cache = auto_scheduler.MeasureCache("measure_cache.db", device_key="rasp4b")
+      tune_option = auto_scheduler.TuningOptions(
+          builder=auto_scheduler.LocalBuilder(measure_cache=cache),
+          runner=auto_scheduler.RPCRunner("rasp4b", "127.0.0.1", 9190),
+      )
+    """
+
+    def __init__(self, path, device_key="local", max_age=None, timeout=60):
+        self.path = path
+        self.device_key = device_key
+        self.max_age = max_age
+        self.timeout = timeout
+        # The cache is used by the builder processes as well, so the connection is opened on
+        # demand instead of being held by this object.
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            with conn:  # commit on success
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(mod):
+        """Make the content-addressed key of a lowered program.
+
+        Parameters
+        ----------
+        mod : IRModule
+            The lowered TIR module.
+
+        Returns
+        -------
+        key : str
+            The hash of the module.
+        """
+        return hashlib.sha256(mod.script().encode("utf-8")).hexdigest()
+
+    def load(self, key, target):
+        """Load the cached costs of a program.
+
+        Parameters
+        ----------
+        key : str
+            The key of the program made by `make_key`.
+        target : str
+            The string of the target.
+
+        Returns
+        -------
+        costs : Optional[List[float]]
+            The cached costs, or None if the program has not been measured on the device,
+            or its result has expired.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT costs, timestamp FROM measure_results "
+                "WHERE program_hash = ? AND target = ? AND device_key = ?",
+                (key, target, self.device_key),
+            ).fetchone()
+        if row is None:
+            return None
+        costs, timestamp = row
+        if self.max_age is not None and time.time() - timestamp > self.max_age:
+            return None
+        return json.loads(costs)
+
+    def save(self, key, target, costs):
+        """Save the costs of a program measured on the device.
+
+        Parameters
+        ----------
+        key : str
+            The key of the program made by `make_key`.
+        target : str
+            The string of the target.
+        costs : List[float]
+            The measured costs.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO measure_results "
+                "(program_hash, target, device_key, costs, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (key, target, self.device_key, json.dumps(list(costs)), time.time()),
+            )
+
+    def invalidate(self):
+        """Remove all the cached results of the device."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM measure_results WHERE device_key = ?", (self.device_key,))
+
+    def __len__(self):
+        with self._connect() as conn:
+            (size,) = conn.execute(
+                "SELECT COUNT(*) FROM measure_results WHERE device_key = ?", (self.device_key,)
+            ).fetchone()
+        return size
@@ -20,12 +20,13 @@
 import argparse
 import logging
 import os
-import itertools
 
 import numpy as np
 
 import tvm._ffi
+from tvm.contrib.popen_pool import map_file_chunks, read_lines_in_range
 from tvm.runtime import Object
+from .binary_record import BinaryRecordFile, convert_record_file, is_binary_record_file
 from .measure import MeasureErrorNo, MeasureCallback
 from .utils import calc_workload_dis_factor, decode_workload_key
 from . import _ffi_api
@@ -190,7 +191,10 @@ def load_records(filename):
     for faster read speed (e.g., input.task.compute_dag, input.state.stages).
     If you want to use them, you can call the :code:`recover_measure_input` below
     to rebuild these fields.
+    Both the JSON and the binary record files are supported.
     """
+    if is_binary_record_file(filename):
+        return list(BinaryRecordFile(filename))
     return zip(*RecordReader(filename).read_lines())
 
 
@@ -236,7 +240,15 @@ def load_best_record(filename, workload_key=None, target=None, include_compatibl
         The best State's MeasureInput from this log fine.
     result : auto_scheduler.measure.MeasureResult
         The best State's MeasureResult from this log fine.
+
+    Note
+    ----
+    For the binary record files, the best record is looked up in the index of the file
+    instead of scanning all records.
     """
+    if is_binary_record_file(filename):
+        return BinaryRecordFile(filename).load_best_record(workload_key, target, include_compatible)
+
     log_reader = RecordReader(filename)
     best_cost = 1e30
     best_inp = None
@@ -272,6 +284,25 @@ def load_best_record(filename, workload_key=None, target=None, include_compatibl
     return best_inp, best_res
 
 
+def _best_lines_in_chunk(path, start, end):
+    """The cost and the record string of the best record of each target key and workload key
+    in a byte range of a record file"""
+    best = {}
+    for line in read_lines_in_range(path, start, end):
+        if not line or line[0] in ("#", " "):
+            continue
+        inp, res = load_record_from_string(line)
+        if res.error_no != MeasureErrorNo.NO_ERROR:
+            continue
+        costs = [x.value for x in res.costs if isinstance(x, tvm.tir.expr.FloatImm)]
+        cost = np.mean(costs)
+        for k in inp.task.target.keys:
+            key = (k, inp.task.workload_key)
+            if key not in best or cost < best[key][0]:
+                best[key] = (cost, line)
+    return best
+
+
 def distill_record_file(in_file, out_file):
     """
     Pick the best entries from a record file and store them to another file.
@@ -289,44 +320,41 @@ def distill_record_file(in_file, out_file):
     # pylint: disable=import-outside-toplevel
     from .dispatcher import ApplyHistoryBest
 
-    context = load_records(in_file)
-
     dirname = os.path.dirname(os.path.abspath(out_file))
     if not os.path.exists(dirname):
         os.makedirs(dirname)
 
+    in_files = [in_file]
     if os.path.isfile(out_file):
-        out_context = load_records(out_file)
-        context = itertools.chain(context, out_context)
+        in_files.append(out_file)
 
     def measure_input_str_key(inp):
         return _ffi_api.SerializeMeasureInput(inp)
 
+    # The best record of each target key and workload key, which are read in parallel,
+    # and merged in the order of the records
+    best_lines = {}
+    for chunk_best in map_file_chunks(_best_lines_in_chunk, in_files):
+        for key, (cost, line) in chunk_best.items():
+            if key not in best_lines or cost < best_lines[key][0]:
+                best_lines[key] = (cost, line)
+
     # Dict[target key,
     #   Dict[workload hash,
-    #     Dict[workload args, (cost, (MeasureInput, MeasureResult))]]]
-    # Full type: Dict[str, Dict[str, Dict[Tuple, Tuple[float, Tuple[Measureinput, MeasureResult]]]]]
+    #     Dict[workload args, (cost, record string)]]]
+    # Full type: Dict[str, Dict[str, Dict[Tuple, Tuple[float, str]]]]
     best_records = {}
-
-    for inp, res in context:
-        if res.error_no != 0:
-            continue
-
-        # Keep the best record for each target and workload.
-        costs = [x.value for x in res.costs if isinstance(x, tvm.tir.expr.FloatImm)]
-        cost = np.mean(costs)
-        for k in inp.task.target.keys:
-            entry, _, workload_args = ApplyHistoryBest.get_workload_entry(
-                best_records, k, inp.task.workload_key
-            )
-            if workload_args not in entry or cost < entry[workload_args][0]:
-                entry[workload_args] = (cost, (inp, res))
+    for (k, workload_key), (cost, line) in best_lines.items():
+        entry, _, workload_args = ApplyHistoryBest.get_workload_entry(best_records, k, workload_key)
+        if workload_args not in entry or cost < entry[workload_args][0]:
+            entry[workload_args] = (cost, line)
 
     # Remove duplications by multiple target keys.
     out_records = {}
     for target_entry in best_records.values():
         for workload_entry in target_entry.values():
-            for _, (inp, res) in workload_entry.values():
+            for _, line in workload_entry.values():
+                inp, res = load_record_from_string(line)
                 out_records[measure_input_str_key(inp)] = (inp, res)
 
     inputs = []
@@ -344,7 +372,7 @@ def distill_record_file(in_file, out_file):
 def main():
     """The main function for CLI."""
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["distill"], default="distill")
+    parser.add_argument("--mode", choices=["distill", "convert"], default="distill")
     parser.add_argument("-i", "--input", type=str, help="input file")
     parser.add_argument("-o", "--output", type=str, default=None, help="output file")
 
@@ -355,12 +383,20 @@ def main():
     if args.mode == "distill":
         args.output = args.output or args.input + ".best.json"
         distill_record_file(args.input, args.output)
+    elif args.mode == "convert":
+        if not args.output:
+            binary = is_binary_record_file(args.input)
+            args.output = os.path.splitext(args.input)[0] + (".json" if binary else ".bin")
+        num_records = convert_record_file(args.input, args.output)
+        logger.info("Convert %d records from %s to %s", num_records, args.input, args.output)
 
 
 """
 Usage:
 * Distill the best entries from a large log file
 e.g. python -m tvm.auto_scheduler.measure_record --mode distill -i input.json
+* Convert a JSON log file to the binary format with an index of the best records, or back
+e.g. python -m tvm.auto_scheduler.measure_record --mode convert -i input.json -o input.bin
 """
 if __name__ == "__main__":
     main()
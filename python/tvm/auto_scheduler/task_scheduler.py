@@ -48,6 +48,8 @@ def make_search_policies(
     load_model_file=None,
     load_log_file=None,
     adaptive_training=False,
+    load_model_artifact=None,
+    incremental_training=False,
 ):
     """Make a list of search policies for a list of search tasks.
     It creates one policy per task.
@@ -74,6 +76,11 @@ def make_search_policies(
     adaptive_training: bool = False
         Option used by XGBModel to reduce the model training frequency when there're too
         many logs.
+    load_model_artifact: Optional[str]
+        Load the model artifact exported by `XGBModel.export` from this file to start from it.
+        The artifact is also updated after every training of the cost model.
+    incremental_training: bool = False
+        Option used by XGBModel to update the model with only the new measurement records.
 
     Returns
     -------
@@ -90,8 +97,13 @@ def make_search_policies(
                 num_warmup_sample=len(tasks) * num_measures_per_round,
                 model_file=load_model_file,
                 adaptive_training=adaptive_training,
+                incremental_training=incremental_training,
+                artifact_file=load_model_artifact,
             )
-            if load_model_file and os.path.isfile(load_model_file):
+            if load_model_artifact and os.path.isfile(load_model_artifact):
+                logger.info("TaskScheduler: Load pretrained model artifact...")
+                cost_model.load_artifact(load_model_artifact)
+            elif load_model_file and os.path.isfile(load_model_file):
                 logger.info("TaskScheduler: Load pretrained model...")
                 cost_model.load(load_model_file)
             elif load_log_file:
@@ -202,6 +214,10 @@ class TaskScheduler:
     callbacks: Optional[List[TaskSchedulerCallback]]
         The task scheduler callbacks that will be called before and after tuning a task.
         If None, PrintTableInfo and LogEstimatedLatency callback will be used.
+    load_model_artifact: Optional[str]
+        Start the cost model from the artifact exported by `XGBModel.export` to this file.
+        The artifact is updated after every training of the cost model, so that it can be
+        reused by a later tuning.
     """
 
     def __init__(
@@ -217,6 +233,7 @@ class TaskScheduler:
         gamma: float = 0.5,
         backward_window_size: int = 3,
         callbacks=None,
+        load_model_artifact: str = None,
     ):
         self.tasks = tasks
         if objective_func:  # use custom objective function
@@ -230,6 +247,7 @@ class TaskScheduler:
         self.strategy = strategy
         self.load_log_file = load_log_file
         self.load_model_file = load_model_file
+        self.load_model_artifact = load_model_artifact
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
@@ -260,6 +278,10 @@ class TaskScheduler:
         self.ct = self.best_ct = self.best_score = self.tic = None
         self.num_measures_per_round = None
         self.dead_tasks = set()
+        # task_id -> the reason why the task is no longer tuned
+        self.dead_task_reasons = {}
+        self.convergence_window = None
+        self.convergence_threshold = None
 
         # Build similarity groups
         self.task_tags = []  # task_id -> tag
@@ -285,6 +307,9 @@ class TaskScheduler:
         search_policy_params=None,
         adaptive_training=False,
         per_task_early_stopping=None,
+        incremental_training=False,
+        per_task_convergence_window=None,
+        per_task_convergence_threshold=0.01,
     ):
         """Tune a batch of tasks together.
 
@@ -305,6 +330,17 @@ class TaskScheduler:
             too many logs.
         per_task_early_stopping : Optional[int]
             Stop tuning a task early if getting no improvement after n measurements.
+        incremental_training : bool = False
+            Option used by XGBModel to update the model with only the new measurement records
+            instead of re-training it on all records.
+        per_task_convergence_window : Optional[int]
+            Retire a task once it has converged, so that its remaining budget is used by the
+            other tasks. A task is converged when its best latency improved by less than
+            `per_task_convergence_threshold` over the last n rounds, and tuning it for one more
+            round is predicted to improve the objective by less than that as well.
+            If None, the convergence of tasks is not detected.
+        per_task_convergence_threshold : float = 0.01
+            The relative improvement below which a task is regarded as converged.
         """
         # init members
         self.tune_option = tune_option
@@ -314,6 +350,8 @@ class TaskScheduler:
         self.early_stopping_task = (
             1e20 if per_task_early_stopping is None else per_task_early_stopping
         )
+        self.convergence_window = per_task_convergence_window
+        self.convergence_threshold = per_task_convergence_threshold
 
         self.measurer = ProgramMeasurer(
             tune_option.builder,
@@ -348,6 +386,8 @@ class TaskScheduler:
             self.load_model_file,
             self.load_log_file,
             adaptive_training,
+            self.load_model_artifact,
+            incremental_training,
         )
 
         # do a round robin first to warm up
@@ -361,7 +401,7 @@ class TaskScheduler:
         # put task without schedule on warm up to dead state
         for task_idx, cost in enumerate(self.best_costs):
             if cost == 1e10:
-                self.dead_tasks.add(task_idx)
+                self._retire_task(task_idx, "no valid schedule")
 
         # use the specific strategy to choose workload to tune
         task_idx = -1
@@ -401,21 +441,7 @@ class TaskScheduler:
                         backward_grad = 0
 
                     # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
-                    g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
-
-                    g_next_2 = self.beta * 1e30
-                    group_id = self.tag_to_group_id.get(self.task_tags[i], None)
-                    if group_id is not None and len(self.group_task_ids[group_id]) > 1:
-                        best_flops = max(
-                            [
-                                self.flop_cts[j] / self.best_costs[j]
-                                for j in self.group_task_ids[group_id]
-                            ]
-                        )
-                        g_next_2 = self.beta * self.flop_cts[i] / best_flops
-
-                    g_next = min(g_next_1, g_next_2)
-                    forward_grad = g_next - self.best_costs[i]
+                    forward_grad = self._predict_next_cost(i) - self.best_costs[i]
 
                     # combine all grads
                     grad = chain_grad * (
@@ -472,18 +498,69 @@ class TaskScheduler:
         no_change_trials = (
             self.task_cts[task_idx] - self.task_best_cts[task_idx]
         ) * self.num_measures_per_round
-        if len(measure_inputs) == 0 or no_change_trials > self.early_stopping_task:
-            self.dead_tasks.add(task_idx)
+        if len(measure_inputs) == 0:
+            self._retire_task(task_idx, "search space exhausted")
+        elif no_change_trials > self.early_stopping_task:
+            self._retire_task(task_idx, "no improvement")
 
         self.task_costs_history[task_idx].append(self.best_costs[task_idx])
 
         self.ct += len(measure_inputs)
         self.cur_score = self._compute_score(self.best_costs)
 
+        if task_idx not in self.dead_tasks and self._is_converged(task_idx):
+            self._retire_task(task_idx, "converged")
+
         # Run post-tune callbacks
         for callback in self.callbacks:
             callback.post_tune(self, task_idx)
 
+    def _retire_task(self, task_idx, reason):
+        """Stop tuning the task in the rest of the process"""
+        self.dead_tasks.add(task_idx)
+        self.dead_task_reasons[task_idx] = reason
+        logger.info("TaskScheduler: Retire task %d: %s", task_idx, reason)
+
+    def _predict_next_cost(self, task_idx):
+        """Predict the best latency of the task after tuning it for one more round"""
+        # The latency is predicted to decrease as the number of rounds grows
+        g_next_1 = self.best_costs[task_idx] - (self.best_costs[task_idx] / self.task_cts[task_idx])
+
+        # The task is predicted to reach the speed of the fastest task in its similarity group
+        g_next_2 = self.beta * 1e30
+        group_id = self.tag_to_group_id.get(self.task_tags[task_idx], None)
+        if group_id is not None and len(self.group_task_ids[group_id]) > 1:
+            best_flops = max(
+                [self.flop_cts[j] / self.best_costs[j] for j in self.group_task_ids[group_id]]
+            )
+            g_next_2 = self.beta * self.flop_cts[task_idx] / best_flops
+
+        return min(g_next_1, g_next_2)
+
+    def _is_converged(self, task_idx):
+        """Check whether the task is converged according to both its measured history
+        and its predicted improvement of the objective"""
+        window = self.convergence_window
+        history = self.task_costs_history[task_idx]
+        if window is None or len(history) <= window or self.best_costs[task_idx] >= 1e9:
+            return False
+
+        # the measured improvement in the last `window` rounds
+        measured = (history[-window - 1] - history[-1]) / history[-window - 1]
+        if measured >= self.convergence_threshold:
+            return False
+
+        # the predicted improvement of the objective by tuning the task for one more round
+        new_costs = list(self.best_costs)
+        new_costs[task_idx] = self._predict_next_cost(task_idx)
+        if all(cost < 1e9 for cost in self.best_costs):
+            predicted = (self.cur_score - self._compute_score(new_costs)) / self.cur_score
+        else:
+            # The objective is not meaningful before all tasks have a valid schedule
+            best_cost = self.best_costs[task_idx]
+            predicted = (best_cost - new_costs[task_idx]) / best_cost
+        return predicted < self.convergence_threshold
+
     def _compute_score(self, costs):
         """compute the objective function"""
         # Make sure to return float.
@@ -533,7 +610,7 @@ class TaskScheduler:
 
         for idx in range(len(self.tasks)):
             if self.task_cts[idx] - self.task_best_cts[idx] > self.early_stopping_task:
-                self.dead_tasks.add(idx)
+                self._retire_task(idx, "no improvement")
 
             # The computation of taks_cts is just an estimation.
             # The estimation may not be accurate if the log file is changed externally or
@@ -631,6 +708,7 @@ class PrintTableInfo(TaskSchedulerCallback):
 
 class LogEstimatedLatency(TaskSchedulerCallback):
     """Log the estimated latency to the file after tuning a task.
+    The tasks retired by the task scheduler are logged as well, together with the reasons.
 
     Parameters
     ----------
@@ -643,6 +721,7 @@ class LogEstimatedLatency(TaskSchedulerCallback):
             os.remove(log_file)
 
         self.log_file = log_file
+        self.logged_dead_tasks = set()
 
     def post_tune(self, task_scheduler, task_id):
         if all(cost < 1e9 for cost in task_scheduler.best_costs):
@@ -655,4 +734,18 @@ class LogEstimatedLatency(TaskSchedulerCallback):
                 "ElapsedTime(s)\t%.0f\tEstimatedLatency(ms)\t%s\tTrials\t%d\n"
                 % (time.time() - task_scheduler.tic, total_latency_str, task_scheduler.ct)
             )
+            # Tasks can also be retired outside of post_tune (e.g. during warm-up or when
+            # restoring the status), so log every retirement that was not logged yet.
+            for dead_id in sorted(task_scheduler.dead_tasks):
+                if dead_id in self.logged_dead_tasks:
+                    continue
+                self.logged_dead_tasks.add(dead_id)
+                filep.write(
+                    "RetiredTask\t%d\tReason\t%s\tTrials\t%d\n"
+                    % (
+                        dead_id,
+                        task_scheduler.dead_task_reasons.get(dead_id, "unknown"),
+                        task_scheduler.task_cts[dead_id] * task_scheduler.num_measures_per_round,
+                    )
+                )
             filep.flush()
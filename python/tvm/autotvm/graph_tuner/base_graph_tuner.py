@@ -17,6 +17,7 @@
 # pylint: disable=too-many-arguments,too-many-locals,too-many-statements,too-many-instance-attributes,too-many-branches,too-many-nested-blocks,invalid-name,unused-argument,unused-variable,no-member,no-value-for-parameter
 """Base class for graph tuner."""
 import logging
+import os
 from abc import abstractmethod
 
 import numpy as np
@@ -376,6 +377,8 @@ class BaseGraphTuner(object):
         target_host=None,
         infer_layout=False,
         runner=None,
+        parallel=False,
+        layout_cache_file=None,
     ):
         """Benchmark all possible layout transformation in the graph,
         given a set of schedule candidates for each workload of target operator.
@@ -441,6 +444,17 @@ class BaseGraphTuner(object):
             This might bring performance loss comparing to benchmarking layout transformation.
         runner : Runner, optional
             Accept a user-supplied runner
+
+        parallel : bool, optional
+            Whether to measure the layout transformations in batches of `n_parallel`,
+            instead of one at a time. The builds of a batch run concurrently, and so do the
+            measurements when the runner has `n_parallel` devices.
+
+        layout_cache_file : str, optional
+            A records log file which memoizes the benchmarked layout transformations across
+            runs. The records in it for the same target are reused, and the newly benchmarked
+            ones are appended to it. As the workload of a layout transformation consists of
+            the input shape, the data type and the pair of layouts, so is the key of the cache.
         """
         self._logger.info("Start to benchmark layout transformation...")
         self._target, target_host = Target.canon_target_and_host(self._target, target_host)
@@ -466,6 +480,22 @@ class BaseGraphTuner(object):
                 total_time += record[1].costs[0]
         avg_time = total_time / num_flops if num_flops > 0 else 0
 
+        if layout_cache_file is not None and os.path.isfile(layout_cache_file):
+            num_cached = 0
+            for record in load_from_file(layout_cache_file):
+                ltf_wkl = record[0].task.workload
+                # The failed measurements are not reused, as they may be transient
+                if (
+                    record[1].error_no == 0
+                    and str(record[0].target) == str(self._target)
+                    and ltf_wkl not in self._layout_transform_perf_records
+                ):
+                    self._layout_transform_perf_records[ltf_wkl] = record
+                    num_cached += 1
+            self._logger.info(
+                "Loaded %d layout transformation records from %s", num_cached, layout_cache_file
+            )
+
         args_list = []
 
         def _fetch_args_callback(from_node_idx, to_node_idx, from_sch_idx, to_sch_idx, args):
@@ -501,6 +531,7 @@ class BaseGraphTuner(object):
         elif not runner:
             runner = autotvm.LocalRunner(number=min_exec_num, repeat=1, timeout=timeout)
         measure_option = autotvm.measure_option(builder=builder, runner=runner)
+        pending_args = {}
         for args in args_list:
             data, in_layout, out_layout = args
             ltf_workload = autotvm.task.args_to_workload(args, "layout_transform")
@@ -531,13 +562,42 @@ class BaseGraphTuner(object):
                 self._layout_transform_perf_records[ltf_workload] = (record_input, record_output)
                 continue
 
-            records = []
-            task = autotvm.task.create("layout_transform", args=args, target=self._target)
-            tuner = autotvm.tuner.GridSearchTuner(task)
-            tuner.tune(n_trial=1, measure_option=measure_option, callbacks=[_log_to_list(records)])
-            if not isinstance(records[0][1].costs[0], float):
-                records[0] = (records[0][0], records[0][1]._replace(costs=(INVALID_LAYOUT_TIME,)))
-            self._layout_transform_perf_records[ltf_workload] = records[0]
+            pending_args.setdefault(ltf_workload, args)
+
+        def _add_record(ltf_workload, record):
+            if not isinstance(record[1].costs[0], float):
+                record = (record[0], record[1]._replace(costs=(INVALID_LAYOUT_TIME,)))
+            self._layout_transform_perf_records[ltf_workload] = record
+            # Only cache the successful measurements, so that a failure, e.g. an RPC timeout,
+            # does not mark the layout transformation invalid in the later runs
+            if layout_cache_file is not None and record[1].error_no == 0:
+                with open(layout_cache_file, "a") as out_file:
+                    out_file.write(encode(record[0], record[1]) + "\n")
+
+        tasks = [
+            (ltf_workload, autotvm.task.create("layout_transform", args=args, target=self._target))
+            for ltf_workload, args in pending_args.items()
+        ]
+        if parallel and tasks:
+            # All the layout transformations share the template and the target,
+            # so that they are measured together by the measure function of any of them.
+            measure_batch = autotvm.measure.create_measure_batch(tasks[0][1], measure_option)
+            for i in range(0, len(tasks), n_parallel):
+                batch = tasks[i : i + n_parallel]
+                inputs = [
+                    MeasureInput(self._target, task, task.config_space.get(0)) for _, task in batch
+                ]
+                results = measure_batch(inputs)
+                for (ltf_workload, _), inp, res in zip(batch, inputs, results):
+                    _add_record(ltf_workload, (inp, res))
+        else:
+            for ltf_workload, task in tasks:
+                records = []
+                tuner = autotvm.tuner.GridSearchTuner(task)
+                tuner.tune(
+                    n_trial=1, measure_option=measure_option, callbacks=[_log_to_list(records)]
+                )
+                _add_record(ltf_workload, records[0])
 
         self._iterate_layout_transform(self._create_matrix_callback)
         self._logger.info("Benchmarking layout transformation successful.")
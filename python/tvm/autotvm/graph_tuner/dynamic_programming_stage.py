@@ -43,6 +43,7 @@ class DPStage(object):
         dep_dict,
         target_ops,
         dtype="float32",
+        defer_compute=False,
     ):
         """Initialize a stage and create all states.
 
@@ -80,6 +81,12 @@ class DPStage(object):
 
         dtype : str, optional
             Data type.
+
+        defer_compute : bool, optional
+            Whether to only update the global dictionaries, and defer the computation of
+            the states to a later call of `compute`. The states of a stage only depend on
+            the states of its input stages, so that deferred stages of independent subgraphs
+            can be computed concurrently.
         """
         self._global_input_shapes = input_shapes
         self._global_input_names = input_shapes.keys()
@@ -101,7 +108,23 @@ class DPStage(object):
         self._states = None
         self._full_states = None
         self._full_states_idx = None
+        self._compute = None
         self._create_states()
+        if not defer_compute:
+            self.compute()
+
+    def compute(self):
+        """Compute the states, after the states of all input stages are computed."""
+        if self._compute is not None:
+            self._compute()
+            self._compute = None
+
+    def _interlayer_cost(self, from_node_idx, to_node_idx):
+        """Layout transformation time between two nodes, as a matrix of schedule indexes."""
+        return np.array(
+            self._global_layout_transform_interlayer_cost[(from_node_idx, to_node_idx)],
+            dtype="float64",
+        )
 
     def _create_states(self):
         """Create states."""
@@ -116,17 +139,18 @@ class DPStage(object):
         input_idx = self._global_in_nodes_dict[self._idx][0]
         input_node_entry = self._global_node_list[input_idx]
         if is_boundary_node(input_node_entry, self._global_input_names):
-            self._full_states = np.array([record[1].costs[0] for record in self._record_list])
-            self._states = self._full_states
+
+            def compute():
+                self._full_states = np.array([record[1].costs[0] for record in self._record_list])
+                self._states = self._full_states
+
+            self._compute = compute
         else:
             input_stage = self._global_stage_dict[input_idx]
             input_dep = input_stage.dep
-            input_states = input_stage.states
-            input_flatten_states = input_states.flatten()
             input_record_list = input_node_entry["record_candidates"]
             num_schedules = len(self._record_list)
             num_input_schedules = len(input_record_list)
-            num_input_states = input_flatten_states.shape[0]
 
             full_states_shape = tuple(
                 [num_schedules, num_input_schedules]
@@ -135,46 +159,44 @@ class DPStage(object):
                     for dep_idx in input_dep
                 ]
             )
-            self._full_states = np.zeros(full_states_shape).flatten().astype("float32")
             self._full_states_idx = [self._idx, input_idx] + input_dep
             dep_multiplier = 1
             for i in range(2, len(full_states_shape)):
                 dep_multiplier *= full_states_shape[i]
             input_node_time_counted = input_idx in self._global_counted_nodes_set
-
-            for i in range(num_schedules):
-                current_sch_time = float(self._record_list[i][1].costs[0])
-                for j in range(num_input_states):
-                    input_sch_idx = j // dep_multiplier
-                    layout_transform_time = self._global_layout_transform_interlayer_cost[
-                        (input_idx, self._idx)
-                    ][input_sch_idx][i]
-
-                    if input_node_time_counted:
-                        total_time = current_sch_time + layout_transform_time
-                    else:
-                        total_time = (
-                            current_sch_time + layout_transform_time + input_flatten_states[j]
-                        )
-                    current_state_idx = i * num_input_states + j
-                    self._full_states[current_state_idx] = total_time
-
             if not input_node_time_counted:
                 self._global_counted_nodes_set.add(input_idx)
-            self._full_states = self._full_states.reshape(full_states_shape)
 
             # If out degree of input node is 1, we can remove the dimension of input node,
             # since the states of input node will not be needed any more. Otherwise, input
             # node should become a dependency.
-            if len(self._global_out_nodes_dict[input_idx]) == 1:
-                self._states = np.amin(self._full_states, axis=1)
+            reduce_input = len(self._global_out_nodes_dict[input_idx]) == 1
+            if reduce_input:
                 self._dep = list(input_dep)
             else:
-                self._states = self._full_states
                 self._dep = [
                     input_idx,
                 ] + input_dep
 
+            def compute():
+                # The state of schedule i of this node and state j of the input node
+                # is at i * num_input_states + j, whose input schedule is j // dep_multiplier.
+                sch_time = np.array([float(record[1].costs[0]) for record in self._record_list])
+                layout_transform_time = np.repeat(
+                    self._interlayer_cost(input_idx, self._idx), dep_multiplier, axis=0
+                ).T
+                full_states = sch_time[:, None] + layout_transform_time
+                if not input_node_time_counted:
+                    input_flatten_states = input_stage.states.flatten().astype("float64")
+                    full_states = full_states + input_flatten_states[None, :]
+                self._full_states = full_states.astype("float32").reshape(full_states_shape)
+                if reduce_input:
+                    self._states = np.amin(self._full_states, axis=1)
+                else:
+                    self._states = self._full_states
+
+            self._compute = compute
+
         # Update global dependency dictionary.
         # This is to monitor the dependency states to decide
         # when a dependency can be eliminated, so that total
@@ -218,68 +240,71 @@ class DPStage(object):
             if not is_boundary_node(input_node, self._global_input_names):
                 input_index_list.append(input_idx)
 
-        # Generate new states
-        states_list, aligned_node_list = DPStage.align_states(
-            input_index_list, self._global_stage_dict, self._global_node_list
-        )
-        target_node_idx, target_major_axis, target_multiplier, target_states = states_list[0]
-        aligned_shape = target_states.shape
-        self._full_states = np.zeros(aligned_shape).astype("float32").flatten()
+        aligned_node_list = DPStage.align_nodes(input_index_list, self._global_stage_dict)
         self._full_states_idx = list(aligned_node_list)
-        num_states = self._full_states.shape[0]
-        node_time_counted = [item[0] in self._global_counted_nodes_set for item in states_list]
-        target_states = target_states.flatten()
-        src_states_list = [states_list[i][3].flatten() for i in range(1, len(states_list))]
-
-        for i in range(num_states):
-            target_sch_idx = (
-                i % (target_multiplier * aligned_shape[target_major_axis])
-            ) // target_multiplier
-            if node_time_counted[0]:
-                new_state = 0
-            else:
-                new_state = target_states[i]
-
-            for j in range(1, len(states_list)):
-                src_states = src_states_list[j - 1]
-                src_node_idx, src_major_axis, src_multiplier, _ = states_list[j]
-                src_sch_idx = (
-                    i % (src_multiplier * aligned_shape[src_major_axis])
-                ) // src_multiplier
-                layout_transform_time = self._global_layout_transform_interlayer_cost[
-                    (src_node_idx, target_node_idx)
-                ][src_sch_idx][target_sch_idx]
-
-                if node_time_counted[j]:
-                    new_state += layout_transform_time
-                else:
-                    new_state += layout_transform_time + src_states[i]
-                self._full_states[i] = new_state
-
-        for i, node_counted in enumerate(node_time_counted):
+        node_time_counted = [idx in self._global_counted_nodes_set for idx in input_index_list]
+        for idx, node_counted in zip(input_index_list, node_time_counted):
             if not node_counted:
-                self._global_counted_nodes_set.add(states_list[i][0])
-        self._full_states = self._full_states.reshape(aligned_shape)
+                self._global_counted_nodes_set.add(idx)
 
         # Remove dependency to reduce states
-        reduced_states = np.array(self._full_states)
-        reduced_states_transpose = [states_list[0][1]]
+        target_major_axis = aligned_node_list.index(input_index_list[0])
+        reduced_states_transpose = [target_major_axis]
         reduced_states_dep_list = []
-        self._dep = []
-        for i in range(len(reduced_states.shape)):
-            if i != states_list[0][1]:
+        for i, idx in enumerate(aligned_node_list):
+            if i != target_major_axis:
                 reduced_states_transpose.append(i)
-                reduced_states_dep_list.append(aligned_node_list[i])
-        reduced_states = np.transpose(reduced_states, reduced_states_transpose)
+                reduced_states_dep_list.append(idx)
+        reduced_axes = []
         shift = 0
+        self._dep = []
         for i, dep in enumerate(reduced_states_dep_list):
             if dep not in self._global_dep_dict or len(self._global_dep_dict[dep]) == 1:
                 self._global_dep_dict.pop(dep, None)
-                reduced_states = np.amin(reduced_states, axis=i + 1 - shift)
+                reduced_axes.append(i + 1 - shift)
                 shift += 1
             else:
                 self._dep.append(dep)
-        self._states = reduced_states
+
+        def compute():
+            states_list, _ = DPStage.align_states(
+                input_index_list, self._global_stage_dict, self._global_node_list
+            )
+            target_node_idx, target_major_axis, target_multiplier, target_states = states_list[0]
+            aligned_shape = target_states.shape
+            state_idx = np.arange(target_states.size)
+            target_sch_idx = (
+                state_idx % (target_multiplier * aligned_shape[target_major_axis])
+            ) // target_multiplier
+            if node_time_counted[0]:
+                full_states = np.zeros(target_states.size)
+            else:
+                full_states = target_states.flatten().astype("float64")
+            for j in range(1, len(states_list)):
+                src_node_idx, src_major_axis, src_multiplier, src_states = states_list[j]
+                src_sch_idx = (
+                    state_idx % (src_multiplier * aligned_shape[src_major_axis])
+                ) // src_multiplier
+                layout_transform_time = self._interlayer_cost(src_node_idx, target_node_idx)[
+                    src_sch_idx, target_sch_idx
+                ]
+                if node_time_counted[j]:
+                    full_states = full_states + layout_transform_time
+                else:
+                    full_states = full_states + (
+                        layout_transform_time + src_states.flatten().astype("float64")
+                    )
+            if len(states_list) == 1:
+                # the states are only written when accumulating the inputs other than the target
+                full_states = np.zeros(target_states.size)
+            self._full_states = full_states.astype("float32").reshape(aligned_shape)
+
+            reduced_states = np.transpose(self._full_states, reduced_states_transpose)
+            for axis in reduced_axes:
+                reduced_states = np.amin(reduced_states, axis=axis)
+            self._states = reduced_states
+
+        self._compute = compute
 
         # Update dependency
         for dep in self._dep:
@@ -336,13 +361,8 @@ class DPStage(object):
         aligned_node_list : list in int
             List of node index for aligned states.
         """
-        aligned_node_list = list(input_index_list)
+        aligned_node_list = DPStage.align_nodes(input_index_list, stage_dict)
         states_list = []
-        for input_idx in input_index_list:
-            input_node_stage = stage_dict[input_idx]
-            for dep_idx in input_node_stage.dep:
-                if dep_idx not in aligned_node_list:
-                    aligned_node_list.append(dep_idx)
         aligned_shape = []
         for idx in aligned_node_list:
             aligned_shape.append(len(node_list[idx]["record_candidates"]))
@@ -369,3 +389,28 @@ class DPStage(object):
                 multiplier *= aligned_shape[i]
             states_list.append((input_idx, major_axis, multiplier, input_node_states))
         return states_list, aligned_node_list
+
+    @staticmethod
+    def align_nodes(input_index_list, stage_dict):
+        """Get the node index of each axis of the aligned states, see `align_states`.
+
+        Parameters
+        ----------
+        input_index_list : list of int
+            List of input node index.
+
+        stage_dict : dict of int to Stage
+            Global dictionary of node index to stage.
+
+        Returns
+        -------
+        aligned_node_list : list in int
+            List of node index for aligned states.
+        """
+        aligned_node_list = list(input_index_list)
+        for input_idx in input_index_list:
+            input_node_stage = stage_dict[input_idx]
+            for dep_idx in input_node_stage.dep:
+                if dep_idx not in aligned_node_list:
+                    aligned_node_list.append(dep_idx)
+        return aligned_node_list
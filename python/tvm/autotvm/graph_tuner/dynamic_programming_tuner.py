@@ -17,6 +17,8 @@
 # pylint: disable=import-error,too-many-locals,too-many-statements,too-many-branches,unused-variable
 """Dynamic programming tuner."""
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 from ._base import MAX_OUTPUT_NODES
@@ -70,14 +72,48 @@ class DPTuner(BaseGraphTuner):
                     % (self._num_states, self._max_num_states)
                 )
 
-    def _forward(self):
+    def _forward(self, num_threads=1):
         """Forward pass in DP to generate states for all stages."""
         self._logger.info("Start forward pass...")
+        if num_threads > 1:
+            self._parallel_forward(num_threads)
+        else:
+            for node_idx in sorted(self._in_nodes_dict.keys()):
+                stage = DPStage(idx=node_idx, target_ops=self._target_ops, **self._global_data_dict)
+                self._check_num_states(stage.full_states.size)
+                self._stage_dict[node_idx] = stage
+        self._logger.info("Finished forward pass.")
+
+    def _parallel_forward(self, num_threads):
+        """Forward pass which computes the states of independent subgraphs concurrently.
+
+        The stages are created in the same order as the sequential forward pass, which decides
+        their dependencies, while the computation of their states is deferred. Each stage is
+        then put into a level one past the deepest of its input stages, and the stages of
+        a level, which do not depend on each other, are computed in a thread pool.
+        """
+        levels = {}
         for node_idx in sorted(self._in_nodes_dict.keys()):
-            stage = DPStage(idx=node_idx, target_ops=self._target_ops, **self._global_data_dict)
-            self._check_num_states(stage.full_states.size)
+            stage = DPStage(
+                idx=node_idx,
+                target_ops=self._target_ops,
+                defer_compute=True,
+                **self._global_data_dict,
+            )
             self._stage_dict[node_idx] = stage
-        self._logger.info("Finished forward pass.")
+            levels[node_idx] = 1 + max(
+                [levels[idx] for idx in self._in_nodes_dict[node_idx] if idx in levels],
+                default=-1,
+            )
+
+        stages_by_level = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+        for node_idx, level in levels.items():
+            stages_by_level[level].append(self._stage_dict[node_idx])
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            for stages in stages_by_level:
+                list(executor.map(DPStage.compute, stages))
+                for stage in stages:
+                    self._check_num_states(stage.full_states.size)
 
     def _backward(self):
         """Backward pass in DP to generate optimal solution."""
@@ -198,11 +234,22 @@ class DPTuner(BaseGraphTuner):
         self._logger.info("Finished backward pass...")
 
     def run(self, **kwargs):
-        """Run dynamic programming solver."""
+        """Run dynamic programming solver.
+
+        Parameters
+        ----------
+        max_num_states : int, optional
+            The upper limit of the number of states.
+
+        num_threads : int, optional
+            The number of threads computing the states of independent subgraphs
+            in the forward pass. The result is the same as the sequential forward pass.
+        """
         max_num_states = None if "max_num_states" not in kwargs else kwargs["max_num_states"]
+        num_threads = kwargs.get("num_threads", 1)
         self._num_states = 0
         self._max_num_states = max_num_states
         self._logger.info("Start to run dynamic programming algorithm...")
-        self._forward()
+        self._forward(num_threads)
         self._backward()
         self._logger.info("Finished DPExecutor run.")
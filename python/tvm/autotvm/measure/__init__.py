@@ -26,6 +26,7 @@ from .measure import (
 from .measure_methods import (
     LocalBuilder,
     LocalRunner,
+    PersistentModuleLoader,
     RPCRunner,
     default_module_loader,
     request_remote,
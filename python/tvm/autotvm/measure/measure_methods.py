@@ -235,6 +235,16 @@ class RPCRunner(Runner):
     module_loader : ModuleLoader
         If given, a context manager that loads the module to be timed into the remote runtime.
         If not given, default_module_loader is used.
+    persistent_session: bool, optional
+        Whether each worker keeps a long-lived RPC session to its device, instead of requesting
+        a new session from the tracker for each measurement. The built modules are uploaded
+        in batches of `upload_batch_size` over the session, which is reconnected transparently
+        if it drops. As each worker holds a device while the runner is alive, `n_parallel`
+        should not exceed the number of devices. The module_loader, if given, must be a
+        PersistentModuleLoader.
+    upload_batch_size: int, optional
+        The number of built modules uploaded and measured by a worker per round trip,
+        when `persistent_session` is enabled.
     """
 
     def __init__(
@@ -251,6 +261,8 @@ class RPCRunner(Runner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        persistent_session=False,
+        upload_batch_size=4,
     ):
         super(RPCRunner, self).__init__(timeout, n_parallel)
 
@@ -268,12 +280,31 @@ class RPCRunner(Runner):
         self.enable_cpu_cache_flush = enable_cpu_cache_flush
         self.cooldown_interval = cooldown_interval
         self.module_loader = module_loader
-
-        self.executor = PopenPoolExecutor(
-            timeout=timeout * (self.n_parallel + 1),
-            initializer=reset_global_scope,
-            initargs=(AutotvmGlobalScope.current,),
-        )
+        self.persistent_session = persistent_session
+        self.upload_batch_size = upload_batch_size
+        if persistent_session and not isinstance(
+            module_loader, (type(None), PersistentModuleLoader)
+        ):
+            raise ValueError("persistent_session requires a PersistentModuleLoader")
+
+        self.executor = None
+        self._reset_executor()
+
+    def _reset_executor(self):
+        """Start new workers, the workers replaced release their persistent sessions"""
+        if self.persistent_session:
+            self.executor = PopenPoolExecutor(
+                max_workers=self.n_parallel,
+                timeout=self.timeout * (self.n_parallel + self.upload_batch_size),
+                initializer=reset_global_scope,
+                initargs=(AutotvmGlobalScope.current,),
+            )
+        else:
+            self.executor = PopenPoolExecutor(
+                timeout=self.timeout * (self.n_parallel + 1),
+                initializer=reset_global_scope,
+                initargs=(AutotvmGlobalScope.current,),
+            )
 
     @property
     def ref_input(self):
@@ -298,6 +329,9 @@ class RPCRunner(Runner):
     def set_task(self, task):
         self.task = task
 
+        if self.persistent_session:
+            # the devices held by the sessions of the previous task are released
+            self._reset_executor()
         if check_remote(task.target, self.key, self.host, self.port):
             logger.info("Get devices for measurement successfully!")
         else:
@@ -341,6 +375,9 @@ class RPCRunner(Runner):
             timeout=self.timeout,
         )
 
+        if self.persistent_session:
+            return self._run_persistent(measure_inputs, build_results, remote_kwargs)
+
         for i in range(0, len(measure_inputs), self.n_parallel):
             futures = []
             for measure_inp, build_res in zip(
@@ -380,6 +417,39 @@ class RPCRunner(Runner):
 
         return results
 
+    def _run_persistent(self, measure_inputs, build_results, remote_kwargs):
+        """Run the measurements in batches over the persistent sessions of the workers"""
+        module_loader = self.module_loader or PersistentModuleLoader()
+        batch_size = self.upload_batch_size
+        futures = []
+        for i in range(0, len(measure_inputs), batch_size):
+            ret = self.executor.submit(
+                run_batch_through_rpc,
+                measure_inputs[i : i + batch_size],
+                build_results[i : i + batch_size],
+                self.number,
+                self.repeat,
+                self.min_repeat_ms,
+                self.cooldown_interval,
+                remote_kwargs,
+                self.ref_input,
+                self.enable_cpu_cache_flush,
+                module_loader,
+            )
+            futures.append((ret, len(measure_inputs[i : i + batch_size])))
+
+        results = []
+        for future, num in futures:
+            try:
+                results.extend(future.result())
+            except Exception as ex:  # pylint: disable=broad-except
+                tb = traceback.format_exc()
+                results.extend(
+                    MeasureResult((tb, ex), MeasureErrorNo.RUN_TIMEOUT, self.timeout, time.time())
+                    for _ in range(num)
+                )
+        return results
+
 
 class LocalRunner(RPCRunner):
     """Run generated code on local devices.
@@ -412,6 +482,10 @@ class LocalRunner(RPCRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    persistent_session: bool, optional
+        Whether to keep a long-lived RPC session to the local server, see RPCRunner.
+    upload_batch_size: int, optional
+        The number of built modules measured per round trip with `persistent_session`.
     Note
     ----
     This is a "fake" local mode. We start a silent rpc tracker and rpc server
@@ -427,6 +501,8 @@ class LocalRunner(RPCRunner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        persistent_session=False,
+        upload_batch_size=4,
     ):
         super(LocalRunner, self).__init__(
             "",
@@ -441,6 +517,8 @@ class LocalRunner(RPCRunner):
             cooldown_interval=cooldown_interval,
             enable_cpu_cache_flush=enable_cpu_cache_flush,
             module_loader=module_loader,
+            persistent_session=persistent_session,
+            upload_batch_size=upload_batch_size,
         )
         self.tracker = None
         self.server = None
@@ -718,6 +796,150 @@ class DefaultModuleLoader:
             remote.remove("")
 
 
+def run_batch_through_rpc(
+    measure_inputs,
+    build_results,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    remote_kwargs,
+    ref_input,
+    enable_cpu_cache_flush=False,
+    module_loader=None,
+):
+    """Run a batch of generated libraries through the persistent rpc session of the worker
+
+    The built modules of the batch are uploaded over the session first, then measured one by
+    one as in `run_through_rpc`. If the session turns out to be dropped, it is reconnected,
+    and the remaining modules are uploaded and measured again.
+
+    Parameters
+    ----------
+    measure_inputs: List[MeasureInput]
+        The raw measure inputs
+    build_results: List[BuildResult]
+        The results returned from Builder
+    module_loader: PersistentModuleLoader, optional
+        The module loader keeping the session. If not given, a default one is used.
+
+    See `run_through_rpc` for the other parameters.
+
+    Returns
+    -------
+    results: List[MeasureResult]
+    """
+    module_loader = module_loader or PersistentModuleLoader()
+    built = [x for x in build_results if not isinstance(x, MeasureResult)]
+    try:
+        module_loader.upload(remote_kwargs, built)
+    except TVMError:
+        # the session kept from a previous batch is gone
+        module_loader.upload(remote_kwargs, built, reconnect=True)
+
+    def run(measure_input, build_result):
+        return run_through_rpc(
+            measure_input,
+            build_result,
+            number,
+            repeat,
+            min_repeat_ms,
+            cooldown_interval,
+            remote_kwargs,
+            ref_input,
+            enable_cpu_cache_flush,
+            module_loader,
+        )
+
+    results = []
+    for i, (measure_input, build_result) in enumerate(zip(measure_inputs, build_results)):
+        result = run(measure_input, build_result)
+        if result.error_no == MeasureErrorNo.RUNTIME_DEVICE and not module_loader.is_alive(
+            remote_kwargs
+        ):
+            logger.debug("RPC session to %s dropped, reconnecting", remote_kwargs["device_key"])
+            remaining = [x for x in build_results[i:] if not isinstance(x, MeasureResult)]
+            module_loader.upload(remote_kwargs, remaining, reconnect=True)
+            result = run(measure_input, build_result)
+        results.append(result)
+    return results
+
+
+# The RPC sessions kept alive in this worker process by PersistentModuleLoader
+_persistent_sessions = {}
+
+
+def _persistent_session(remote_kwargs, reconnect=False):
+    key = tuple(sorted(remote_kwargs.items()))
+    if reconnect:
+        _persistent_sessions.pop(key, None)
+    if key not in _persistent_sessions:
+        # the session outlives single measurements, whose timeout is enforced by the executor
+        _persistent_sessions[key] = request_remote(**dict(remote_kwargs, timeout=0))
+    return _persistent_sessions[key]
+
+
+class PersistentModuleLoader(DefaultModuleLoader):
+    """A module loader which keeps one long-lived RPC session per device in each worker process,
+    and uploads the built modules in batches ahead of their measurement.
+    See RPCRunner's `persistent_session`.
+
+    Parameters
+    ----------
+    pre_load_function : Optional[Function[tvm.rpc.Session, tvm.runtime.Module]]
+        Invoked before each module is loaded, see default_module_loader().
+    """
+
+    def __init__(self, pre_load_function=None) -> None:
+        super().__init__(pre_load_function)
+        self.uploaded = set()
+
+    def upload(self, remote_kwargs, build_results, reconnect=False):
+        """Upload built modules over the session, connecting first if needed
+
+        Parameters
+        ----------
+        remote_kwargs: dict
+            Keyword args to request_remote()
+        build_results: List[BuildResult]
+            The built modules to upload
+        reconnect: bool
+            Whether to drop the current session and request a new one
+        """
+        remote = _persistent_session(remote_kwargs, reconnect)
+        if reconnect:
+            self.uploaded.clear()
+        for build_result in build_results:
+            remote.upload(build_result.filename)
+            self.uploaded.add(build_result.filename)
+
+    def is_alive(self, remote_kwargs):
+        """Check whether the session to the device is still connected"""
+        try:
+            _persistent_session(remote_kwargs).get_function("tvm.rpc.server.upload")
+        except (TVMError, OSError, AttributeError):
+            return False
+        return True
+
+    @contextlib.contextmanager
+    def __call__(self, remote_kwargs, build_result):
+        remote = _persistent_session(remote_kwargs)
+        if self.pre_load_function is not None:
+            self.pre_load_function(remote, build_result)
+
+        filename = os.path.split(build_result.filename)[1]
+        if build_result.filename not in self.uploaded:
+            remote.upload(build_result.filename)
+        try:
+            yield remote, remote.load_module(filename)
+
+        finally:
+            # clean up remote files, but keep the work directory of the session
+            self.uploaded.discard(build_result.filename)
+            remote.remove(filename)
+            remote.remove(os.path.splitext(filename)[0] + ".so")
+
+
 def default_module_loader(pre_load_function=None):
     """Returns a default function that can be passed as module_loader to run_through_rpc.
 
@@ -27,7 +27,6 @@ import json
 import time
 from typing import Union
 import os
-import itertools
 from collections import OrderedDict
 import numpy as np
 
@@ -36,7 +35,7 @@ from ..target import Target
 from ..contrib import popen_pool
 from .. import __version__
 from . import task
-from .task import ConfigEntity, ApplyHistoryBest
+from .task import ConfigEntity, ApplyHistoryBest  # pylint: disable=unused-import
 from .measure import MeasureInput, MeasureResult
 
 AUTOTVM_LOG_VERSION = 0.2
@@ -124,6 +123,19 @@ def encode(inp, result, protocol="json"):
     raise RuntimeError("Invalid log protocol: " + protocol)
 
 
+def clean_json_to_python(x):
+    """1. Convert all list in x to tuple (hashable)
+    2. Convert unicode to str for python2
+    """
+    if isinstance(x, list):
+        return tuple([clean_json_to_python(a) for a in x])
+    if isinstance(x, _unicode):
+        return str(x)
+    if isinstance(x, (_long, int)):
+        return int(x)
+    return x
+
+
 def decode(row, protocol="json"):
     """Decode encoded record string to python object
 
@@ -158,18 +170,6 @@ def decode(row, protocol="json"):
             tgt = tgt.replace("-target", "-mtriple")
         tgt = Target(str(tgt))
 
-        def clean_json_to_python(x):
-            """1. Convert all list in x to tuple (hashable)
-            2. Convert unicode to str for python2
-            """
-            if isinstance(x, list):
-                return tuple([clean_json_to_python(a) for a in x])
-            if isinstance(x, _unicode):
-                return str(x)
-            if isinstance(x, (_long, int)):
-                return int(x)
-            return x
-
         tsk = task.Task(clean_json_to_python(task_name), clean_json_to_python(task_args))
         config = ConfigEntity.from_json_dict(row["config"])
         inp = MeasureInput(tgt, tsk, config)
@@ -239,6 +239,78 @@ def load_from_file(filepath: Union[str, bytes, os.PathLike]):
                 yield ret
 
 
+def _decode_chunk(path, start, end):
+    """Decode the records in a byte range of a log file"""
+    records = []
+    for row in popen_pool.read_lines_in_range(path, start, end):
+        if row and not row.startswith("#"):
+            ret = decode(row)
+            if ret is not None:
+                records.append(ret)
+    return records
+
+
+def load_from_file_parallel(
+    filepath: Union[str, bytes, os.PathLike], max_workers=None, chunk_bytes=1 << 24
+):
+    """Generator: load records from path, which is split into chunks by byte range,
+    and decoded in parallel by a pool of worker processes.
+    This is a generator that yields the records in the same order as `load_from_file`.
+
+    Parameters
+    ----------
+    filepath: str, bytes, or os.PathLike
+    max_workers: Optional[int]
+        The number of worker processes. Defaults to os.cpu_count().
+    chunk_bytes: int
+        The approximate number of bytes of each chunk.
+
+    Yields
+    ------
+    input: autotvm.measure.MeasureInput
+    result: autotvm.measure.MeasureResult
+    """
+    for records in popen_pool.map_file_chunks(
+        _decode_chunk, filepath, max_workers=max_workers, chunk_bytes=chunk_bytes
+    ):
+        yield from records
+
+
+def _workload_keys_in_chunk(path, start, end):
+    """The workload key, the record key and the encoded record of each record in a chunk"""
+    return [
+        (measure_str_key(inp, False), measure_str_key(inp), encode(inp, res))
+        for inp, res in _decode_chunk(path, start, end)
+    ]
+
+
+def _best_keys_in_chunk(path, start, end):
+    """The cost and the record key of the best record of each target key (or model) and
+    workload in a chunk, which follows the rules of ApplyHistoryBest"""
+    best = {}
+    for inp, res in _decode_chunk(path, start, end):
+        if res.error_no != 0:
+            continue
+        cost = np.mean(res.costs)
+        keys = [("target_key", k, inp.task.workload) for k in inp.target.keys]
+        if inp.target.model != "unknown":
+            keys.append(("model", inp.target.model, inp.task.workload))
+        for key in keys:
+            if key not in best or best[key][0] > cost:
+                best[key] = (cost, measure_str_key(inp))
+    return best
+
+
+def _encode_best_in_chunk(path, start, end, best_set):
+    """The record key and the encoded record of each record in a chunk that is in the best set"""
+    return [
+        (str_key, encode(inp, res))
+        for inp, res in _decode_chunk(path, start, end)
+        for str_key in [measure_str_key(inp)]
+        if str_key in best_set
+    ]
+
+
 def split_workload(in_file, clean=True):
     """Split a log file into separate files, each of which contains only a single workload
     This function can also delete duplicated records in log file
@@ -251,43 +323,37 @@ def split_workload(in_file, clean=True):
         whether delete duplicated items
     """
     tic = time.time()
-    lines = list(open(in_file).readlines())
-
     logger.info("start converting...")
-    pool = popen_pool.PopenPoolExecutor()
-    lines = [rec for rec in pool.map(decode, lines) if rec is not None]
-    logger.info("map done %.2f", time.time() - tic)
-
     wkl_dict = OrderedDict()
-    for inp, res in lines:
-        wkl = measure_str_key(inp, False)
-        if wkl not in wkl_dict:
-            wkl_dict[wkl] = []
-        wkl_dict[wkl].append([inp, res])
+    for chunk in popen_pool.map_file_chunks(_workload_keys_in_chunk, in_file):
+        for wkl, str_key, row in chunk:
+            if wkl not in wkl_dict:
+                wkl_dict[wkl] = []
+            wkl_dict[wkl].append((str_key, row))
+    logger.info("map done %.2f", time.time() - tic)
 
     if clean:
         for i, (k, v) in enumerate(wkl_dict.items()):
             # clean duplicated items
             added = set()
             cleaned = []
-            for inp, res in v:
-                str_key = measure_str_key(inp)
+            for str_key, row in v:
                 if str_key in added:
                     continue
                 added.add(str_key)
-                cleaned.append([inp, res])
+                cleaned.append(row)
 
             # write to file
             logger.info("Key: %s\tValid: %d\tDup: %d\t", k, len(cleaned), len(v) - len(cleaned))
-            with open(args.i + f".{i:03d}.wkl", "w") as fout:
-                for inp, res in cleaned:
-                    fout.write(encode(inp, res) + "\n")
+            with open(in_file + f".{i:03d}.wkl", "w") as fout:
+                for row in cleaned:
+                    fout.write(row + "\n")
     else:
         for i, (k, v) in enumerate(wkl_dict.items()):
             logger.info("Key: %s\tNum: %d", k, len(v))
-            with open(args.i + f".{i:03d}.wkl", "w") as fout:
-                for inp, res in v:
-                    fout.write(encode(inp, res) + "\n")
+            with open(in_file + f".{i:03d}.wkl", "w") as fout:
+                for _, row in v:
+                    fout.write(row + "\n")
 
 
 def pick_best(in_file, out_file):
@@ -304,27 +370,34 @@ def pick_best(in_file, out_file):
     out_file: str or file
         The filename of output
     """
-    context = load_from_file(in_file)
+    in_files = [in_file]
     if os.path.isfile(out_file):
-        out_context = load_from_file(out_file)
-        context = itertools.chain(context, out_context)
-    context, context_clone = itertools.tee(context)
-    best_context = ApplyHistoryBest(context)
-    best_set = set()
-
-    for v in best_context.best_by_model.values():
-        best_set.add(measure_str_key(v[0]))
+        in_files.append(out_file)
+
+    # The best record of each key, which are decoded in parallel, and merged in order
+    best = {}
+    for chunk_best in popen_pool.map_file_chunks(_best_keys_in_chunk, in_files):
+        for key, (cost, str_key) in chunk_best.items():
+            if key not in best or best[key][0] > cost:
+                best[key] = (cost, str_key)
+    best_set = {str_key for _, str_key in best.values()}
+    logger.info("Extract %d best records from the %s", len(best_set), in_file)
 
-    for v in best_context.best_by_targetkey.values():
-        best_set.add(measure_str_key(v[0]))
+    rows = []
+    best_rows = popen_pool.map_file_chunks(
+        _encode_best_in_chunk, in_files, args=(frozenset(best_set),)
+    )
+    for chunk in best_rows:
+        for str_key, row in chunk:
+            if str_key in best_set:
+                rows.append(row)
+                best_set.remove(str_key)
 
-    logger.info("Extract %d best records from the %s", len(best_set), in_file)
     fout = open(out_file, "w") if isinstance(out_file, str) else out_file
-
-    for inp, res in context_clone:
-        if measure_str_key(inp) in best_set:
-            fout.write(encode(inp, res) + "\n")
-            best_set.remove(measure_str_key(inp))
+    for row in rows:
+        fout.write(row + "\n")
+    if isinstance(out_file, str):
+        fout.close()
 
 
 """
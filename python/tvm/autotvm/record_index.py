@@ -0,0 +1,208 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A persistent index of the best record per workload in an AutoTVM log file.
+
+The index is stored beside the log as ``<log>.idx``, and is a header followed by a table of
+fixed-size entries sorted by the hash of their keys. Each entry points to the line of the best
+record of a key, i.e. a pair of a target key (or model) and a workload, so that only the records
+actually queried are decoded. When the log grows, only the new lines are scanned to update the
+index.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..target import Target
+from . import record
+from .measure import MeasureInput, MeasureResult
+from .task.task import args_to_workload
+
+logger = logging.getLogger("autotvm")
+
+_MAGIC = b"TVMAHB01"
+# magic, the number of bytes of the log indexed, the number of entries, the digest of the prefix
+_HEADER = struct.Struct("<8sQQ32s")
+# The number of bytes at the beginning of the log to detect if it is rewritten
+_PREFIX_SIZE = 65536
+_ENTRY_DTYPE = np.dtype(
+    [("hash", "<u8"), ("cost", "<f8"), ("offset", "<u8"), ("length", "<u8")],
+)
+
+KIND_TARGET_KEY = "target_key"
+KIND_MODEL = "model"
+
+
+def _key_hash(kind: str, key: str, workload: tuple) -> int:
+    digest = hashlib.blake2b(repr((kind, key, workload)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _prefix_digest(file, size: int) -> bytes:
+    file.seek(0)
+    return hashlib.sha256(file.read(min(size, _PREFIX_SIZE))).digest()
+
+
+class RecordIndex(object):
+    """A memory-mapped index of the best record per target key (or model) and workload.
+
+    Parameters
+    ----------
+    log_path : str
+        The path to the log file in the JSON protocol.
+    index_path : Optional[str]
+        The path to the index file. Defaults to ``<log_path>.idx``.
+    """
+
+    def __init__(self, log_path, index_path: Optional[str] = None):
+        self.log_path = os.fspath(log_path)
+        self.index_path = index_path or self.log_path + ".idx"
+        self._mmap = None
+        self._decoded: Dict[int, Optional[Tuple[MeasureInput, MeasureResult]]] = {}
+        self.entries = np.empty(0, dtype=_ENTRY_DTYPE)
+        self._load_or_update()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _read_index(self, log_file, log_size: int):
+        """Read the index if it is consistent with the log.
+        Returns the number of bytes of the log indexed, and the mapped index."""
+        if not os.path.isfile(self.index_path):
+            return 0, None
+        with open(self.index_path, "rb") as index_file:
+            if os.fstat(index_file.fileno()).st_size < _HEADER.size:
+                return 0, None
+            mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, indexed_size, num_entries, digest = _HEADER.unpack_from(mapped, 0)
+        if (
+            magic != _MAGIC
+            or indexed_size > log_size
+            or len(mapped) != _HEADER.size + num_entries * _ENTRY_DTYPE.itemsize
+            or digest != _prefix_digest(log_file, indexed_size)
+        ):
+            mapped.close()
+            return 0, None
+        return indexed_size, mapped
+
+    def _load_or_update(self):
+        with open(self.log_path, "rb") as log_file:
+            log_size = os.fstat(log_file.fileno()).st_size
+            indexed_size, mapped = self._read_index(log_file, log_size)
+            if mapped is not None:
+                entries = np.frombuffer(mapped, dtype=_ENTRY_DTYPE, offset=_HEADER.size)
+                if indexed_size == log_size:
+                    self._mmap, self.entries = mapped, entries
+                    return
+                best = {int(e["hash"]): (e["cost"], e["offset"], e["length"]) for e in entries}
+                del entries
+                mapped.close()
+                logger.debug("Updating the index of %s from byte %d", self.log_path, indexed_size)
+            else:
+                best = {}
+                logger.debug("Building the index of %s", self.log_path)
+            indexed_size = self._scan(log_file, indexed_size, best)
+            digest = _prefix_digest(log_file, indexed_size)
+        entries = np.array(
+            [(h, cost, offset, length) for h, (cost, offset, length) in best.items()],
+            dtype=_ENTRY_DTYPE,
+        )
+        entries.sort(order="hash")
+        self.entries = entries
+        try:
+            tmp_path = f"{self.index_path}.tmp{os.getpid()}"
+            with open(tmp_path, "wb") as index_file:
+                index_file.write(_HEADER.pack(_MAGIC, indexed_size, len(entries), digest))
+                index_file.write(entries.tobytes())
+            os.replace(tmp_path, self.index_path)
+        except OSError as error:
+            logger.warning("Cannot write the index of %s: %s", self.log_path, error)
+
+    @staticmethod
+    def _scan(log_file, offset: int, best: Dict[int, Tuple[float, int, int]]) -> int:
+        """Scan the complete lines of the log from the offset, and update the best record of each
+        key. Returns the number of bytes of the log scanned."""
+        targets: Dict[str, Target] = {}
+        log_file.seek(offset)
+        for line in log_file:
+            if not line.endswith(b"\n"):
+                # The last line is being written
+                break
+            length = len(line)
+            row = line.strip()
+            if row and not row.startswith(b"#"):
+                row = json.loads(row)
+                if not ("v" in row and row["v"] == 0.1) and row["result"][1] == 0:
+                    tgt, task_name, task_args, _ = row["input"]
+                    tgt = str(tgt).replace("-target", "-mtriple")
+                    if tgt not in targets:
+                        targets[tgt] = Target(tgt)
+                    tgt = targets[tgt]
+                    workload = args_to_workload(
+                        record.clean_json_to_python(task_args),
+                        record.clean_json_to_python(task_name),
+                    )
+                    cost = float(np.mean(row["result"][0]))
+                    keys = [(KIND_TARGET_KEY, k) for k in tgt.keys]
+                    if tgt.model != "unknown":
+                        keys.append((KIND_MODEL, tgt.model))
+                    for kind, key in keys:
+                        key_hash = _key_hash(kind, key, workload)
+                        if key_hash not in best or best[key_hash][0] > cost:
+                            best[key_hash] = (cost, offset, length)
+            offset += length
+        return offset
+
+    def query(
+        self, kind: str, key: str, workload: tuple
+    ) -> Optional[Tuple[MeasureInput, MeasureResult]]:
+        """Query the best record of a target key (or model) and a workload.
+
+        Parameters
+        ----------
+        kind : str
+            Either KIND_TARGET_KEY or KIND_MODEL.
+        key : str
+            The target key, or the model.
+        workload : tuple
+            The workload.
+
+        Returns
+        -------
+        ret : Optional[Tuple[MeasureInput, MeasureResult]]
+            The best record, or None if not found.
+        """
+        key_hash = _key_hash(kind, key, workload)
+        if key_hash in self._decoded:
+            return self._decoded[key_hash]
+        ret = None
+        pos = int(np.searchsorted(self.entries["hash"], np.uint64(key_hash)))
+        if pos < len(self.entries) and int(self.entries[pos]["hash"]) == key_hash:
+            with open(self.log_path, "rb") as log_file:
+                log_file.seek(int(self.entries[pos]["offset"]))
+                line = log_file.read(int(self.entries[pos]["length"]))
+            ret = record.decode(line.decode())
+            if ret is not None and ret[0].task.workload != workload:
+                # A hash collision
+                ret = None
+        self._decoded[key_hash] = ret
+        return ret
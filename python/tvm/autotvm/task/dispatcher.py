@@ -250,14 +250,22 @@ class ApplyHistoryBest(DispatchContext):
 
         Collection of tuning records. If multiple Records objects are passed, their
         contents will be merged.
+
+    use_index : bool
+        Whether to load the log files through a persistent index of the best records beside
+        them, i.e. ``<log>.idx``, which is built on first use and updated when the log grows.
+        Only the records queried are decoded, instead of the whole log. The records loaded
+        through the index are not in `best_by_targetkey` or `best_by_model`.
     """
 
-    def __init__(self, records: Union[None, Records, Iterable[Records]]):
+    def __init__(self, records: Union[None, Records, Iterable[Records]], use_index: bool = False):
         super(ApplyHistoryBest, self).__init__()
 
         self.best_by_targetkey = {}
         self.best_by_model = {}
         self._best_user_defined = {}
+        self._use_index = use_index
+        self._indexes = []
 
         if records:
             self.load(records)
@@ -275,12 +283,16 @@ class ApplyHistoryBest(DispatchContext):
         """
         # pylint: disable=import-outside-toplevel
         from ..record import load_from_file, load_from_buffer
+        from ..record_index import RecordIndex
 
         def _unpack_records(
             records: Union[Records, Iterable[Records]]
         ) -> List[Tuple[MeasureInput, MeasureResult]]:
 
             if isinstance(records, (str, bytes, PathLike)):
+                if self._use_index:
+                    self._indexes.append(RecordIndex(records))
+                    return []
                 return load_from_file(records)
 
             if isinstance(records, TextIOBase):
@@ -330,6 +342,17 @@ class ApplyHistoryBest(DispatchContext):
 
         logger.debug("Finish loading %d records", counter)
 
+    def _best_of(self, best_map, kind, key, workload):
+        """The best record of the key among the records loaded and the indexes"""
+        best = best_map.get((key, workload), None)
+        for index in self._indexes:
+            found = index.query(kind, key, workload)
+            if found is not None and (
+                best is None or np.mean(best[1].costs) > np.mean(found[1].costs)
+            ):
+                best = found
+        return best
+
     def _query_inside(self, target, workload):
         if target is None:
             raise RuntimeError(
@@ -342,18 +365,18 @@ class ApplyHistoryBest(DispatchContext):
         key = (target.model, workload)
         if key in self._best_user_defined:
             return self._best_user_defined[key]
-        if key in self.best_by_model:
-            inp, _ = self.best_by_model[key]
-            return inp.config
+        best = self._best_of(self.best_by_model, "model", target.model, workload)
+        if best is not None:
+            return best[0].config
 
         # then try matching by target key
         for k in target.keys:
             key = (k, workload)
             if key in self._best_user_defined:
                 return self._best_user_defined[key]
-            if key in self.best_by_targetkey:
-                inp, _ = self.best_by_targetkey[key]
-                return inp.config
+            best = self._best_of(self.best_by_targetkey, "target_key", k, workload)
+            if best is not None:
+                return best[0].config
 
         return None
 
@@ -848,6 +848,21 @@ class ConfigSpace(object):
             self._make_shared_filter_cache()
         return self._shared_filter_cache[index]
 
+    def valid_index_mask(self):
+        """Get the vectorized form of `is_index_valid` over the range of the space
+
+        Returns
+        -------
+        mask: numpy.ndarray of bool, or None
+            whether each index meets all the constraints,
+            None if the space has no multi_filter condition
+        """
+        if self._shared_filter is None:
+            return None
+        if self._shared_filter_cache is None:
+            self._make_shared_filter_cache()
+        return np.fromiter(self._shared_filter_cache, bool, self.range_length)
+
     def multi_filter(self, filter):  # pylint: disable=redefined-builtin
         """The filter can restrict combination of parameters in difference to the knob filter,
         that restricts only single parameter
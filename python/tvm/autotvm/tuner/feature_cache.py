@@ -0,0 +1,290 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Feature cache persisted on disk, shared across tuning sessions and processes"""
+import glob
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+logger = logging.getLogger("autotvm")
+
+
+def feature_cache_namespace(task):
+    """Get the namespace of the features of a task in a disk feature cache.
+
+    Features are specific to the workload, the target and the config space of a task.
+
+    Parameters
+    ----------
+    task: Task
+        The tuning task
+
+    Returns
+    -------
+    namespace: str
+    """
+    space = [(name, len(knob)) for name, knob in task.config_space.space_map.items()]
+    return repr((task.workload, str(task.target), space))
+
+
+class _FeatureTable(object):
+    """The features of one feature type in a namespace, as a dict from config index to feature.
+
+    The table is a directory of immutable segments. Each segment is a pair of npy files,
+    the index file of (config index, feature length) rows and the feature file of zero padded
+    float32 rows, which is memory-mapped on load. A failed extraction has length -1.
+    New features are kept in memory until `flush_size` of them are pending, and then written
+    as a new segment. Segments are published by renaming the index file, which is written last.
+    """
+
+    def __init__(self, cache, table_dir):
+        self.cache = cache
+        self.table_dir = table_dir
+        self.segments = {}  # segment name -> (config indexes, lengths, features)
+        self.rows = {}  # config index -> (segment name, row)
+        self.pending = {}  # config index -> feature
+        os.makedirs(table_dir, exist_ok=True)
+        self.refresh()
+
+    def _segment_path(self, name, kind):
+        return os.path.join(self.table_dir, f"{name}.{kind}.npy")
+
+    def refresh(self):
+        """Load the segments written by other processes"""
+        for path in glob.glob(os.path.join(self.table_dir, "*.index.npy")):
+            name = os.path.basename(path)[: -len(".index.npy")]
+            if name in self.segments:
+                continue
+            try:
+                index = np.load(path)
+                features = np.load(self._segment_path(name, "feature"), mmap_mode="r")
+            except (OSError, ValueError):
+                # evicted concurrently
+                continue
+            self.segments[name] = (index[:, 0], index[:, 1], features)
+            for row, config_index in enumerate(index[:, 0].tolist()):
+                self.rows[config_index] = (name, row)
+
+    def __contains__(self, config_index):
+        config_index = int(config_index)
+        return config_index in self.pending or config_index in self.rows
+
+    def __getitem__(self, config_index):
+        config_index = int(config_index)
+        if config_index in self.pending:
+            return self.pending[config_index]
+        name, row = self.rows[config_index]
+        _, lengths, features = self.segments[name]
+        length = int(lengths[row])
+        if length < 0:
+            return None
+        return np.array(features[row, :length])
+
+    def __setitem__(self, config_index, feature):
+        self.pending[int(config_index)] = feature
+        if len(self.pending) >= self.cache.flush_size:
+            self.flush()
+
+    def __len__(self):
+        return len(self.rows) + sum(1 for x in self.pending if x not in self.rows)
+
+    def touch(self):
+        """Mark the segments as recently used"""
+        for name in self.segments:
+            try:
+                os.utime(self._segment_path(name, "index"))
+            except OSError:
+                pass
+
+    def _write_pending(self):
+        config_indexes = list(self.pending)
+        feas = [self.pending[x] for x in config_indexes]
+        lengths = [-1 if x is None else len(x) for x in feas]
+        features = np.zeros((len(feas), max([0, *lengths])), dtype=np.float32)
+        for row, fea in enumerate(feas):
+            if fea is not None:
+                features[row, : len(fea)] = fea
+        # the table may have been evicted by another process
+        os.makedirs(self.table_dir, exist_ok=True)
+        name = uuid.uuid4().hex
+        tmp_path = os.path.join(self.table_dir, f".tmp-{name}.npy")
+        np.save(tmp_path, features)
+        os.replace(tmp_path, self._segment_path(name, "feature"))
+        np.save(tmp_path, np.array([config_indexes, lengths], dtype=np.int64).T)
+        os.replace(tmp_path, self._segment_path(name, "index"))
+        self.pending = {}
+
+    def flush(self):
+        """Write the pending features as a new segment"""
+        if not self.pending:
+            return
+        self._write_pending()
+        self.refresh()
+        if len(self.segments) > self.cache.max_segments:
+            self.compact()
+        self.cache.evict()
+
+    def compact(self):
+        """Merge all the segments of the table into one"""
+        names = list(self.segments)
+        self.pending = {x: self[x] for x in self.rows}
+        # the merged segment is written before the old ones are removed,
+        # so that the features stay available to other processes
+        self._write_pending()
+        for name in names:
+            for kind in ("index", "feature"):
+                try:
+                    os.remove(self._segment_path(name, kind))
+                except OSError:
+                    pass
+        self.segments, self.rows = {}, {}
+        self.refresh()
+
+    def clear(self):
+        self.pending, self.segments, self.rows = {}, {}, {}
+        shutil.rmtree(self.table_dir, ignore_errors=True)
+        os.makedirs(self.table_dir, exist_ok=True)
+
+
+class DiskFeatureCache(object):
+    """Feature cache persisted on disk, a drop-in replacement of FeatureCache.
+
+    The features of different namespaces, e.g. different tasks, and different feature types are
+    stored in separate tables under `cache_dir`, so that a cache directory can be shared by
+    many tuning sessions and processes. The least recently used tables are evicted when the
+    total size of the cache exceeds `max_bytes`.
+
+    Parameters
+    ----------
+    cache_dir: str
+        The directory of the cache
+    namespace: str
+        The namespace of the features, see `feature_cache_namespace`
+    max_bytes: int, optional
+        The maximum total size of the cache in bytes
+    flush_size: int, optional
+        The number of new features kept in memory before they are written to disk
+    max_segments: int, optional
+        The maximum number of segment files of a table before they are merged
+    """
+
+    def __init__(self, cache_dir, namespace, max_bytes=1 << 30, flush_size=1024, max_segments=32):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, but got {max_bytes}")
+        self.cache_dir = cache_dir
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.flush_size = flush_size
+        self.max_segments = max_segments
+        self.tables = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _table_dir(self, key):
+        digest = hashlib.sha256(repr((self.namespace, key)).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:32])
+
+    def get(self, key):
+        """Get feature cache dictionary for a key
+
+        Parameters
+        ----------
+        key: str
+            The key of a feature type
+
+        Returns
+        -------
+        fea_cache: dict-like
+            cache dictionary from config index to feature
+        """
+        if key not in self.tables:
+            self.tables[key] = _FeatureTable(self, self._table_dir(key))
+            self.tables[key].touch()
+        return self.tables[key]
+
+    def size(self, key):
+        """Get the size of a feature cache dictionary
+
+        Parameters
+        ----------
+        key: str
+            The key of a feature type
+
+        Returns
+        -------
+        n: int
+        """
+        return len(self.tables[key]) if key in self.tables else 0
+
+    def clear(self, key):
+        """Clear feature cache for a key
+
+        Parameters
+        ----------
+        key: str
+            The key of a feature type
+        """
+        if key in self.tables:
+            self.tables[key].clear()
+
+    def flush(self):
+        """Write all the pending features to disk"""
+        for table in self.tables.values():
+            table.flush()
+
+    def refresh(self):
+        """Load the features written by other processes since the tables were opened.
+        It scans the table directories, so it is not done on every lookup."""
+        for table in self.tables.values():
+            table.refresh()
+
+    def evict(self):
+        """Evict the least recently used tables until the cache fits in `max_bytes`
+
+        Returns
+        -------
+        num_evicted: int
+            The number of evicted tables
+        """
+        tables = []
+        for name in os.listdir(self.cache_dir):
+            table_dir = os.path.join(self.cache_dir, name)
+            try:
+                files = [os.path.join(table_dir, x) for x in os.listdir(table_dir)]
+                size = sum(os.path.getsize(x) for x in files)
+                last_use = max([os.path.getmtime(x) for x in files], default=0)
+            except OSError:
+                continue
+            tables.append((last_use, size, table_dir))
+        tables.sort()
+        total_bytes = sum(size for _, size, _ in tables)
+        in_use = {table.table_dir for table in self.tables.values()}
+        num_evicted = 0
+        for _, size, table_dir in tables:
+            if total_bytes <= self.max_bytes:
+                break
+            if table_dir in in_use:
+                continue
+            shutil.rmtree(table_dir, ignore_errors=True)
+            total_bytes -= size
+            num_evicted += 1
+        if num_evicted:
+            logger.debug("Evicted %d feature tables from %s", num_evicted, self.cache_dir)
+        return num_evicted
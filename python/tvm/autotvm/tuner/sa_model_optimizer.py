@@ -19,7 +19,6 @@
 Cost model optimizer based on simulated annealing
 """
 
-import heapq
 import logging
 import time
 
@@ -33,6 +32,9 @@ logger = logging.getLogger("autotvm")
 class SimulatedAnnealingOptimizer(ModelOptimizer):
     """parallel simulated annealing optimization algorithm
 
+    The random walks, the acceptance test and the maintenance of the maximums are done on
+    whole arrays of points, using the mixed radix arithmetic of the knobs of the config space.
+
     Parameters
     ----------
     task: Task
@@ -46,6 +48,9 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         Stop iteration if the optimal set do not change in `early_stop` rounds
     log_interval: int, optional
         Print log every `log_interval` iterations
+    seed: int, optional
+        The seed of the random state of the optimizer, with which the same maximums are
+        found for the same cost model. If not set, the global numpy random state is used.
     """
 
     def __init__(
@@ -57,6 +62,7 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         parallel_size=128,
         early_stop=50,
         log_interval=50,
+        seed=None,
     ):
         super(SimulatedAnnealingOptimizer, self).__init__()
         self.task = task
@@ -67,6 +73,85 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         self.early_stop = early_stop or 1e9
         self.log_interval = log_interval
         self.points = None
+        self.rng = np.random if seed is None else np.random.RandomState(seed)
+
+        space = self.task.config_space
+        # indexes of huge spaces do not fit in int64, in which case they are python ints
+        self.dtype = np.int64 if space.range_length < 2**62 else object
+        self.dims = np.array(space.dims, dtype=np.int64)
+        self.strides = np.ones(len(self.dims), dtype=self.dtype)
+        for i in range(1, len(self.dims)):
+            self.strides[i] = self.strides[i - 1] * int(self.dims[i - 1])
+        # knobs with a single candidate never change in a random walk
+        self.mutable = np.flatnonzero(self.dims > 1)
+        self.valid = space.valid_index_mask()
+
+    def sample(self, n):
+        """Sample n different valid points from the config space
+
+        Parameters
+        ----------
+        n: int
+            The number of sampled points
+
+        Returns
+        -------
+        points: numpy.ndarray
+        """
+        space = self.task.config_space
+        if self.valid is not None:
+            return self.rng.choice(np.flatnonzero(self.valid), n, replace=False)
+        if self.dtype is object:
+            return np.array(list(space.sample_ints(n)), dtype=object)
+        points = np.empty(0, dtype=np.int64)
+        while len(points) < n:
+            new = self.rng.randint(0, space.range_length, size=n - len(points), dtype=np.int64)
+            points = np.concatenate([points, new])
+            _, index = np.unique(points, return_index=True)
+            points = points[np.sort(index)]
+        return points
+
+    def point2knob(self, points):
+        """Convert an array of points to the matrix of their knobs, one row per point"""
+        knobs = np.empty((len(points), len(self.dims)), dtype=np.int64)
+        points = np.array(points, dtype=self.dtype)
+        for i, dim in enumerate(self.dims):
+            knobs[:, i] = points % int(dim)
+            points = points // int(dim)
+        return knobs
+
+    def random_walk(self, points, knobs):
+        """Vectorized `ConfigSpace.random_walk` of an array of points
+
+        Parameters
+        ----------
+        points: numpy.ndarray
+            The points to walk from
+        knobs: numpy.ndarray
+            The knobs of the points, as returned by `point2knob`
+
+        Returns
+        -------
+        new_points: numpy.ndarray
+            The valid neighborhood points, each differs from its origin
+        new_knobs: numpy.ndarray
+            The knobs of the new points
+        """
+        new_points = np.array(points, dtype=self.dtype)
+        new_knobs = knobs.copy()
+        pending = np.arange(len(points))
+        # like ConfigSpace.random_walk, keep mutating until the knob differs and is valid
+        while len(pending) > 0:
+            axis = self.mutable[self.rng.randint(len(self.mutable), size=len(pending))]
+            value = self.rng.randint(self.dims[axis])
+            delta = value - new_knobs[pending, axis]
+            new_knobs[pending, axis] = value
+            new_points[pending] += delta.astype(self.dtype) * self.strides[axis]
+            done = np.any(new_knobs[pending] != knobs[pending], axis=1)
+            if self.valid is not None:
+                done &= self.valid[new_points[pending]]
+            pending = pending[~done]
+        return new_points, new_knobs
 
     def find_maximums(self, model, num, exclusive):
         tic = time.time()
@@ -80,21 +165,39 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         if self.persistent and self.points is not None:
             points = self.points
         else:
-            points = self.task.config_space.sample_ints(self.parallel_size)
+            points = self.sample(self.parallel_size)
+        knobs = self.point2knob(points)
 
         scores = model.predict(points)
 
-        # build heap and insert initial points
-        heap_items = [(float("-inf"), -1 - i) for i in range(num)]
-        heapq.heapify(heap_items)
-        in_heap = set(exclusive)
-        in_heap.update([x[1] for x in heap_items])
-
-        for s, p in zip(scores, points):
-            if s > heap_items[0][0] and p not in in_heap:
-                pop = heapq.heapreplace(heap_items, (s, p))
-                in_heap.remove(pop[1])
-                in_heap.add(p)
+        # the maximums found so far, with placeholders that are never returned
+        max_scores = np.full(num, float("-inf"))
+        max_points = np.arange(-1, -1 - num, -1).astype(self.dtype)
+        exclusive = np.sort(np.array(list(exclusive or ()), dtype=self.dtype))
+
+        def update(new_scores, new_points):
+            nonlocal max_scores, max_points
+            index = np.flatnonzero(new_scores > max_scores.min())
+            if len(index) == 0:
+                return False
+            # drop the duplicates, the excluded points and the points in the maximums
+            _, first = np.unique(new_points[index], return_index=True)
+            index = index[np.sort(first)]
+            cand_points = new_points[index]
+            pos = np.minimum(np.searchsorted(exclusive, cand_points), max(len(exclusive) - 1, 0))
+            keep = ~np.isin(cand_points, max_points)
+            if len(exclusive) > 0:
+                keep &= exclusive[pos] != cand_points
+            if not keep.any():
+                return False
+            all_scores = np.concatenate([max_scores, new_scores[index[keep]]])
+            all_points = np.concatenate([max_points, cand_points[keep]])
+            # the existing maximums win the ties
+            order = np.argsort(-all_scores, kind="stable")[:num]
+            max_scores, max_points = all_scores[order], all_points[order]
+            return bool(order.max() >= num)
+
+        update(scores, points)
 
         k = 0
         k_last_modify = 0
@@ -107,24 +210,19 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             cool = 0
 
         while k < n_iter and k < k_last_modify + early_stop:
-            new_points = np.empty_like(points)
-            for i, p in enumerate(points):
-                new_points[i] = self.task.config_space.random_walk(p)
+            new_points, new_knobs = self.random_walk(points, knobs)
 
             new_scores = model.predict(new_points)
 
             ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
-            ac_index = np.random.random(len(ac_prob)) < ac_prob
+            ac_index = self.rng.random_sample(len(ac_prob)) < ac_prob
 
             points[ac_index] = new_points[ac_index]
+            knobs[ac_index] = new_knobs[ac_index]
             scores[ac_index] = new_scores[ac_index]
 
-            for s, p in zip(new_scores, new_points):
-                if s > heap_items[0][0] and p not in in_heap:
-                    pop = heapq.heapreplace(heap_items, (s, p))
-                    in_heap.remove(pop[1])
-                    in_heap.add(p)
-                    k_last_modify = k
+            if update(new_scores, new_points):
+                k_last_modify = k
 
             k += 1
             t -= cool
@@ -136,20 +234,19 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
                     "elapsed: %.2f",
                     k,
                     k_last_modify,
-                    heap_items[0][0],
-                    np.max([v for v, _ in heap_items]),
+                    max_scores.min(),
+                    max_scores.max(),
                     t_str,
                     time.time() - tic,
                 )
 
-        heap_items.sort(key=lambda item: -item[0])
-        heap_items = [x for x in heap_items if x[0] >= 0]
+        maximums = [(s, int(p)) for s, p in zip(max_scores, max_points) if s >= 0]
         logger.debug(
             "SA iter: %d\tlast_update: %d\telapsed: %.2f", k, k_last_modify, time.time() - tic
         )
-        logger.debug("SA Maximums: %s", heap_items)
+        logger.debug("SA Maximums: %s", maximums)
 
         if self.persistent:
             self.points = points
 
-        return [x[1] for x in heap_items]
+        return [x[1] for x in maximums]
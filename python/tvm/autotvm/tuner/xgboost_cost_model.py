@@ -23,11 +23,12 @@ import time
 from typing import Dict
 
 import numpy as np
-from tvm.contrib.popen_pool import PopenPoolExecutor, StatusKind
+from tvm.contrib.popen_pool import MapResult, PopenPoolExecutor, StatusKind
 
 from .. import feature
 from ..utils import get_rank
 from .metric import cover_curve, max_curve, recall_curve
+from .feature_cache import DiskFeatureCache, feature_cache_namespace
 from .model_based_tuner import CostModel, FeatureCache
 
 try:
@@ -79,6 +80,11 @@ class XGBoostCostModel(CostModel):
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    feature_cache_dir: str, optional
+        If is not none, the extracted features are persisted in a DiskFeatureCache
+        in this directory, and reused across tuning sessions and processes.
+    feature_cache_max_bytes: int, optional
+        The maximum total size of the disk feature cache in bytes.
     """
 
     def __init__(
@@ -89,6 +95,8 @@ class XGBoostCostModel(CostModel):
         num_threads=None,
         log_interval=25,
         upper_model=None,
+        feature_cache_dir=None,
+        feature_cache_max_bytes=1 << 30,
     ):
         global xgb
         super(XGBoostCostModel, self).__init__()
@@ -154,6 +162,10 @@ class XGBoostCostModel(CostModel):
 
         if upper_model:  # share a same feature cache with upper model
             self.feature_cache = upper_model.feature_cache
+        elif feature_cache_dir is not None:
+            self.feature_cache = DiskFeatureCache(
+                feature_cache_dir, feature_cache_namespace(task), feature_cache_max_bytes
+            )
         else:
             self.feature_cache = FeatureCache()
         self.upper_model = upper_model
@@ -182,6 +194,10 @@ class XGBoostCostModel(CostModel):
     def _close_pool(self):
         if self.pool:
             self.pool = None
+        if isinstance(self.feature_cache, DiskFeatureCache):
+            self.feature_cache.flush()
+            # pick up the features of other processes when (re)starting to fit
+            self.feature_cache.refresh()
 
     def _get_pool(self):
         if self.upper_model:
@@ -249,6 +265,23 @@ class XGBoostCostModel(CostModel):
 
         logger.debug("XGB load %d entries from history log file", len(data))
 
+        # the features of the records of this task are looked up by their config indexes,
+        # so that they are shared with the disk feature cache
+        cached_xs, cached_ys = [], []
+        if isinstance(self.feature_cache, DiskFeatureCache):
+            uncached = []
+            for inp, res in data:
+                if inp.task.workload == self.task.workload and str(inp.target) == str(self.target):
+                    cached_xs.append(inp.config.index)
+                    # the tasks decoded from logs have no flop until instantiated,
+                    # so use that of the same workload of this task
+                    cached_ys.append(
+                        self.task.flop / np.mean(res.costs) if res.error_no == 0 else 0.0
+                    )
+                else:
+                    uncached.append((inp, res))
+            data = uncached
+
         # extract feature
         self._reset_pool(self.space, self.target, self.task)
         pool = self._get_pool()
@@ -262,6 +295,12 @@ class XGBoostCostModel(CostModel):
             raise RuntimeError("Invalid feature type: " + self.fea_type)
         result = pool.map_with_error_catching(feature_extract_func, data)
         result = list(result)  # store results so we can iterate through them twice
+        if cached_xs:
+            fea_cache = self.feature_cache.get(self.fea_type)
+            self._get_feature(cached_xs)
+            for x, y in zip(cached_xs, cached_ys):
+                if fea_cache[x] is not None:
+                    result.append(MapResult(status=StatusKind.COMPLETE, value=(fea_cache[x], y)))
 
         # get maximum feature length
         fea_len = -1
@@ -340,8 +379,11 @@ class XGBoostCostModel(CostModel):
 
     def _get_feature(self, indexes):
         """get features for indexes, run extraction if we do not have cache for them"""
-        # free feature cache
-        if self.feature_cache.size(self.fea_type) >= 100000:
+        # free feature cache, the disk feature cache is bounded by itself
+        if (
+            isinstance(self.feature_cache, FeatureCache)
+            and self.feature_cache.size(self.fea_type) >= 100000
+        ):
             self.feature_cache.clear(self.fea_type)
 
         fea_cache = self.feature_cache.get(self.fea_type)
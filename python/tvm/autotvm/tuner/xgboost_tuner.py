@@ -72,6 +72,13 @@ class XGBTuner(ModelBasedTuner):
         The verbose level.
         If is 0, output nothing.
         Otherwise, output debug information every `verbose` iterations.
+
+    feature_cache_dir: str, optional
+        If is not None, the extracted features are persisted in this directory,
+        and reused by later tuning sessions and other processes tuning the same task.
+
+    feature_cache_max_bytes: int, optional
+        The maximum total size of the feature cache directory in bytes.
     """
 
     def __init__(
@@ -84,6 +91,8 @@ class XGBTuner(ModelBasedTuner):
         optimizer="sa",
         diversity_filter_ratio=None,
         log_interval=50,
+        feature_cache_dir=None,
+        feature_cache_max_bytes=1 << 30,
     ):
         cost_model = XGBoostCostModel(
             task,
@@ -91,6 +100,8 @@ class XGBTuner(ModelBasedTuner):
             loss_type=loss_type,
             num_threads=num_threads,
             log_interval=log_interval // 2,
+            feature_cache_dir=feature_cache_dir,
+            feature_cache_max_bytes=feature_cache_max_bytes,
         )
         if optimizer == "sa":
             optimizer = SimulatedAnnealingOptimizer(task, log_interval=log_interval)
@@ -371,12 +371,18 @@ class PopenPoolExecutor:
             raise TypeError("initializer must be callable for PopenPoolExecutor")
 
     def __del__(self):
+        self.shutdown()
+
+    def shutdown(self):
+        """Kill the worker processes and shut down the pool.
+        The pool cannot be used after it is shut down."""
         self._lock.acquire()
         for worker in self._worker_map.values():
             try:
                 worker.kill()
             except ImportError:
                 pass
+        self._worker_map.clear()
         self._lock.release()
         self._threadpool.shutdown()
 
@@ -450,3 +456,123 @@ class PopenPoolExecutor:
         """
         worker = lambda x: self._worker_run_with_error_catching(fn, (x,), None)
         return self._threadpool.map(worker, iterator)
+
+
+def split_file_by_lines(path, chunk_bytes):
+    """Split a text file into byte ranges of about `chunk_bytes` bytes each,
+    which are aligned to the line boundaries.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+
+    chunk_bytes : int
+        The approximate number of bytes in each range.
+
+    Returns
+    -------
+    ranges : List[Tuple[int, int]]
+        The list of [start, end) byte ranges that cover the file.
+    """
+    if chunk_bytes <= 0:
+        raise ValueError("chunk_bytes must be positive")
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def read_lines_in_range(path, start, end):
+    """Read the lines of a text file in the byte range [start, end),
+    which is returned by `split_file_by_lines`.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+
+    start : int
+        The start of the range.
+
+    end : int
+        The end of the range.
+
+    Returns
+    -------
+    lines : List[str]
+        The lines in the range, without the line breaks.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return data.decode().splitlines()
+
+
+def map_file_chunks(fn, paths, args=(), max_workers=None, chunk_bytes=1 << 24):
+    """Split text files into chunks of lines, and invoke `fn(path, start, end, *args)` on each
+    chunk in a PopenPoolExecutor. The results are yielded in the order of the chunks as soon as
+    they are ready, while the later chunks are still being processed. If there is only one chunk
+    or one worker, the chunks are processed in the current process.
+
+    Parameters
+    ----------
+    fn : function
+        The function to be invoked on each chunk, which is usually a module-level function
+        that reads the lines with `read_lines_in_range`.
+
+    paths : Union[str, List[str]]
+        The path, or the list of paths to the files.
+
+    args : tuple
+        The extra arguments of `fn`.
+
+    max_workers : Optional[int]
+        The number of worker processes. Defaults to os.cpu_count().
+
+    chunk_bytes : int
+        The approximate number of bytes in each chunk.
+
+    Yields
+    ------
+    result : Any
+        The result of `fn` on each chunk.
+    """
+    if isinstance(paths, (str, bytes, os.PathLike)):
+        paths = [paths]
+    chunks = [
+        (os.fspath(path), start, end)
+        for path in paths
+        for start, end in split_file_by_lines(path, chunk_bytes)
+    ]
+    if not chunks:
+        return
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    max_workers = max(1, min(max_workers, len(chunks)))
+    if max_workers == 1:
+        # Not worth the start-up time of a worker process
+        for chunk in chunks:
+            yield fn(*chunk, *args)
+        return
+    pool = PopenPoolExecutor(max_workers=max_workers)
+    # Only a bounded number of chunks are in flight, so that the results not consumed yet
+    # do not pile up in memory
+    futures = []
+    next_chunk = 0
+    while next_chunk < len(chunks) or futures:
+        while next_chunk < len(chunks) and len(futures) < 2 * max_workers:
+            futures.append(pool.submit(fn, *chunks[next_chunk], *args))
+            next_chunk += 1
+        yield futures.pop(0).result()
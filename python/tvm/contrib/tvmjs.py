@@ -17,14 +17,19 @@
 """Namespace to store utilities for building web runtime."""
 import hashlib
 import json
+import logging
 import math
 import os
 import shutil
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 # pylint: disable=unused-import
 import sys
 from types import GeneratorType
-from typing import Iterator, Mapping, Tuple, Union
+from typing import Iterator, Mapping, Optional, Tuple, Union
 
 import numpy as np
 
@@ -38,6 +43,8 @@ from tvm._ffi.libinfo import find_lib_path
 
 from .emcc import create_tvmjs_wasm
 
+logger = logging.getLogger(__name__)
+
 
 def _convert_f32_to_bf16(value):
     cap = np.finfo("float32").max
@@ -62,6 +69,11 @@ def _convert_bf16_to_f32(value):
     return (data.astype("uint32") << 16).view("float32")
 
 
+# The alignment of the parameters in a shard, which is kAllocAlignment of NDArray, so that the
+# parameters of a memory-mapped shard can be used in place.
+_PARAM_ALIGNMENT = 64
+
+
 def _calculate_md5(filename):
     hash_md5 = hashlib.md5()
     with open(filename, "rb") as file:
@@ -117,6 +129,7 @@ class NDArrayCacheShardingManager:
                 self._commit_internal(data, [rec])
                 return
             self.commit()
+        self.curr_data += bytes(-self.pending_nbytes % _PARAM_ALIGNMENT)
         rec["byteOffset"] = self.pending_nbytes
         self.curr_records.append(rec)
         self.curr_data += data
@@ -263,9 +276,71 @@ def dump_ndarray_cache(
         print("Also saved a bf16 record to %s" % b16_nd_cache_json)
 
 
-def load_ndarray_cache(cachepath: str, device: tvm.runtime.Device):
+def _read_shard(cachedir, shard_rec, use_mmap):
+    """Read a shard, and return its raw data and the elapsed time."""
+    tic = time.perf_counter()
+    full_data_path = os.path.join(cachedir, shard_rec["dataPath"])
+    if use_mmap:
+        # Copy-on-write, so that writing to a parameter never changes the shard
+        raw_data = np.memmap(full_data_path, dtype="uint8", mode="c")
+    else:
+        with open(full_data_path, "rb") as file:
+            raw_data = file.read()
+    assert shard_rec["format"] == "raw-shard"
+    assert shard_rec["nbytes"] == len(raw_data)
+    return raw_data, time.perf_counter() - tic
+
+
+def _decode_param(raw_data, rec, device, use_mmap):
+    """Decode a parameter of a shard into a numpy array,
+    or into an NDArray viewing the mapped shard when it can be used in place."""
+    shape = rec["shape"]
+    dtype = rec["dtype"]
+    encode_format = rec["format"]
+    offset = rec["byteOffset"]
+    nbytes = rec["nbytes"]
+
+    assert offset + nbytes <= len(raw_data)
+    buffer_source = raw_data[offset : offset + nbytes]
+    if use_mmap and device.device_type == tvm.cpu().device_type:
+        view = _view_mapped_param(buffer_source, shape, dtype, encode_format)
+        if view is not None:
+            return tvm.nd.from_dlpack(view)
+    if dtype == "e4m3_float8":
+        if ml_dtypes is not None:
+            dtype = ml_dtypes.float8_e4m3fn
+        else:
+            raise RuntimeError(
+                "ml_dtypes is not installed, cannot convert e4m3_float8 array to numpy."
+            )
+    if dtype == "e5m2_float8":
+        if ml_dtypes is not None:
+            dtype = ml_dtypes.float8_e5m2
+        else:
+            raise RuntimeError(
+                "ml_dtypes is not installed, cannot convert e5m2_float8 array to numpy."
+            )
+    if encode_format == "f32-to-bf16" and dtype == "float32":
+        data = np.frombuffer(buffer_source, dtype="uint16").reshape(shape)
+        return _convert_bf16_to_f32(data)
+    if dtype == "bfloat16":
+        return np.frombuffer(buffer_source, dtype="uint16").reshape(shape)
+    return np.frombuffer(buffer_source, dtype=dtype).reshape(shape)
+
+
+def load_ndarray_cache(
+    cachepath: str,
+    device: tvm.runtime.Device,
+    use_mmap: bool = False,
+    num_workers: Optional[int] = None,
+    read_ahead: int = 2,
+):
     """Load the ndarray cache from the directory or json.
 
+    Up to `read_ahead` shards are read by a thread pool ahead of the one being copied
+    to the device, and the parameters of each shard are decoded in parallel by another
+    thread pool, so that decoding never waits behind the reads ahead. The time spent
+    in each phase is logged.
 
     Parameters
     ----------
@@ -274,59 +349,98 @@ def load_ndarray_cache(cachepath: str, device: tvm.runtime.Device):
 
     device: tvm.runtime.Device
         The device we would like to load the data from.
+
+    use_mmap: bool
+        Whether to map the shards into memory instead of reading them.
+        On CPU, the aligned parameters without encoding are zero-copy views of the
+        mapped shards, whose pages are read from the disk on the first access.
+
+    num_workers: Optional[int]
+        The number of threads decoding the parameters of a shard.
+        Defaults to the number of CPUs.
+
+    read_ahead: int
+        The number of shards read concurrently ahead of the one being copied to the device.
+        Each of them is held in memory until copied, so it is kept small by default.
     """
     if not cachepath.endswith(".json"):
         cachepath = os.path.join(cachepath, "ndarray-cache.json")
 
+    tic = time.perf_counter()
     cachedir = os.path.dirname(cachepath)
     json_info = json.loads(open(cachepath, "r").read())
+    shard_recs = json_info["records"]
+    num_workers = max(1, num_workers or os.cpu_count() or 1)
+    read_ahead = max(1, read_ahead)
     result_dict = {}
-
-    for shard_rec in json_info["records"]:
-        data_path = shard_rec["dataPath"]
-        full_data_path = os.path.join(cachedir, data_path)
-        raw_data = open(full_data_path, "rb").read()
-        assert shard_rec["format"] == "raw-shard"
-        assert shard_rec["nbytes"] == len(raw_data)
-
-        for rec in shard_rec["records"]:
-            name = rec["name"]
-            shape = rec["shape"]
-            dtype = rec["dtype"]
-            encode_format = rec["format"]
-            offset = rec["byteOffset"]
-            nbytes = rec["nbytes"]
-
-            arr = tvm.nd.empty(shape, dtype, device=device)
-            assert offset + nbytes <= len(raw_data)
-            buffer_source = raw_data[offset : offset + nbytes]
-            if dtype == "e4m3_float8":
-                if ml_dtypes is not None:
-                    dtype = ml_dtypes.float8_e4m3fn
-                else:
-                    raise RuntimeError(
-                        "ml_dtypes is not installed, cannot convert e4m3_float8 array to numpy."
-                    )
-            if dtype == "e5m2_float8":
-                if ml_dtypes is not None:
-                    dtype = ml_dtypes.float8_e5m2
-                else:
-                    raise RuntimeError(
-                        "ml_dtypes is not installed, cannot convert e5m2_float8 array to numpy."
-                    )
-            if encode_format == "f32-to-bf16" and dtype == "float32":
-                data = np.frombuffer(buffer_source, dtype="uint16").reshape(shape)
-                arr.copyfrom(_convert_bf16_to_f32(data))
-            elif dtype == "bfloat16":
-                data = np.frombuffer(buffer_source, dtype="uint16").reshape(shape)
-                arr.copyfrom(data)
-            else:
-                data = np.frombuffer(buffer_source, dtype=dtype).reshape(shape)
+    timings = {"read": 0.0, "read_wait": 0.0, "decode": 0.0, "copy": 0.0}
+
+    io_executor = ThreadPoolExecutor(max_workers=read_ahead)
+    decode_executor = ThreadPoolExecutor(max_workers=num_workers)
+    with io_executor, decode_executor:
+        pending = deque()
+        to_read = iter(shard_recs)
+
+        def submit_reads():
+            for shard_rec in islice(to_read, read_ahead - len(pending)):
+                pending.append(io_executor.submit(_read_shard, cachedir, shard_rec, use_mmap))
+
+        submit_reads()
+        for shard_rec in shard_recs:
+            wait_tic = time.perf_counter()
+            raw_data, read_sec = pending.popleft().result()
+            timings["read_wait"] += time.perf_counter() - wait_tic
+            timings["read"] += read_sec
+            submit_reads()
+
+            decode_tic = time.perf_counter()
+            params = list(
+                decode_executor.map(
+                    lambda rec, raw_data=raw_data: _decode_param(raw_data, rec, device, use_mmap),
+                    shard_rec["records"],
+                )
+            )
+            timings["decode"] += time.perf_counter() - decode_tic
+
+            copy_tic = time.perf_counter()
+            for rec, data in zip(shard_rec["records"], params):
+                if isinstance(data, tvm.runtime.NDArray):
+                    result_dict[rec["name"]] = data
+                    continue
+                arr = tvm.nd.empty(rec["shape"], rec["dtype"], device=device)
                 arr.copyfrom(data)
-            result_dict[name] = arr
+                result_dict[rec["name"]] = arr
+            timings["copy"] += time.perf_counter() - copy_tic
+            del raw_data, params
+
+    logger.info(
+        "Loaded %d shard(s) with read-ahead %d and %d decoding worker(s) in %.3f s: "
+        "read %.3f s (waited %.3f s), decode %.3f s, copy %.3f s",
+        len(shard_recs),
+        read_ahead,
+        num_workers,
+        time.perf_counter() - tic,
+        timings["read"],
+        timings["read_wait"],
+        timings["decode"],
+        timings["copy"],
+    )
     return result_dict, json_info["metadata"]
 
 
+def _view_mapped_param(buffer_source, shape, dtype, encode_format):
+    """Return the numpy view of a parameter in a mapped shard,
+    or None when the parameter cannot be used in place."""
+    if encode_format != "raw" or dtype in ["bfloat16", "e4m3_float8", "e5m2_float8"]:
+        return None
+    if buffer_source.ctypes.data % _PARAM_ALIGNMENT != 0:
+        return None
+    try:
+        return buffer_source.view(dtype).reshape(shape)
+    except (TypeError, ValueError):
+        return None
+
+
 def export_runtime(runtime_dir):
     """Export TVMJS runtime to the runtime_dir
 
@@ -37,6 +37,7 @@ from . import (
 from .builder import Builder
 from .cost_model import CostModel
 from .database import Database
+from .distributed import tune_tasks_distributed
 from .extracted_task import ExtractedTask
 from .feature_extractor import FeatureExtractor
 from .measure_callback import MeasureCallback
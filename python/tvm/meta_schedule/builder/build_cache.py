@@ -0,0 +1,203 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A content-addressed on-disk cache of the artifacts exported by builders"""
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from tvm.ir import IRModule
+from tvm.target import Target
+
+from ..logging import get_logger
+from ..utils import shash2hex
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+def build_cache_key(
+    mod: IRModule,
+    target: Target,
+    extra: Optional[List[str]] = None,
+) -> str:
+    """Get the key of an IRModule in the build cache.
+
+    The key is the structural hash of the module after lowering, together with the target, so
+    that candidates lowered to the same module share the artifact. If the module cannot be
+    lowered, e.g. it is not a TIR module, the structural hash of the module itself is used.
+
+    Parameters
+    ----------
+    mod : IRModule
+        The IRModule to be built.
+    target : Target
+        The target to be built for.
+    extra : Optional[List[str]]
+        Other strings that affect the artifact, e.g. the names of the build functions.
+
+    Returns
+    -------
+    key : str
+        The key of the module in the build cache.
+    """
+    from tvm.driver import lower  # pylint: disable=import-outside-toplevel
+
+    try:
+        shash = shash2hex(lower(mod))
+    except Exception:  # pylint: disable=broad-except
+        shash = shash2hex(mod)
+    sha = hashlib.sha256()
+    for item in [shash, str(target), *(extra or [])]:
+        sha.update(item.encode("utf-8"))
+        sha.update(b"\0")
+    return sha.hexdigest()[:32]
+
+
+class BuildCache:
+    """A content-addressed on-disk cache of the artifacts exported by builders.
+
+    Each entry is a directory named after its key, containing the artifact. Entries are published
+    by renaming a complete directory, so that multiple processes can share the cache. The
+    modification time of an entry is refreshed on each hit, and the least recently used entries
+    are evicted when the total size of the cache exceeds `max_bytes`.
+
+    The artifacts are never handed out directly, since the caller may remove them after use.
+    Instead, each hit gets a hard link to the cached artifact in a new temporary directory,
+    or a copy if hard links are not supported.
+
+    Parameters
+    ----------
+    cache_dir : str
+        The directory of the cache.
+    max_bytes : int
+        The maximum total size of the cached artifacts in bytes.
+    """
+
+    cache_dir: str
+    max_bytes: int
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1 << 30) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, but got {max_bytes}")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Look up an artifact in the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key of the artifact.
+
+        Returns
+        -------
+        artifact_path : Optional[str]
+            The path to a private copy of the cached artifact, or None if it is not cached.
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            (name,) = os.listdir(entry_dir)
+            cached_path = os.path.join(entry_dir, name)
+            artifact_path = os.path.join(tempfile.mkdtemp(), name)
+            try:
+                os.link(cached_path, artifact_path)
+            except OSError:
+                shutil.copyfile(cached_path, artifact_path)
+            os.utime(entry_dir)
+        except (OSError, ValueError):
+            # Not cached, or evicted concurrently
+            return None
+        return artifact_path
+
+    def insert(self, key: str, artifact_path: str) -> None:
+        """Insert an artifact into the cache. Nothing is done if the key is already cached.
+
+        Parameters
+        ----------
+        key : str
+            The key of the artifact.
+        artifact_path : str
+            The path to the artifact, which is copied into the cache.
+        """
+        entry_dir = self._entry_dir(key)
+        if os.path.isdir(entry_dir):
+            return
+        tmp_dir = os.path.join(self.cache_dir, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+        try:
+            shutil.copyfile(artifact_path, os.path.join(tmp_dir, os.path.basename(artifact_path)))
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Inserted concurrently by another process
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        """The last use time, the size and the directory of each entry, in LRU order"""
+        entries: List[Tuple[float, int, str]] = []
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(".tmp-"):
+                continue
+            entry_dir = self._entry_dir(name)
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(entry_dir, f)) for f in os.listdir(entry_dir)
+                )
+                entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+            except OSError:
+                # Evicted concurrently
+                continue
+        entries.sort()
+        return entries
+
+    def evict(self) -> int:
+        """Evict the least recently used entries until the cache fits in `max_bytes`.
+
+        Returns
+        -------
+        num_evicted : int
+            The number of evicted entries.
+        """
+        entries = self._scan()
+        total_bytes = sum(size for _, size, _ in entries)
+        num_evicted = 0
+        for _, size, entry_dir in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_bytes -= size
+            num_evicted += 1
+        if num_evicted:
+            logger.info("BuildCache: Evicted %d entries from %s", num_evicted, self.cache_dir)
+        return num_evicted
+
+    def stats(self) -> Dict[str, int]:
+        """The number of entries and the total size of the cache.
+
+        Returns
+        -------
+        stats : Dict[str, int]
+            The number of entries as "num_entries", and the total size in bytes as "num_bytes".
+        """
+        entries = self._scan()
+        return {"num_entries": len(entries), "num_bytes": sum(size for _, size, _ in entries)}
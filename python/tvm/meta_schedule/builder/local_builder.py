@@ -15,9 +15,10 @@
 # specific language governing permissions and limitations
 # under the License.
 """Local builder that compile on the local host"""
+import hashlib
 import os
 import tempfile
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from tvm._ffi import register_func
 from tvm.ir import IRModule
@@ -27,6 +28,7 @@ from tvm.target import Target
 from ...contrib.popen_pool import MapResult, PopenPoolExecutor, StatusKind
 from ..logging import get_logger
 from ..utils import cpu_count, derived_object, get_global_func_with_default_on_worker
+from .build_cache import BuildCache, build_cache_key
 from .builder import BuilderInput, BuilderResult, PyBuilder
 
 logger = get_logger(__name__)  # pylint: disable=invalid-name
@@ -50,6 +52,12 @@ def _deserialize_params(params: Optional[bytearray]) -> Optional[Dict[str, NDArr
     return load_param_dict(params)
 
 
+def _func_name(func: Union[None, str, Callable]) -> str:
+    if func is None or isinstance(func, str):
+        return str(func)
+    return f"{func.__module__}.{func.__qualname__}"
+
+
 @derived_object
 class LocalBuilder(PyBuilder):
     """A builder that builds the given input on local host.
@@ -70,6 +78,13 @@ class LocalBuilder(PyBuilder):
     f_export : Union[None, str, T_EXPORT]
         Name of the export function to be used.
         Defaults to `meta_schedule.builder.default_export`.
+    cache : Optional[BuildCache]
+        The on-disk cache of the exported artifacts, keyed by the structural hash of the lowered
+        IRModule and the target. On a hit, the build is skipped.
+    cache_hits : int
+        The number of builds skipped by the cache so far.
+    cache_lookups : int
+        The number of builds looked up in the cache so far.
 
     Attributes
     ----------
@@ -106,6 +121,9 @@ class LocalBuilder(PyBuilder):
     initializer: Optional[Callable[[], None]]
     f_build: Union[None, str, T_BUILD]
     f_export: Union[None, str, T_EXPORT]
+    cache: Optional[BuildCache]
+    cache_hits: int
+    cache_lookups: int
 
     def __init__(
         self,
@@ -115,6 +133,8 @@ class LocalBuilder(PyBuilder):
         f_build: Union[None, str, T_BUILD] = None,
         f_export: Union[None, str, T_EXPORT] = None,
         initializer: Optional[Callable[[], None]] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 1 << 30,
     ) -> None:
         """Constructor.
 
@@ -133,6 +153,13 @@ class LocalBuilder(PyBuilder):
             Defaults to `meta_schedule.builder.default_export`.
         initializer : Optional[Callable[[], None]]
             The initializer to be used for the worker processes.
+        cache_dir : Optional[str]
+            The directory of the build cache, which can be shared by multiple builders.
+            None means no build cache. The build and export functions are assumed to produce
+            the same artifact for the same lowered IRModule and target.
+        cache_max_bytes : int
+            The maximum total size of the build cache in bytes. The least recently used
+            artifacts are evicted when exceeded.
         """
         super().__init__()
 
@@ -145,11 +172,15 @@ class LocalBuilder(PyBuilder):
         self.initializer = initializer
         self.f_build = f_build
         self.f_export = f_export
+        self.cache = None if cache_dir is None else BuildCache(cache_dir, cache_max_bytes)
+        self.cache_hits = 0
+        self.cache_lookups = 0
         self._sanity_check()
 
     def build(self, build_inputs: List[BuilderInput]) -> List[BuilderResult]:
         results: List[BuilderResult] = []
         map_result: MapResult
+        num_hits = 0
 
         # Here we restart the PopenPool everytime because of a known memory leak issue with the
         # PopenPool workers after a couple times of usage. We don't apply the same to runners to
@@ -170,12 +201,15 @@ class LocalBuilder(PyBuilder):
                     build_input.mod,
                     build_input.target,
                     _serialize_params(build_input.params),
+                    None if self.cache is None else self.cache.cache_dir,
                 )
                 for build_input in build_inputs
             ],
         ):
             if map_result.status == StatusKind.COMPLETE:
-                results.append(BuilderResult(map_result.value, None))
+                artifact_path, cache_hit = map_result.value
+                num_hits += int(cache_hit)
+                results.append(BuilderResult(artifact_path, None))
             elif map_result.status == StatusKind.TIMEOUT:
                 results.append(
                     BuilderResult(
@@ -193,8 +227,25 @@ class LocalBuilder(PyBuilder):
             else:
                 raise ValueError("Unreachable: unexpected result: {map_result}")
         del pool
+        if self.cache is not None:
+            self.cache.evict()
+            self.cache_hits += num_hits
+            self.cache_lookups += len(build_inputs)
+            logger.info(
+                "LocalBuilder: Build cache hits: %d/%d. Overall hit rate: %.2f%%",
+                num_hits,
+                len(build_inputs),
+                self.cache_hit_rate * 100,
+            )
         return results
 
+    @property
+    def cache_hit_rate(self) -> float:
+        """The fraction of the builds skipped by the build cache so far."""
+        if self.cache_lookups == 0:
+            return 0.0
+        return self.cache_hits / self.cache_lookups
+
     def _sanity_check(self) -> None:
         def _check(f_build, f_export) -> None:
             get_global_func_with_default_on_worker(name=f_build, default=None)
@@ -217,7 +268,8 @@ def _worker_func(
     mod: IRModule,
     target: Target,
     params: Optional[bytearray],
-) -> str:
+    cache_dir: Optional[str],
+) -> Tuple[str, bool]:
     # Step 0. Get the registered functions
     f_build: T_BUILD = get_global_func_with_default_on_worker(
         _f_build,
@@ -227,11 +279,30 @@ def _worker_func(
         _f_export,
         default_export,
     )
-    # Step 1. Build the IRModule
+    # Step 1. Look up the build cache
+    cache: Optional[BuildCache] = None
+    key = ""
+    if cache_dir is not None:
+        cache = BuildCache(cache_dir)
+        key = build_cache_key(
+            mod,
+            target,
+            extra=[
+                _func_name(_f_build),
+                _func_name(_f_export),
+                "" if params is None else hashlib.sha256(params).hexdigest(),
+            ],
+        )
+        artifact_path = cache.lookup(key)
+        if artifact_path is not None:
+            return artifact_path, True
+    # Step 2. Build the IRModule
     rt_mod: Module = f_build(mod, target, _deserialize_params(params))
-    # Step 2. Export the Module
+    # Step 3. Export the Module
     artifact_path: str = f_export(rt_mod)
-    return artifact_path
+    if cache is not None:
+        cache.insert(key, artifact_path)
+    return artifact_path, False
 
 
 @register_func("meta_schedule.builder.default_build")
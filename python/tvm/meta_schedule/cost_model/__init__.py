@@ -18,5 +18,6 @@
 The tvm.meta_schedule.cost_model package.
 """
 from .cost_model import CostModel, PyCostModel
+from .model_zoo import model_zoo_path
 from .random_model import RandomModel
 from .xgb_model import XGBModel
@@ -128,7 +128,7 @@ class CostModel(Object):
             return XGBModel(*args, **kwargs)  # type: ignore
 
         # params only relevant to XGBModel
-        _xgb_params = ["num_tuning_cores", "tree_method"]
+        _xgb_params = ["num_tuning_cores", "tree_method", "max_history_size"]
 
         for param in _xgb_params:
             if param in kwargs:
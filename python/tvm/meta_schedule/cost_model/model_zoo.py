@@ -0,0 +1,47 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""The model zoo of pretrained cost models, keyed by target"""
+import hashlib
+import os
+from typing import Union
+
+from tvm.target import Target
+
+
+def model_zoo_path(zoo_dir: str, target: Union[str, Target]) -> str:
+    """Get the path of the cost model for the given target in the model zoo.
+
+    Cost models trained on one target are not transferable to another, so each target has its
+    own model in the zoo, named after the kind of the target and the hash of its full string
+    representation, e.g. `llvm-0123456789abcdef.tar`.
+
+    Parameters
+    ----------
+    zoo_dir : str
+        The directory of the model zoo.
+    target : Union[str, Target]
+        The target of the cost model.
+
+    Returns
+    -------
+    path : str
+        The path of the cost model, which may not exist yet.
+    """
+    if not isinstance(target, Target):
+        target = Target(target)
+    key = hashlib.sha256(str(target).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(zoo_dir, f"{target.kind.name}-{key}.tar")
@@ -19,7 +19,7 @@ import os
 import tempfile
 from collections import OrderedDict
 from itertools import chain as itertools_chain
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from typing_extensions import Literal
 
@@ -28,7 +28,7 @@ import numpy as np  # type: ignore
 from ...contrib.tar import tar, untar
 from ...runtime import NDArray
 from ..cost_model import PyCostModel
-from ..feature_extractor import FeatureExtractor
+from ..feature_extractor import FeatureExtractor, PerStoreFeature
 from ..logging import get_logger
 from ..runner import RunnerResult
 from ..search_strategy import MeasureCandidate
@@ -72,34 +72,46 @@ class PackSum:
     ids : np.ndarray
         An int64 array of shape [n] containing nonnegative integers,
         indicating which the index of a sample that a block belongs to
+    num_samples : int
+        The number of samples
     """
 
     dmatrix: "xgb.DMatrix"  # type: ignore # pylint: disable=invalid-name
     ids: np.ndarray
+    num_samples: int
 
     def __init__(
         self,
-        xs: List[np.ndarray],  # pylint: disable=invalid-name
+        xs: Union[List[np.ndarray], np.ndarray],  # pylint: disable=invalid-name
         ys: Optional[np.ndarray],  # pylint: disable=invalid-name
+        offsets: Optional[np.ndarray] = None,
     ):
         """Create PackSum format given a batch of samples
 
         Parameters
         ----------
-        xs : List[np.ndarray]
-            A batch of input samples
+        xs : Union[List[np.ndarray], np.ndarray]
+            A batch of input samples. If `offsets` is given, it is a single array
+            containing the blocks of all the samples.
         ys : Optional[List[float]]
             A batch of labels. None means no labels available.
+        offsets : Optional[np.ndarray]
+            An int64 array of shape [num_samples + 1], where the blocks of the i-th sample
+            are `xs[offsets[i]:offsets[i + 1]]`. None means `xs` is a list of samples.
         """
         import xgboost as xgb  # type: ignore # pylint: disable=import-outside-toplevel
 
-        repeats = [x.shape[0] for x in xs]
-        xs = np.concatenate(xs, axis=0)
-        self.ids = np.concatenate([[i] * repeat for i, repeat in enumerate(repeats)], axis=0)
+        if offsets is None:
+            repeats = np.array([x.shape[0] for x in xs], dtype="int64")
+            xs = np.concatenate(xs, axis=0)
+        else:
+            repeats = np.diff(offsets)
+        self.num_samples = len(repeats)
+        self.ids = np.repeat(np.arange(self.num_samples, dtype="int64"), repeats)
         if ys is None:
             self.dmatrix = xgb.DMatrix(data=xs, label=None)
         else:
-            ys = np.concatenate([[y] * repeat for y, repeat in zip(ys, repeats)], axis=0)
+            ys = np.repeat(ys, repeats)
             self.dmatrix = xgb.DMatrix(data=xs, label=ys)
             self.dmatrix.set_weight(ys)
 
@@ -116,7 +128,7 @@ class PackSum:
         result : np.ndarray
             The predictions for each candidate.
         """
-        return np.bincount(self.ids, weights=pred)
+        return np.bincount(self.ids, weights=pred, minlength=self.num_samples)
 
     def obj_square_error(self, ys_pred: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Implement square error loss on pack-sum format as
@@ -309,6 +321,10 @@ class XGBModel(PyCostModel):
         The number to calculate average peak score.
     adaptive_training : bool
         Whether use adaptive training to reduce tuning time.
+    max_history_size : Optional[int]
+        The maximum number of samples kept for training. When exceeded, the oldest samples are
+        dropped, which bounds the training time and the size of the saved model.
+        None means unlimited.
     """
 
     # feature extractor
@@ -328,6 +344,7 @@ class XGBModel(PyCostModel):
     # adaptive training
     adaptive_training: bool
     last_train_size: int
+    max_history_size: Optional[int]
 
     def __init__(
         self,
@@ -345,6 +362,7 @@ class XGBModel(PyCostModel):
         adaptive_training: bool = True,
         num_tuning_cores: Optional[int] = None,
         tree_method: Optional[Literal["auto", "exact", "approx", "hist", "gpu_hist"]] = None,
+        max_history_size: Optional[int] = None,
     ):
         super().__init__()
         if not isinstance(extractor, FeatureExtractor):
@@ -376,6 +394,10 @@ class XGBModel(PyCostModel):
         # adaptive training
         self.adaptive_training = adaptive_training
         self.last_train_size = 0
+        # bounded history
+        if max_history_size is not None and max_history_size <= 0:
+            raise ValueError(f"max_history_size must be positive, but got {max_history_size}")
+        self.max_history_size = max_history_size
 
     def load(self, path: str) -> None:
         """Load the cost model from given file location.
@@ -413,10 +435,11 @@ class XGBModel(PyCostModel):
                 booster = xgb.Booster()
                 booster.load_model(model_path)
             else:
-                self.booster = None
+                booster = None
         self.data = data
         self.data_size = data_size
         self.booster = booster
+        self._trim_history()
 
     def save(self, path: str) -> None:
         """Save the cost model to given file location.
@@ -484,23 +507,24 @@ class XGBModel(PyCostModel):
         group = self.data.get(new_group_hash, None)
 
         # Step 2. Extract features
-        def _feature(x: NDArray) -> np.ndarray:
-            return x.numpy().astype("float32")
-
         def _mean_cost(x: RunnerResult) -> float:
             if not x.run_secs:
                 return 1e10
             return float(np.median([float(s) for s in x.run_secs]))
 
-        new_features = [_feature(x) for x in self.extractor.extract_from(context, candidates)]
-        new_mean_costs = [_mean_cost(x) for x in results]
+        features, offsets = self._extract(context, candidates)
+        new_mean_costs = np.array([_mean_cost(x) for x in results]).astype("float32")
 
-        # Filter instances with no features
-        new_mean_costs = [c for i, c in enumerate(new_mean_costs) if len(new_features[i]) != 0]
-        new_mean_costs_np = np.array(new_mean_costs).astype("float32")
-        new_features = [f for f in new_features if len(f) != 0]
-        if not new_features:
+        # Filter instances with no features. Their segments are empty, so the features
+        # of the rest are still contiguous in the buffer.
+        num_blocks = np.diff(offsets)
+        non_empty = num_blocks != 0
+        if not non_empty.any():
             return
+        new_mean_costs_np = new_mean_costs[non_empty]
+        new_offsets = np.concatenate([[0], np.cumsum(num_blocks[non_empty])])
+        # Views into the buffer, one per instance
+        new_features = np.split(features, new_offsets[1:-1])
 
         # Steps 3. Run validation
         if group is not None and self.booster is not None:
@@ -509,8 +533,9 @@ class XGBModel(PyCostModel):
                 "\t".join(
                     f"{key}: {score:.6f}"
                     for key, score in self._validate(
-                        xs=new_features,
+                        xs=features,
                         ys=group.min_cost / new_mean_costs_np,
+                        offsets=new_offsets,
                     )
                 ),
             )
@@ -526,6 +551,10 @@ class XGBModel(PyCostModel):
             group.append(new_features, new_mean_costs_np)
         self.data[new_group_hash] = group
         self.data_size += len(new_features)
+        if self.max_history_size is not None:
+            # The most recently updated group is the last one to be dropped
+            self.data.move_to_end(new_group_hash)
+            self._trim_history()
 
         if (
             self.adaptive_training
@@ -565,15 +594,8 @@ class XGBModel(PyCostModel):
             The predicted normalized score.
         """
         if self.data_size >= self.num_warmup_samples and self.booster is not None:
-            ret = self._predict(
-                xs=[
-                    x.numpy().astype("float32")
-                    for x in self.extractor.extract_from(
-                        context,
-                        candidates,
-                    )
-                ]
-            )
+            features, offsets = self._extract(context, candidates)
+            ret = self._predict(xs=features, offsets=offsets)
         else:
             ret = np.random.uniform(
                 low=0,
@@ -582,6 +604,60 @@ class XGBModel(PyCostModel):
             )
         return ret.astype("float64")
 
+    def _trim_history(self) -> None:
+        """Drop the oldest samples until there are at most `max_history_size` of them."""
+        if self.max_history_size is None:
+            return
+        num_dropped = 0
+        while self.data_size > self.max_history_size:
+            group_hash, group = next(iter(self.data.items()))
+            excess = self.data_size - self.max_history_size
+            if excess >= len(group.costs):
+                del self.data[group_hash]
+                excess = len(group.costs)
+            else:
+                self.data[group_hash] = FeatureGroup(
+                    group_hash=group_hash,
+                    features=group.features[excess:],
+                    costs=group.costs[excess:],
+                )
+            self.data_size -= excess
+            num_dropped += excess
+        # Keep counting the new samples since the last training for adaptive training
+        self.last_train_size = max(0, self.last_train_size - num_dropped)
+
+    def _extract(
+        self,
+        context: "TuneContext",
+        candidates: List[MeasureCandidate],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract the features of the candidates into one contiguous buffer.
+
+        Parameters
+        ----------
+        context : TuneContext
+            The tuning context.
+        candidates : List[MeasureCandidate]
+            The measure candidates.
+
+        Returns
+        -------
+        features : np.ndarray
+            A float32 array of shape [n, m] containing the features of all the candidates.
+        offsets : np.ndarray
+            An int64 array of shape [len(candidates) + 1], where the features of the i-th
+            candidate are `features[offsets[i]:offsets[i + 1]]`.
+        """
+        if isinstance(self.extractor, PerStoreFeature):
+            # The buffer is filled by the extractor and viewed by numpy without copying
+            features, offsets = self.extractor.extract_batched(context, candidates)
+            return _as_numpy(features), _as_numpy(offsets)
+        arrays = [
+            x.numpy().astype("float32") for x in self.extractor.extract_from(context, candidates)
+        ]
+        offsets = np.cumsum([0] + [x.shape[0] for x in arrays], dtype="int64")
+        return np.concatenate(arrays, axis=0), offsets
+
     def _train(  # type: ignore # pylint: disable=invalid-name
         self,
         xs: List[np.ndarray],
@@ -620,26 +696,30 @@ class XGBModel(PyCostModel):
 
     def _predict(  # type: ignore # pylint: disable=invalid-name
         self,
-        xs: List[np.ndarray],
+        xs: Union[List[np.ndarray], np.ndarray],
+        offsets: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        d_test = PackSum(xs=xs, ys=None)
+        d_test = PackSum(xs=xs, ys=None, offsets=offsets)
         pred = self.booster.predict(d_test.dmatrix)
         ret = d_test.predict_with_score(pred)
         return ret
 
     def _validate(  # type: ignore # pylint: disable=invalid-name
         self,
-        xs: List[np.ndarray],
+        xs: Union[List[np.ndarray], np.ndarray],
         ys: np.ndarray,
+        offsets: Optional[np.ndarray] = None,
     ) -> List[Tuple[str, float]]:
         """Evaluate the score of inputs.
 
         Parameters
         ----------
-        xs : List[np.ndarray]
-            A batch of input samples
+        xs : Union[List[np.ndarray], np.ndarray]
+            A batch of input samples, or the blocks of all the samples if `offsets` is given
         ys : List[float]
             A batch of labels
+        offsets : Optional[np.ndarray]
+            The offsets of the blocks of each sample in `xs`
 
         Returns
         -------
@@ -648,7 +728,7 @@ class XGBModel(PyCostModel):
         """
         assert self.booster is not None
 
-        d_valid = PackSum(xs=xs, ys=ys)
+        d_valid = PackSum(xs=xs, ys=ys, offsets=offsets)
 
         def average_peak_score(ys_pred: np.ndarray):
             return d_valid.average_peak_score(ys_pred, n=self.average_peak_n)
@@ -665,6 +745,13 @@ class XGBModel(PyCostModel):
         return eval_result
 
 
+def _as_numpy(array: NDArray) -> np.ndarray:
+    """View a CPU NDArray as a numpy array without copying, if supported by numpy."""
+    if hasattr(np, "from_dlpack"):
+        return np.from_dlpack(array)
+    return array.numpy()
+
+
 def _get_custom_call_back(
     early_stopping_rounds: int,
     verbose_eval: int,
@@ -18,9 +18,11 @@
 The tvm.meta_schedule.database package.
 The database that stores serialized tuning records and workloads
 """
+from .binary_database import BinaryDatabase
 from .database import Database, PyDatabase, TuningRecord, Workload, create
 from .json_database import JSONDatabase
 from .memory_database import MemoryDatabase
 from .ordered_union_database import OrderedUnionDatabase
 from .schedule_fn_database import ScheduleFnDatabase
+from .sqlite_database import SQLiteDatabase
 from .union_database import UnionDatabase
@@ -0,0 +1,416 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A database that stores tuning records in an indexed, append-only binary format"""
+import json
+import logging
+import os
+import os.path as osp
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+from tvm.ir import IRModule
+
+from ..utils import derived_object, module_equality_equal, module_equality_hash
+from .database import Database, PyDatabase, TuningRecord, Workload
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# The magic numbers at the beginning of each file, which also encode the format version.
+_WORKLOAD_MAGIC = b"TVMMSWL1"
+_RECORD_MAGIC = b"TVMMSTR1"
+_INDEX_MAGIC = b"TVMMSIX1"
+# Workload entry header: structural hash, payload size
+_WORKLOAD_HEADER = struct.Struct("<QI")
+# Tuning record entry header: workload index, mean run seconds, payload size
+_RECORD_HEADER = struct.Struct("<IdI")
+# Index entry: workload index, mean run seconds, payload offset, payload size
+_INDEX_ENTRY = struct.Struct("<IdQI")
+_INDEX_DTYPE = np.dtype(
+    [("workload", "<u4"), ("mean_run_secs", "<f8"), ("offset", "<u8"), ("size", "<u4")]
+)
+assert _INDEX_DTYPE.itemsize == _INDEX_ENTRY.size
+
+
+def _encode_payload(json_obj: Any) -> bytes:
+    return zlib.compress(json.dumps(json_obj, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode_payload(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _open_table(path: str, magic: bytes, allow_missing: bool) -> int:
+    """Check the magic number of a table file, creating the file if missing.
+    Returns the size of the file."""
+    if not osp.exists(path):
+        if not allow_missing:
+            raise ValueError(f"File doesn't exist: {path}")
+        with open(path, "wb") as f:
+            f.write(magic)
+        return len(magic)
+    with open(path, "rb") as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError(f"Not a binary database file, or its version is unsupported: {path}")
+    return osp.getsize(path)
+
+
+def _scan_entries(
+    path: str,
+    header: struct.Struct,
+    begin: int,
+    end: int,
+) -> List[Tuple[Any, ...]]:
+    """Scan the entry headers in a table file without decoding their payloads.
+
+    Returns the header fields with the payload offset appended. A truncated trailing entry,
+    e.g. left by an interrupted write, is removed from the file.
+    """
+    entries = []
+    with open(path, "rb") as f:
+        f.seek(begin)
+        offset = begin
+        while offset + header.size <= end:
+            fields = header.unpack(f.read(header.size))
+            payload_offset = offset + header.size
+            if payload_offset + fields[-1] > end:
+                break
+            entries.append((*fields, payload_offset))
+            offset = payload_offset + fields[-1]
+            f.seek(offset)
+    if offset < end:
+        logger.warning("Removing a truncated entry at the end of: %s", path)
+        os.truncate(path, offset)
+    return entries
+
+
+def _mean_run_secs(record: TuningRecord) -> float:
+    """The sorting key of a tuning record, infinity if the record is invalid."""
+    if not record.is_valid():
+        return float("inf")
+    run_secs = [float(x) for x in record.run_secs]
+    return sum(run_secs) / len(run_secs)
+
+
+@derived_object
+class BinaryDatabase(PyDatabase):
+    """Database class backed by an indexed, append-only binary format.
+
+    Unlike JSONDatabase, opening the database only reads the fixed-size entry headers.
+    Workloads and tuning records are decoded lazily, and only when they are queried.
+    The database consists of three files:
+      - The workload table, where each entry stores the workload hash and its JSON serialization;
+      - The tuning record table, where each entry stores the workload index, the mean run time
+        and the JSON serialization of the tuning record;
+      - The index, which stores the workload index, the mean run time and the location of each
+        entry in the tuning record table. It is rebuilt from the tuning record table if it is
+        missing or lags behind.
+    All payloads are zlib-compressed JSON objects.
+
+    Parameters
+    ----------
+    path_workload : str
+        The path to the workload table.
+    path_tuning_record : str
+        The path to the tuning record table.
+    path_index : str
+        The path to the index of the tuning record table.
+    module_equality : str
+        A string to specify the module equality testing and hashing method.
+        See JSONDatabase for the available choices.
+    """
+
+    path_workload: str
+    path_tuning_record: str
+    path_index: str
+    module_equality: str
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path_workload: Optional[str] = None,
+        path_tuning_record: Optional[str] = None,
+        path_index: Optional[str] = None,
+        *,
+        work_dir: Optional[str] = None,
+        allow_missing: bool = True,
+        module_equality: str = "structural",
+    ) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        path_workload : Optional[str] = None
+            The path to the workload table. If not specified,
+            will be generated from `work_dir` as `$work_dir/database_workload.bin`.
+        path_tuning_record : Optional[str] = None
+            The path to the tuning record table. If not specified,
+            will be generated from `work_dir` as `$work_dir/database_tuning_record.bin`.
+        path_index : Optional[str] = None
+            The path to the index of the tuning record table. If not specified,
+            will be generated from `path_tuning_record` by appending the suffix `.idx`.
+        work_dir : Optional[str] = None
+            The work directory, if specified, will be used to generate `path_tuning_record`
+            and `path_workload`.
+        allow_missing : bool
+            Whether to create new file when the given path is not found.
+        module_equality : str
+            A string to specify the module equality testing and hashing method.
+        """
+        super().__init__()
+        if work_dir is not None:
+            if path_workload is None:
+                path_workload = osp.join(work_dir, "database_workload.bin")
+            if path_tuning_record is None:
+                path_tuning_record = osp.join(work_dir, "database_tuning_record.bin")
+        if path_workload is None:
+            raise ValueError("`path_workload` is not specified.")
+        if path_tuning_record is None:
+            raise ValueError("`path_tuning_record` is not specified.")
+        if path_index is None:
+            path_index = path_tuning_record + ".idx"
+        self.path_workload = path_workload
+        self.path_tuning_record = path_tuning_record
+        self.path_index = path_index
+        self.module_equality = module_equality
+        # Workload table: (hash, payload offset, payload size) of each entry,
+        # and the decoded workloads, which are populated lazily
+        self._workload_entries: List[Tuple[int, int, int]] = []
+        self._workloads: List[Optional[Workload]] = []
+        self._hash2indices: Dict[int, List[int]] = {}
+        self._workload2idx: Dict[Workload, int] = {}
+        # Tuning record index: the entries loaded from disk, and those committed since then
+        self._index: np.ndarray = np.empty((0,), dtype=_INDEX_DTYPE)
+        self._pending: List[Tuple[int, float, int, int]] = []
+        self._load_workload_table(allow_missing)
+        self._load_index(allow_missing)
+
+    def _load_workload_table(self, allow_missing: bool) -> None:
+        size = _open_table(self.path_workload, _WORKLOAD_MAGIC, allow_missing)
+        entries = _scan_entries(self.path_workload, _WORKLOAD_HEADER, len(_WORKLOAD_MAGIC), size)
+        for shash, payload_size, payload_offset in entries:
+            self._append_workload_entry(shash, payload_offset, payload_size)
+
+    def _load_index(self, allow_missing: bool) -> None:
+        record_size = _open_table(self.path_tuning_record, _RECORD_MAGIC, allow_missing)
+        if osp.exists(self.path_index):
+            index_size = _open_table(self.path_index, _INDEX_MAGIC, allow_missing=False)
+            num_entries = (index_size - len(_INDEX_MAGIC)) // _INDEX_ENTRY.size
+            indexed_size = len(_INDEX_MAGIC) + num_entries * _INDEX_ENTRY.size
+            if indexed_size < index_size:
+                # Remove the partial entry, so that the entries appended later stay aligned
+                logger.warning("Removing a truncated entry at the end of: %s", self.path_index)
+                os.truncate(self.path_index, indexed_size)
+            self._index = np.fromfile(
+                self.path_index,
+                dtype=_INDEX_DTYPE,
+                count=num_entries,
+                offset=len(_INDEX_MAGIC),
+            )
+        else:
+            with open(self.path_index, "wb") as f:
+                f.write(_INDEX_MAGIC)
+        # Entries of the tuning record table beyond the end of the index are re-indexed,
+        # which happens if the index is missing or a previous writer was interrupted.
+        if len(self._index) > 0:
+            last = self._index[-1]
+            indexed_end = int(last["offset"]) + int(last["size"])
+        else:
+            indexed_end = len(_RECORD_MAGIC)
+        if indexed_end > record_size:
+            raise ValueError(
+                f"The index {self.path_index} is inconsistent with the tuning record table "
+                f"{self.path_tuning_record}. Please remove the index to rebuild it."
+            )
+        if indexed_end < record_size:
+            entries = _scan_entries(
+                self.path_tuning_record, _RECORD_HEADER, indexed_end, record_size
+            )
+            logger.info(
+                "Re-indexing %d tuning record(s) in: %s", len(entries), self.path_tuning_record
+            )
+            with open(self.path_index, "ab") as f:
+                for workload_idx, mean_run_secs, payload_size, payload_offset in entries:
+                    entry = (workload_idx, mean_run_secs, payload_offset, payload_size)
+                    f.write(_INDEX_ENTRY.pack(*entry))
+                    self._pending.append(entry)
+
+    def _append_workload_entry(self, shash: int, offset: int, size: int) -> int:
+        idx = len(self._workload_entries)
+        self._workload_entries.append((shash, offset, size))
+        self._workloads.append(None)
+        self._hash2indices.setdefault(shash, []).append(idx)
+        return idx
+
+    def _get_workload(self, idx: int) -> Workload:
+        workload = self._workloads[idx]
+        if workload is None:
+            _, offset, size = self._workload_entries[idx]
+            with open(self.path_workload, "rb") as f:
+                f.seek(offset)
+                workload = Workload.from_json(_decode_payload(f.read(size)))
+            self._workloads[idx] = workload
+            self._workload2idx[workload] = idx
+        return workload
+
+    def _find_workload(self, mod: IRModule) -> Tuple[int, Optional[int]]:
+        """Find the index of the workload equal to the given module.
+        Returns the hash of the module as well, which is reused when committing."""
+        shash = int(module_equality_hash(mod, self.module_equality), 16)
+        for idx in self._hash2indices.get(shash, []):
+            if module_equality_equal(self._get_workload(idx).mod, mod, self.module_equality):
+                return shash, idx
+        return shash, None
+
+    def _workload_index(self, workload: Workload) -> Optional[int]:
+        idx = self._workload2idx.get(workload, None)
+        if idx is None:
+            _, idx = self._find_workload(workload.mod)
+        return idx
+
+    def _entries(self) -> np.ndarray:
+        if self._pending:
+            self._index = np.concatenate([self._index, np.array(self._pending, dtype=_INDEX_DTYPE)])
+            self._pending = []
+        return self._index
+
+    def _read_records(self, entries: np.ndarray) -> List[TuningRecord]:
+        results = []
+        with open(self.path_tuning_record, "rb") as f:
+            for entry in entries:
+                f.seek(int(entry["offset"]))
+                json_obj = _decode_payload(f.read(int(entry["size"])))
+                workload = self._get_workload(int(entry["workload"]))
+                results.append(TuningRecord.from_json(json_obj, workload))
+        return results
+
+    def has_workload(self, mod: IRModule) -> bool:
+        _, idx = self._find_workload(mod)
+        return idx is not None
+
+    def commit_workload(self, mod: IRModule) -> Workload:
+        shash, idx = self._find_workload(mod)
+        if idx is not None:
+            return self._get_workload(idx)
+        workload = Workload(mod)
+        payload = _encode_payload(workload.as_json())
+        with open(self.path_workload, "ab") as f:
+            f.write(_WORKLOAD_HEADER.pack(shash, len(payload)))
+            offset = f.tell()
+            f.write(payload)
+        idx = self._append_workload_entry(shash, offset, len(payload))
+        self._workloads[idx] = workload
+        self._workload2idx[workload] = idx
+        return workload
+
+    def commit_tuning_record(self, record: TuningRecord) -> None:
+        workload_idx = self._workload_index(record.workload)
+        if workload_idx is None:
+            raise ValueError("The workload of the tuning record is not committed to the database")
+        mean_run_secs = _mean_run_secs(record)
+        payload = _encode_payload(record.as_json())
+        with open(self.path_tuning_record, "ab") as f:
+            f.write(_RECORD_HEADER.pack(workload_idx, mean_run_secs, len(payload)))
+            offset = f.tell()
+            f.write(payload)
+        entry = (workload_idx, mean_run_secs, offset, len(payload))
+        # The index is written after the record, so that an interrupted write can be recovered
+        # by re-indexing the tail of the tuning record table.
+        with open(self.path_index, "ab") as f:
+            f.write(_INDEX_ENTRY.pack(*entry))
+        self._pending.append(entry)
+
+    def get_top_k(self, workload: Workload, top_k: int) -> List[TuningRecord]:
+        if top_k < 0:
+            raise ValueError("top_k must be non-negative")
+        if top_k == 0:
+            return []
+        workload_idx = self._workload_index(workload)
+        if workload_idx is None:
+            return []
+        entries = self._entries()
+        entries = entries[
+            (entries["workload"] == workload_idx) & np.isfinite(entries["mean_run_secs"])
+        ]
+        # Stable sorting keeps the records with equal run time in the order of commit,
+        # which is consistent with JSONDatabase
+        order = np.argsort(entries["mean_run_secs"], kind="stable")[:top_k]
+        return self._read_records(entries[order])
+
+    def get_all_tuning_records(self) -> List[TuningRecord]:
+        return self._read_records(self._entries())
+
+    def __len__(self) -> int:
+        return len(self._index) + len(self._pending)
+
+    @staticmethod
+    def import_from(
+        source: Database,
+        path_workload: Optional[str] = None,
+        path_tuning_record: Optional[str] = None,
+        path_index: Optional[str] = None,
+        *,
+        work_dir: Optional[str] = None,
+        module_equality: str = "structural",
+    ) -> "BinaryDatabase":
+        """Import all workloads and tuning records of another database, e.g. a JSONDatabase,
+        into a binary database.
+
+        Parameters
+        ----------
+        source : Database
+            The database to import from.
+        path_workload : Optional[str] = None
+            The path to the workload table of the binary database.
+        path_tuning_record : Optional[str] = None
+            The path to the tuning record table of the binary database.
+        path_index : Optional[str] = None
+            The path to the index of the tuning record table of the binary database.
+        work_dir : Optional[str] = None
+            The work directory of the binary database.
+        module_equality : str
+            A string to specify the module equality testing and hashing method.
+
+        Returns
+        -------
+        database : BinaryDatabase
+            The binary database with all the records imported.
+        """
+        database = BinaryDatabase(
+            path_workload,
+            path_tuning_record,
+            path_index,
+            work_dir=work_dir,
+            module_equality=module_equality,
+        )
+        workloads: Dict[Workload, Workload] = {}
+        for record in source.get_all_tuning_records():
+            workload = workloads.get(record.workload, None)
+            if workload is None:
+                workload = database.commit_workload(record.workload.mod)
+                workloads[record.workload] = workload
+            database.commit_tuning_record(
+                TuningRecord(
+                    trace=record.trace,
+                    workload=workload,
+                    run_secs=record.run_secs,
+                    target=record.target,
+                    args_info=record.args_info,
+                )
+            )
+        return database
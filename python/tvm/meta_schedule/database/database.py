@@ -131,6 +131,16 @@ class TuningRecord(Object):
         """
         return _ffi_api.TuningRecordAsMeasureCandidate(self)  # type: ignore # pylint: disable=no-member
 
+    def is_valid(self) -> bool:
+        """Check if the tuning record has valid trace instructions and successful run results.
+
+        Returns
+        -------
+        result : bool
+            The check result.
+        """
+        return bool(_ffi_api.TuningRecordIsValid(self))  # type: ignore # pylint: disable=no-member
+
     def as_json(self) -> Any:
         """Export the tuning record to a JSON string.
 
@@ -164,7 +174,7 @@ class TuningRecord(Object):
 class Database(Object):
     """The abstract database interface."""
 
-    DatabaseType = Union["Database", Literal["json", "memory"]]
+    DatabaseType = Union["Database", Literal["json", "memory", "binary", "sqlite"]]
 
     def has_workload(self, mod: IRModule) -> bool:
         """Check if the database has the given workload.
@@ -383,6 +393,8 @@ class Database(Object):
                 "memory",
                 "union",
                 "ordered_union",
+                "binary",
+                "sqlite",
             ],
             Callable[[Schedule], bool],
         ] = "json",
@@ -393,10 +405,11 @@ class Database(Object):
 
         Parameters
         ----------
-        kind : str = "json" | "memory" | "union" | "ordered_union" | Callable[[tvm.tir.Schedule],
-        bool]
+        kind : str = "json" | "memory" | "union" | "ordered_union" | "binary" | "sqlite" |
+        Callable[[tvm.tir.Schedule], bool]
             The kind of the database to be created. The following kinds are supported:
-            "json", "memory", "union", "ordered_union", and a custom schedule function.
+            "json", "memory", "union", "ordered_union", "binary", "sqlite", and a custom schedule
+            function.
 
         Returns
         -------
@@ -404,10 +417,12 @@ class Database(Object):
             The created database.
         """
         from . import (  # pylint: disable=import-outside-toplevel
+            BinaryDatabase,
             JSONDatabase,
             MemoryDatabase,
             OrderedUnionDatabase,
             ScheduleFnDatabase,
+            SQLiteDatabase,
             UnionDatabase,
         )
 
@@ -421,6 +436,10 @@ class Database(Object):
             return UnionDatabase(*args, **kwargs)  # type: ignore
         if kind == "ordered_union":
             return OrderedUnionDatabase(*args, **kwargs)  # type: ignore
+        if kind == "binary":
+            return BinaryDatabase(*args, **kwargs)  # type: ignore
+        if kind == "sqlite":
+            return SQLiteDatabase(*args, **kwargs)  # type: ignore
         raise ValueError(f"Unknown Database: {kind}")
 
 
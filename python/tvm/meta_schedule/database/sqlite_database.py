@@ -0,0 +1,246 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A database backed by SQLite, which supports concurrent writers from multiple processes"""
+import json
+import os.path as osp
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from tvm.ir import IRModule
+
+from ..utils import derived_object, module_equality_equal, module_equality_hash
+from .database import PyDatabase, TuningRecord, Workload
+
+# kMaxMeanTime on the C++ side, the stub mean run time of records without valid measurements
+_MAX_MEAN_TIME = 1e10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workloads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    shash TEXT NOT NULL,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workloads_shash ON workloads (shash);
+CREATE TABLE IF NOT EXISTS tuning_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workload_id INTEGER NOT NULL REFERENCES workloads (id),
+    is_valid INTEGER NOT NULL,
+    mean_run_secs REAL NOT NULL,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tuning_records_top_k
+    ON tuning_records (workload_id, is_valid, mean_run_secs, id);
+"""
+
+
+def _mean_run_secs(record: TuningRecord) -> float:
+    if not record.run_secs:
+        return _MAX_MEAN_TIME
+    run_secs = [float(x) for x in record.run_secs]
+    return sum(run_secs) / len(run_secs)
+
+
+@derived_object
+class SQLiteDatabase(PyDatabase):
+    """Database class backed by SQLite.
+
+    The database file is opened in WAL mode, so that multiple tuning processes can commit to the
+    same database concurrently while others read from it. Workloads are indexed by their hash,
+    and tuning records by their workload and mean run time, so that the top-k queries are done
+    in SQL and only the returned records are decoded.
+
+    Parameters
+    ----------
+    path : str
+        The path to the SQLite database file.
+    module_equality : str
+        A string to specify the module equality testing and hashing method.
+        See JSONDatabase for the available choices.
+    """
+
+    path: str
+    module_equality: str
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        work_dir: Optional[str] = None,
+        allow_missing: bool = True,
+        timeout_sec: float = 600.0,
+        module_equality: str = "structural",
+    ) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        path : Optional[str] = None
+            The path to the SQLite database file. If not specified,
+            will be generated from `work_dir` as `$work_dir/database.sqlite`.
+        work_dir : Optional[str] = None
+            The work directory, if specified, will be used to generate `path`.
+        allow_missing : bool
+            Whether to create new file when the given path is not found.
+        timeout_sec : float
+            How long to wait for the lock held by another writer before raising an error.
+        module_equality : str
+            A string to specify the module equality testing and hashing method.
+        """
+        super().__init__()
+        if path is None and work_dir is not None:
+            path = osp.join(work_dir, "database.sqlite")
+        if path is None:
+            raise ValueError("`path` is not specified.")
+        if not allow_missing and not osp.exists(path):
+            raise ValueError(f"File doesn't exist: {path}")
+        self.path = path
+        self.module_equality = module_equality
+        # The connection is in autocommit mode, and transactions are opened explicitly.
+        # It may be used by the threads of the task scheduler, which is guarded by the lock.
+        self._conn = sqlite3.connect(
+            path,
+            timeout=timeout_sec,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        # The workloads decoded so far, which are shared by their tuning records
+        self._id2workload: Dict[int, Workload] = {}
+        self._workload2id: Dict[Workload, int] = {}
+
+    def _get_workload(self, workload_id: int, json_str: Optional[str] = None) -> Workload:
+        workload = self._id2workload.get(workload_id, None)
+        if workload is None:
+            if json_str is None:
+                (json_str,) = self._conn.execute(
+                    "SELECT json FROM workloads WHERE id = ?", (workload_id,)
+                ).fetchone()
+            workload = Workload.from_json(json.loads(json_str))
+            self._id2workload[workload_id] = workload
+            self._workload2id[workload] = workload_id
+        return workload
+
+    def _find_workload(self, mod: IRModule) -> Tuple[str, Optional[int]]:
+        """Find the id of the workload equal to the given module.
+        Returns the hash of the module as well, which is reused when committing."""
+        shash = module_equality_hash(mod, self.module_equality)
+        rows = self._conn.execute(
+            "SELECT id, json FROM workloads WHERE shash = ? ORDER BY id", (shash,)
+        ).fetchall()
+        for workload_id, json_str in rows:
+            workload = self._get_workload(workload_id, json_str)
+            if module_equality_equal(workload.mod, mod, self.module_equality):
+                return shash, workload_id
+        return shash, None
+
+    def _workload_id(self, workload: Workload) -> Optional[int]:
+        workload_id = self._workload2id.get(workload, None)
+        if workload_id is None:
+            _, workload_id = self._find_workload(workload.mod)
+        return workload_id
+
+    def _decode_records(self, rows: List[Tuple[int, str]]) -> List[TuningRecord]:
+        return [
+            TuningRecord.from_json(json.loads(json_str), self._get_workload(workload_id))
+            for workload_id, json_str in rows
+        ]
+
+    def has_workload(self, mod: IRModule) -> bool:
+        with self._lock:
+            _, workload_id = self._find_workload(mod)
+        return workload_id is not None
+
+    def commit_workload(self, mod: IRModule) -> Workload:
+        with self._lock:
+            _, workload_id = self._find_workload(mod)
+            if workload_id is not None:
+                return self._get_workload(workload_id)
+            # Take the write lock before checking again, so that concurrent writers
+            # never insert the same workload twice
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                shash, workload_id = self._find_workload(mod)
+                if workload_id is None:
+                    workload = Workload(mod)
+                    json_str = json.dumps(workload.as_json(), separators=(",", ":"))
+                    workload_id = self._conn.execute(
+                        "INSERT INTO workloads (shash, json) VALUES (?, ?)", (shash, json_str)
+                    ).lastrowid
+                    self._id2workload[workload_id] = workload
+                    self._workload2id[workload] = workload_id
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._get_workload(workload_id)
+
+    def commit_tuning_record(self, record: TuningRecord) -> None:
+        with self._lock:
+            workload_id = self._workload_id(record.workload)
+            if workload_id is None:
+                raise ValueError(
+                    "The workload of the tuning record is not committed to the database"
+                )
+            self._conn.execute(
+                "INSERT INTO tuning_records (workload_id, is_valid, mean_run_secs, json) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    workload_id,
+                    int(record.is_valid()),
+                    _mean_run_secs(record),
+                    json.dumps(record.as_json(), separators=(",", ":")),
+                ),
+            )
+
+    def get_top_k(self, workload: Workload, top_k: int) -> List[TuningRecord]:
+        if top_k < 0:
+            raise ValueError("top_k must be non-negative")
+        if top_k == 0:
+            return []
+        with self._lock:
+            workload_id = self._workload_id(workload)
+            if workload_id is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT workload_id, json FROM tuning_records "
+                "WHERE workload_id = ? AND is_valid = 1 "
+                "ORDER BY mean_run_secs, id LIMIT ?",
+                (workload_id, top_k),
+            ).fetchall()
+            return self._decode_records(rows)
+
+    def get_all_tuning_records(self) -> List[TuningRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT workload_id, json FROM tuning_records ORDER BY mean_run_secs, id"
+            ).fetchall()
+            return self._decode_records(rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM tuning_records").fetchone()
+        return size
+
+    def close(self) -> None:
+        """Close the connection to the database file."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,334 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Distributed tuning that shards the tasks over multiple tuning workers"""
+import concurrent.futures
+import shutil
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# isort: off
+from typing_extensions import Literal
+
+# isort: on
+
+from tvm.contrib.popen_pool import PopenPoolExecutor
+from tvm.ir import IRModule
+from tvm.target import Target
+from tvm.tir.analysis import estimate_tir_flops
+
+from .builder import LocalBuilder
+from .database import Database, SQLiteDatabase, TuningRecord, Workload
+from .extracted_task import ExtractedTask
+from .logging import get_logger, get_loggers_from_work_dir
+from .measure_callback import MeasureCallback, PyMeasureCallback
+from .runner import EvaluatorConfig, RPCConfig, RPCRunner
+from .search_strategy import SearchStrategy
+from .space_generator import SpaceGenerator
+from .tune import tune_tasks
+from .tune_context import TuneContext
+from .utils import cpu_count, derived_object, fork_seed
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+@derived_object
+class _CountTrials(PyMeasureCallback):
+    """Count the number of measured candidates"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.num_trials = 0
+
+    def apply(self, task_scheduler, task_id, measure_candidates, builder_results, runner_results):
+        self.num_trials += len(runner_results)
+
+
+class _TaskSpec(NamedTuple):
+    """The part of an extracted task sent to a tuning worker"""
+
+    task_name: str
+    mod: IRModule
+    target: Target
+    share: float
+
+
+def _tune_task(  # pylint: disable=too-many-arguments
+    spec: _TaskSpec,
+    num_trials: int,
+    num_trials_per_iter: int,
+    seed: int,
+    work_dir: str,
+    shared_database: str,
+    rpc_config: RPCConfig,
+    evaluator_config: Optional[EvaluatorConfig],
+    num_threads: int,
+    space: str,
+    strategy: str,
+    cost_model: str,
+    cost_model_zoo: Optional[str],
+    module_equality: str,
+) -> int:
+    """Tune a single task in a tuning worker, and return the number of trials measured"""
+    (task_logger,) = get_loggers_from_work_dir(work_dir, [spec.task_name])
+    task = TuneContext(
+        mod=spec.mod,
+        target=spec.target,
+        space_generator=space,
+        search_strategy=strategy,
+        task_name=spec.task_name,
+        logger=task_logger,
+        rand_state=seed,
+        num_threads=num_threads,
+    ).clone()
+    counter = _CountTrials()
+    database = SQLiteDatabase(shared_database, module_equality=module_equality)
+    try:
+        tune_tasks(
+            tasks=[task],
+            task_weights=[1.0],
+            work_dir=work_dir,
+            max_trials_global=num_trials,
+            max_trials_per_task=num_trials,
+            num_trials_per_iter=num_trials_per_iter,
+            builder=LocalBuilder(max_workers=num_threads),
+            runner=RPCRunner(rpc_config, evaluator_config, max_workers=1),
+            database=database,
+            cost_model=cost_model,
+            measure_callbacks=list(MeasureCallback.create("default")) + [counter],
+            task_scheduler="round-robin",
+            module_equality=module_equality,
+            cost_model_zoo=cost_model_zoo,
+        )
+    finally:
+        database.close()
+    return counter.num_trials
+
+
+def _estimated_cost(task: ExtractedTask) -> float:
+    """The estimated share of the task in the end-to-end latency, up to a constant factor"""
+    try:
+        flop = float(estimate_tir_flops(task.dispatched[0]))
+    except Exception:  # pylint: disable=broad-except
+        flop = 1.0
+    return max(flop, 1.0) * float(task.weight)
+
+
+def _merge_into(source: Database, target: Database) -> int:
+    """Commit all tuning records of the source database to the target database"""
+    workloads: Dict[Workload, Workload] = {}
+    records = source.get_all_tuning_records()
+    for record in records:
+        workload = workloads.get(record.workload, None)
+        if workload is None:
+            workload = workloads[record.workload] = target.commit_workload(record.workload.mod)
+        target.commit_tuning_record(
+            TuningRecord(
+                trace=record.trace,
+                workload=workload,
+                run_secs=record.run_secs,
+                target=record.target,
+                args_info=record.args_info,
+            )
+        )
+    return len(records)
+
+
+def tune_tasks_distributed(
+    *,
+    tasks: List[ExtractedTask],
+    work_dir: str,
+    max_trials_global: int,
+    max_trials_per_task: Optional[int] = None,
+    num_trials_per_iter: int = 64,
+    rpc_config: Optional[RPCConfig] = None,
+    evaluator_config: Optional[EvaluatorConfig] = None,
+    num_workers: Optional[int] = None,
+    database: Database.DatabaseType = "json",
+    space: SpaceGenerator.SpaceGeneratorType = "post-order-apply",
+    strategy: SearchStrategy.SearchStrategyType = "evolutionary",
+    cost_model: Literal["xgb", "mlp", "random"] = "xgb",
+    cost_model_zoo: Optional[str] = None,
+    num_threads: Union[Literal["physical", "logical"], int] = "physical",
+    module_equality: str = "structural",
+    seed: Optional[int] = None,
+) -> Database:
+    """Tune the extracted tasks with multiple tuning workers, each of which tunes one task at a time
+    and measures the candidates on the devices registered in the RPC tracker.
+
+    The tasks are queued in the descending order of their estimated cost, i.e. FLOPs times weight,
+    and a worker picks up the next task as soon as it finishes one. The trials of each task are
+    allocated when it starts, in proportion to its estimated cost among the tasks not started yet,
+    so that the trials left over by tasks that finished early, e.g. with an exhausted search
+    space, go to the remaining tasks. The workers commit to a shared SQLite database, which is
+    merged into the returned database in the end.
+
+    Parameters
+    ----------
+    tasks : List[ExtractedTask]
+        The tasks to tune.
+    work_dir : str
+        The working directory.
+    max_trials_global : int
+        The maximum number of trials to run globally.
+    max_trials_per_task : Optional[int]
+        The maximum number of trials to run per task.
+    num_trials_per_iter : int
+        The number of trials to run per iteration.
+    rpc_config : Optional[RPCConfig]
+        The configuration of the RPC tracker to measure the candidates.
+    evaluator_config : Optional[EvaluatorConfig]
+        The evaluator configuration.
+    num_workers : Optional[int]
+        The number of tuning workers. Defaults to the number of servers in the tracker.
+    database : Database.DatabaseType
+        The database to merge the tuning records into.
+    space : SpaceGenerator.SpaceGeneratorType
+        The space generator, which must be a string to be sent to the workers.
+    strategy : SearchStrategy.SearchStrategyType
+        The search strategy, which must be a string to be sent to the workers.
+    cost_model : Literal["xgb", "mlp", "random"]
+        The cost model of each worker.
+    cost_model_zoo : Optional[str]
+        The directory of the pretrained cost models shared by the workers. See `tune_tasks`.
+    num_threads : Union[Literal["physical", "logical"], int]
+        The number of threads on this host, which are split among the workers.
+    module_equality : str
+        A string to specify the module equality testing and hashing method.
+    seed : Optional[int]
+        The random seed.
+
+    Returns
+    -------
+    database : Database
+        The database with all tuning records
+    """
+    if len(tasks) == 0:
+        raise ValueError("No tasks to tune.")
+    for name, value in [("space", space), ("strategy", strategy), ("cost_model", cost_model)]:
+        if not isinstance(value, str):
+            raise TypeError(f"`{name}` must be a string to be sent to the workers, got {value}")
+    if max_trials_per_task is None:
+        max_trials_per_task = max_trials_global
+    rpc_config = RPCConfig._normalized(rpc_config)  # pylint: disable=protected-access
+    if num_workers is None:
+        num_workers = rpc_config.count_num_servers(allow_missing=False)
+    if num_workers <= 0:
+        raise ValueError(f"`num_workers` must be positive, but got {num_workers}")
+    if isinstance(num_threads, str):
+        num_threads = cpu_count(logical=num_threads == "logical")
+    num_threads = max(1, num_threads // num_workers)
+    if database in ("json", "binary", "sqlite"):
+        database = Database.create(database, work_dir=work_dir, module_equality=module_equality)
+    elif not isinstance(database, Database):
+        database = Database.create(database, module_equality=module_equality)
+
+    specs = [
+        _TaskSpec(task.task_name, task.dispatched[0], task.target, _estimated_cost(task))
+        for task in tasks
+        if not task.mod.attrs.get("tir.is_scheduled", False)
+    ]
+    seeds = fork_seed(seed, n=len(specs))
+    # The indices of the tasks not started yet, in the descending order of their cost
+    pending = sorted(range(len(specs)), key=lambda i: specs[i].share, reverse=True)
+    running: Dict[concurrent.futures.Future, Tuple[int, int]] = {}
+    num_trials_done = 0
+    num_trials_reserved = 0
+    num_tasks_dispatched = 0
+    failed_tasks: List[str] = []
+    shared_dir = tempfile.mkdtemp(prefix="shared-", dir=work_dir)
+    shared_database = f"{shared_dir}/database.sqlite"
+    # Create the tables before the workers write to it concurrently
+    SQLiteDatabase(shared_database, module_equality=module_equality).close()
+    pool = PopenPoolExecutor(max_workers=num_workers)
+    try:
+        while pending or running:
+            while pending and len(running) < num_workers:
+                task_id = pending.pop(0)
+                remaining = max_trials_global - num_trials_done - num_trials_reserved
+                total_share = specs[task_id].share + sum(specs[i].share for i in pending)
+                num_trials = min(
+                    max_trials_per_task,
+                    max(num_trials_per_iter, int(remaining * specs[task_id].share / total_share)),
+                    remaining,
+                )
+                if num_trials <= 0:
+                    logger.info("Skipping task %s: No trials left", specs[task_id].task_name)
+                    continue
+                num_trials_reserved += num_trials
+                future = pool.submit(
+                    _tune_task,
+                    specs[task_id],
+                    num_trials,
+                    num_trials_per_iter,
+                    seeds[task_id],
+                    work_dir,
+                    shared_database,
+                    rpc_config,
+                    evaluator_config,
+                    num_threads,
+                    space,
+                    strategy,
+                    cost_model,
+                    cost_model_zoo,
+                    module_equality,
+                )
+                running[future] = (task_id, num_trials)
+                num_tasks_dispatched += 1
+                logger.info(
+                    "Dispatched task %s with %d trials. Tasks running: %d, pending: %d",
+                    specs[task_id].task_name,
+                    num_trials,
+                    len(running),
+                    len(pending),
+                )
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                task_id, num_trials = running.pop(future)
+                num_trials_reserved -= num_trials
+                try:
+                    num_trials_used = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.error("Task %s failed: %s", specs[task_id].task_name, error)
+                    failed_tasks.append(specs[task_id].task_name)
+                    num_trials_used = 0
+                num_trials_done += num_trials_used
+                logger.info(
+                    "Finished task %s with %d trials. Trials used: %d/%d",
+                    specs[task_id].task_name,
+                    num_trials_used,
+                    num_trials_done,
+                    max_trials_global,
+                )
+        shared = SQLiteDatabase(shared_database, module_equality=module_equality)
+        try:
+            num_records = _merge_into(shared, database)
+        finally:
+            shared.close()
+        logger.info("Merged %d tuning records into the database", num_records)
+    finally:
+        pool.shutdown()
+        shutil.rmtree(shared_dir, ignore_errors=True)
+    if failed_tasks and len(failed_tasks) == num_tasks_dispatched:
+        raise RuntimeError(
+            f"All the {len(failed_tasks)} tuning task(s) failed, e.g. because of a misconfigured "
+            f"RPC tracker. See the logs in {work_dir}. Failed tasks: {failed_tasks}"
+        )
+    if failed_tasks:
+        logger.warning("%d tuning task(s) failed: %s", len(failed_tasks), failed_tasks)
+    return database
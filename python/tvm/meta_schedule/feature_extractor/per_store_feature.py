@@ -18,9 +18,14 @@
 """We extract one feature vector per BufferStoreNode statement in a TIR Stmt,
 so we call this feature as "per-store" feature.
 """
+from typing import List, Tuple
+
 from tvm._ffi import register_object
+from tvm.runtime.ndarray import NDArray
 
 from .. import _ffi_api
+from ..search_strategy import MeasureCandidate
+from ..tune_context import TuneContext
 from .feature_extractor import FeatureExtractor
 
 
@@ -65,3 +70,29 @@ class PerStoreFeature(FeatureExtractor):
             cache_line_bytes,
             extract_workload,
         )
+
+    def extract_batched(
+        self, context: TuneContext, candidates: List[MeasureCandidate]
+    ) -> Tuple[NDArray, NDArray]:
+        """Extract features from the given measure candidates into one contiguous buffer.
+
+        Parameters
+        ----------
+        context : TuneContext
+            The tuning context for feature extraction.
+        candidates : List[MeasureCandidate]
+            The measure candidates to extract features from.
+
+        Returns
+        -------
+        features : NDArray
+            A float32 array of shape [n, feature_vector_length], where `n` is the total number
+            of feature vectors of all the candidates.
+        offsets : NDArray
+            An int64 array of shape [len(candidates) + 1]. The features of the i-th candidate are
+            the rows `features[offsets[i]:offsets[i + 1]]`.
+        """
+        features, offsets = _ffi_api.FeatureExtractorPerStoreFeatureExtractBatched(  # type: ignore # pylint: disable=no-member
+            self, context, candidates
+        )
+        return features, offsets
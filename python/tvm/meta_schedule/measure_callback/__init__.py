@@ -16,6 +16,7 @@
 # under the License.
 """The tvm.meta_schedule.measure_callback package."""
 from .add_to_database import AddToDatabase
+from .checkpoint_cost_model import CheckpointCostModel
 from .measure_callback import MeasureCallback, PyMeasureCallback
 from .remove_build_artifact import RemoveBuildArtifact
 from .update_cost_model import UpdateCostModel
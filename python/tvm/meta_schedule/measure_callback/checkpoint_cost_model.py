@@ -0,0 +1,109 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A callback that periodically saves the cost model to a checkpoint file"""
+import os
+import tempfile
+from typing import TYPE_CHECKING, List
+
+from ..builder import BuilderResult
+from ..cost_model import CostModel
+from ..logging import get_logger
+from ..runner import RunnerResult
+from ..search_strategy import MeasureCandidate
+from ..utils import derived_object
+from .measure_callback import PyMeasureCallback
+
+if TYPE_CHECKING:
+    from ..task_scheduler import TaskScheduler
+
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+@derived_object
+class CheckpointCostModel(PyMeasureCallback):
+    """A callback that saves the cost model of the task scheduler to a file every `interval`
+    measured candidates, so that later tuning sessions can start from it.
+
+    The checkpoint is written to a unique temporary file first and then moved to `path`, so that
+    the file at `path` is always a complete model even if tuning is interrupted, or if several
+    processes save to the same path.
+
+    Parameters
+    ----------
+    path : str
+        The path of the checkpoint file.
+    interval : int
+        The number of measured candidates between two checkpoints.
+    """
+
+    path: str
+    interval: int
+
+    def __init__(self, path: str, interval: int = 256) -> None:
+        super().__init__()
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, but got {interval}")
+        self.path = path
+        self.interval = interval
+        self._num_unsaved = 0
+
+    def apply(
+        self,
+        task_scheduler: "TaskScheduler",
+        task_id: int,
+        measure_candidates: List[MeasureCandidate],
+        builder_results: List[BuilderResult],
+        runner_results: List[RunnerResult],
+    ) -> None:
+        cost_model = task_scheduler.cost_model_
+        if cost_model is None:
+            return
+        self._num_unsaved += len(measure_candidates)
+        if self._num_unsaved >= self.interval:
+            self.save(cost_model)
+
+    def save(self, cost_model: CostModel) -> None:
+        """Save the cost model to the checkpoint file.
+
+        Parameters
+        ----------
+        cost_model : CostModel
+            The cost model to save.
+        """
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        # A unique temporary file, as the processes tuning the same target may save concurrently
+        tmp_fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=dirname or None
+        )
+        os.close(tmp_fd)
+        try:
+            cost_model.save(tmp_path)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._num_unsaved = 0
+        logger.info("Saved the cost model checkpoint to %s", self.path)
+
+    @property
+    def num_unsaved(self) -> int:
+        """The number of measured candidates since the last checkpoint."""
+        return self._num_unsaved
@@ -41,6 +41,18 @@ class EvaluatorConfig(NamedTuple):
         increase the number of runs to the given time (in ms) to reduce the measurement error.
     enable_cpu_cache_flush: bool
         Whether to flush the cache on CPU.
+    max_repeat: Optional[int]
+        If specified, the evaluator is adaptive: `repeat` becomes the minimum number of repeats,
+        and the measurement stops as soon as the confidence interval of the mean cost lies
+        entirely above or below `reference_cost`. Otherwise it keeps repeating, up to
+        `max_repeat` times, so that only the candidates close to the reference are measured
+        longer.
+    confidence: float
+        The confidence level of the interval used by the adaptive evaluator.
+    reference_cost: Optional[float]
+        The mean cost in seconds to compare against in the adaptive evaluator, usually the cost
+        of the k-th best candidate measured so far. It is filled in by RPCRunner. Without a
+        reference cost, the evaluator always runs `repeat` times.
 
     Note
     ----
@@ -52,6 +64,9 @@ class EvaluatorConfig(NamedTuple):
     repeat: int = 1
     min_repeat_ms: int = 100
     enable_cpu_cache_flush: bool = False
+    max_repeat: Optional[int] = None
+    confidence: float = 0.95
+    reference_cost: Optional[float] = None
 
     @staticmethod
     def _normalized(config: Optional["EvaluatorConfig"]) -> "EvaluatorConfig":
@@ -62,7 +77,16 @@ class EvaluatorConfig(NamedTuple):
             repeat=config.repeat,
             min_repeat_ms=config.min_repeat_ms,
             enable_cpu_cache_flush=config.enable_cpu_cache_flush,
+            max_repeat=config.max_repeat,
+            confidence=config.confidence,
+            reference_cost=config.reference_cost,
         )
+        if config.max_repeat is not None and config.max_repeat < config.repeat:
+            raise ValueError(
+                f"max_repeat ({config.max_repeat}) must not be less than repeat ({config.repeat})"
+            )
+        if not 0.0 < config.confidence < 1.0:
+            raise ValueError(f"confidence must be in (0, 1), but got {config.confidence}")
         return config
 
 
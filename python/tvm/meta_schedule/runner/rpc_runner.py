@@ -16,9 +16,12 @@
 # under the License.
 """RPC Runner"""
 import concurrent.futures
+import functools
+import hashlib
 import os.path as osp
+import threading
 from contextlib import contextmanager
-from typing import Callable, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from tvm.contrib.popen_pool import PopenPoolExecutor
 from tvm.rpc import RPCSession
@@ -157,6 +160,8 @@ class RPCRunner(PyRunner):
         The function name to cleanup the session or the function itself.
     pool: PopenPoolExecutor
         The popen pool executor.
+    adaptive_top_k: int
+        The rank of the best candidate whose cost is the reference of the adaptive evaluator.
 
     Attributes
     ----------
@@ -231,6 +236,7 @@ class RPCRunner(PyRunner):
     f_cleanup: Union[T_CLEANUP, str, None]
 
     pool: PopenPoolExecutor
+    adaptive_top_k: int
 
     def __init__(
         self,
@@ -245,6 +251,7 @@ class RPCRunner(PyRunner):
         f_cleanup: Union[T_CLEANUP, str, None] = None,
         max_workers: Optional[int] = None,
         initializer: Optional[Callable[[], None]] = None,
+        adaptive_top_k: int = 1,
     ) -> None:
         """Constructor
 
@@ -272,6 +279,10 @@ class RPCRunner(PyRunner):
             The maximum number of connections. Defaults to 1.
         initializer: Optional[Callable[[], None]]
             The initializer function.
+        adaptive_top_k: int
+            The cost of the k-th best candidate of each workload measured so far is used as the
+            reference cost of the adaptive evaluator. Only used when `evaluator_config.max_repeat`
+            is specified.
         """
         super().__init__()
         self.rpc_config = RPCConfig._normalized(rpc_config)
@@ -283,6 +294,13 @@ class RPCRunner(PyRunner):
         self.f_alloc_argument = f_alloc_argument
         self.f_run_evaluator = f_run_evaluator
         self.f_cleanup = f_cleanup
+        if adaptive_top_k <= 0:
+            raise ValueError(f"adaptive_top_k must be positive, but got {adaptive_top_k}")
+        self.adaptive_top_k = adaptive_top_k
+        # The sorted mean costs of the best candidates measured so far, keyed by the arguments
+        # info, which are updated by the worker threads of the pool
+        self._top_costs: Dict[str, List[float]] = {}
+        self._top_costs_lock = threading.Lock()
         if max_workers is None:
             max_workers = 1
         logger.info("RPCRunner: max_workers = %d", max_workers)
@@ -294,9 +312,23 @@ class RPCRunner(PyRunner):
 
     def run(self, runner_inputs: List[RunnerInput]) -> List[RunnerFuture]:
         results: List[RunnerFuture] = []
+        # Identical candidates in the same batch are measured only once
+        submitted: Dict[Tuple[str, str, str], concurrent.futures.Future] = {}
+        adaptive = self.evaluator_config.max_repeat is not None
         for runner_input in runner_inputs:
-            future = RPCRunnerFuture(
-                future=self.pool.submit(
+            artifact_path = str(runner_input.artifact_path)
+            device_type = str(runner_input.device_type)
+            args_info = tuple(arg_info.as_json() for arg_info in runner_input.args_info)
+            workload_key = repr(args_info)
+            dedup_key = (_file_digest(artifact_path), device_type, workload_key)
+            future = submitted.get(dedup_key, None)
+            if future is None:
+                evaluator_config = self.evaluator_config
+                if adaptive:
+                    evaluator_config = evaluator_config._replace(
+                        reference_cost=self._reference_cost(workload_key)
+                    )
+                future = self.pool.submit(
                     _worker_func,
                     self.f_create_session,
                     self.f_upload_module,
@@ -304,17 +336,50 @@ class RPCRunner(PyRunner):
                     self.f_run_evaluator,
                     self.f_cleanup,
                     self.rpc_config,
-                    self.evaluator_config,
+                    evaluator_config,
                     self.alloc_repeat,
-                    str(runner_input.artifact_path),
-                    str(runner_input.device_type),
-                    tuple(arg_info.as_json() for arg_info in runner_input.args_info),
-                ),
-                timeout_sec=self.rpc_config.session_timeout_sec,
+                    artifact_path,
+                    device_type,
+                    args_info,
+                )
+                if adaptive:
+                    future.add_done_callback(
+                        functools.partial(self._update_top_costs, workload_key)
+                    )
+                submitted[dedup_key] = future
+            results.append(
+                RPCRunnerFuture(  # type: ignore
+                    future=future,
+                    timeout_sec=self.rpc_config.session_timeout_sec,
+                )
+            )
+        if len(submitted) < len(runner_inputs):
+            logger.info(
+                "RPCRunner: Skipped measuring %d duplicate candidate(s)",
+                len(runner_inputs) - len(submitted),
             )
-            results.append(future)  # type: ignore
         return results
 
+    def _reference_cost(self, workload_key: str) -> Optional[float]:
+        with self._top_costs_lock:
+            top_costs = self._top_costs.get(workload_key, [])
+            if len(top_costs) < self.adaptive_top_k:
+                return None
+            return top_costs[self.adaptive_top_k - 1]
+
+    def _update_top_costs(self, workload_key: str, future: concurrent.futures.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        costs: List[float] = future.result()
+        if not costs:
+            return
+        mean_cost = sum(costs) / len(costs)
+        with self._top_costs_lock:
+            top_costs = self._top_costs.setdefault(workload_key, [])
+            top_costs.append(mean_cost)
+            top_costs.sort()
+            del top_costs[self.adaptive_top_k :]
+
     def _sanity_check(self) -> None:
         def _check(
             f_create_session,
@@ -340,6 +405,18 @@ class RPCRunner(PyRunner):
         value.result()
 
 
+def _file_digest(path: str) -> str:
+    """The digest of the file content, or the path itself if the file cannot be read"""
+    try:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+    except OSError:
+        return path
+
+
 def _worker_func(
     _f_create_session: Union[T_CREATE_SESSION, str, None],
     _f_upload_module: Union[T_UPLOAD_MODULE, str, None],
@@ -16,6 +16,8 @@
 # under the License.
 """Runner utility functions"""
 import itertools
+import math
+from statistics import NormalDist, mean, stdev
 from typing import Any, Callable, Dict, List
 
 from ...runtime import Device, Module, ndarray
@@ -77,6 +79,17 @@ def alloc_argument_common(
     return repeated_args
 
 
+def _is_conclusive(costs: List[float], reference_cost: float, confidence: float) -> bool:
+    """Whether the confidence interval of the mean cost lies entirely on one side of the
+    reference cost, i.e. more repeats would not change if the candidate beats the reference"""
+    if len(costs) < 2:
+        return False
+    z_score = NormalDist().inv_cdf((1.0 + confidence) / 2.0)
+    half_width = z_score * stdev(costs) / math.sqrt(len(costs))
+    mean_cost = mean(costs)
+    return mean_cost - half_width > reference_cost or mean_cost + half_width < reference_cost
+
+
 def run_evaluator_common(
     rt_mod: Module,
     device: Device,
@@ -101,20 +114,46 @@ def run_evaluator_common(
     costs: List[float]
         The evaluator results
     """
-    evaluator = rt_mod.time_evaluator(
-        func_name=rt_mod.entry_name,
-        dev=device,
-        number=evaluator_config.number,
-        repeat=evaluator_config.repeat,
-        min_repeat_ms=evaluator_config.min_repeat_ms,
-        f_preproc="cache_flush_cpu_non_first_arg"
-        if evaluator_config.enable_cpu_cache_flush
-        else "",
-    )
-    repeated_costs: List[List[float]] = []
-    for args in repeated_args:
+
+    def make_evaluator(repeat: int) -> Callable:
+        return rt_mod.time_evaluator(
+            func_name=rt_mod.entry_name,
+            dev=device,
+            number=evaluator_config.number,
+            repeat=repeat,
+            min_repeat_ms=evaluator_config.min_repeat_ms,
+            f_preproc="cache_flush_cpu_non_first_arg"
+            if evaluator_config.enable_cpu_cache_flush
+            else "",
+        )
+
+    def evaluate(evaluator: Callable, args: T_ARGUMENT_LIST) -> List[float]:
         device.sync()
         profile_result = evaluator(*args)
-        repeated_costs.append(profile_result.results)
-    costs = [float(cost) for cost in itertools.chain.from_iterable(repeated_costs)]
+        return [float(cost) for cost in profile_result.results]
+
+    adaptive = (
+        evaluator_config.max_repeat is not None and evaluator_config.reference_cost is not None
+    )
+
+    def is_conclusive(costs: List[float]) -> bool:
+        return adaptive and _is_conclusive(
+            costs, evaluator_config.reference_cost, evaluator_config.confidence
+        )
+
+    evaluator = make_evaluator(evaluator_config.repeat)
+    costs: List[float] = []
+    for args in repeated_args:
+        costs.extend(evaluate(evaluator, args))
+        if is_conclusive(costs):
+            return costs
+    if not adaptive:
+        return costs
+    # Keep repeating for the close contenders, one repeat at a time
+    evaluator = make_evaluator(1)
+    num_extra_repeats = (evaluator_config.max_repeat - evaluator_config.repeat) * len(repeated_args)
+    for args in itertools.islice(itertools.cycle(repeated_args), num_extra_repeats):
+        costs.extend(evaluate(evaluator, args))
+        if is_conclusive(costs):
+            break
     return costs
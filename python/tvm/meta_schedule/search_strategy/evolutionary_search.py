@@ -45,6 +45,10 @@ class EvolutionarySearch(SearchStrategy):
         The maximum number to retry mutation.
     eps_greedy : float
         The ratio of greedy selected samples in the final picks.
+    init_warm_start_ratio : float
+        The ratio of samples in the initial population that are replayed from the best tuning
+        records of similar workloads in the database, i.e. those with the same anchor block but
+        different shapes or fused operators. Zero disables the warm-start.
     """
 
     population_size: int
@@ -54,6 +58,7 @@ class EvolutionarySearch(SearchStrategy):
     genetic_mutate_prob: float
     genetic_max_fail_count: int
     eps_greedy: float
+    init_warm_start_ratio: float
 
     def __init__(
         self,
@@ -66,6 +71,7 @@ class EvolutionarySearch(SearchStrategy):
         genetic_mutate_prob: float = 0.85,
         genetic_max_fail_count: int = 10,
         eps_greedy: float = 0.05,
+        init_warm_start_ratio: float = 0.0,
     ) -> None:
         """Constructor"""
         self.__init_handle_by_constructor__(
@@ -78,4 +84,5 @@ class EvolutionarySearch(SearchStrategy):
             genetic_mutate_prob,
             genetic_max_fail_count,
             eps_greedy,
+            init_warm_start_ratio,
         )
@@ -21,5 +21,6 @@ for measure candidates generation and measurement, then save
 records to the database.
 """
 from .gradient_based import GradientBased
+from .profile_guided import ProfileGuided
 from .round_robin import RoundRobin
 from .task_scheduler import PyTaskScheduler, TaskScheduler, create
@@ -34,6 +34,7 @@ class GradientBased(TaskScheduler):
         alpha: float = 0.2,
         window_size: int = 3,
         seed: int = -1,
+        pipeline_depth: int = 0,
     ) -> None:
         """Constructor.
 
@@ -45,6 +46,9 @@ class GradientBased(TaskScheduler):
             The parameter to control backward window size in gradient computation.
         seed : int = -1
             The random seed.
+        pipeline_depth : int = 0
+            The maximum number of tasks built in the background while the others are measured.
+            0 means building, measuring and updating the cost model are not overlapped.
         """
         self.__init_handle_by_constructor__(
             _ffi_api.TaskSchedulerGradientBased,  # type: ignore # pylint: disable=no-member
@@ -52,4 +56,5 @@ class GradientBased(TaskScheduler):
             alpha,
             window_size,
             seed,
+            pipeline_depth,
         )
@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Profile Guided Task Scheduler"""
+import json
+from typing import Dict, Union
+
+from tvm._ffi import register_object
+from tvm.runtime.profiling import Report
+
+from .. import _ffi_api
+from ..logging import get_logger, get_logging_func
+from .task_scheduler import TaskScheduler
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+def _duration_by_name(report: Report) -> Dict[str, float]:
+    """Sum up the duration of the calls to each function in the report, in microseconds."""
+    result: Dict[str, float] = {}
+    # Each metric in the JSON report is wrapped by its type, e.g. {"string": "fused_add"}
+    for call in json.loads(report.json())["calls"]:
+        name = call.get("Name", {}).get("string", None)
+        duration = call.get("Duration (us)", {}).get("microseconds", None)
+        if name is None or duration is None:
+            continue
+        result[name] = result.get(name, 0.0) + float(duration)
+    return result
+
+
+@register_object("meta_schedule.ProfileGuided")
+class ProfileGuided(TaskScheduler):
+    """Profile Guided Task Scheduler
+
+    The trials are allocated to each task in proportion to its share in the end-to-end latency,
+    scaled by the speedup found so far, and its estimated headroom, i.e. the relative improvement
+    of its best latency in the recent rounds. The share is measured by a profiler in a baseline
+    run, e.g. `relax.VirtualMachine.profile`, whose calls are matched to the tasks by name. Tasks
+    that are not found in the profile are tuned for one round only.
+    """
+
+    def __init__(
+        self,
+        profile: Union[Report, Dict[str, float]],
+        *,
+        window_size: int = 3,
+        min_headroom: float = 0.01,
+        seed: int = -1,
+        pipeline_depth: int = 0,
+    ) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        profile : Union[Report, Dict[str, float]]
+            The profiling report of a baseline run, or the total duration of the calls to each
+            function, keyed by the task name.
+        window_size : int = 3
+            The backward window size to estimate the headroom of a task.
+        min_headroom : float = 0.01
+            The headroom that a task is assumed to have at the least, so that a task that has
+            plateaued still gets trials if it dominates the end-to-end latency.
+        seed : int = -1
+            The random seed.
+        pipeline_depth : int = 0
+            The maximum number of tasks built in the background while the others are measured.
+            0 means building, measuring and updating the cost model are not overlapped.
+        """
+        if isinstance(profile, Report):
+            profile = _duration_by_name(profile)
+        self.__init_handle_by_constructor__(
+            _ffi_api.TaskSchedulerProfileGuided,  # type: ignore # pylint: disable=no-member
+            get_logging_func(logger),
+            {name: float(duration) for name, duration in profile.items()},
+            window_size,
+            min_headroom,
+            seed,
+            pipeline_depth,
+        )
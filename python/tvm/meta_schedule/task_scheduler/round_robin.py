@@ -28,9 +28,17 @@ logger = get_logger(__name__)  # pylint: disable=invalid-name
 class RoundRobin(TaskScheduler):
     """Round Robin Task Scheduler"""
 
-    def __init__(self) -> None:
-        """Constructor."""
+    def __init__(self, *, pipeline_depth: int = 0) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        pipeline_depth : int = 0
+            The maximum number of tasks built in the background while the others are measured.
+            0 means building, measuring and updating the cost model are not overlapped.
+        """
         self.__init_handle_by_constructor__(
             _ffi_api.TaskSchedulerRoundRobin,  # type: ignore # pylint: disable=no-member
             get_logging_func(logger),
+            pipeline_depth,
         )
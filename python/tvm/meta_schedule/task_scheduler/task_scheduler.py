@@ -62,6 +62,7 @@ class TaskScheduler(Object):
     database_: Optional[Database]
     cost_model_: Optional[CostModel]
     remaining_tasks_: int
+    pipeline_depth: int
 
     TaskSchedulerType = Union["TaskScheduler", Literal["gradient", "round-robin"]]
 
@@ -167,15 +168,26 @@ class TaskScheduler(Object):
         """Print out a human-readable format of the tuning statistics."""
         return _ffi_api.TaskSchedulerPrintTuningStatistics(self)  # type: ignore # pylint: disable=no-member
 
+    def device_utilization(self) -> float:
+        """The fraction of the tuning time in which any measure candidate is being measured.
+
+        Returns
+        -------
+        utilization : float
+            The device utilization in [0, 1].
+        """
+        return _ffi_api.TaskSchedulerDeviceUtilization(self)  # type: ignore # pylint: disable=no-member
+
     @staticmethod
     def create(  # pylint: disable=keyword-arg-before-vararg
-        kind: Literal["round-robin", "gradient"] = "gradient",
+        kind: Literal["round-robin", "gradient", "profile-guided"] = "gradient",
         *args,
         **kwargs,
     ) -> "TaskScheduler":
         """Create a task scheduler."""
         from . import (  # pylint: disable=import-outside-toplevel
             GradientBased,
+            ProfileGuided,
             RoundRobin,
         )
 
@@ -183,6 +195,8 @@ class TaskScheduler(Object):
             return RoundRobin(*args, **kwargs)  # type: ignore
         if kind == "gradient":
             return GradientBased(*args, **kwargs)
+        if kind == "profile-guided":
+            return ProfileGuided(*args, **kwargs)  # type: ignore
         raise ValueError(f"Unknown TaskScheduler name: {kind}")
 
 
@@ -0,0 +1,122 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the open time and the query latency of BinaryDatabase against JSONDatabase"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from statistics import mean, median
+from typing import Callable, List
+
+from tvm import meta_schedule as ms
+from tvm.ir import IRModule
+
+DELIMITOR = "\n" + "-" * 30 + "\n"
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument(
+        "--work-dir",
+        type=str,
+        required=True,
+        help="The path to the work directory containing the JSON database files.",
+    )
+    args.add_argument(
+        "--binary-work-dir",
+        type=str,
+        default=None,
+        help="The path to the work directory of the binary database. "
+        "If it doesn't contain a binary database, the JSON database is imported into it. "
+        "If not specified, a temporary directory is used.",
+    )
+    args.add_argument(
+        "--top-k",
+        type=int,
+        default=1,
+        help="The number of top-k tuning records to query for each workload.",
+    )
+    args.add_argument(
+        "--num-workloads",
+        type=int,
+        default=None,
+        help="The number of workloads to query. All workloads are queried if not specified.",
+    )
+    return args.parse_args()
+
+
+logging.basicConfig(
+    format="%(asctime)s.%(msecs)03d %(levelname)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+)
+logging.getLogger("tvm.meta_schedule").setLevel(logging.INFO)
+
+
+def _timeit(func: Callable):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _query_latency(
+    database: ms.database.Database,
+    mods: List[IRModule],
+    top_k: int,
+) -> List[float]:
+    latency = []
+    for mod in mods:
+        elapsed, _ = _timeit(
+            lambda mod=mod: database.get_top_k(database.commit_workload(mod), top_k)
+        )
+        latency.append(elapsed)
+    return latency
+
+
+def _report(name: str, open_sec: float, latency: List[float]) -> None:
+    print(f"{name}:")
+    print(f"  Open time: {open_sec * 1000:.3f} ms")
+    if latency:
+        print(
+            f"  Query latency: mean {mean(latency) * 1e6:.1f} us, "
+            f"median {median(latency) * 1e6:.1f} us, max {max(latency) * 1e6:.1f} us"
+        )
+
+
+def main():
+    """Main function"""
+    args = _parse_args()
+    json_open_sec, json_db = _timeit(lambda: ms.database.JSONDatabase(work_dir=args.work_dir))
+    workloads = {record.workload: None for record in json_db.get_all_tuning_records()}
+    mods = [workload.mod for workload in workloads][: args.num_workloads]
+    print(f"Found {len(json_db)} tuning records of {len(mods)} workload(s)", end=DELIMITOR)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        binary_work_dir = args.binary_work_dir or tmp_dir
+        if not os.path.exists(os.path.join(binary_work_dir, "database_tuning_record.bin")):
+            import_sec, _ = _timeit(
+                lambda: ms.database.BinaryDatabase.import_from(json_db, work_dir=binary_work_dir)
+            )
+            print(f"Imported the JSON database in {import_sec:.3f} s", end=DELIMITOR)
+        binary_open_sec, binary_db = _timeit(
+            lambda: ms.database.BinaryDatabase(work_dir=binary_work_dir)
+        )
+        _report("JSONDatabase", json_open_sec, _query_latency(json_db, mods, args.top_k))
+        _report("BinaryDatabase", binary_open_sec, _query_latency(binary_db, mods, args.top_k))
+
+
+if __name__ == "__main__":
+    main()
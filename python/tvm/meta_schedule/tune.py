@@ -15,16 +15,20 @@
 # specific language governing permissions and limitations
 # under the License.
 """The core tuning API"""
+import os
 from typing import List, Optional
 
 from .builder import Builder
-from .cost_model import CostModel
+from .cost_model import CostModel, model_zoo_path
 from .database import Database
-from .measure_callback import MeasureCallback
+from .logging import get_logger
+from .measure_callback import CheckpointCostModel, MeasureCallback
 from .runner import Runner
 from .task_scheduler import TaskScheduler
 from .tune_context import TuneContext
 
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
 
 def tune_tasks(
     *,
@@ -41,6 +45,9 @@ def tune_tasks(
     measure_callbacks: MeasureCallback.CallbackListType = "default",
     task_scheduler: TaskScheduler.TaskSchedulerType = "gradient",
     module_equality: str = "structural",
+    cost_model_zoo: Optional[str] = None,
+    cost_model_checkpoint_interval: int = 256,
+    cost_model_max_history: Optional[int] = 16384,
 ) -> Database:
     """Tune a list of tasks. Using a task scheduler.
 
@@ -81,6 +88,17 @@ def tune_tasks(
                 a given module. The "ignore-ndarray" varint is used for the extracted blocks or in
                 case no anchor block is found. For the definition of the anchor block, see
                 tir/analysis/analysis.py.
+    cost_model_zoo : Optional[str]
+        The directory of the pretrained cost models, keyed by target. If specified, the cost model
+        for the target of the tasks is loaded from the directory if it exists, is fine-tuned with
+        the measurement results, and is saved back to the directory every
+        `cost_model_checkpoint_interval` measured candidates and at the end of tuning.
+    cost_model_checkpoint_interval : int
+        The number of measured candidates between two checkpoints of the cost model.
+    cost_model_max_history : Optional[int]
+        The maximum number of samples kept by the cost model created from `cost_model` when
+        `cost_model_zoo` is specified, so that the checkpoints do not grow without bound across
+        tuning sessions. None means unbounded.
 
     Returns
     -------
@@ -103,16 +121,27 @@ def tune_tasks(
         builder = Builder.create(builder, max_workers=num_cores)
     if not isinstance(runner, Runner):
         runner = Runner.create(runner, max_workers=num_cores)
-    if database == "json":
+    if database in ("json", "binary", "sqlite"):
         database = Database.create(database, work_dir=work_dir, module_equality=module_equality)
     elif not isinstance(database, Database):
         database = Database.create(database, module_equality=module_equality)
     if not isinstance(cost_model, CostModel):
-        cost_model = CostModel.create(cost_model, num_tuning_cores=num_cores, tree_method="auto")
+        cost_model_kwargs = {"num_tuning_cores": num_cores, "tree_method": "auto"}
+        if cost_model_zoo is not None:
+            cost_model_kwargs["max_history_size"] = cost_model_max_history
+        cost_model = CostModel.create(cost_model, **cost_model_kwargs)
     if isinstance(measure_callbacks, MeasureCallback):
         measure_callbacks = [measure_callbacks]
     elif measure_callbacks == "default":
         measure_callbacks = MeasureCallback.create(measure_callbacks)
+    checkpoint = None
+    if cost_model_zoo is not None and cost_model is not None:
+        checkpoint_path = model_zoo_path(cost_model_zoo, tasks[0].target)
+        if os.path.exists(checkpoint_path):
+            cost_model.load(checkpoint_path)
+            logger.info("Loaded the pretrained cost model from %s", checkpoint_path)
+        checkpoint = CheckpointCostModel(checkpoint_path, interval=cost_model_checkpoint_interval)
+        measure_callbacks = list(measure_callbacks) + [checkpoint]
     if not isinstance(task_scheduler, TaskScheduler):
         task_scheduler = TaskScheduler.create(task_scheduler)
     task_scheduler.tune(
@@ -127,4 +156,6 @@ def tune_tasks(
         database=database,
         cost_model=cost_model,
     )
+    if checkpoint is not None and checkpoint.num_unsaved > 0:
+        checkpoint.save(cost_model)
     return database
@@ -379,6 +379,49 @@ def shash2hex(mod: IRModule) -> str:
     return str(func(mod))
 
 
+def module_equality_hash(mod: IRModule, module_equality: str = "structural") -> str:
+    """Get the hash of a module under the given module equality method.
+
+    Parameters
+    ----------
+    mod : IRModule
+        The module to be hashed.
+    module_equality : str
+        The module equality method, one of "structural", "ignore-ndarray" and "anchor-block".
+
+    Returns
+    -------
+    result : str
+        The hex string of the hash code, which is consistent with the workload hashing
+        used by the databases on the C++ side.
+    """
+    func = get_global_func("meta_schedule.ModuleEqualityHash")
+    return str(func(mod, module_equality))
+
+
+def module_equality_equal(
+    lhs: IRModule, rhs: IRModule, module_equality: str = "structural"
+) -> bool:
+    """Check if two modules are equal under the given module equality method.
+
+    Parameters
+    ----------
+    lhs : IRModule
+        The first module.
+    rhs : IRModule
+        The second module.
+    module_equality : str
+        The module equality method, one of "structural", "ignore-ndarray" and "anchor-block".
+
+    Returns
+    -------
+    result : bool
+        Whether the two modules are equal.
+    """
+    func = get_global_func("meta_schedule.ModuleEqualityEqual")
+    return bool(func(lhs, rhs, module_equality))
+
+
 def _get_default_str(obj: Any) -> str:
     return (
         # pylint: disable=protected-access
@@ -0,0 +1,67 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Statistics and allocation tracking of the runtime memory manager."""
+import json
+from typing import Any, Dict
+
+from . import _ffi_api
+from .ndarray import Device
+
+
+def enable_memory_tracking(enabled: bool = True) -> None:
+    """Enable or disable tracking the allocations of the memory manager.
+
+    When enabled, the live and peak memory, the allocation counts by size and the VM
+    instruction of each live allocation are recorded for every device and allocator.
+    When disabled, the statistics are kept, and the overhead of each allocation is
+    checking a flag.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether to track the allocations.
+    """
+    _ffi_api.SetMemoryTracking(enabled)
+
+
+def reset_memory_stats() -> None:
+    """Clear the statistics of the tracked allocations, and forget the live ones."""
+    _ffi_api.ResetMemoryStats()
+
+
+def memory_stats(dev: Device) -> Dict[str, Any]:
+    """Get the memory statistics of the allocators of a device.
+
+    Parameters
+    ----------
+    dev : Device
+        The device to query.
+
+    Returns
+    -------
+    stats : Dict[str, Any]
+        The statistics, with the keys
+
+        - "tracking": whether the allocations are tracked.
+        - "allocators": the statistics of each allocator by its type, e.g. "pooled",
+          which contain "used_bytes" reported by the allocator, and, once tracked,
+          "live_bytes", "peak_bytes", "num_allocs", "num_frees", "allocs_by_size"
+          keyed by the power-of-two upper bounds of the sizes, and "live_by_site",
+          the bytes and the count of the live allocations by the VM instructions
+          that made them, in the form of "function@pc:callee".
+    """
+    return json.loads(_ffi_api.MemoryStats(dev))
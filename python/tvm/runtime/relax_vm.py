@@ -41,6 +41,13 @@ class VirtualMachine(object):
 
     NAIVE_ALLOCATOR = 1
     POOLED_ALLOCATOR = 2
+    BUDDY_ALLOCATOR = 3
+
+    _ALLOCATOR_TYPES = {
+        "naive": NAIVE_ALLOCATOR,
+        "pooled": POOLED_ALLOCATOR,
+        "buddy": BUDDY_ALLOCATOR,
+    }
 
     def __init__(
         self,
@@ -48,6 +55,7 @@ class VirtualMachine(object):
         device: Union[Device, List[Device]],
         memory_cfg: Optional[Union[str, Dict[Device, str]]] = None,
         profile: bool = False,
+        prelink: bool = False,
     ) -> None:
         """
         Construct a VirtualMachine wrapper object.
@@ -62,7 +70,9 @@ class VirtualMachine(object):
 
         memory_cfg : Optional[Union[str, Dict[Device, str]]]
             Config the type of memory allocator. The allocator type can be ["naive",
-            "pooled"]. If memory_cfg is None, all devices will use pooled allocator
+            "pooled", "buddy"]. The buddy allocator splits and coalesces blocks of power-of-two
+            size classes, which bounds the fragmentation of dynamic shapes, and supports CPU,
+            CUDA and ROCm devices. If memory_cfg is None, all devices will use pooled allocator
             by default. If memory_cfg is string, all devices will use the specified
             allocator type. If memory_cfg is a dict, each device uses the allocator
             type specified in the dict, or pooled allocator if not specified in the
@@ -70,6 +80,12 @@ class VirtualMachine(object):
 
         profile : Optional[bool]
             Whether or not to enable profiling.
+
+        prelink : bool
+            Whether to link the bytecode instructions ahead of time. The callee of each
+            call instruction is resolved and its argument stack is preallocated once, which
+            reduces the dispatch overhead of functions with many small calls. The calls are
+            dispatched as usual while an instrument is set or the allocations are tracked.
         """
         if not isinstance(rt_mod, tvm.runtime.Module):
             # important to keep this import local
@@ -95,6 +111,8 @@ class VirtualMachine(object):
         self._get_function_param_name = self.module["get_function_param_name"]
         self._set_instrument = self.module["set_instrument"]
         self._setup_device(device, memory_cfg)
+        if prelink:
+            self.module["prelink"]()
 
     def _setup_device(self, dev: Device, memory_cfg: Union[str, Dict[Device, str]]) -> None:
         """init devices and allocators."""
@@ -115,9 +133,8 @@ class VirtualMachine(object):
         if memory_cfg is None:
             memory_cfg = {}
         elif isinstance(memory_cfg, str):
-            assert memory_cfg in ["naive", "pooled"]
-            if memory_cfg == "naive":
-                default_alloc_type = VirtualMachine.NAIVE_ALLOCATOR
+            assert memory_cfg in VirtualMachine._ALLOCATOR_TYPES
+            default_alloc_type = VirtualMachine._ALLOCATOR_TYPES[memory_cfg]
             memory_cfg = {}
         elif not isinstance(memory_cfg, dict):
             raise TypeError(
@@ -129,6 +146,7 @@ class VirtualMachine(object):
             init_args.append(device.device_type % RPC_SESS_MASK)
             init_args.append(device.device_id)
             alloc_type = memory_cfg[device] if device in memory_cfg else default_alloc_type
+            alloc_type = VirtualMachine._ALLOCATOR_TYPES.get(alloc_type, alloc_type)
             init_args.append(alloc_type)
         self.module["vm_initialization"](*init_args)
 
@@ -18,6 +18,7 @@
  */
 #include <tvm/tir/transform.h>
 
+#include <algorithm>
 #include <cmath>
 #include <memory>
 #include <numeric>
@@ -1371,7 +1372,7 @@ class PerStoreFeatureNode : public FeatureExtractorNode {
     v->Visit("feature_vector_length", &feature_vector_length);
   }
 
-  void ExtractSingle(IRModule mod, bool is_gpu, std::vector<std::vector<double>>* results) {
+  void ExtractSingle(IRModule mod, bool is_gpu, std::vector<std::vector<double>>* results) const {
     static transform::Sequential passes = tir::transform::PassListForPerStoreFeature();
     mod = passes(std::move(mod));
     std::vector<tir::Feature> features = tir::PerStoreFeatureCollector::Collect(
@@ -1390,10 +1391,16 @@ class PerStoreFeatureNode : public FeatureExtractorNode {
     }
   }
 
-  Array<runtime::NDArray> ExtractFrom(const TuneContext& tune_context,
-                                      const Array<MeasureCandidate>& candidates) {
+  /*!
+   * \brief Extract the features of each candidate in parallel
+   * \param tune_context The tuning context
+   * \param candidates The measure candidates
+   * \return The features of each candidate, one feature vector per store
+   */
+  std::vector<std::vector<std::vector<double>>> ExtractAll(
+      const TuneContext& tune_context, const Array<MeasureCandidate>& candidates) const {
     bool is_gpu = tune_context->target.value()->kind->name == "cuda";
-    std::vector<runtime::NDArray> results;
+    std::vector<std::vector<std::vector<double>>> results;
     results.resize(candidates.size());
     std::unique_ptr<tir::group6::Feature> feature_group6 = nullptr;
     if (extract_workload) {
@@ -1401,19 +1408,69 @@ class PerStoreFeatureNode : public FeatureExtractorNode {
     }
     auto f = [this, is_gpu, &feature_group6, &candidates, &results](int, int task_id) -> void {
       const auto& candidate = candidates[task_id];
-      std::vector<std::vector<double>> features;
+      std::vector<std::vector<double>>& features = results[task_id];
       ExtractSingle(DeepCopyIRModule(candidate->sch->mod()), is_gpu, &features);
       if (extract_workload) {
         for (auto& feature : features) {
           feature_group6->Export(&feature);
         }
       }
-      results[task_id] = tir::utils::AsNDArray(features, this->feature_vector_length);
     };
     support::parallel_for_dynamic(0, candidates.size(), tune_context->num_threads, f);
     return results;
   }
 
+  Array<runtime::NDArray> ExtractFrom(const TuneContext& tune_context,
+                                      const Array<MeasureCandidate>& candidates) {
+    std::vector<std::vector<std::vector<double>>> features = ExtractAll(tune_context, candidates);
+    Array<runtime::NDArray> results;
+    results.reserve(features.size());
+    for (const std::vector<std::vector<double>>& feature : features) {
+      results.push_back(tir::utils::AsNDArray(feature, this->feature_vector_length));
+    }
+    return results;
+  }
+
+  /*!
+   * \brief Extract the features of all candidates into one contiguous buffer
+   * \param tune_context The tuning context
+   * \param candidates The measure candidates
+   * \return A pair of NDArrays. The first one is a float32 array of shape
+   * (total number of stores, feature_vector_length), where the features of each candidate
+   * are stored in the order of the candidates. The second one is an int64 array of shape
+   * (number of candidates + 1), where the features of the i-th candidate are the rows
+   * in the range [offsets[i], offsets[i + 1]) of the first one.
+   */
+  Array<runtime::NDArray> ExtractBatched(const TuneContext& tune_context,
+                                         const Array<MeasureCandidate>& candidates) const {
+    std::vector<std::vector<std::vector<double>>> features = ExtractAll(tune_context, candidates);
+    int64_t n = features.size();
+    int64_t m = this->feature_vector_length;
+    runtime::NDArray offsets = runtime::NDArray::Empty(
+        /*shape=*/{n + 1},
+        /*dtype=*/DLDataType{kDLInt, 64, 1},
+        /*ctx=*/DLDevice{kDLCPU, 0});
+    int64_t* offsets_data = static_cast<int64_t*>(offsets->data);
+    offsets_data[0] = 0;
+    for (int64_t i = 0; i < n; ++i) {
+      offsets_data[i + 1] = offsets_data[i] + features[i].size();
+    }
+    runtime::NDArray buffer = runtime::NDArray::Empty(
+        /*shape=*/{offsets_data[n], m},
+        /*dtype=*/DLDataType{kDLFloat, 32, 1},
+        /*ctx=*/DLDevice{kDLCPU, 0});
+    float* data = static_cast<float*>(buffer->data);
+    auto f = [m, data, offsets_data, &features](int, int task_id) -> void {
+      float* dst = data + offsets_data[task_id] * m;
+      for (const std::vector<double>& row : features[task_id]) {
+        ICHECK_EQ(static_cast<int64_t>(row.size()), m);
+        dst = std::copy(row.begin(), row.end(), dst);
+      }
+    };
+    support::parallel_for_dynamic(0, n, tune_context->num_threads, f);
+    return {buffer, offsets};
+  }
+
   static constexpr const char* _type_key = "meta_schedule.PerStoreFeature";
   TVM_DECLARE_FINAL_OBJECT_INFO(PerStoreFeatureNode, FeatureExtractorNode);
 };
@@ -1440,6 +1497,13 @@ FeatureExtractor FeatureExtractor::PerStoreFeature(int buffers_per_store,
 TVM_REGISTER_NODE_TYPE(PerStoreFeatureNode);
 TVM_REGISTER_GLOBAL("meta_schedule.FeatureExtractorPerStoreFeature")
     .set_body_typed(FeatureExtractor::PerStoreFeature);
+TVM_REGISTER_GLOBAL("meta_schedule.FeatureExtractorPerStoreFeatureExtractBatched")
+    .set_body_typed([](FeatureExtractor extractor, TuneContext tune_context,
+                       Array<MeasureCandidate> candidates) -> Array<runtime::NDArray> {
+      const auto* node = extractor.as<PerStoreFeatureNode>();
+      ICHECK(node) << "TypeError: Expects PerStoreFeature, but gets: " << extractor->GetTypeKey();
+      return node->ExtractBatched(tune_context, candidates);
+    });
 
 }  // namespace meta_schedule
 }  // namespace tvm
@@ -21,9 +21,12 @@
 #include <tvm/ir/module.h>
 #include <tvm/node/structural_equal.h>
 #include <tvm/node/structural_hash.h>
+#include <tvm/runtime/registry.h>
 #include <tvm/tir/analysis.h>
 
+#include <iomanip>
 #include <memory>
+#include <sstream>
 
 #include "../node/ndarray_hash_equal.h"
 
@@ -96,5 +99,18 @@ std::unique_ptr<ModuleEquality> ModuleEquality::Create(const std::string& mod_eq
   LOG(FATAL) << "Unknown module equality " << mod_eq_name;
 }
 
+TVM_REGISTER_GLOBAL("meta_schedule.ModuleEqualityHash")
+    .set_body_typed([](IRModule mod, String mod_eq_name) -> String {
+      std::ostringstream os;
+      os << "0x" << std::setw(16) << std::setfill('0') << std::hex
+         << ModuleEquality::Create(mod_eq_name)->Hash(mod);
+      return os.str();
+    });
+
+TVM_REGISTER_GLOBAL("meta_schedule.ModuleEqualityEqual")
+    .set_body_typed([](IRModule lhs, IRModule rhs, String mod_eq_name) -> bool {
+      return ModuleEquality::Create(mod_eq_name)->Equal(lhs, rhs);
+    });
+
 }  // namespace meta_schedule
 }  // namespace tvm
@@ -17,7 +17,12 @@
  * under the License.
  */
 
+#include <tvm/tir/analysis.h>
+
+#include <unordered_map>
+
 #include "../module_equality.h"
+#include "../trace_apply.h"
 #include "../utils.h"
 
 #define TVM_META_SCHEDULE_CHECK_PROB_RANGE(p, name)                               \
@@ -239,6 +244,54 @@ std::vector<double> PredictNormalizedScore(const std::vector<Schedule>& candidat
   return scores;
 }
 
+/*!
+ * \brief Compute a shape-agnostic signature of the anchor block of a module. Workloads with the
+ * same signature, e.g. the same operator with different shapes, are considered similar.
+ * \param mod The module.
+ * \return The signature, or NullOpt if the module has no anchor block.
+ */
+Optional<String> AnchorBlockSignature(const IRModule& mod) {
+  const tir::BlockNode* block = tir::FindAnchorBlock(mod);
+  if (block == nullptr) {
+    return NullOpt;
+  }
+  std::ostringstream os;
+  os << block->name_hint << ";iters=";
+  for (const tir::IterVar& iter_var : block->iter_vars) {
+    os << static_cast<int>(iter_var->iter_type) << ",";
+  }
+  auto f_regions = [&os](const char* name, const Array<tir::BufferRegion>& regions) {
+    os << ";" << name << "=";
+    for (const tir::BufferRegion& region : regions) {
+      os << region->buffer->dtype << "[" << region->region.size() << "],";
+    }
+  };
+  f_regions("reads", block->reads);
+  f_regions("writes", block->writes);
+  return String(os.str());
+}
+
+/*!
+ * \brief Remove the decisions of tile size sampling from a trace, which are usually invalid when
+ * the trace is applied to a workload of different shapes.
+ * \param trace The trace.
+ * \return The trace whose tile sizes are to be re-sampled.
+ */
+tir::Trace RemoveTileDecisions(const tir::Trace& trace) {
+  static const tir::InstructionKind& inst_sample_perfect_tile =
+      tir::InstructionKind::Get("SamplePerfectTile");
+  static const tir::InstructionKind& inst_sample_partitioned_tile =
+      tir::InstructionKind::Get("SamplePartitionedTile");
+  Map<tir::Instruction, ObjectRef> decisions;
+  for (const auto& kv : trace->decisions) {
+    const tir::InstructionKind& kind = kv.first->kind;
+    if (!kind.same_as(inst_sample_perfect_tile) && !kind.same_as(inst_sample_partitioned_tile)) {
+      decisions.Set(kv.first, kv.second);
+    }
+  }
+  return tir::Trace(trace->insts, decisions);
+}
+
 /**************** Evolutionary Search ****************/
 
 /*!\brief A search strategy that generates measure candidates using evolutionary search. */
@@ -273,6 +326,12 @@ class EvolutionarySearchNode : public SearchStrategyNode {
     CostModel cost_model_{nullptr};
     /*! \brief The token registered for the given workload in database. */
     Workload token_{nullptr};
+    /*! \brief The traces of similar workloads in the database to warm-start the search. */
+    std::vector<tir::Trace> warm_start_traces_;
+    /*! \brief The schedules replayed from `warm_start_traces_`, populated on first use. */
+    std::vector<Schedule> warm_starts_;
+    /*! \brief Whether `warm_starts_` is populated. */
+    bool warm_started_ = false;
 
     explicit State(EvolutionarySearchNode* self, int max_trials, int num_trials_per_iter,
                    Array<Schedule> design_space_schedules, Database database, CostModel cost_model)
@@ -297,6 +356,10 @@ class EvolutionarySearchNode : public SearchStrategyNode {
       this->database_ = database;
       this->cost_model_ = cost_model;
       this->token_ = database->CommitWorkload(mod);
+      if (self->init_warm_start_ratio > 0.0) {
+        this->warm_start_traces_ = CollectWarmStartTraces(
+            static_cast<int>(self->population_size * self->init_warm_start_ratio));
+      }
     }
 
     /*!
@@ -305,6 +368,18 @@ class EvolutionarySearchNode : public SearchStrategyNode {
      * \return The picked best candidates.
      */
     inline std::vector<Schedule> PickBestFromDatabase(int num);
+    /*!
+     * \brief Collect the best traces of similar workloads from database, i.e. those with the same
+     *  anchor block but different shapes or fused operators, for the same kind of target.
+     * \param num The number of traces to collect.
+     * \return The traces collected, interleaved among the similar workloads.
+     */
+    inline std::vector<tir::Trace> CollectWarmStartTraces(int num);
+    /*!
+     * \brief Replay the traces of similar workloads on the workload being tuned.
+     * \return The warm-start candidates that are successfully replayed and postprocessed.
+     */
+    inline std::vector<Schedule> PickWarmStarts();
     /*!
      * \brief Sample the initial population from previous measured results and randomly generated
      *  traces via trace replaying.
@@ -377,6 +452,9 @@ class EvolutionarySearchNode : public SearchStrategyNode {
   /*** Configuration: pick states for measurement ***/
   /*! \brief The ratio of measurements to use randomly sampled states. */
   double eps_greedy;
+  /*** Configuration: warm-start ***/
+  /*! \brief The ratio of states in the initial population replayed from similar workloads */
+  double init_warm_start_ratio;
 
   void VisitAttrs(tvm::AttrVisitor* v) {
     // `context_` is not visited
@@ -396,6 +474,8 @@ class EvolutionarySearchNode : public SearchStrategyNode {
     v->Visit("genetic_max_fail_count", &genetic_max_fail_count);
     /*** Configuration: pick states for measurement ***/
     v->Visit("eps_greedy", &eps_greedy);
+    /*** Configuration: warm-start ***/
+    v->Visit("init_warm_start_ratio", &init_warm_start_ratio);
   }
 
   static constexpr const char* _type_key = "meta_schedule.EvolutionarySearch";
@@ -464,6 +544,7 @@ class EvolutionarySearchNode : public SearchStrategyNode {
     n->genetic_mutate_prob = this->genetic_mutate_prob;
     n->genetic_max_fail_count = this->genetic_max_fail_count;
     n->eps_greedy = this->eps_greedy;
+    n->init_warm_start_ratio = this->init_warm_start_ratio;
     n->ctx_ = this->ctx_;
     n->rand_state_ = this->rand_state_;
     n->state_ = nullptr;  // cleared the state
@@ -501,6 +582,108 @@ std::vector<Schedule> EvolutionarySearchNode::State::PickBestFromDatabase(int nu
   return results;
 }
 
+std::vector<tir::Trace> EvolutionarySearchNode::State::CollectWarmStartTraces(int num) {
+  auto _ = Profiler::TimedScope("EvoSearch/CollectWarmStartTraces");
+  std::vector<tir::Trace> results;
+  const TuneContextNode* ctx = self->ctx_;
+  Optional<String> signature = AnchorBlockSignature(token_->mod);
+  if (num <= 0 || !signature.defined()) {
+    return results;
+  }
+  const ModuleEquality& mod_eq = database_->GetModuleEquality();
+  // Group the valid records of similar workloads by workload, in the order of first appearance
+  std::unordered_map<Workload, int, ObjectPtrHash, ObjectPtrEqual> workload2group;
+  std::vector<std::vector<TuningRecord>> groups;
+  for (const TuningRecord& record : database_->GetAllTuningRecords()) {
+    if (!record->IsValid()) {
+      continue;
+    }
+    if (record->target.defined() && ctx->target.defined() &&
+        record->target.value()->kind->name != ctx->target.value()->kind->name) {
+      continue;
+    }
+    auto it = workload2group.find(record->workload);
+    if (it == workload2group.end()) {
+      const IRModule& mod = record->workload->mod;
+      Optional<String> other = AnchorBlockSignature(mod);
+      // Records of the workload itself are picked by `PickBestFromDatabase` instead
+      bool is_similar =
+          other.defined() && other.value() == signature.value() && !mod_eq.Equal(mod, token_->mod);
+      int group_id = is_similar ? static_cast<int>(groups.size()) : -1;
+      it = workload2group.emplace(record->workload, group_id).first;
+      if (is_similar) {
+        groups.emplace_back();
+      }
+    }
+    if (it->second != -1) {
+      groups[it->second].push_back(record);
+    }
+  }
+  // Interleave the groups, so that the best records of each similar workload come first
+  for (std::vector<TuningRecord>& group : groups) {
+    std::stable_sort(group.begin(), group.end(), SortTuningRecordByMeanRunSecs());
+  }
+  for (size_t rank = 0; static_cast<int>(results.size()) < num; ++rank) {
+    bool found = false;
+    for (const std::vector<TuningRecord>& group : groups) {
+      if (rank < group.size() && static_cast<int>(results.size()) < num) {
+        results.push_back(group[rank]->trace->Simplified(/*remove_postproc=*/true));
+        found = true;
+      }
+    }
+    if (!found) {
+      break;
+    }
+  }
+  TVM_PY_LOG(INFO, ctx->logger) << "Collected " << results.size() << " warm-start trace(s) from "
+                                << groups.size() << " similar workload(s) in database";
+  return results;
+}
+
+std::vector<Schedule> EvolutionarySearchNode::State::PickWarmStarts() {
+  if (warm_started_) {
+    return warm_starts_;
+  }
+  auto _ = Profiler::TimedScope("EvoSearch/PickWarmStarts");
+  warm_started_ = true;
+  int n = warm_start_traces_.size();
+  const Target& target = self->ctx_->target.value();
+  ThreadedTraceApply pp(self->postprocs_);
+  std::vector<Schedule> results(n, Schedule{nullptr});
+  auto f_proc_warm_start = [this, &results, &pp, &target](int thread_id, int trace_id) -> void {
+    PerThreadData& data = this->per_thread_data_.at(thread_id);
+    TRandState* rand_state = &data.rand_state;
+    const IRModule& mod = data.mod;
+    const tir::Trace& anchor_trace = warm_start_traces_.at(trace_id);
+    // Try the decisions of the anchor trace first, and then re-sample the tile sizes in case the
+    // decisions do not fit the shapes of this workload
+    for (const tir::Trace& trace : {anchor_trace, RemoveTileDecisions(anchor_trace)}) {
+      try {
+        Schedule sch =
+            Schedule::Traced(mod, /*rand_state=*/ForkSeed(rand_state), /*debug_mode=*/0,
+                             /*error_render_level=*/tir::ScheduleErrorRenderLevel::kNone);
+        ScheduleUsingAnchorTrace(sch, trace, target);
+        if (Optional<Schedule> result = pp.Apply(mod, sch->trace().value(), rand_state)) {
+          results.at(trace_id) = result.value();
+          return;
+        }
+      } catch (const std::runtime_error& e) {
+        // The trace is not applicable to this workload
+      }
+    }
+  };
+  support::parallel_for_dynamic(0, n, self->ctx_->num_threads, f_proc_warm_start);
+  for (const Schedule& sch : results) {
+    if (sch.defined()) {
+      warm_starts_.push_back(sch);
+    }
+  }
+  TVM_PY_LOG(INFO, self->ctx_->logger) << "Replayed " << warm_starts_.size() << " out of " << n
+                                       << " warm-start trace(s) on the workload";
+  warm_start_traces_.clear();
+  return warm_starts_;
+}
+
 std::vector<Schedule> EvolutionarySearchNode::State::SampleInitPopulation(int num) {
   auto _ = Profiler::TimedScope("EvoSearch/SampleInitPopulation");
   ThreadedTraceApply pp(self->postprocs_);
@@ -714,7 +897,13 @@ Optional<Array<MeasureCandidate>> EvolutionarySearchNode::State::GenerateMeasure
   std::vector<Schedule> measured = PickBestFromDatabase(pop * self->init_measured_ratio);
   TVM_PY_LOG(INFO, self->ctx_->logger)
       << "Picked top " << measured.size() << " candidate(s) from database";
-  std::vector<Schedule> unmeasured = SampleInitPopulation(pop - measured.size());
+  std::vector<Schedule> warm_starts = PickWarmStarts();
+  if (!warm_starts.empty()) {
+    TVM_PY_LOG(INFO, self->ctx_->logger)
+        << "Picked " << warm_starts.size() << " warm-start candidate(s) from similar workloads";
+  }
+  std::vector<Schedule> unmeasured =
+      SampleInitPopulation(pop - measured.size() - warm_starts.size());
   if (static_cast<int>(unmeasured.size()) < self->init_min_unmeasured) {
     TVM_PY_LOG(WARNING, self->ctx_->logger)
         << "Cannot sample enough initial population, evolutionary search failed.";
@@ -722,6 +911,7 @@ Optional<Array<MeasureCandidate>> EvolutionarySearchNode::State::GenerateMeasure
   }
   TVM_PY_LOG(INFO, self->ctx_->logger) << "Sampled " << unmeasured.size() << " candidate(s)";
   inits.insert(inits.end(), measured.begin(), measured.end());
+  inits.insert(inits.end(), warm_starts.begin(), warm_starts.end());
   inits.insert(inits.end(), unmeasured.begin(), unmeasured.end());
   std::vector<Schedule> bests = EvolveWithCostModel(inits, sample_num);
   TVM_PY_LOG(INFO, self->ctx_->logger)
@@ -755,10 +945,15 @@ SearchStrategy SearchStrategy::EvolutionarySearch(int population_size,         /
                                                   int genetic_num_iters,       //
                                                   double genetic_mutate_prob,  //
                                                   int genetic_max_fail_count,  //
-                                                  double eps_greedy) {
+                                                  double eps_greedy,           //
+                                                  double init_warm_start_ratio) {
   TVM_META_SCHEDULE_CHECK_PROB_RANGE(init_measured_ratio, "Initial measured ratio");
   TVM_META_SCHEDULE_CHECK_PROB_RANGE(genetic_mutate_prob, "Mutation probability");
   TVM_META_SCHEDULE_CHECK_PROB_RANGE(eps_greedy, "Greedy pick probability");
+  TVM_META_SCHEDULE_CHECK_PROB_RANGE(init_warm_start_ratio, "Initial warm-start ratio");
+  CHECK_LE(init_measured_ratio + init_warm_start_ratio, 1.0)
+      << "ValueError: The sum of initial measured ratio and initial warm-start ratio should be "
+         "within [0, 1]";
   ObjectPtr<EvolutionarySearchNode> n = make_object<EvolutionarySearchNode>();
   n->population_size = population_size;
   n->num_empty_iters_before_early_stop = 5;
@@ -769,6 +964,7 @@ SearchStrategy SearchStrategy::EvolutionarySearch(int population_size,         /
   n->genetic_max_fail_count = genetic_max_fail_count;
   n->genetic_mutate_prob = genetic_mutate_prob;
   n->eps_greedy = eps_greedy;
+  n->init_warm_start_ratio = init_warm_start_ratio;
   return SearchStrategy(n);
 }
 
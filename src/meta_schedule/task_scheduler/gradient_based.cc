@@ -135,12 +135,15 @@ class GradientBasedNode final : public TaskSchedulerNode {
 };
 
 TaskScheduler TaskScheduler::GradientBased(PackedFunc logger, double alpha, int window_size,
-                                           support::LinearCongruentialEngine::TRandState seed) {
+                                           support::LinearCongruentialEngine::TRandState seed,
+                                           int pipeline_depth) {
+  CHECK_GE(pipeline_depth, 0) << "ValueError: `pipeline_depth` must be non-negative";
   ObjectPtr<GradientBasedNode> n = make_object<GradientBasedNode>();
   n->logger = logger;
   n->alpha = alpha;
   n->window_size = window_size;
   n->rand_state = support::LinearCongruentialEngine::NormalizeSeed(seed);
+  n->pipeline_depth = pipeline_depth;
   return TaskScheduler(n);
 }
 
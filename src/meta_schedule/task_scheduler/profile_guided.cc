@@ -0,0 +1,238 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <limits>
+
+#include "../utils.h"
+
+namespace tvm {
+namespace meta_schedule {
+
+/*!
+ * \brief The task scheduler that allocates the trial budget to the tasks in proportion to their
+ * contribution to the end-to-end latency measured by a profiler, and their estimated headroom.
+ */
+class ProfileGuidedNode final : public TaskSchedulerNode {
+ public:
+  /*! \brief The total duration of the calls to each function in the profile. */
+  Map<String, FloatImm> profile;
+  /*! \brief The backward window size to estimate the headroom of a task. */
+  int window_size;
+  /*! \brief The headroom that a task is assumed to have at the least. */
+  double min_headroom;
+  support::LinearCongruentialEngine::TRandState rand_state;
+
+  int round_robin_rounds_;
+  int max_trials_global_;
+  /*! \brief The share of each task in the end-to-end latency. */
+  std::vector<double> latency_share_;
+  std::vector<std::vector<double>> best_latency_history_;
+
+  void VisitAttrs(tvm::AttrVisitor* v) {
+    TaskSchedulerNode::VisitAttrs(v);
+    v->Visit("profile", &profile);
+    v->Visit("window_size", &window_size);
+    v->Visit("min_headroom", &min_headroom);
+    // `rand_state` is not visited.
+    // `round_robin_rounds_` is not visited.
+    // `max_trials_global_` is not visited.
+    // `latency_share_` is not visited.
+    // `best_latency_history_` is not visited.
+  }
+
+  static constexpr const char* _type_key = "meta_schedule.ProfileGuided";
+  TVM_DECLARE_FINAL_OBJECT_INFO(ProfileGuidedNode, TaskSchedulerNode);
+
+ public:
+  void Tune(Array<TuneContext> tasks, Array<FloatImm> task_weights, int max_trials_global,
+            int max_trials_per_task, int num_trials_per_iter, Builder builder, Runner runner,
+            Array<MeasureCallback> measure_callbacks, Optional<Database> database,
+            Optional<CostModel> cost_model) final {
+    int n_tasks = tasks.size();
+    round_robin_rounds_ = 0;
+    max_trials_global_ = max_trials_global;
+    best_latency_history_.assign(n_tasks, std::vector<double>());
+    latency_share_.assign(n_tasks, 0.0);
+    // Match the tasks with the profiled functions by name
+    double total_us = 0.0;
+    std::vector<String> unmatched;
+    for (int i = 0; i < n_tasks; ++i) {
+      String task_name = tasks[i]->task_name.value_or("");
+      if (Optional<FloatImm> duration_us = profile.Get(task_name)) {
+        latency_share_[i] = duration_us.value()->value;
+        total_us += latency_share_[i];
+      } else {
+        unmatched.push_back(task_name);
+      }
+    }
+    if (total_us > 0.0) {
+      for (double& share : latency_share_) {
+        share /= total_us;
+      }
+    } else {
+      // Nothing is matched, fall back to the task weights
+      LOG(WARNING) << "None of the tasks is found in the profile, using the task weights instead";
+      double total_weight = 0.0;
+      for (const FloatImm& weight : task_weights) {
+        total_weight += weight->value;
+      }
+      for (int i = 0; i < n_tasks; ++i) {
+        latency_share_[i] =
+            total_weight > 0.0 ? task_weights[i]->value / total_weight : 1.0 / n_tasks;
+      }
+      unmatched.clear();
+    }
+    if (!unmatched.empty()) {
+      TVM_PY_LOG(WARNING, this->logger)
+          << "The following tasks are not found in the profile, and are only tuned for one round: "
+          << Array<String>(unmatched);
+    }
+    TaskSchedulerNode::Tune(tasks, task_weights, max_trials_global, max_trials_per_task,
+                            num_trials_per_iter, builder, runner, measure_callbacks, database,
+                            cost_model);
+  }
+
+  int NextTaskId() final {
+    int n_tasks = this->tasks_.size();
+    // Step 1. Check if it's in round robin mode, so that every task has a baseline.
+    if (round_robin_rounds_ == 0) {
+      TVM_PY_LOG_CLEAR_SCREEN(this->logger);
+      this->PrintTuningStatistics();
+    }
+    if (round_robin_rounds_ < n_tasks) {
+      return round_robin_rounds_++;
+    }
+    if (round_robin_rounds_ == n_tasks) {
+      for (int i = 0; i < n_tasks; ++i) {
+        if (this->tasks_[i]->runner_futures.defined()) {
+          this->JoinRunningTask(i);
+        }
+        if (latency_share_[i] == 0.0 && !this->tasks_[i]->is_terminated) {
+          this->TerminateTask(i);
+        }
+      }
+      ++round_robin_rounds_;
+    }
+    // Step 2. Collect the tasks that are not terminated yet
+    std::vector<int> tasks_alive;
+    tasks_alive.reserve(n_tasks);
+    for (int i = 0; i < n_tasks; ++i) {
+      this->TouchTask(i);
+      if (!this->tasks_[i]->is_terminated) {
+        tasks_alive.push_back(i);
+      }
+    }
+    if (tasks_alive.empty()) {
+      return -1;
+    }
+    // Step 3. Score each task alive by its current share in the end-to-end latency, i.e. the
+    // profiled share scaled by the speedup so far, times its estimated headroom.
+    std::vector<double> score;
+    score.reserve(tasks_alive.size());
+    double total_score = 0.0;
+    int total_trials = 0;
+    for (int task_id : tasks_alive) {
+      score.push_back(Score(task_id));
+      total_score += score.back();
+      total_trials += this->tasks_[task_id]->latency_ms.size();
+    }
+    // Step 4. Split the trials of the tasks alive in proportion to their scores, and select the
+    // task that falls behind its budget the most
+    int budget = total_trials + std::max(0, max_trials_global_ - NumTrialsAlready());
+    int task_id = -1;
+    double max_deficit = -std::numeric_limits<double>::infinity();
+    for (int i = 0, n = tasks_alive.size(); i < n; ++i) {
+      double task_budget = total_score > 0.0 ? budget * score[i] / total_score : 0.0;
+      double deficit = task_budget - this->tasks_[tasks_alive[i]]->latency_ms.size();
+      if (deficit > max_deficit) {
+        max_deficit = deficit;
+        task_id = tasks_alive[i];
+      }
+    }
+    if (total_score <= 0.0) {
+      task_id = tasks_alive[tir::SampleInt(&this->rand_state, 0, tasks_alive.size())];
+    }
+    if (this->tasks_[task_id]->runner_futures.defined()) {
+      JoinRunningTask(task_id);
+    }
+    return task_id;
+  }
+
+  Array<RunnerResult> JoinRunningTask(int task_id) final {
+    Array<RunnerResult> results = TaskSchedulerNode::JoinRunningTask(task_id);
+    TaskRecordNode* task = this->tasks_[task_id].get();
+    if (task->latency_ms.size() > 0) {
+      this->best_latency_history_.at(task_id).push_back(
+          *std::min_element(task->latency_ms.begin(),  //
+                            task->latency_ms.end()));
+    }
+    return results;
+  }
+
+ private:
+  int NumTrialsAlready() const {
+    int num_trials = 0;
+    for (const TaskRecord& task : this->tasks_) {
+      num_trials += task->latency_ms.size();
+    }
+    return num_trials;
+  }
+
+  double Score(int task_id) const {
+    const std::vector<double>& best_latency = this->best_latency_history_.at(task_id);
+    int n = best_latency.size();
+    if (n == 0 || best_latency[n - 1] >= 1e9) {
+      // If the best time cost is unavailable, it means some task is not valid. Skip it.
+      return 0.0;
+    }
+    double best = best_latency[n - 1];
+    // The speedup over the first round is applied to the profiled share
+    double share = latency_share_[task_id] * best / best_latency[0];
+    // The relative improvement in the last `window_size` rounds estimates the headroom, which is
+    // optimistic before there are enough rounds
+    double headroom = 1.0;
+    if (n > window_size && best_latency[n - 1 - window_size] < 1e9) {
+      headroom = (best_latency[n - 1 - window_size] - best) / best_latency[n - 1 - window_size];
+    }
+    return share * std::max(headroom, min_headroom);
+  }
+};
+
+TaskScheduler TaskScheduler::ProfileGuided(PackedFunc logger, Map<String, FloatImm> profile,
+                                           int window_size, double min_headroom,
+                                           support::LinearCongruentialEngine::TRandState seed,
+                                           int pipeline_depth) {
+  CHECK_GT(window_size, 0) << "ValueError: `window_size` must be positive";
+  CHECK_GE(min_headroom, 0.0) << "ValueError: `min_headroom` must be non-negative";
+  CHECK_GE(pipeline_depth, 0) << "ValueError: `pipeline_depth` must be non-negative";
+  ObjectPtr<ProfileGuidedNode> n = make_object<ProfileGuidedNode>();
+  n->logger = logger;
+  n->profile = profile;
+  n->window_size = window_size;
+  n->min_headroom = min_headroom;
+  n->rand_state = support::LinearCongruentialEngine::NormalizeSeed(seed);
+  n->pipeline_depth = pipeline_depth;
+  return TaskScheduler(n);
+}
+
+TVM_REGISTER_NODE_TYPE(ProfileGuidedNode);
+TVM_REGISTER_GLOBAL("meta_schedule.TaskSchedulerProfileGuided")
+    .set_body_typed(TaskScheduler::ProfileGuided);
+
+}  // namespace meta_schedule
+}  // namespace tvm
@@ -55,10 +55,12 @@ class RoundRobinNode final : public TaskSchedulerNode {
   }
 };
 
-TaskScheduler TaskScheduler::RoundRobin(PackedFunc logger) {
+TaskScheduler TaskScheduler::RoundRobin(PackedFunc logger, int pipeline_depth) {
+  CHECK_GE(pipeline_depth, 0) << "ValueError: `pipeline_depth` must be non-negative";
   ObjectPtr<RoundRobinNode> n = make_object<RoundRobinNode>();
   n->logger = logger;
   n->task_id = -1;
+  n->pipeline_depth = pipeline_depth;
   return TaskScheduler(n);
 }
 
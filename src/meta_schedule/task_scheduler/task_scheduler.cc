@@ -16,6 +16,9 @@
  * specific language governing permissions and limitations
  * under the License.
  */
+#include <memory>
+#include <sstream>
+
 #include "../utils.h"
 
 namespace tvm {
@@ -38,8 +41,7 @@ TaskRecord::TaskRecord(TuneContext ctx, double task_weight) {
   this->data_ = std::move(n);
 }
 
-void SendToBuilder(TaskRecordNode* self, const Builder& builder) {
-  auto _ = Profiler::TimedScope("SendToBuilder");
+Array<BuilderInput> MakeBuilderInputs(TaskRecordNode* self) {
   Array<MeasureCandidate> candidates = self->measure_candidates.value();
   Target target = self->ctx->target.value();
   Array<BuilderInput> inputs;
@@ -47,10 +49,54 @@ void SendToBuilder(TaskRecordNode* self, const Builder& builder) {
   for (const MeasureCandidate& candidate : candidates) {
     inputs.push_back(BuilderInput(candidate->sch->mod(), target));
   }
-  self->builder_results = builder->Build(inputs);
+  return inputs;
 }
 
-void SendToRunner(TaskRecordNode* self, const Runner& runner) {
+void SendToBuilder(TaskRecordNode* self, const Builder& builder) {
+  auto _ = Profiler::TimedScope("SendToBuilder");
+  self->builder_results = builder->Build(MakeBuilderInputs(self));
+}
+
+/*!
+ * \brief Build the measure candidates of a task in the background. The builds are done one after
+ * another in the order they are sent, so that they never compete for the builder.
+ */
+void SendToBuilderInBackground(TaskSchedulerNode* self, int task_id, const Builder& builder) {
+  auto _ = Profiler::TimedScope("SendToBuilder");
+  Array<BuilderInput> inputs = MakeBuilderInputs(self->tasks_[task_id].get());
+  std::shared_future<Array<BuilderResult>> prev;
+  if (!self->pending_builds_.empty()) {
+    prev = self->pending_builds_.back().second;
+  }
+  std::shared_future<Array<BuilderResult>> future =
+      std::async(std::launch::async, [builder, inputs, prev]() -> Array<BuilderResult> {
+        if (prev.valid()) {
+          prev.wait();
+        }
+        return builder->Build(inputs);
+      }).share();
+  self->pending_builds_.emplace_back(task_id, std::move(future));
+}
+
+/*! \brief Mark the devices busy with the measurement of a task. */
+void StartMeasuring(TaskSchedulerNode* self, int task_id) {
+  if (self->measuring_tasks_.empty()) {
+    self->device_busy_since_ = std::chrono::steady_clock::now();
+  }
+  self->measuring_tasks_.insert(task_id);
+}
+
+/*! \brief Mark the measurement of a task finished. */
+void FinishMeasuring(TaskSchedulerNode* self, int task_id) {
+  if (self->measuring_tasks_.erase(task_id) && self->measuring_tasks_.empty()) {
+    std::chrono::duration<double> busy =
+        std::chrono::steady_clock::now() - self->device_busy_since_;
+    self->device_busy_seconds_ += busy.count();
+  }
+}
+
+/*! \brief Send the candidates to the runner, and return the number of candidates sent. */
+int SendToRunner(TaskRecordNode* self, const Runner& runner) {
   auto _ = Profiler::TimedScope("SendToRunner");
   Array<MeasureCandidate> candidates = self->measure_candidates.value();
   Array<BuilderResult> builder_results = self->builder_results.value();
@@ -74,7 +120,7 @@ void SendToRunner(TaskRecordNode* self, const Runner& runner) {
   Array<RunnerFuture> futures = runner->Run(inputs);
   if (n_build_errors == 0) {
     self->runner_futures = futures;
-    return;
+    return inputs.size();
   }
   Array<RunnerFuture> results;
   results.reserve(n);
@@ -92,6 +138,95 @@ void SendToRunner(TaskRecordNode* self, const Runner& runner) {
     }
   }
   self->runner_futures = results;
+  return inputs.size();
+}
+
+/*!
+ * \brief Send the tasks built in the background to the runner, in the order they were sent to
+ * the builder. The tasks whose building results are ready are always sent.
+ * \param self The task scheduler
+ * \param runner The runner
+ * \param max_pending Wait for the builds until at most this number of tasks are pending
+ * \param task_id Wait for the builds until this task is sent, -1 means no such task
+ */
+void SendBuiltTasksToRunner(TaskSchedulerNode* self, const Runner& runner, int max_pending,
+                            int task_id = -1) {
+  std::deque<std::pair<int, std::shared_future<Array<BuilderResult>>>>& pending =
+      self->pending_builds_;
+  int num_waits = std::max(0, static_cast<int>(pending.size()) - max_pending);
+  for (int i = 0, n = pending.size(); i < n; ++i) {
+    if (pending[i].first == task_id) {
+      num_waits = std::max(num_waits, i + 1);
+    }
+  }
+  for (; !pending.empty(); --num_waits) {
+    const std::shared_future<Array<BuilderResult>>& future = pending.front().second;
+    if (num_waits <= 0 && future.wait_for(std::chrono::seconds(0)) != std::future_status::ready) {
+      break;
+    }
+    int pending_task_id = pending.front().first;
+    TaskRecordNode* task = self->tasks_[pending_task_id].get();
+    {
+      auto _ = Profiler::TimedScope("JoinBuilder");
+      task->builder_results = future.get();
+    }
+    pending.pop_front();
+    TVM_PY_LOG(INFO, self->logger) << "Sending " << task->measure_candidates.value().size()
+                                   << " sample(s) of Task #" << pending_task_id << " to runner";
+    if (SendToRunner(task, runner) > 0) {
+      StartMeasuring(self, pending_task_id);
+    }
+  }
+}
+
+/*! \brief Wait for the ongoing update of the cost model, and rethrow its error if any. */
+void WaitForUpdate(std::future<void>* update) {
+  if (update->valid()) {
+    update->get();
+  }
+}
+
+/*!
+ * \brief Wrap a cost model so that its updates run in the background. The other methods wait for
+ * the ongoing update first, so that the predictions always reflect all the previous updates.
+ * \param cost_model The cost model to be wrapped
+ * \param update The ongoing update of the cost model
+ * \return The wrapped cost model
+ */
+CostModel UpdateCostModelInBackground(CostModel cost_model,
+                                      std::shared_ptr<std::future<void>> update) {
+  return CostModel::PyCostModel(
+      /*f_load=*/
+      [cost_model, update](String path) -> void {
+        WaitForUpdate(update.get());
+        cost_model->Load(path);
+      },
+      /*f_save=*/
+      [cost_model, update](String path) -> void {
+        WaitForUpdate(update.get());
+        cost_model->Save(path);
+      },
+      /*f_update=*/
+      [cost_model, update](const TuneContext& context, const Array<MeasureCandidate>& candidates,
+                           const Array<RunnerResult>& results) -> void {
+        WaitForUpdate(update.get());
+        *update = std::async(std::launch::async, [cost_model, context, candidates, results]() {
+          cost_model->Update(context, candidates, results);
+        });
+      },
+      /*f_predict=*/
+      [cost_model, update](const TuneContext& context, const Array<MeasureCandidate>& candidates,
+                           void* p_addr) -> void {
+        WaitForUpdate(update.get());
+        std::vector<double> result = cost_model->Predict(context, candidates);
+        std::copy(result.begin(), result.end(), static_cast<double*>(p_addr));
+      },
+      /*f_as_string=*/
+      [cost_model]() -> String {
+        std::ostringstream os;
+        os << cost_model;
+        return os.str();
+      });
 }
 
 void TaskCleanUp(TaskRecordNode* self, int task_id, const Array<RunnerResult>& results) {
@@ -148,9 +283,19 @@ void TaskSchedulerNode::Tune(Array<TuneContext> ctxs, Array<FloatImm> task_weigh
   CHECK_EQ(ctxs.size(), task_weights.size()) << "ValueError: `task_weights` must have the same "
                                                 "length as `ctxs`";
   int n_tasks = this->remaining_tasks_ = ctxs.size();
+  std::shared_ptr<std::future<void>> cost_model_update = nullptr;
+  if (this->pipeline_depth > 0 && cost_model.defined()) {
+    cost_model_update = std::make_shared<std::future<void>>();
+    cost_model = UpdateCostModelInBackground(cost_model.value(), cost_model_update);
+  }
   this->measure_callbacks_ = measure_callbacks;
   this->database_ = database;
   this->cost_model_ = cost_model;
+  this->pending_builds_.clear();
+  this->measuring_tasks_.clear();
+  this->device_busy_seconds_ = 0.0;
+  this->tune_start_time_ = std::chrono::steady_clock::now();
+  this->tune_end_time_ = {};
   this->tasks_.clear();
   this->tasks_.reserve(n_tasks);
   for (int i = 0; i < n_tasks; ++i) {
@@ -181,6 +326,12 @@ void TaskSchedulerNode::Tune(Array<TuneContext> ctxs, Array<FloatImm> task_weigh
         << "TaskScheduler picks Task #" << task_id << ": " << tasks_[task_id]->ctx->task_name;
     TaskRecordNode* task = tasks_[task_id].get();
     ICHECK(!task->is_terminated);
+    if (std::any_of(pending_builds_.begin(), pending_builds_.end(),
+                    [task_id](const auto& pending) { return pending.first == task_id; })) {
+      // The results of the previous candidates of the task are needed before generating more
+      SendBuiltTasksToRunner(this, runner, this->pipeline_depth, task_id);
+      JoinRunningTask(task_id);
+    }
     ICHECK(!task->runner_futures.defined());
     if (static_cast<int>(task->latency_ms.size()) >= max_trials_per_task) {
       TerminateTask(task_id);
@@ -191,13 +342,21 @@ void TaskSchedulerNode::Tune(Array<TuneContext> ctxs, Array<FloatImm> task_weigh
       int num_candidates = candidates.value().size();
       num_trials_already += num_candidates;
       TVM_PY_LOG(INFO, this->logger) << "Sending " << num_candidates << " sample(s) to builder";
+      if (this->pipeline_depth > 0) {
+        SendToBuilderInBackground(this, task_id, builder);
+        SendBuiltTasksToRunner(this, runner, this->pipeline_depth);
+        continue;
+      }
       SendToBuilder(task, builder);
       TVM_PY_LOG(INFO, this->logger) << "Sending " << num_candidates << " sample(s) to runner";
-      SendToRunner(task, runner);
+      if (SendToRunner(task, runner) > 0) {
+        StartMeasuring(this, task_id);
+      }
     } else {
       TerminateTask(task_id);
     }
   }
+  SendBuiltTasksToRunner(this, runner, /*max_pending=*/0);
   for (int task_id = 0; task_id < n_tasks; ++task_id) {
     TaskRecordNode* task = this->tasks_[task_id].get();
     if (!task->is_terminated) {
@@ -208,6 +367,12 @@ void TaskSchedulerNode::Tune(Array<TuneContext> ctxs, Array<FloatImm> task_weigh
     }
     task->ctx->search_strategy.value()->PostTuning();
   }
+  if (cost_model_update != nullptr) {
+    WaitForUpdate(cost_model_update.get());
+  }
+  this->tune_end_time_ = std::chrono::steady_clock::now();
+  TVM_PY_LOG(INFO, this->logger) << std::fixed << std::setprecision(2)
+                                 << "Device utilization: " << DeviceUtilization() * 100 << "%";
 }
 
 Array<RunnerResult> TaskSchedulerNode::JoinRunningTask(int task_id) {
@@ -222,6 +387,7 @@ Array<RunnerResult> TaskSchedulerNode::JoinRunningTask(int task_id) {
       results.push_back(future->Result());
     }
   }
+  FinishMeasuring(this, task_id);
   ICHECK(task->measure_candidates.defined());
   task->ctx->search_strategy.value()->NotifyRunnerResults(task->measure_candidates.value(),
                                                           results);
@@ -308,8 +474,9 @@ void TaskSchedulerNode::PrintTuningStatistics() {
   }
   p.Separator();
 
-  os << "\nTotal trials: " << total_trials         //
-     << "\nTotal latency (us): " << total_latency  //
+  os << "\nTotal trials: " << total_trials                         //
+     << "\nTotal latency (us): " << total_latency                  //
+     << "\nDevice utilization (%): " << DeviceUtilization() * 100  //
      << "\n";
 
   if (using_ipython()) {
@@ -321,6 +488,21 @@ void TaskSchedulerNode::PrintTuningStatistics() {
   }
 }
 
+double TaskSchedulerNode::DeviceUtilization() const {
+  using TimePoint = std::chrono::steady_clock::time_point;
+  if (this->tune_start_time_ == TimePoint()) {
+    return 0.0;
+  }
+  TimePoint now = this->tune_end_time_ == TimePoint() ? std::chrono::steady_clock::now()  //
+                                                      : this->tune_end_time_;
+  double busy = this->device_busy_seconds_;
+  if (!this->measuring_tasks_.empty()) {
+    busy += std::chrono::duration<double>(now - this->device_busy_since_).count();
+  }
+  double total = std::chrono::duration<double>(now - this->tune_start_time_).count();
+  return total > 0.0 ? std::min(1.0, busy / total) : 0.0;
+}
+
 TaskScheduler TaskScheduler::PyTaskScheduler(
     PackedFunc logger, PyTaskSchedulerNode::FNextTaskId f_next_task_id,
     PyTaskSchedulerNode::FJoinRunningTask f_join_running_task, PyTaskSchedulerNode::FTune f_tune) {
@@ -378,6 +560,8 @@ TVM_REGISTER_GLOBAL("meta_schedule.TaskSchedulerTouchTask")
     .set_body_method<TaskScheduler>(&TaskSchedulerNode::TouchTask);
 TVM_REGISTER_GLOBAL("meta_schedule.TaskSchedulerPrintTuningStatistics")
     .set_body_method<TaskScheduler>(&TaskSchedulerNode::PrintTuningStatistics);
+TVM_REGISTER_GLOBAL("meta_schedule.TaskSchedulerDeviceUtilization")
+    .set_body_method<TaskScheduler>(&TaskSchedulerNode::DeviceUtilization);
 
 }  // namespace meta_schedule
 }  // namespace tvm
@@ -0,0 +1,350 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+/*!
+ * \file src/runtime/memory/buddy_allocator.h
+ * \brief An allocator with power-of-two size classes, which splits and coalesces blocks.
+ */
+#ifndef TVM_RUNTIME_MEMORY_BUDDY_ALLOCATOR_H_
+#define TVM_RUNTIME_MEMORY_BUDDY_ALLOCATOR_H_
+
+#include <tvm/runtime/device_api.h>
+#include <tvm/runtime/memory/memory_manager.h>
+
+#include <algorithm>
+#include <map>
+#include <mutex>
+#include <set>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+namespace tvm {
+namespace runtime {
+namespace memory {
+
+/*!
+ * \brief A buddy allocator.
+ *
+ * Memory is requested from the device in power-of-two sized arenas. Each allocation is served
+ * by a block of the smallest power-of-two size class that fits. A larger free block is split
+ * in halves until it is of the size class, and a freed block is merged with its free buddy
+ * repeatedly, so that the memory freed by allocations of one size can be reused by allocations
+ * of other sizes. The arenas which are entirely free are kept for reuse until trimmed.
+ *
+ * Blocks are addressed by offsets into their arenas, so that only the devices whose data
+ * pointers can be offset are supported. The arenas are aligned to kArenaAlignment, so that every
+ * block is aligned to it as well. The allocations requiring a larger alignment are requested from
+ * the device directly.
+ */
+class BuddyAllocator : public Allocator {
+ public:
+  /*! \brief The size of the smallest size class. */
+  static constexpr size_t kMinBlockSize = 256;
+  /*! \brief The default size of the arenas requested from the device. */
+  static constexpr size_t kDefaultArenaSize = 1 << 24;
+  /*!
+   * \brief The alignment of the arenas, which is the largest alignment supported by the blocks.
+   * It is no larger than the alignment guaranteed by the GPU device APIs.
+   */
+  static constexpr size_t kArenaAlignment = kMinBlockSize;
+
+  /*! \brief The statistics of the allocator, in bytes unless otherwise stated. */
+  struct Stats {
+    /*! \brief The memory requested from the device. */
+    size_t reserved_bytes = 0;
+    /*! \brief The memory of the blocks in use. */
+    size_t allocated_bytes = 0;
+    /*! \brief The memory requested by the allocations in use. */
+    size_t requested_bytes = 0;
+    /*! \brief The high watermark of reserved_bytes. */
+    size_t peak_reserved_bytes = 0;
+    /*! \brief The high watermark of allocated_bytes. */
+    size_t peak_allocated_bytes = 0;
+    /*! \brief The largest free block, i.e. the largest allocation served without new arenas. */
+    size_t largest_free_block_bytes = 0;
+    /*! \brief The number of arenas. */
+    size_t num_arenas = 0;
+    /*! \brief The number of allocations in use. */
+    size_t num_allocations = 0;
+
+    /*! \brief The fraction of the blocks in use wasted by rounding up to the size classes. */
+    double InternalFragmentation() const {
+      return allocated_bytes == 0 ? 0.0
+                                  : 1.0 - static_cast<double>(requested_bytes) /
+                                              static_cast<double>(allocated_bytes);
+    }
+    /*! \brief The fraction of the free memory not in the largest free block. */
+    double ExternalFragmentation() const {
+      size_t free_bytes = reserved_bytes - allocated_bytes;
+      return free_bytes == 0 ? 0.0
+                             : 1.0 - static_cast<double>(largest_free_block_bytes) /
+                                         static_cast<double>(free_bytes);
+    }
+  };
+
+  explicit BuddyAllocator(size_t arena_size = kDefaultArenaSize)
+      : Allocator(kBuddy), arena_order_(OrderOf(arena_size)) {}
+
+  ~BuddyAllocator() { Trim(0); }
+
+  Buffer Alloc(Device dev, size_t nbytes, size_t alignment, DLDataType type_hint) override {
+    std::lock_guard<std::recursive_mutex> lock(mu_);
+    CHECK(SupportsOffset(dev)) << "ValueError: BuddyAllocator cannot split the memory of " << dev
+                               << ", whose data pointers cannot be offset. "
+                               << "Please use the pooled allocator instead.";
+    Buffer buf;
+    buf.device = dev;
+    buf.alloc_type = kBuddy;
+    if (alignment > kArenaAlignment) {
+      // The blocks are only aligned to the arenas, so fall back to the device
+      buf.size = nbytes;
+      buf.data = DeviceAllocDataSpace(dev, nbytes, alignment, type_hint);
+      direct_allocs_[buf.data] = nbytes;
+      stats_.reserved_bytes += nbytes;
+      stats_.peak_reserved_bytes = std::max(stats_.peak_reserved_bytes, stats_.reserved_bytes);
+      stats_.allocated_bytes += nbytes;
+      stats_.requested_bytes += nbytes;
+      stats_.peak_allocated_bytes = std::max(stats_.peak_allocated_bytes, stats_.allocated_bytes);
+      VLOG(1) << "allocate " << nbytes << " B aligned to " << alignment << " B from the device";
+      return buf;
+    }
+    int order = OrderOf(nbytes);
+    std::pair<int64_t, size_t> block;
+    if (!PopFreeBlock(order, &block)) {
+      NewArena(dev, std::max(order, arena_order_), type_hint);
+      ICHECK(PopFreeBlock(order, &block));
+    }
+    buf.size = BlockSize(order);
+    buf.data = static_cast<char*>(arenas_.at(block.first).data) + block.second;
+    live_blocks_[buf.data] = LiveBlock{block.first, block.second, order, nbytes};
+    stats_.allocated_bytes += buf.size;
+    stats_.requested_bytes += nbytes;
+    stats_.peak_allocated_bytes = std::max(stats_.peak_allocated_bytes, stats_.allocated_bytes);
+    VLOG(1) << "allocate " << buf.size << " B for " << nbytes << " B, allocated memory "
+            << stats_.allocated_bytes << " B";
+    return buf;
+  }
+
+  Buffer Alloc(Device dev, ShapeTuple shape, DLDataType type_hint,
+               const std::string& mem_scope) override {
+    if (AllowMemoryScope(mem_scope)) {
+      return Allocator::Alloc(dev, shape, type_hint, mem_scope);
+    }
+    LOG(FATAL) << "This alloc should be implemented";
+    return {};
+  }
+
+  void Free(const Buffer& buffer) override {
+    std::lock_guard<std::recursive_mutex> lock(mu_);
+    auto direct_it = direct_allocs_.find(buffer.data);
+    if (direct_it != direct_allocs_.end()) {
+      DeviceFreeDataSpace(buffer.device, buffer.data);
+      stats_.reserved_bytes -= direct_it->second;
+      stats_.allocated_bytes -= direct_it->second;
+      stats_.requested_bytes -= direct_it->second;
+      direct_allocs_.erase(direct_it);
+      return;
+    }
+    auto it = live_blocks_.find(buffer.data);
+    ICHECK(it != live_blocks_.end()) << "BuddyAllocator frees a buffer not allocated by itself";
+    LiveBlock block = it->second;
+    live_blocks_.erase(it);
+    stats_.allocated_bytes -= BlockSize(block.order);
+    stats_.requested_bytes -= block.nbytes;
+    // Merge the block with its buddy as long as the buddy is free
+    int arena_order = arenas_.at(block.arena).order;
+    while (block.order < arena_order) {
+      auto buddy =
+          free_blocks_[block.order].find({block.arena, block.offset ^ BlockSize(block.order)});
+      if (buddy == free_blocks_[block.order].end()) {
+        break;
+      }
+      free_blocks_[block.order].erase(buddy);
+      block.offset &= ~BlockSize(block.order);
+      ++block.order;
+    }
+    free_blocks_[block.order].insert({block.arena, block.offset});
+    VLOG(1) << "reclaim buffer " << buffer.size;
+  }
+
+  void Clear() override { Trim(0); }
+
+  size_t UsedMemory() const override {
+    std::lock_guard<std::recursive_mutex> lock(mu_);
+    return stats_.reserved_bytes;
+  }
+
+  /*!
+   * \brief Return the arenas which are entirely free to the device, until the reserved memory
+   * is no more than the watermark.
+   * \param watermark_bytes The reserved memory to trim to.
+   * \return The memory returned to the device.
+   */
+  size_t Trim(size_t watermark_bytes) {
+    std::lock_guard<std::recursive_mutex> lock(mu_);
+    size_t released = 0;
+    for (auto it = arenas_.begin();
+         it != arenas_.end() && stats_.reserved_bytes > watermark_bytes;) {
+      const Arena& arena = it->second;
+      auto& free_blocks = free_blocks_[arena.order];
+      auto free_it = free_blocks.find({it->first, 0});
+      if (free_it == free_blocks.end()) {
+        ++it;
+        continue;
+      }
+      free_blocks.erase(free_it);
+      DeviceFreeDataSpace(arena.device, arena.data);
+      stats_.reserved_bytes -= BlockSize(arena.order);
+      released += BlockSize(arena.order);
+      it = arenas_.erase(it);
+    }
+    VLOG(1) << "trim " << released << " B, reserved memory " << stats_.reserved_bytes << " B";
+    return released;
+  }
+
+  /*! \brief Return the statistics of the allocator. */
+  Stats GetStats() const {
+    std::lock_guard<std::recursive_mutex> lock(mu_);
+    Stats stats = stats_;
+    stats.num_arenas = arenas_.size();
+    stats.num_allocations = live_blocks_.size() + direct_allocs_.size();
+    for (int order = static_cast<int>(free_blocks_.size()) - 1; order >= 0; --order) {
+      if (!free_blocks_[order].empty()) {
+        stats.largest_free_block_bytes = BlockSize(order);
+        break;
+      }
+    }
+    return stats;
+  }
+
+ protected:
+  virtual void* DeviceAllocDataSpace(Device dev, size_t nbytes, size_t alignment,
+                                     DLDataType type_hint) {
+    return DeviceAPI::Get(dev)->AllocDataSpace(dev, nbytes, alignment, type_hint);
+  }
+
+  virtual void DeviceFreeDataSpace(Device dev, void* ptr) {
+    DeviceAPI::Get(dev)->FreeDataSpace(dev, ptr);
+  }
+
+ private:
+  /*! \brief A piece of memory requested from the device. */
+  struct Arena {
+    void* data;
+    int order;
+    Device device;
+  };
+
+  /*! \brief A block in use. */
+  struct LiveBlock {
+    int64_t arena;
+    size_t offset;
+    int order;
+    size_t nbytes;
+  };
+
+  static size_t BlockSize(int order) { return kMinBlockSize << order; }
+
+  /*! \brief The smallest size class that fits the given size. */
+  static int OrderOf(size_t nbytes) {
+    int order = 0;
+    while (BlockSize(order) < nbytes) {
+      ++order;
+    }
+    return order;
+  }
+
+  static bool SupportsOffset(Device dev) {
+    switch (static_cast<int>(dev.device_type)) {
+      case kDLCPU:
+      case kDLCUDA:
+      case kDLCUDAHost:
+      case kDLCUDAManaged:
+      case kDLROCM:
+      case kDLROCMHost:
+        return true;
+      default:
+        return false;
+    }
+  }
+
+  /*! \brief Take the lowest free block of the size class, splitting a larger one if needed. */
+  bool PopFreeBlock(int order, std::pair<int64_t, size_t>* block) {
+    int found = order;
+    while (found < static_cast<int>(free_blocks_.size()) && free_blocks_[found].empty()) {
+      ++found;
+    }
+    if (found >= static_cast<int>(free_blocks_.size())) {
+      return false;
+    }
+    *block = *free_blocks_[found].begin();
+    free_blocks_[found].erase(free_blocks_[found].begin());
+    // Split the block in halves, keeping the lower half and freeing the upper one
+    while (found > order) {
+      --found;
+      free_blocks_[found].insert({block->first, block->second + BlockSize(found)});
+    }
+    return true;
+  }
+
+  void NewArena(Device dev, int order, DLDataType type_hint) {
+    size_t size = BlockSize(order);
+    size_t alignment = kArenaAlignment;
+    void* data;
+    try {
+      data = DeviceAllocDataSpace(dev, size, alignment, type_hint);
+    } catch (InternalError& err) {
+      LOG(WARNING) << "BuddyAllocator got InternalError during allocation: " << err.message();
+      LOG(WARNING) << "Trying to release all unused memory and reallocate...";
+      Trim(0);
+      data = DeviceAllocDataSpace(dev, size, alignment, type_hint);
+    }
+    int64_t arena = next_arena_++;
+    arenas_[arena] = Arena{data, order, dev};
+    if (static_cast<int>(free_blocks_.size()) <= order) {
+      free_blocks_.resize(order + 1);
+    }
+    free_blocks_[order].insert({arena, 0});
+    stats_.reserved_bytes += size;
+    stats_.peak_reserved_bytes = std::max(stats_.peak_reserved_bytes, stats_.reserved_bytes);
+    VLOG(1) << "new arena of " << size << " B, reserved memory " << stats_.reserved_bytes << " B";
+  }
+
+  /*! \brief The size class of the arenas. */
+  int arena_order_;
+  /*! \brief The id of the next arena. */
+  int64_t next_arena_ = 0;
+  /*! \brief The arenas by their ids. */
+  std::map<int64_t, Arena> arenas_;
+  /*! \brief The free blocks of each size class, as pairs of the arena id and the offset. */
+  std::vector<std::set<std::pair<int64_t, size_t>>> free_blocks_;
+  /*! \brief The blocks in use by their data pointers. */
+  std::unordered_map<void*, LiveBlock> live_blocks_;
+  /*! \brief The sizes of the allocations requested from the device directly. */
+  std::unordered_map<void*, size_t> direct_allocs_;
+  Stats stats_;
+  mutable std::recursive_mutex mu_;
+};
+
+}  // namespace memory
+}  // namespace runtime
+}  // namespace tvm
+
+#endif  // TVM_RUNTIME_MEMORY_BUDDY_ALLOCATOR_H_
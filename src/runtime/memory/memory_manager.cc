@@ -21,12 +21,24 @@
  * \file tvm/runtime/memory/memory_manager.cc
  * \brief Allocate and manage memory for the runtime.
  */
+#define PICOJSON_USE_INT64
+#ifndef __STDC_FORMAT_MACROS
+#define __STDC_FORMAT_MACROS
+#endif
+#include <picojson.h>
 #include <tvm/runtime/memory/memory_manager.h>
 #include <tvm/runtime/registry.h>
 
+#include <algorithm>
+#include <atomic>
+#include <map>
 #include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
 #include <utility>
 
+#include "buddy_allocator.h"
 #include "naive_allocator.h"
 #include "pooled_allocator.h"
 
@@ -38,6 +50,7 @@ static void BufferDeleter(Object* obj) {
   auto* ptr = static_cast<NDArray::Container*>(obj);
   ICHECK(ptr->manager_ctx != nullptr);
   Buffer* buffer = reinterpret_cast<Buffer*>(ptr->manager_ctx);
+  AllocationTracker::OnFree(*buffer);
   MemoryManager::GetAllocator(buffer->device, buffer->alloc_type)->Free(*(buffer));
   delete buffer;
   delete ptr;
@@ -47,6 +60,7 @@ Storage::Storage(Buffer buffer, Allocator* allocator) {
   auto n = make_object<StorageObj>();
   n->buffer = std::move(buffer);
   n->allocator = allocator;
+  AllocationTracker::OnAlloc(n->buffer);
   data_ = std::move(n);
 }
 
@@ -147,6 +161,11 @@ Allocator* MemoryManager::GetOrCreateAllocator(Device dev, AllocatorType type) {
         alloc.reset(new PooledAllocator());
         break;
       }
+      case kBuddy: {
+        VLOG(1) << "New buddy allocator for " << dev;
+        alloc.reset(new BuddyAllocator());
+        break;
+      }
       default:
         LOG(FATAL) << "Unknown allocator type: " << type;
     }
@@ -176,6 +195,17 @@ Allocator* MemoryManager::GetAllocator(Device dev, AllocatorType type) {
   return it->second.at(type).get();
 }
 
+Allocator* MemoryManager::FindAllocator(Device dev, AllocatorType type) {
+  MemoryManager* m = MemoryManager::Global();
+  std::lock_guard<std::mutex> lock(m->mu_);
+  auto it = m->allocators_.find(dev);
+  if (it == m->allocators_.end()) {
+    return nullptr;
+  }
+  auto alloc_it = it->second.find(type);
+  return alloc_it == it->second.end() ? nullptr : alloc_it->second.get();
+}
+
 void MemoryManager::Clear() {
   MemoryManager* m = MemoryManager::Global();
   std::lock_guard<std::mutex> lock(m->mu_);
@@ -201,6 +231,7 @@ NDArray Allocator::Empty(ShapeTuple shape, DLDataType dtype, DLDevice dev,
   }
   container->manager_ctx = reinterpret_cast<void*>(buffer);
   container->dl_tensor.data = buffer->data;
+  AllocationTracker::OnAlloc(*buffer);
   return NDArray(GetObjectPtr<Object>(container));
 }
 
@@ -228,7 +259,219 @@ void Allocator::Clear() {
   // Pooled allocator will override this method.
 }
 
+/*!
+ * \brief Trim the buddy allocator of the device to the watermark.
+ * \return The memory returned to the device.
+ */
+int64_t TrimBuddyAllocator(Device dev, int64_t watermark_bytes) {
+  Allocator* alloc = MemoryManager::FindAllocator(dev, kBuddy);
+  if (alloc == nullptr) {
+    return 0;
+  }
+  return static_cast<BuddyAllocator*>(alloc)->Trim(static_cast<size_t>(watermark_bytes));
+}
+
+/*! \brief The statistics of the tracked allocations of an allocator. */
+struct TrackedAllocatorStats {
+  int64_t live_bytes = 0;
+  int64_t peak_bytes = 0;
+  int64_t num_allocs = 0;
+  int64_t num_frees = 0;
+  /*! \brief The allocation counts by the power-of-two upper bounds of their sizes. */
+  std::map<size_t, int64_t> allocs_by_size;
+};
+
+/*! \brief A tracked allocation which is not freed yet. */
+struct TrackedAllocation {
+  Device device;
+  AllocatorType alloc_type;
+  size_t size;
+  std::string site;
+};
+
+struct AllocationTrackerState {
+  std::atomic<bool> enabled{false};
+  /*! \brief The number of live tracked allocations, so that frees are looked up only if needed. */
+  std::atomic<int64_t> num_live{0};
+  std::mutex mu;
+  std::unordered_map<Device, std::map<AllocatorType, TrackedAllocatorStats>> stats;
+  std::unordered_map<const void*, TrackedAllocation> live;
+
+  static AllocationTrackerState* Global() {
+    // NOTE: explicitly use new to avoid exit-time destruction of global state
+    static auto* inst = new AllocationTrackerState();
+    return inst;
+  }
+};
+
+static thread_local const std::string* current_allocation_site = nullptr;
+
+bool AllocationTracker::Enabled() {
+  return AllocationTrackerState::Global()->enabled.load(std::memory_order_relaxed);
+}
+
+void AllocationTracker::SetEnabled(bool enabled) {
+  AllocationTrackerState::Global()->enabled.store(enabled, std::memory_order_relaxed);
+}
+
+void AllocationTracker::OnAlloc(const Buffer& buffer) {
+  AllocationTrackerState* state = AllocationTrackerState::Global();
+  if (!state->enabled.load(std::memory_order_relaxed)) {
+    return;
+  }
+  const std::string* site = AllocationSiteScope::Current();
+  std::lock_guard<std::mutex> lock(state->mu);
+  TrackedAllocatorStats& stats = state->stats[buffer.device][buffer.alloc_type];
+  stats.live_bytes += buffer.size;
+  stats.peak_bytes = std::max(stats.peak_bytes, stats.live_bytes);
+  ++stats.num_allocs;
+  size_t bucket = 1;
+  while (bucket < buffer.size) {
+    bucket <<= 1;
+  }
+  ++stats.allocs_by_size[bucket];
+  auto [it, inserted] = state->live.emplace(
+      buffer.data, TrackedAllocation{buffer.device, buffer.alloc_type, buffer.size,
+                                     site != nullptr ? *site : std::string()});
+  if (inserted) {
+    state->num_live.fetch_add(1, std::memory_order_relaxed);
+  } else {
+    it->second = TrackedAllocation{buffer.device, buffer.alloc_type, buffer.size,
+                                   site != nullptr ? *site : std::string()};
+  }
+}
+
+void AllocationTracker::OnFree(const Buffer& buffer) {
+  AllocationTrackerState* state = AllocationTrackerState::Global();
+  if (state->num_live.load(std::memory_order_relaxed) == 0) {
+    return;
+  }
+  std::lock_guard<std::mutex> lock(state->mu);
+  auto it = state->live.find(buffer.data);
+  if (it == state->live.end()) {
+    return;
+  }
+  TrackedAllocatorStats& stats = state->stats[it->second.device][it->second.alloc_type];
+  stats.live_bytes -= it->second.size;
+  ++stats.num_frees;
+  state->live.erase(it);
+  state->num_live.fetch_sub(1, std::memory_order_relaxed);
+}
+
+void AllocationTracker::Reset() {
+  AllocationTrackerState* state = AllocationTrackerState::Global();
+  std::lock_guard<std::mutex> lock(state->mu);
+  state->stats.clear();
+  state->live.clear();
+  state->num_live.store(0, std::memory_order_relaxed);
+}
+
+AllocationSiteScope::AllocationSiteScope(std::string site)
+    : site_(std::move(site)), prev_(current_allocation_site) {
+  current_allocation_site = &site_;
+}
+
+AllocationSiteScope::~AllocationSiteScope() { current_allocation_site = prev_; }
+
+const std::string* AllocationSiteScope::Current() { return current_allocation_site; }
+
+const std::pair<AllocatorType, const char*> kAllocatorTypeNames[] = {
+    {kNaive, "naive"}, {kPooled, "pooled"}, {kBuddy, "buddy"}};
+
+/*! \brief Return the statistics reported by an allocator. */
+picojson::object AllocatorStatsAsJSON(Allocator* alloc) {
+  picojson::object stats;
+  stats["used_bytes"] = picojson::value(static_cast<int64_t>(alloc->UsedMemory()));
+  if (alloc->type() == kBuddy) {
+    BuddyAllocator::Stats buddy = static_cast<BuddyAllocator*>(alloc)->GetStats();
+    stats["reserved_bytes"] = picojson::value(static_cast<int64_t>(buddy.reserved_bytes));
+    stats["allocated_bytes"] = picojson::value(static_cast<int64_t>(buddy.allocated_bytes));
+    stats["requested_bytes"] = picojson::value(static_cast<int64_t>(buddy.requested_bytes));
+    stats["peak_reserved_bytes"] = picojson::value(static_cast<int64_t>(buddy.peak_reserved_bytes));
+    stats["peak_allocated_bytes"] =
+        picojson::value(static_cast<int64_t>(buddy.peak_allocated_bytes));
+    stats["largest_free_block_bytes"] =
+        picojson::value(static_cast<int64_t>(buddy.largest_free_block_bytes));
+    stats["num_arenas"] = picojson::value(static_cast<int64_t>(buddy.num_arenas));
+    stats["num_allocations"] = picojson::value(static_cast<int64_t>(buddy.num_allocations));
+    stats["internal_fragmentation"] = picojson::value(buddy.InternalFragmentation());
+    stats["external_fragmentation"] = picojson::value(buddy.ExternalFragmentation());
+  }
+  return stats;
+}
+
+/*! \brief Return the statistics of the allocators of the device in JSON. */
+std::string GetAllocatorStats(Device dev) {
+  picojson::object result;
+  for (const auto& [type, name] : kAllocatorTypeNames) {
+    if (Allocator* alloc = MemoryManager::FindAllocator(dev, type)) {
+      result[name] = picojson::value(AllocatorStatsAsJSON(alloc));
+    }
+  }
+  return picojson::value(result).serialize();
+}
+
+/*!
+ * \brief Return the statistics of the allocators of the device in JSON, including the
+ * statistics of the tracked allocations.
+ */
+std::string GetMemoryStats(Device dev) {
+  AllocationTrackerState* state = AllocationTrackerState::Global();
+  std::lock_guard<std::mutex> lock(state->mu);
+  auto dev_stats = state->stats.find(dev);
+  picojson::object allocators;
+  for (const auto& [type, name] : kAllocatorTypeNames) {
+    Allocator* alloc = MemoryManager::FindAllocator(dev, type);
+    const TrackedAllocatorStats* tracked = nullptr;
+    if (dev_stats != state->stats.end() && dev_stats->second.count(type)) {
+      tracked = &dev_stats->second.at(type);
+    }
+    if (alloc == nullptr && tracked == nullptr) {
+      continue;
+    }
+    picojson::object stats = alloc != nullptr ? AllocatorStatsAsJSON(alloc) : picojson::object();
+    if (tracked != nullptr) {
+      stats["live_bytes"] = picojson::value(tracked->live_bytes);
+      stats["peak_bytes"] = picojson::value(tracked->peak_bytes);
+      stats["num_allocs"] = picojson::value(tracked->num_allocs);
+      stats["num_frees"] = picojson::value(tracked->num_frees);
+      picojson::object allocs_by_size;
+      for (const auto& [bucket, count] : tracked->allocs_by_size) {
+        allocs_by_size[std::to_string(bucket)] = picojson::value(count);
+      }
+      stats["allocs_by_size"] = picojson::value(allocs_by_size);
+      // The live allocations by their sites, which point to the leaks
+      std::map<std::string, std::pair<int64_t, int64_t>> sites;
+      for (const auto& [data, allocation] : state->live) {
+        if (allocation.device == dev && allocation.alloc_type == type) {
+          auto& [bytes, count] = sites[allocation.site.empty() ? "<unknown>" : allocation.site];
+          bytes += allocation.size;
+          count += 1;
+        }
+      }
+      picojson::object live_by_site;
+      for (const auto& [site, bytes_count] : sites) {
+        picojson::object site_stats;
+        site_stats["bytes"] = picojson::value(bytes_count.first);
+        site_stats["count"] = picojson::value(bytes_count.second);
+        live_by_site[site] = picojson::value(site_stats);
+      }
+      stats["live_by_site"] = picojson::value(live_by_site);
+    }
+    allocators[name] = picojson::value(stats);
+  }
+  picojson::object result;
+  result["tracking"] = picojson::value(state->enabled.load(std::memory_order_relaxed));
+  result["allocators"] = picojson::value(allocators);
+  return picojson::value(result).serialize();
+}
+
 TVM_REGISTER_GLOBAL("vm.builtin.memory_manager.clear").set_body_typed(MemoryManager::Clear);
+TVM_REGISTER_GLOBAL("vm.builtin.memory_manager.trim").set_body_typed(TrimBuddyAllocator);
+TVM_REGISTER_GLOBAL("vm.builtin.memory_manager.stats").set_body_typed(GetAllocatorStats);
+TVM_REGISTER_GLOBAL("runtime.MemoryStats").set_body_typed(GetMemoryStats);
+TVM_REGISTER_GLOBAL("runtime.SetMemoryTracking").set_body_typed(AllocationTracker::SetEnabled);
+TVM_REGISTER_GLOBAL("runtime.ResetMemoryStats").set_body_typed(AllocationTracker::Reset);
 
 }  // namespace memory
 }  // namespace runtime
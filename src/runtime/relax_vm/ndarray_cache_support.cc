@@ -39,10 +39,26 @@
 #define __STDC_FORMAT_MACROS
 #endif
 #include <picojson.h>
+#include <tvm/runtime/device_api.h>
 #include <tvm/runtime/ndarray.h>
 #include <tvm/runtime/registry.h>
 #include <tvm/runtime/relax_vm/ndarray_cache_support.h>
+#include <tvm/runtime/threading_backend.h>
 
+#ifndef _WIN32
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+#include <algorithm>
+#include <cerrno>
+#include <chrono>
+#include <cstring>
+#include <deque>
+#include <future>
+#include <memory>
 #include <string>
 #include <vector>
 
@@ -165,24 +181,134 @@ void CopyNDArrayFromBytes(NDArray param, const void* data, size_t nbytes,
   TVMSynchronize(device.device_type, device.device_id, nullptr);
 }
 
-NDArray NDArrayCacheMetadata::FileRecord::ParamRecord::Load(
-    Device device, const std::string* raw_data, Optional<NDArray>* staging_buffer) const {
-  NDArray arr = NDArray::Empty(shape, dtype, device);
-  if (dtype == DataType::Float(32) && format == "f32-to-bf16") {
-    // decode bf16 to f32
-    std::vector<uint16_t> buffer(nbytes / 2);
-    std::vector<uint32_t> decoded(nbytes / 2);
-    std::memcpy(buffer.data(), raw_data->data() + byte_offset, nbytes);
-    for (size_t i = 0; i < buffer.size(); ++i) {
-      decoded[i] = static_cast<uint32_t>(buffer[i]) << 16;
-    }
+using ParamRecord = NDArrayCacheMetadata::FileRecord::ParamRecord;
+
+/*! \brief Whether a parameter is to be decoded before copied to the device. */
+bool NeedsDecoding(const ParamRecord& rec) {
+  return rec.dtype == DataType::Float(32) && rec.format == "f32-to-bf16";
+}
+
+/*! \brief Decode the bf16 values of a parameter to f32. */
+std::vector<uint32_t> DecodeBF16ToF32(const char* data, int64_t nbytes) {
+  std::vector<uint16_t> buffer(nbytes / 2);
+  std::vector<uint32_t> decoded(nbytes / 2);
+  std::memcpy(buffer.data(), data, nbytes);
+  for (size_t i = 0; i < buffer.size(); ++i) {
+    decoded[i] = static_cast<uint32_t>(buffer[i]) << 16;
+  }
+  return decoded;
+}
+
+/*! \brief Load a parameter from the raw data of its shard. */
+NDArray LoadParamFromBytes(const ParamRecord& rec, Device device, const char* raw_data,
+                           Optional<NDArray>* staging_buffer) {
+  NDArray arr = NDArray::Empty(rec.shape, rec.dtype, device);
+  if (NeedsDecoding(rec)) {
+    std::vector<uint32_t> decoded = DecodeBF16ToF32(raw_data + rec.byte_offset, rec.nbytes);
     CopyNDArrayFromBytes(arr, decoded.data(), decoded.size() * sizeof(uint32_t), staging_buffer);
   } else {
-    CopyNDArrayFromBytes(arr, raw_data->data() + byte_offset, nbytes, staging_buffer);
+    CopyNDArrayFromBytes(arr, raw_data + rec.byte_offset, rec.nbytes, staging_buffer);
   }
   return arr;
 }
 
+NDArray NDArrayCacheMetadata::FileRecord::ParamRecord::Load(
+    Device device, const std::string* raw_data, Optional<NDArray>* staging_buffer) const {
+  return LoadParamFromBytes(*this, device, raw_data->data(), staging_buffer);
+}
+
+/*!
+ * \brief A shard file mapped into memory, which is unmapped when the last parameter viewing it
+ * is freed.
+ */
+class MappedFile {
+ public:
+  MappedFile(const std::string& path, bool prefetch) {
+#ifdef _WIN32
+    LOG(FATAL) << "ValueError: Memory-mapped loading of ndarray cache is not supported on Windows";
+#else
+    int fd = open(path.c_str(), O_RDONLY);
+    CHECK_NE(fd, -1) << "ValueError: Cannot open " << path << ": " << strerror(errno);
+    struct stat st;
+    if (fstat(fd, &st) != 0) {
+      close(fd);
+      LOG(FATAL) << "ValueError: Cannot stat " << path << ": " << strerror(errno);
+    }
+    size_ = static_cast<size_t>(st.st_size);
+    if (size_ != 0) {
+      // The pages are mapped privately and writable, so that writing to a parameter
+      // only copies the written pages, and never changes the file.
+      void* data = mmap(nullptr, size_, PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, 0);
+      close(fd);
+      CHECK(data != MAP_FAILED) << "ValueError: Cannot map " << path << ": " << strerror(errno);
+      data_ = static_cast<char*>(data);
+      if (prefetch) {
+        madvise(data_, size_, MADV_WILLNEED);
+      }
+    } else {
+      close(fd);
+    }
+#endif
+  }
+
+  ~MappedFile() {
+#ifndef _WIN32
+    if (data_ != nullptr) {
+      munmap(data_, size_);
+    }
+#endif
+  }
+
+  char* data() const { return data_; }
+  size_t size() const { return size_; }
+
+ private:
+  char* data_ = nullptr;
+  size_t size_ = 0;
+};
+
+/*! \brief The DLPack context of a parameter viewing a mapped file. */
+struct MappedParamContext {
+  std::shared_ptr<MappedFile> file;
+  std::vector<int64_t> shape;
+  DLManagedTensor tensor;
+};
+
+/*! \brief Whether a parameter can be a zero-copy view of its mapped shard. */
+bool CanViewMappedParam(const ParamRecord& rec, const MappedFile& file) {
+  if (NeedsDecoding(rec)) {
+    return false;
+  }
+  int64_t expected_nbytes = (rec.dtype.bits() * rec.dtype.lanes() + 7) / 8;
+  for (int64_t d : rec.shape) {
+    expected_nbytes *= d;
+  }
+  const char* data = file.data() + rec.byte_offset;
+  return expected_nbytes == rec.nbytes &&
+         rec.byte_offset + rec.nbytes <= static_cast<int64_t>(file.size()) &&
+         reinterpret_cast<size_t>(data) % kAllocAlignment == 0;
+}
+
+NDArray ViewMappedParam(const ParamRecord& rec, Device device,
+                        const std::shared_ptr<MappedFile>& file) {
+  MappedParamContext* ctx = new MappedParamContext();
+  ctx->file = file;
+  ctx->shape.assign(rec.shape.begin(), rec.shape.end());
+  DLTensor* tensor = &ctx->tensor.dl_tensor;
+  tensor->data = file->data() + rec.byte_offset;
+  tensor->device = device;
+  tensor->ndim = static_cast<int>(ctx->shape.size());
+  tensor->dtype = rec.dtype;
+  tensor->shape = ctx->shape.data();
+  tensor->strides = nullptr;
+  tensor->byte_offset = 0;
+  ctx->tensor.manager_ctx = ctx;
+  ctx->tensor.deleter = [](DLManagedTensor* self) {
+    delete static_cast<MappedParamContext*>(self->manager_ctx);
+  };
+  return NDArray::FromDLPack(&ctx->tensor);
+}
+
 TVM_DLL Array<NDArray> NDArrayCacheMetadata::FileRecord::Load(
     Device device,
     const std::string& path_prefix,  //
@@ -201,6 +327,116 @@ TVM_DLL Array<NDArray> NDArrayCacheMetadata::FileRecord::Load(
   return result;
 }
 
+/*! \brief The time spent in each phase of loading an ndarray cache. */
+struct NDArrayCacheLoadTimings {
+  /*! \brief The time spent reading the shards, summed over the reading threads. */
+  double read_sec = 0;
+  /*! \brief The time the loading thread waits for the shards to be read. */
+  double read_wait_sec = 0;
+  /*! \brief The time spent decoding the parameters. */
+  double decode_sec = 0;
+  /*! \brief The time spent creating the parameters and copying them to the device. */
+  double copy_sec = 0;
+  /*! \brief The wall time of loading. */
+  double total_sec = 0;
+
+  std::string AsJSON(int64_t num_shards, int64_t read_ahead) const {
+    picojson::object obj;
+    obj["num_shards"] = picojson::value(num_shards);
+    obj["read_ahead"] = picojson::value(read_ahead);
+    obj["read_sec"] = picojson::value(read_sec);
+    obj["read_wait_sec"] = picojson::value(read_wait_sec);
+    obj["decode_sec"] = picojson::value(decode_sec);
+    obj["copy_sec"] = picojson::value(copy_sec);
+    obj["total_sec"] = picojson::value(total_sec);
+    return picojson::value(obj).serialize();
+  }
+};
+
+double SecondsSince(std::chrono::steady_clock::time_point tstart) {
+  return std::chrono::duration<double>(std::chrono::steady_clock::now() - tstart).count();
+}
+
+/*! \brief The content of a shard file, which is either read into memory or mapped. */
+struct ShardData {
+  std::string buffer;
+  std::shared_ptr<MappedFile> mapped;
+  /*! \brief The time spent reading the shard. */
+  double read_sec = 0;
+
+  const char* data() const { return mapped != nullptr ? mapped->data() : buffer.data(); }
+  size_t size() const { return mapped != nullptr ? mapped->size() : buffer.size(); }
+};
+
+/*! \brief Read a shard file, which is thread-safe. */
+ShardData ReadShard(const NDArrayCacheMetadata::FileRecord& shard_rec,
+                    const std::string& path_prefix, bool use_mmap, bool prefetch) {
+  auto tstart = std::chrono::steady_clock::now();
+  CHECK_EQ(shard_rec.format, "raw-shard") << "ValueError: Only `raw-shard` format is supported";
+  ShardData shard;
+  std::string path = path_prefix + "/" + shard_rec.data_path;
+  if (use_mmap) {
+    shard.mapped = std::make_shared<MappedFile>(path, prefetch);
+  } else {
+    LoadBinaryFromFile(path, &shard.buffer);
+  }
+  CHECK_EQ(shard_rec.nbytes, shard.size())
+      << "ValueError: Encountered an corrupted parameter shard. It means it is not downloaded "
+         "completely or downloading is interrupted. Please try to download again.";
+  shard.read_sec = SecondsSince(tstart);
+  return shard;
+}
+
+/*!
+ * \brief Create the parameters of a shard on the device. The parameters to be decoded
+ * are decoded in parallel with the threading backend, before copied one by one.
+ */
+Array<NDArray> LoadShard(const NDArrayCacheMetadata::FileRecord& shard_rec, Device device,
+                         const ShardData& shard, Optional<NDArray>* staging_buffer,
+                         NDArrayCacheLoadTimings* timings) {
+  const std::vector<ParamRecord>& records = shard_rec.records;
+  auto tstart = std::chrono::steady_clock::now();
+  std::vector<std::vector<uint32_t>> decoded(records.size());
+  std::vector<size_t> to_decode;
+  for (size_t i = 0; i < records.size(); ++i) {
+    if (NeedsDecoding(records[i])) {
+      to_decode.push_back(i);
+    }
+  }
+  if (!to_decode.empty()) {
+    parallel_for_with_threading_backend(
+        [&](int64_t j) {
+          const ParamRecord& rec = records[to_decode[j]];
+          decoded[to_decode[j]] = DecodeBF16ToF32(shard.data() + rec.byte_offset, rec.nbytes);
+        },
+        0, to_decode.size());
+  }
+  timings->decode_sec += SecondsSince(tstart);
+
+  tstart = std::chrono::steady_clock::now();
+  Array<NDArray> result;
+  result.reserve(records.size());
+  for (size_t i = 0; i < records.size(); ++i) {
+    const ParamRecord& rec = records[i];
+    if (shard.mapped != nullptr && device.device_type == kDLCPU &&
+        CanViewMappedParam(rec, *shard.mapped)) {
+      result.push_back(ViewMappedParam(rec, device, shard.mapped));
+      continue;
+    }
+    NDArray arr = NDArray::Empty(rec.shape, rec.dtype, device);
+    if (NeedsDecoding(rec)) {
+      CopyNDArrayFromBytes(arr, decoded[i].data(), decoded[i].size() * sizeof(uint32_t),
+                           staging_buffer);
+      std::vector<uint32_t>().swap(decoded[i]);
+    } else {
+      CopyNDArrayFromBytes(arr, shard.data() + rec.byte_offset, rec.nbytes, staging_buffer);
+    }
+    result.push_back(arr);
+  }
+  timings->copy_sec += SecondsSince(tstart);
+  return result;
+}
+
 /*!
  * A NDArray cache to store pre-loaded arrays in the system.
  */
@@ -241,16 +477,49 @@ class NDArrayCache {
    * \param cache_path The cache to path.
    * \param device_type The type of device to be loaded.
    * \param device_id The device id.
+   * \param use_mmap Whether to map the shard files into memory instead of reading them.
+   * On CPU, the parameters are zero-copy views of the mapped files.
+   * \param prefetch Whether to hint the OS to read the mapped files ahead.
+   * \param read_ahead The number of shards read concurrently ahead of the one being copied to
+   * the device, each of which is held in memory until copied. Defaults to kDefaultReadAhead when
+   * non-positive. The parameters of a shard are decoded by the threading backend regardless.
+   * \return The time spent in each phase of loading, in JSON.
    */
-  static void Load(const std::string& cache_path, int device_type, int device_id) {
+  static std::string Load(const std::string& cache_path, int device_type, int device_id,
+                          bool use_mmap = false, bool prefetch = false, int read_ahead = 0) {
+    auto tstart = std::chrono::steady_clock::now();
     DLDevice device{static_cast<DLDeviceType>(device_type), device_id};
     NDArrayCacheMetadata metadata = NDArrayCacheMetadata::Load(cache_path);
+    const std::vector<NDArrayCacheMetadata::FileRecord>& shard_recs = metadata.records;
+    if (read_ahead <= 0) {
+      read_ahead = kDefaultReadAhead;
+    }
+    read_ahead = std::max(1, std::min<int>(read_ahead, shard_recs.size()));
+    NDArrayCacheLoadTimings timings;
     Optional<NDArray> staging_buffer;
-    std::string raw_data;
-    Array<NDArray> params;
-    for (const NDArrayCacheMetadata::FileRecord& shard_rec : metadata.records) {
+    // The shards being read, so that the shards are read while the previous ones are decoded
+    // and copied to the device
+    std::deque<std::future<ShardData>> pending;
+    size_t next_shard = 0;
+    auto read_ahead = [&]() {
+      while (next_shard < shard_recs.size() && pending.size() < static_cast<size_t>(read_ahead)) {
+        const NDArrayCacheMetadata::FileRecord* shard_rec = &shard_recs[next_shard++];
+        pending.push_back(std::async(std::launch::async, [=]() {
+          return ReadShard(*shard_rec, cache_path, use_mmap, prefetch);
+        }));
+      }
+    };
+    read_ahead();
+    for (const NDArrayCacheMetadata::FileRecord& shard_rec : shard_recs) {
+      Array<NDArray> params;
       try {
-        params = shard_rec.Load(device, cache_path, &raw_data, &staging_buffer);
+        auto twait = std::chrono::steady_clock::now();
+        ShardData shard = pending.front().get();
+        pending.pop_front();
+        timings.read_wait_sec += SecondsSince(twait);
+        timings.read_sec += shard.read_sec;
+        read_ahead();
+        params = LoadShard(shard_rec, device, shard, &staging_buffer, &timings);
       } catch (const dmlc::Error& e) {
         LOG(FATAL) << "ValueError: Error when loading parameters from " << shard_rec.data_path
                    << ": " << e.what();
@@ -260,8 +529,16 @@ class NDArrayCache {
         Update(shard_rec.records[i].name, params[i], true);
       }
     }
+    timings.total_sec = SecondsSince(tstart);
+    return timings.AsJSON(shard_recs.size(), read_ahead);
   }
 
+  /*!
+   * \brief The default number of shards read ahead, which is kept small to bound the memory
+   * held by the shards not copied to the device yet.
+   */
+  static constexpr int kDefaultReadAhead = 2;
+
  private:
   Map<String, NDArray> pool_;
 };
@@ -291,7 +568,17 @@ TVM_REGISTER_GLOBAL("vm.builtin.ndarray_cache.update").set_body([](TVMArgs args,
 });
 TVM_REGISTER_GLOBAL("vm.builtin.ndarray_cache.remove").set_body_typed(NDArrayCache::Remove);
 TVM_REGISTER_GLOBAL("vm.builtin.ndarray_cache.clear").set_body_typed(NDArrayCache::Clear);
-TVM_REGISTER_GLOBAL("vm.builtin.ndarray_cache.load").set_body_typed(NDArrayCache::Load);
+TVM_REGISTER_GLOBAL("vm.builtin.ndarray_cache.load").set_body([](TVMArgs args, TVMRetValue* rv) {
+  CHECK(args.size() >= 3 && args.size() <= 6)
+      << "ValueError: Expect 3 to 6 arguments: cache_path, device_type, device_id, "
+         "[use_mmap, prefetch, read_ahead], but get "
+      << args.size();
+  std::string cache_path = args[0];
+  bool use_mmap = args.size() > 3 ? static_cast<bool>(args[3]) : false;
+  bool prefetch = args.size() > 4 ? static_cast<bool>(args[4]) : false;
+  int read_ahead = args.size() > 5 ? static_cast<int>(args[5]) : 0;
+  *rv = NDArrayCache::Load(cache_path, args[1], args[2], use_mmap, prefetch, read_ahead);
+});
 
 // This param module node can be useful to get param dict in RPC mode
 // when the remote already have loaded parameters from file.
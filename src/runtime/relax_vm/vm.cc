@@ -193,6 +193,32 @@ struct VMFrame {
   }
 };
 
+/*!
+ * \brief An instruction linked ahead of time, which runs a call without looking up
+ *  the callee or filling the arguments other than registers.
+ * \sa VirtualMachineImpl::Prelink
+ */
+struct LinkedInstruction {
+  /*! \brief The decoded instruction. */
+  Instruction instr;
+  /*!
+   * \brief The function called by a call instruction, which is either the PackedFunc
+   *  or the implementation of the VM closure kept alive by the function pool.
+   */
+  const PackedFuncObj* callee{nullptr};
+  /*!
+   * \brief The argument value stack of a call instruction, with the VM context pointer
+   *  of a closure, the immediates, the constants and the functions filled at link time.
+   */
+  std::vector<TVMValue> call_arg_values;
+  /*! \brief The argument tcode stack of a call instruction. */
+  std::vector<int> call_arg_tcodes;
+  /*! \brief The arguments read from registers, as pairs of stack index and register. */
+  std::vector<std::pair<Index, RegName>> reg_args;
+  /*! \brief Whether the argument stack is used by a call in progress. */
+  bool active{false};
+};
+
 class VirtualMachineImpl : public VirtualMachine {
  public:
   //---------------------------------------------------
@@ -216,6 +242,7 @@ class VirtualMachineImpl : public VirtualMachine {
   void _InvokeClosure(TVMArgs args, TVMRetValue* rv);
   void _InvokeClosureStateful(std::string func_name);
   void _SetInstrument(TVMArgs args, TVMRetValue* rv);
+  void _Prelink(TVMArgs args, TVMRetValue* rv);
   void _GetOutputArity(TVMArgs args, TVMRetValue* rv);
   void _GetOutput(TVMArgs args, TVMRetValue* rv);
   void _SetInputWithoutParamModule(TVMArgs args, TVMRetValue* rv);
@@ -230,6 +257,7 @@ class VirtualMachineImpl : public VirtualMachine {
   TVM_MODULE_VTABLE_ENTRY_PACKED("invoke_closure", &VirtualMachineImpl::_InvokeClosure);
   TVM_MODULE_VTABLE_ENTRY("invoke_stateful", &VirtualMachineImpl::_InvokeClosureStateful);
   TVM_MODULE_VTABLE_ENTRY_PACKED("set_instrument", &VirtualMachineImpl::_SetInstrument);
+  TVM_MODULE_VTABLE_ENTRY_PACKED("prelink", &VirtualMachineImpl::_Prelink);
   TVM_MODULE_VTABLE_ENTRY_PACKED("get_output_arity", &VirtualMachineImpl::_GetOutputArity);
   TVM_MODULE_VTABLE_ENTRY_PACKED("get_output", &VirtualMachineImpl::_GetOutput);
   TVM_MODULE_VTABLE_ENTRY_PACKED("set_input", &VirtualMachineImpl::_SetInputWithoutParamModule);
@@ -305,6 +333,13 @@ class VirtualMachineImpl : public VirtualMachine {
    * \return The object representing the result.
    */
   RegType InvokeBytecode(Index fidx, const std::vector<RegType>& args);
+  /*!
+   * \brief Link the instructions ahead of time, after which the calls are dispatched
+   *  directly to the resolved functions with argument stacks preallocated per instruction.
+   * \note The calls fall back to RunInstrCall while an instrument is set or the
+   *  allocations are tracked.
+   */
+  void Prelink();
 
  protected:
   /*!
@@ -400,6 +435,22 @@ class VirtualMachineImpl : public VirtualMachine {
    */
   virtual void RunInstrCall(VMFrame* curr_frame, Instruction inst);
 
+  /*!
+   * \brief Run call instruction linked ahead of time.
+   * \param curr_frame The current frame.
+   * \param linked The linked call instruction.
+   */
+  void RunLinkedCall(VMFrame* curr_frame, LinkedInstruction* linked);
+
+  /*!
+   * \brief Whether the dispatch loop runs the linked instructions.
+   * \return True if the instructions are linked, and no instrumentation needs RunInstrCall.
+   */
+  virtual bool UseLinkedInstructions() {
+    return !linked_instrs_.empty() && instrument_ == nullptr &&
+           !memory::AllocationTracker::Enabled();
+  }
+
   /*! \brief Run VM dispatch loop. */
   void RunLoop();
 
@@ -410,6 +461,24 @@ class VirtualMachineImpl : public VirtualMachine {
    */
   const std::string& GetFuncName(int idx) { return exec_->func_table[idx].name; }
 
+  /*!
+   * \brief Describe the call instruction at the current pc, to which its allocations are
+   * attributed when they are tracked.
+   * \param instr The call instruction.
+   * \return The caller, the pc and the callee, e.g. "main@3:vm.builtin.alloc_storage".
+   */
+  std::string GetAllocationSite(const Instruction& instr) {
+    std::string caller = "<unknown>";
+    for (const VMFuncInfo& info : exec_->func_table) {
+      if (info.kind == VMFuncInfo::FuncKind::kVMFunc && info.start_instr <= pc_ &&
+          pc_ < info.end_instr) {
+        caller = info.name;
+        break;
+      }
+    }
+    return caller + "@" + std::to_string(pc_) + ":" + GetFuncName(instr.func_idx);
+  }
+
   /*!
    * \brief Retrieve the inputs for a function.
    * \param func_name The name of the function.
@@ -432,6 +501,10 @@ class VirtualMachineImpl : public VirtualMachine {
    * \brief Function pool to cache functions in func_table
    */
   std::vector<TVMRetValue> func_pool_;
+  /*!
+   * \brief The instructions linked by Prelink indexed by pc, empty if not linked.
+   */
+  std::vector<LinkedInstruction> linked_instrs_;
   //--------------------------------------------------------
   // Executor interface support
   //--------------------------------------------------------
@@ -717,8 +790,81 @@ void VirtualMachineImpl::InitFuncPool() {
   }
 }
 
+void VirtualMachineImpl::Prelink() {
+  ICHECK_EQ(func_pool_.size(), exec_->func_table.size())
+      << "The VM must be initialized before linking the instructions.";
+  std::vector<LinkedInstruction> linked_instrs(exec_->instr_offset.size());
+  for (const VMFuncInfo& info : exec_->func_table) {
+    if (info.kind != VMFuncInfo::FuncKind::kVMFunc) continue;
+    for (Index pc = info.start_instr; pc < info.end_instr; ++pc) {
+      LinkedInstruction& linked = linked_instrs[pc];
+      linked.instr = exec_->GetInstruction(pc);
+      const Instruction& instr = linked.instr;
+      if (instr.op != Opcode::Call) continue;
+      ICHECK(instr.dst >= Instruction::kBeginSpecialReg || instr.dst < info.register_file_size)
+          << "Invalid destination register " << instr.dst << " in " << info.name;
+      ICHECK_LT(static_cast<size_t>(instr.func_idx), func_pool_.size());
+      // Resolve the callee, where a closure takes the VM context pointer before the arguments.
+      ObjectRef func = func_pool_[instr.func_idx];
+      int args_begin_offset = 0;
+      if (const auto* packed = func.as<PackedFunc::ContainerType>()) {
+        linked.callee = packed;
+      } else {
+        const auto* clo = func.as<VMClosureObj>();
+        ICHECK(clo != nullptr) << "Function expects a closure or PackedFunc ";
+        linked.callee = clo->impl.as<PackedFunc::ContainerType>();
+        args_begin_offset = 1;
+      }
+      linked.call_arg_values.resize(args_begin_offset + instr.num_args);
+      linked.call_arg_tcodes.resize(args_begin_offset + instr.num_args);
+      runtime::TVMArgsSetter setter(linked.call_arg_values.data(), linked.call_arg_tcodes.data());
+      if (args_begin_offset != 0) {
+        setter(0, static_cast<void*>(static_cast<VirtualMachine*>(this)));
+      }
+      for (Index i = 0; i < instr.num_args; ++i) {
+        Instruction::Arg arg = instr.args[i];
+        int arg_index = args_begin_offset + i;
+        switch (arg.kind()) {
+          case Instruction::ArgKind::kRegister: {
+            if (arg.value() < Instruction::kBeginSpecialReg) {
+              ICHECK_LT(arg.value(), info.register_file_size)
+                  << "Invalid argument register " << arg.value() << " in " << info.name;
+              linked.reg_args.emplace_back(arg_index, arg.value());
+            } else {
+              // The special registers do not depend on the frame.
+              setter(arg_index, ReadRegister(nullptr, arg.value()));
+            }
+            break;
+          }
+          case Instruction::ArgKind::kImmediate: {
+            setter(arg_index, arg.value());
+            break;
+          }
+          case Instruction::ArgKind::kConstIdx: {
+            setter(arg_index, this->const_pool_[arg.value()]);
+            break;
+          }
+          case Instruction::ArgKind::kFuncIdx: {
+            ICHECK_LT(static_cast<size_t>(arg.value()), this->func_pool_.size());
+            setter(arg_index, this->func_pool_[arg.value()]);
+            break;
+          }
+          default: {
+            LOG(FATAL) << "ValueError: Unknown argument kind: " << int(arg.kind());
+          }
+        }
+      }
+    }
+  }
+  linked_instrs_ = std::move(linked_instrs);
+}
+
 void VirtualMachineImpl::RunInstrCall(VMFrame* curr_frame, Instruction instr) {
   DLOG(INFO) << "\n  pc = " << pc_ << ", execute: " << GetFuncName(instr.func_idx);
+  std::optional<memory::AllocationSiteScope> alloc_site;
+  if (memory::AllocationTracker::Enabled()) {
+    alloc_site.emplace(GetAllocationSite(instr));
+  }
   int args_begin_offset = instrument_ != nullptr ? 4 : 0;
   // Use the call arg stack from the current frame to increase reuse
   // and avoid re-allocation
@@ -803,15 +949,51 @@ void VirtualMachineImpl::RunInstrCall(VMFrame* curr_frame, Instruction instr) {
   pc_++;
 }
 
+void VirtualMachineImpl::RunLinkedCall(VMFrame* curr_frame, LinkedInstruction* linked) {
+  if (linked->active) {
+    // The instruction is re-entered by its own call, whose arguments are still in use.
+    this->RunInstrCall(curr_frame, linked->instr);
+    return;
+  }
+  TVMValue* values = linked->call_arg_values.data();
+  int* tcodes = linked->call_arg_tcodes.data();
+  runtime::TVMArgsSetter setter(values, tcodes);
+  // Pass the registers without copying them, as the frame keeps them alive during the call.
+  for (const auto& [arg_index, reg] : linked->reg_args) {
+    setter(arg_index, curr_frame->register_file[reg]);
+  }
+  TVMRetValue ret;
+  {
+    struct ActiveGuard {
+      bool* active;
+      ~ActiveGuard() { *active = false; }
+    } guard{&linked->active};
+    linked->active = true;
+    linked->callee->CallPacked(TVMArgs(values, tcodes, linked->call_arg_values.size()), &ret);
+  }
+  // save the return value to the register
+  // saving to special register is a NOP
+  if (linked->instr.dst < Instruction::kBeginSpecialReg) {
+    curr_frame->register_file[linked->instr.dst] = std::move(ret);
+  }
+  // increment pc
+  pc_++;
+}
+
 void VirtualMachineImpl::RunLoop() {
   VMFrame* curr_frame = frames_.back().get();
+  bool use_linked_instrs = this->UseLinkedInstructions();
 
   while (true) {
     ICHECK_LT(static_cast<size_t>(pc_), exec_->instr_offset.size()) << "run into invalid section";
-    Instruction instr = exec_->GetInstruction(pc_);
+    Instruction instr = use_linked_instrs ? linked_instrs_[pc_].instr : exec_->GetInstruction(pc_);
     switch (instr.op) {
       case Opcode::Call: {
-        this->RunInstrCall(curr_frame, instr);
+        if (use_linked_instrs) {
+          this->RunLinkedCall(curr_frame, &linked_instrs_[pc_]);
+        } else {
+          this->RunInstrCall(curr_frame, instr);
+        }
         break;
       }
       case Opcode::Ret: {
@@ -907,6 +1089,8 @@ void VirtualMachineImpl::_SetInstrument(TVMArgs args, TVMRetValue* rv) {
   }
 }
 
+void VirtualMachineImpl::_Prelink(TVMArgs args, TVMRetValue* rv) { this->Prelink(); }
+
 void VirtualMachineImpl::_GetOutputArity(TVMArgs args, TVMRetValue* rv) {
   std::string func_name = args[0];
   RegType out = LookupVMOutput(func_name);
@@ -1072,6 +1256,11 @@ class VirtualMachineProfiler : public VirtualMachineImpl {
     }
   }
 
+  bool UseLinkedInstructions() override {
+    // The calls are profiled by RunInstrCall.
+    return !(prof_ && prof_->IsRunning()) && VirtualMachineImpl::UseLinkedInstructions();
+  }
+
  private:
   std::optional<profiling::Profiler> prof_;
 };
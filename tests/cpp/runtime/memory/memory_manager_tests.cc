@@ -20,9 +20,11 @@
 #include <gmock/gmock.h>
 #include <gtest/gtest.h>
 #include <tvm/runtime/memory/memory_manager.h>
+#include <tvm/runtime/registry.h>
 
 #include <exception>
 
+#include "../../../../src/runtime/memory/buddy_allocator.h"
 #include "../../../../src/runtime/memory/pooled_allocator.h"
 
 namespace tvm {
@@ -150,6 +152,153 @@ TEST_F(TvmVMMemoryManagerTest, PooledAllocWithShape) {
   }
 }
 
+TEST_F(TvmVMMemoryManagerTest, BuddyAllocBasic) {
+  Device dev = {kDLCPU, 0};
+  Allocator* allocator = MemoryManagerWrapper::GetOrCreateAllocator(dev, kBuddy);
+  EXPECT_EQ(allocator->UsedMemory(), 0);
+  auto buff = allocator->Alloc(dev, 300, 32, DataType::Float(32));
+  EXPECT_EQ(buff.size, 512);
+  EXPECT_EQ(allocator->UsedMemory(), BuddyAllocator::kDefaultArenaSize);
+  allocator->Free(buff);
+  EXPECT_EQ(allocator->UsedMemory(), BuddyAllocator::kDefaultArenaSize);
+  allocator->Clear();
+  EXPECT_EQ(allocator->UsedMemory(), 0);
+}
+
+TEST_F(TvmVMMemoryManagerTest, BuddySplitAndCoalesce) {
+  Device dev = {kDLCPU, 0};
+  BuddyAllocator allocator(4096);
+  // Split the arena of 4096 bytes into blocks of 1024, 1024 and 2048 bytes
+  auto a = allocator.Alloc(dev, 1000, 64, DataType::Float(32));
+  auto b = allocator.Alloc(dev, 1024, 64, DataType::Float(32));
+  auto c = allocator.Alloc(dev, 2048, 64, DataType::Float(32));
+  EXPECT_EQ(allocator.GetStats().num_arenas, 1);
+  EXPECT_EQ(static_cast<char*>(b.data) - static_cast<char*>(a.data), 1024);
+  EXPECT_EQ(static_cast<char*>(c.data) - static_cast<char*>(a.data), 2048);
+  EXPECT_EQ(allocator.GetStats().largest_free_block_bytes, 0);
+  EXPECT_EQ(allocator.GetStats().requested_bytes, 1000 + 1024 + 2048);
+  // The freed buddies of 1024 bytes are merged and serve an allocation of 2048 bytes
+  allocator.Free(a);
+  allocator.Free(b);
+  EXPECT_EQ(allocator.GetStats().largest_free_block_bytes, 2048);
+  auto d = allocator.Alloc(dev, 1500, 64, DataType::Float(32));
+  EXPECT_EQ(d.data, a.data);
+  EXPECT_EQ(allocator.GetStats().num_arenas, 1);
+  // A larger allocation takes a new arena of its own size class
+  auto e = allocator.Alloc(dev, 8192, 64, DataType::Float(32));
+  BuddyAllocator::Stats stats = allocator.GetStats();
+  EXPECT_EQ(stats.num_arenas, 2);
+  EXPECT_EQ(stats.reserved_bytes, 4096 + 8192);
+  EXPECT_EQ(stats.allocated_bytes, 2048 + 2048 + 8192);
+  EXPECT_EQ(stats.peak_allocated_bytes, 2048 + 2048 + 8192);
+  allocator.Free(c);
+  allocator.Free(d);
+  allocator.Free(e);
+  stats = allocator.GetStats();
+  EXPECT_EQ(stats.allocated_bytes, 0);
+  EXPECT_EQ(stats.largest_free_block_bytes, 8192);
+  EXPECT_EQ(stats.peak_reserved_bytes, 4096 + 8192);
+}
+
+TEST_F(TvmVMMemoryManagerTest, BuddyTrim) {
+  Device dev = {kDLCPU, 0};
+  BuddyAllocator allocator(4096);
+  auto a = allocator.Alloc(dev, 4096, 64, DataType::Float(32));
+  auto b = allocator.Alloc(dev, 4096, 64, DataType::Float(32));
+  auto c = allocator.Alloc(dev, 4096, 64, DataType::Float(32));
+  EXPECT_EQ(allocator.UsedMemory(), 3 * 4096);
+  allocator.Free(a);
+  allocator.Free(b);
+  // Only the free arenas are released, and no more than needed to reach the watermark
+  EXPECT_EQ(allocator.Trim(2 * 4096), 4096);
+  EXPECT_EQ(allocator.UsedMemory(), 2 * 4096);
+  EXPECT_EQ(allocator.Trim(0), 4096);
+  EXPECT_EQ(allocator.UsedMemory(), 4096);
+  allocator.Free(c);
+  EXPECT_EQ(allocator.Trim(0), 4096);
+  EXPECT_EQ(allocator.UsedMemory(), 0);
+}
+
+TEST_F(TvmVMMemoryManagerTest, BuddyAlignment) {
+  Device dev = {kDLCPU, 0};
+  BuddyAllocator allocator(4096);
+  // The blocks of an arena created by a request of a small alignment keep the arena alignment
+  auto a = allocator.Alloc(dev, 256, 4, DataType::Float(32));
+  auto b = allocator.Alloc(dev, 256, BuddyAllocator::kArenaAlignment, DataType::Float(32));
+  EXPECT_EQ(reinterpret_cast<uintptr_t>(a.data) % BuddyAllocator::kArenaAlignment, 0);
+  EXPECT_EQ(reinterpret_cast<uintptr_t>(b.data) % BuddyAllocator::kArenaAlignment, 0);
+  EXPECT_EQ(allocator.GetStats().num_arenas, 1);
+  // A larger alignment is served by the device directly
+  size_t alignment = 4 * BuddyAllocator::kArenaAlignment;
+  auto c = allocator.Alloc(dev, 256, alignment, DataType::Float(32));
+  EXPECT_EQ(reinterpret_cast<uintptr_t>(c.data) % alignment, 0);
+  BuddyAllocator::Stats stats = allocator.GetStats();
+  EXPECT_EQ(stats.num_arenas, 1);
+  EXPECT_EQ(stats.num_allocations, 3);
+  EXPECT_EQ(stats.reserved_bytes, 4096 + 256);
+  allocator.Free(c);
+  EXPECT_EQ(allocator.UsedMemory(), 4096);
+  allocator.Free(a);
+  allocator.Free(b);
+  EXPECT_EQ(allocator.Trim(0), 4096);
+  EXPECT_EQ(allocator.UsedMemory(), 0);
+}
+
+TEST_F(TvmVMMemoryManagerTest, BuddyEmptyBasic) {
+  Device dev = {kDLCPU, 0};
+  Allocator* allocator = MemoryManagerWrapper::GetOrCreateAllocator(dev, kBuddy);
+  auto dt = DataType::Float(32);
+  ShapeTuple shape = {1, 3, 6, 6};
+  {
+    auto ndarray = allocator->Empty(shape, dt, dev);
+    EXPECT_EQ(static_cast<BuddyAllocator*>(allocator)->GetStats().requested_bytes,
+              1 * 3 * 6 * 6 * dt.bytes());
+  }
+  EXPECT_EQ(static_cast<BuddyAllocator*>(allocator)->GetStats().allocated_bytes, 0);
+  EXPECT_EQ(allocator->UsedMemory(), BuddyAllocator::kDefaultArenaSize);
+  allocator->Clear();
+}
+
+TEST_F(TvmVMMemoryManagerTest, AllocationTracking) {
+  Device dev = {kDLCPU, 0};
+  Allocator* allocator = MemoryManagerWrapper::GetOrCreateAllocator(dev, kNaive);
+  const PackedFunc* fstats = Registry::Get("runtime.MemoryStats");
+  ASSERT_NE(fstats, nullptr);
+  AllocationTracker::Reset();
+  // Allocations are not recorded until tracking is enabled
+  Storage untracked(allocator->Alloc(dev, 64, 32, DataType::Float(32)), allocator);
+  AllocationTracker::SetEnabled(true);
+  EXPECT_TRUE(AllocationTracker::Enabled());
+  {
+    AllocationSiteScope site("main@1:vm.builtin.alloc_storage");
+    EXPECT_EQ(*AllocationSiteScope::Current(), "main@1:vm.builtin.alloc_storage");
+    Storage storage(allocator->Alloc(dev, 100, 32, DataType::Float(32)), allocator);
+    auto ndarray = allocator->Empty({4, 8}, DataType::Float(32), dev);
+    std::string stats = (*fstats)(dev);
+    EXPECT_NE(stats.find("\"live_bytes\":228"), std::string::npos) << stats;
+    EXPECT_NE(stats.find("\"main@1:vm.builtin.alloc_storage\":{\"bytes\":228,\"count\":2}"),
+              std::string::npos)
+        << stats;
+  }
+  EXPECT_EQ(AllocationSiteScope::Current(), nullptr);
+  {
+    Storage leaked(allocator->Alloc(dev, 1000, 32, DataType::Float(32)), allocator);
+    AllocationTracker::SetEnabled(false);
+    EXPECT_FALSE(AllocationTracker::Enabled());
+    std::string stats = (*fstats)(dev);
+    EXPECT_NE(stats.find("\"<unknown>\":{\"bytes\":1000,\"count\":1}"), std::string::npos) << stats;
+    EXPECT_NE(stats.find("\"peak_bytes\":1000"), std::string::npos) << stats;
+    EXPECT_NE(stats.find("\"num_allocs\":3"), std::string::npos) << stats;
+    EXPECT_NE(stats.find("\"allocs_by_size\":{\"1024\":1,\"128\":2}"), std::string::npos) << stats;
+    EXPECT_NE(stats.find("\"tracking\":false"), std::string::npos) << stats;
+  }
+  // The frees of the tracked allocations are recorded after tracking is disabled
+  std::string stats = (*fstats)(dev);
+  EXPECT_NE(stats.find("\"live_bytes\":0"), std::string::npos) << stats;
+  EXPECT_NE(stats.find("\"num_frees\":3"), std::string::npos) << stats;
+  AllocationTracker::Reset();
+}
+
 TEST_F(TvmVMMemoryManagerTest, NaiveAllocOpenCLTexture) {
   bool enabled = tvm::runtime::RuntimeEnabled("opencl");
   if (!enabled) {
@@ -20,6 +20,7 @@
 import tempfile
 
 import numpy as np
+import pytest
 
 import tvm
 from tvm import auto_scheduler
@@ -79,6 +80,44 @@ def test_xgb_model():
     model.load(tmpfile)
 
 
+def test_xgb_model_incremental_training_and_artifact():
+    task, inputs, results = get_sample_records(50)
+    states = [x.state for x in inputs]
+
+    model = auto_scheduler.XGBModel(num_warmup_sample=-1, incremental_training=True)
+    model.update(inputs[:30], results[:30])
+    assert model.last_full_train_length == 30
+    model.update(inputs[30:], results[30:])
+    # the second update is trained incrementally
+    assert model.last_full_train_length == 30
+    assert model.num_trained_samples == 50
+    assert len(model.inputs_feature_cache) == 50
+    assert len(model.predict(task, states)) == len(inputs)
+
+    tmpdir = tvm.contrib.utils.tempdir()
+    artifact = tmpdir.relpath("model.json")
+    model.export(artifact)
+
+    new_model = auto_scheduler.XGBModel(incremental_training=True)
+    new_model.load_artifact(artifact)
+    assert new_model.min_costs == model.min_costs
+    assert new_model.num_trained_samples == 50
+    np.testing.assert_allclose(
+        new_model.predict(task, states), model.predict(task, states), rtol=1e-5
+    )
+
+    # the loaded model is refined with the new records instead of being re-trained
+    new_model.update(inputs[:10], results[:10])
+    assert new_model.last_full_train_length == 50
+    assert new_model.num_trained_samples == 60
+
+    with open(artifact, "w") as fout:
+        fout.write('{"format": "tvm.auto_scheduler.XGBModel", "version": 0}')
+    with pytest.raises(ValueError):
+        new_model.load_artifact(artifact)
+
+
 if __name__ == "__main__":
     test_random_model()
     test_xgb_model()
+    test_xgb_model_incremental_training_and_artifact()
@@ -26,6 +26,7 @@ from tvm import te, auto_scheduler
 import tempfile
 import tvm.testing
 import pickle
+import time
 from tvm.testing.auto_scheduler import matmul_auto_scheduler_test
 from tvm.auto_scheduler import workload_registry
 
@@ -203,6 +204,48 @@ def test_recover_measure_input():
         assert str(correct_inp.state) == str(inp.state)
 
 
+def test_binary_record_file(tmpdir):
+    tasks = [
+        auto_scheduler.SearchTask(func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm")
+        for n in [64, 128]
+    ]
+    inputs, results = [], []
+    for i, cost in enumerate([0.3, 0.2, 0.1, 0.4, 0.05]):
+        task = tasks[i % 2]
+        inputs.append(auto_scheduler.MeasureInput(task, task.compute_dag.init_state))
+        results.append(auto_scheduler.MeasureResult([cost], 0 if i < 4 else 1, "", 0.2, 1))
+
+    json_file = str(tmpdir / "records.json")
+    auto_scheduler.save_records(json_file, inputs, results)
+    bin_file = str(tmpdir / "records.bin")
+    assert auto_scheduler.convert_record_file(json_file, bin_file) == len(inputs)
+
+    records = list(auto_scheduler.load_records(bin_file))
+    assert len(records) == len(inputs)
+    for (inp, res), ref_res in zip(records, results):
+        assert res.error_no == ref_res.error_no
+        assert res.costs[0].value == ref_res.costs[0].value
+
+    # The best record is looked up in the index, which skips the records with errors
+    target = tvm.target.Target("llvm")
+    for task, best_cost in zip(tasks, [0.1, 0.2]):
+        inp, res = auto_scheduler.load_best_record(bin_file, task.workload_key, target)
+        assert inp.task.workload_key == task.workload_key
+        assert res.costs[0].value == best_cost
+    assert len(auto_scheduler.BinaryRecordFile(bin_file).best_records()) == 2
+    with auto_scheduler.ApplyHistoryBest(bin_file) as context:
+        assert len(context.best_by_targetkey["cpu"]) == 1
+
+    # Append to the binary file, and convert it back to JSON
+    binary_file = auto_scheduler.BinaryRecordFile(bin_file)
+    binary_file.append(inputs[:1], [auto_scheduler.MeasureResult([0.01], 0, "", 0.2, 1)])
+    inp, res = auto_scheduler.load_best_record(bin_file, tasks[0].workload_key, target)
+    assert res.costs[0].value == 0.01
+    back_file = str(tmpdir / "back.json")
+    assert auto_scheduler.convert_record_file(bin_file, back_file) == len(inputs) + 1
+    assert len(list(auto_scheduler.load_records(back_file))) == len(inputs) + 1
+
+
 def test_workload_dis_factor():
     calc = auto_scheduler.utils.calc_workload_dis_factor
     decode = auto_scheduler.utils.decode_workload_key
@@ -423,5 +466,56 @@ def test_measure_special_inputs_map_by_name_rpc_runner():
         assert mress[0].error_no == 0
 
 
+def test_measure_cache(tmpdir):
+    cache = auto_scheduler.MeasureCache(str(tmpdir / "cache.db"), device_key="dev0")
+    assert cache.load("prog", "llvm") is None
+    cache.save("prog", "llvm", [1.0, 2.0])
+    assert cache.load("prog", "llvm") == [1.0, 2.0]
+    assert cache.load("prog", "cuda") is None
+    assert len(cache) == 1
+
+    # The results are isolated by device keys, and expire per device key
+    other = auto_scheduler.MeasureCache(str(tmpdir / "cache.db"), device_key="dev1")
+    assert other.load("prog", "llvm") is None
+    expired = auto_scheduler.MeasureCache(str(tmpdir / "cache.db"), device_key="dev0", max_age=0)
+    time.sleep(0.01)
+    assert expired.load("prog", "llvm") is None
+
+    cache.invalidate()
+    assert cache.load("prog", "llvm") is None
+
+
+@tvm.testing.requires_llvm
+def test_measure_local_builder_runner_with_cache(tmpdir):
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(128, 128, 128), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    cache = auto_scheduler.MeasureCache(str(tmpdir / "cache.db"))
+    local_builder = auto_scheduler.LocalBuilder(measure_cache=cache)
+    local_runner = auto_scheduler.LocalRunner(timeout=60)
+
+    bress = local_builder.build([minp])
+    assert bress[0].error_no == 0 and bress[0].filename
+    mress = local_runner.run([minp], bress)
+    assert mress[0].error_no == 0
+    assert len(cache) == 1
+
+    # The measured program is neither built nor run again
+    bress = local_builder.build([minp])
+    assert bress[0].error_no == 0 and not bress[0].filename
+    cached = local_runner.run([minp], bress)
+    assert cached[0].error_no == 0
+    assert [x.value for x in cached[0].costs] == [x.value for x in mress[0].costs]
+
+    # The cached costs are only returned for the build results of the last build of the input
+    bress = local_builder.build([minp])
+    other_minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    assert local_runner.run([other_minp], bress)[0].error_no != 0
+    bress = local_builder.build([minp])
+    local_builder.build([minp])
+    assert local_runner.run([minp], bress)[0].error_no != 0
+
+
 if __name__ == "__main__":
     tvm.testing.main()
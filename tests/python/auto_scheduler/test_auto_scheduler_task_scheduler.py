@@ -139,7 +139,52 @@ def test_task_scheduler_gradient():
         del measure_ctx
 
 
+def test_task_scheduler_convergence_detection():
+    tasks = [
+        auto_scheduler.SearchTask(func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm")
+        for n in [2, 4]
+    ]
+    task_scheduler = auto_scheduler.TaskScheduler(tasks, callbacks=[])
+    task_scheduler.convergence_window = 3
+    task_scheduler.convergence_threshold = 0.01
+    task_scheduler.num_measures_per_round = 4
+    # Do not predict the latency from the similar tasks
+    task_scheduler.task_tags = [None, None]
+
+    # Task 0 has plateaued for a long time, while task 1 is still improving
+    task_scheduler.task_cts = [200, 4]
+    task_scheduler.task_costs_history = [[2.0, 1.0, 1.0, 1.0, 1.0], [4.0, 3.0, 2.0, 1.0]]
+    task_scheduler.best_costs = np.array([1.0, 1.0])
+    task_scheduler.cur_score = task_scheduler._compute_score(task_scheduler.best_costs)
+    assert task_scheduler._is_converged(0)
+    assert not task_scheduler._is_converged(1)
+
+    # Too few rounds to decide
+    task_scheduler.convergence_window = 5
+    assert not task_scheduler._is_converged(0)
+
+    # The decision is logged
+    with tempfile.NamedTemporaryFile() as fp:
+        callback = auto_scheduler.task_scheduler.LogEstimatedLatency(fp.name)
+        task_scheduler.tic = task_scheduler.ct = 0
+        task_scheduler._retire_task(0, "converged")
+        callback.post_tune(task_scheduler, 0)
+        callback.post_tune(task_scheduler, 0)
+        # Retirements are logged even if they happen outside of the tuned task
+        # and while some task has no valid schedule yet
+        task_scheduler.best_costs = np.array([1.0, 1e10])
+        task_scheduler._retire_task(1, "no valid schedule")
+        callback.post_tune(task_scheduler, 0)
+        with open(fp.name) as f:
+            lines = [line for line in f if line.startswith("RetiredTask")]
+        assert lines == [
+            "RetiredTask\t0\tReason\tconverged\tTrials\t800\n",
+            "RetiredTask\t1\tReason\tno valid schedule\tTrials\t16\n",
+        ]
+
+
 if __name__ == "__main__":
     test_task_scheduler_round_robin()
     test_task_scheduler_round_robin_spawn()
     test_task_scheduler_gradient()
+    test_task_scheduler_convergence_detection()
@@ -233,6 +233,55 @@ def test_graph_tuner_layout_transform_runner():
         )
 
 
+@tvm.testing.requires_x86
+def test_graph_tuner_layout_transform_parallel_cache(tmpdir):
+    log_file = "%s/test_tuner.log" % (os.getcwd())
+    cache_file = str(tmpdir / "layout_transform.log")
+    target = "llvm"
+    dshape = (1, 3, 8, 8)
+    dtype = "float32"
+    layout = "NCHW"
+    conv2d = relay.op.get("nn.conv2d")
+    target_ops = [conv2d]
+
+    g, records, _, _, _ = _create_data(target, dshape, dtype, layout)
+    executor = DPTuner(g, {"data": dshape}, records, target_ops, target=target, log_file=log_file)
+    executor.benchmark_layout_transform(
+        min_exec_num=1, n_parallel=2, parallel=True, layout_cache_file=cache_file
+    )
+    out = executor._layout_transform_perf_records
+    assert out
+    with open(cache_file) as cache:
+        assert len(cache.readlines()) == len(out)
+
+    # the benchmarked layout transformations are loaded from the cache
+    executor = DPTuner(g, {"data": dshape}, records, target_ops, target=target, log_file=log_file)
+    executor.benchmark_layout_transform(
+        min_exec_num=1, n_parallel=2, parallel=True, layout_cache_file=cache_file
+    )
+    cached_out = executor._layout_transform_perf_records
+    assert {wkl: rec[1].costs for wkl, rec in out.items()} == {
+        wkl: rec[1].costs for wkl, rec in cached_out.items()
+    }
+    with open(cache_file) as cache:
+        assert len(cache.readlines()) == len(out)
+
+    # a failed measurement in the cache is measured again
+    with open(cache_file) as cache:
+        lines = cache.readlines()
+    inp, res = autotvm.record.decode(lines[0])
+    lines[0] = autotvm.record.encode(inp, res._replace(error_no=4)) + "\n"
+    with open(cache_file, "w") as cache:
+        cache.writelines(lines)
+    executor = DPTuner(g, {"data": dshape}, records, target_ops, target=target, log_file=log_file)
+    executor.benchmark_layout_transform(
+        min_exec_num=1, n_parallel=2, parallel=True, layout_cache_file=cache_file
+    )
+    assert executor._layout_transform_perf_records[inp.task.workload][1].error_no == 0
+    with open(cache_file) as cache:
+        assert len(cache.readlines()) == len(out) + 1
+
+
 @tvm.testing.requires_x86
 def test_DPTuner_run():
     log_file = "%s/test_tuner.log" % (os.getcwd())
@@ -511,6 +560,15 @@ def test_many_sub_graphs():
         str(out),
     )
 
+    executor = DPTuner(net, {"data": dshape}, records, target_ops, target)
+    executor.benchmark_layout_transform(layout_records=ltf_records, infer_layout=True)
+    executor.run(num_threads=4)
+    out = [record[0].config for record in executor.get_optimal_records()]
+    assert expected_out == out, "Output mismatch: expecting %s but got %s" % (
+        str(expected_out),
+        str(out),
+    )
+
     executor = PBQPTuner(net, {"data": dshape}, records, target_ops, target)
     executor.benchmark_layout_transform(layout_records=ltf_records, infer_layout=True)
     executor.run()
@@ -772,6 +830,15 @@ def test_triangle_block():
         str(out),
     )
 
+    executor = DPTuner(net, {"data": dshape}, records, target_ops, target)
+    executor.benchmark_layout_transform(layout_records=ltf_records, infer_layout=True)
+    executor.run(num_threads=4)
+    out = [record[0].config for record in executor.get_optimal_records()]
+    assert expected_out == out, "Output mismatch: expecting %s but got %s" % (
+        str(expected_out),
+        str(out),
+    )
+
     executor = PBQPTuner(net, {"data": dshape}, records, target_ops, target)
     executor.benchmark_layout_transform(layout_records=ltf_records, infer_layout=True)
     executor.run()
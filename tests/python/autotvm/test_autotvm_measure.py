@@ -86,9 +86,57 @@ def test_task_runner_with_ref_input():
     assert runner.executor.ran_dummy_executor
 
 
+def test_rpc_runner_persistent_session():
+    """test measurements over persistent RPC sessions, which survive the restart of the server"""
+    from tvm import rpc
+    from tvm.rpc.tracker import Tracker
+
+    task, target = get_sample_task()
+    tracker = Tracker(port=9000, port_end=10000, silent=True)
+
+    def start_server():
+        return rpc.Server(
+            port=9000,
+            port_end=10000,
+            key="persistent",
+            silent=True,
+            tracker_addr=("127.0.0.1", tracker.port),
+        )
+
+    server = start_server()
+    runner = autotvm.RPCRunner(
+        "persistent",
+        "127.0.0.1",
+        tracker.port,
+        n_parallel=1,
+        number=1,
+        repeat=1,
+        cooldown_interval=0,
+        persistent_session=True,
+        upload_batch_size=2,
+    )
+    measure_option = autotvm.measure_option(builder=autotvm.LocalBuilder(), runner=runner)
+    measure_batch = autotvm.measure.create_measure_batch(task, measure_option)
+    inputs = [autotvm.MeasureInput(target, task, task.config_space.get(i)) for i in range(5)]
+    results = measure_batch(inputs)
+    assert len(results) == len(inputs)
+    assert all(res.error_no == MeasureErrorNo.NO_ERROR for res in results)
+
+    # the dropped session is reconnected to the new server
+    server.terminate()
+    server = start_server()
+    results = measure_batch(inputs)
+    assert len(results) == len(inputs)
+    assert all(res.error_no == MeasureErrorNo.NO_ERROR for res in results)
+
+    server.terminate()
+    tracker.terminate()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     test_task_tuner_without_measurement()
     test_task_tuner_without_measurement_spawn()
     test_task_runner_with_ref_input()
+    test_rpc_runner_persistent_session()
@@ -24,6 +24,7 @@ from tvm.contrib import utils
 from tvm import autotvm
 from tvm.autotvm.measure import MeasureInput, MeasureResult, MeasureErrorNo
 from tvm.autotvm.record import encode, decode, ApplyHistoryBest, measure_str_key
+from tvm.autotvm.record_index import RecordIndex
 
 from tvm.testing.autotvm import get_sample_task
 
@@ -157,6 +158,72 @@ def test_apply_history_best_multiple_batches(tmpdir):
     assert str(hist_best.query(target, tsk.workload)) == best
 
 
+def test_apply_history_best_index(tmpdir):
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(4)]
+    filepath = tmpdir / "records.log"
+    with open(filepath, "w") as file:
+        results = [MeasureResult((i,), 0, 0, 0) for i in range(3, 0, -1)]
+        autotvm.callback.log_to_file(file)(None, inputs[:3], results)
+
+    hist_best = ApplyHistoryBest(filepath, use_index=True)
+    assert str(hist_best.query(target, tsk.workload)) == str(tsk.config_space.get(2))
+    assert (tmpdir / "records.log.idx").exists()
+
+    # The index is reused as is
+    index = RecordIndex(filepath)
+    assert len(index) == len(target.keys)
+
+    # A better record and an error are appended, so the index is updated incrementally
+    with open(filepath, "a") as file:
+        autotvm.callback.log_to_file(file)(
+            None,
+            [inputs[3], inputs[0]],
+            [MeasureResult((0.5,), 0, 0, 0), MeasureResult((0.1,), 1, 0, 0)],
+        )
+    hist_best = ApplyHistoryBest(filepath, use_index=True)
+    assert str(hist_best.query(target, tsk.workload)) == str(tsk.config_space.get(3))
+
+    # The records loaded otherwise are merged with the index
+    hist_best = ApplyHistoryBest(
+        [filepath, [(inputs[1], MeasureResult((0.2,), 0, 0, 0))]], use_index=True
+    )
+    assert str(hist_best.query(target, tsk.workload)) == str(tsk.config_space.get(1))
+
+    # The index is rebuilt if the log is rewritten
+    with open(filepath, "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs[:1], [MeasureResult((1.0,), 0, 0, 0)])
+    hist_best = ApplyHistoryBest(filepath, use_index=True)
+    assert str(hist_best.query(target, tsk.workload)) == str(tsk.config_space.get(0))
+
+
+def test_load_from_file_parallel(tmpdir):
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i % 8)) for i in range(64)]
+    results = [MeasureResult(((i * 7) % 13 + 1,), int(i % 5 == 0), 0, 0) for i in range(64)]
+    filepath = str(tmpdir / "records.log")
+    with open(filepath, "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs, results)
+
+    # Small chunks to be decoded by multiple workers
+    records = list(
+        autotvm.record.load_from_file_parallel(filepath, max_workers=2, chunk_bytes=1024)
+    )
+    expected = list(autotvm.record.load_from_file(filepath))
+    assert len(records) == len(expected) == 64
+    for (inp, res), (expected_inp, expected_res) in zip(records, expected):
+        assert measure_str_key(inp) == measure_str_key(expected_inp)
+        assert res.costs == expected_res.costs
+
+    # pick_best keeps the first record of each best config
+    out_path = str(tmpdir / "best.log")
+    autotvm.record.pick_best(filepath, out_path)
+    best = list(autotvm.record.load_from_file(out_path))
+    hist_best = ApplyHistoryBest(filepath)
+    assert len(best) == 1
+    assert str(best[0][0].config) == str(hist_best.query(target, tsk.workload))
+
+
 if __name__ == "__main__":
     test_load_dump()
     test_apply_history_best()
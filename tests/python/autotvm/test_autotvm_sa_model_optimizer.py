@@ -0,0 +1,72 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test simulated annealing model optimizer"""
+import numpy as np
+
+from tvm.autotvm.tuner.model_based_tuner import CostModel
+from tvm.autotvm.tuner.sa_model_optimizer import SimulatedAnnealingOptimizer
+from tvm.testing.autotvm import get_sample_task
+
+
+class HashCostModel(CostModel):
+    """A deterministic cost model with many local maximums"""
+
+    def predict(self, xs, output_margin=False):
+        return np.array([(int(x) * 2654435761) % 1000 / 10.0 for x in xs])
+
+
+def test_sa_model_optimizer():
+    """The maximums are valid, sorted, exclusive and reproducible with the same seed"""
+    task, _ = get_sample_task()
+    space = task.config_space
+    model = HashCostModel()
+    exclusive = set(range(8))
+
+    maximums = []
+    for _ in range(2):
+        optimizer = SimulatedAnnealingOptimizer(task, n_iter=100, parallel_size=16, seed=0)
+        maximums.append(optimizer.find_maximums(model, 8, exclusive))
+    assert maximums[0] == maximums[1]
+    assert len(maximums[0]) == len(set(maximums[0])) == 8
+    assert not set(maximums[0]) & exclusive
+    scores = model.predict(maximums[0])
+    assert list(scores) == sorted(scores, reverse=True)
+
+    # the neighbors of a random walk differ from their origin
+    points = optimizer.sample(16)
+    knobs = optimizer.point2knob(points)
+    assert [space.knob2point(list(knob)) for knob in knobs] == list(points)
+    new_points, new_knobs = optimizer.random_walk(points, knobs)
+    assert np.all(new_points != points)
+    assert [space.knob2point(list(knob)) for knob in new_knobs] == list(new_points)
+
+
+def test_sa_model_optimizer_multi_filter():
+    """The maximums satisfy the multi_filter condition"""
+    task, _ = get_sample_task()
+    task.config_space.multi_filter(
+        filter=lambda entity: 8 <= (entity["tile_x"].size[1] * entity["tile_y"].size[1]) < 1024
+    )
+    optimizer = SimulatedAnnealingOptimizer(task, n_iter=100, parallel_size=8, seed=0)
+    maximums = optimizer.find_maximums(HashCostModel(), 4, set())
+    assert maximums
+    assert all(task.config_space.is_index_valid(index) for index in maximums)
+
+
+if __name__ == "__main__":
+    test_sa_model_optimizer()
+    test_sa_model_optimizer_multi_filter()
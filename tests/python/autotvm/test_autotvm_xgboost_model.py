@@ -23,6 +23,7 @@ import tvm
 from tvm import te
 from tvm import autotvm
 from tvm.autotvm import MeasureInput, MeasureResult
+from tvm.autotvm.tuner.feature_cache import DiskFeatureCache
 from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
 
 from tvm.testing.autotvm import get_sample_task, get_sample_records
@@ -91,6 +92,69 @@ def test_update():
     assert all(x in tuner.visited for x in tuner.xs)
 
 
+def test_disk_feature_cache(tmpdir):
+    cache_dir = str(tmpdir)
+    cache = DiskFeatureCache(cache_dir, "task", flush_size=4, max_segments=2)
+    fea_cache = cache.get("knob")
+    for i in range(10):
+        fea_cache[i] = np.arange(i % 3 + 1, dtype=np.float32) if i != 7 else None
+    cache.flush()
+
+    # another session reads the features back from disk
+    fea_cache = DiskFeatureCache(cache_dir, "task").get("knob")
+    assert len(fea_cache) == 10
+    assert fea_cache[7] is None
+    np.testing.assert_equal(fea_cache[5], np.arange(3, dtype=np.float32))
+    assert 10 not in fea_cache
+    assert DiskFeatureCache(cache_dir, "other-task").size("knob") == 0
+
+    # the tables which are not in use are evicted when the cache is full
+    cache = DiskFeatureCache(cache_dir, "other-task", max_bytes=1, flush_size=1)
+    cache.get("knob")[0] = np.zeros(4, dtype=np.float32)
+    assert len(DiskFeatureCache(cache_dir, "task").get("knob")) == 0
+    assert len(DiskFeatureCache(cache_dir, "other-task").get("knob")) == 1
+
+    # the features written by another process are loaded on refresh, not on every lookup
+    reader = DiskFeatureCache(cache_dir, "shared")
+    assert 3 not in reader.get("knob")
+    DiskFeatureCache(cache_dir, "shared", flush_size=1).get("knob")[3] = np.ones(2)
+    assert 3 not in reader.get("knob")
+    reader.refresh()
+    np.testing.assert_equal(reader.get("knob")[3], np.ones(2, dtype=np.float32))
+
+
+def test_fit_with_disk_feature_cache(tmpdir):
+    task, target = get_sample_task()
+    records = get_sample_records(n=100)
+
+    model = XGBoostCostModel(task, feature_type="knob", feature_cache_dir=str(tmpdir))
+    model.fit_log(records, plan_size=32, min_seed_records=10)
+    model._close_pool()
+
+    # the features of the records are reused by a new cost model of the same task
+    model = XGBoostCostModel(task, feature_type="knob", feature_cache_dir=str(tmpdir))
+    assert model.feature_cache.size("knob") == 0
+    assert len(model.feature_cache.get("knob")) == len(task.config_space)
+    model.fit(np.arange(10), np.arange(10), plan_size=32)
+    model.predict(np.arange(12))
+
+
+def test_fit_log_with_disk_feature_cache(tmpdir):
+    task, target = get_sample_task()
+    log_file = str(tmpdir.join("records.log"))
+    with open(log_file, "w") as fout:
+        for inp, res in get_sample_records(n=100):
+            fout.write(autotvm.record.encode(inp, res) + "\n")
+
+    # the tasks of the records decoded from a log are not instantiated
+    records = list(autotvm.record.load_from_file(log_file))
+    assert records[0][0].task.flop is None
+
+    model = XGBoostCostModel(task, feature_type="knob", feature_cache_dir=str(tmpdir))
+    assert model.fit_log(records, plan_size=32, min_seed_records=10)
+    model._close_pool()
+
+
 if __name__ == "__main__":
     test_fit()
     test_fit_spawn()
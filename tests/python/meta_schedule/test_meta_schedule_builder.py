@@ -18,6 +18,7 @@
 
 import os
 import sys
+import tempfile
 import time
 from typing import List
 
@@ -27,6 +28,7 @@ import tvm.testing
 from tvm import script
 from tvm._ffi import register_func
 from tvm.meta_schedule.builder import (
+    BuildCache,
     BuilderInput,
     BuilderResult,
     LocalBuilder,
@@ -225,5 +227,48 @@ def test_meta_schedule_missing_build_func():
         LocalBuilder(f_build="wrong-name")
 
 
+def test_meta_schedule_build_cache():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        builder = LocalBuilder(cache_dir=cache_dir)
+        builder_inputs = [
+            BuilderInput(MatmulModule, Target("llvm")),
+            BuilderInput(BatchMatmulModule, Target("llvm")),
+        ]
+        _check_build_results(builder.build(builder_inputs))
+        assert builder.cache_hits == 0
+        assert builder.cache.stats()["num_entries"] == 2
+        builder_results = builder.build(builder_inputs)
+        assert builder.cache_hits == 2
+        assert builder.cache_lookups == 4
+        assert builder.cache_hit_rate == 0.5
+        for result in builder_results:
+            assert os.path.getsize(result.artifact_path) > 0
+        _check_build_results(builder_results)
+        # The artifacts handed out are removed, but the cache is intact
+        assert builder.cache.stats()["num_entries"] == 2
+        # The target is a part of the key
+        _check_build_results(
+            builder.build([BuilderInput(MatmulModule, Target("llvm -num-cores=1"))])
+        )
+        assert builder.cache_hits == 2
+
+
+def test_meta_schedule_build_cache_evict_lru():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = BuildCache(os.path.join(tmp_dir, "cache"), max_bytes=1024)
+        for key in ["a", "b"]:
+            artifact_path = os.path.join(tmp_dir, key + ".tar")
+            with open(artifact_path, "wb") as file:
+                file.write(b"\0" * 1024)
+            cache.insert(key, artifact_path)
+        os.utime(os.path.join(cache.cache_dir, "a"), (100, 100))
+        os.utime(os.path.join(cache.cache_dir, "b"), (200, 200))
+        assert cache.lookup("a") is not None
+        assert cache.evict() == 1
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") is not None
+        assert cache.stats() == {"num_entries": 1, "num_bytes": 1024}
+
+
 if __name__ == "__main__":
     tvm.testing.main()
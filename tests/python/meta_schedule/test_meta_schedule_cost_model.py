@@ -234,6 +234,26 @@ def test_meta_schedule_xgb_model_reload():
             assert (f1 == f2).all()
 
 
+def test_meta_schedule_xgb_model_max_history_size():
+    extractor = RandomFeatureExtractor()
+    model = XGBModel(extractor=extractor, num_warmup_samples=2, max_history_size=16)
+    for _ in range(3):
+        model.update(
+            TuneContext(),
+            [_dummy_candidate() for i in range(10)],
+            [_dummy_result() for i in range(10)],
+        )
+        assert model.data_size <= 16
+        assert model.data_size == sum(len(g.costs) for g in model.data.values())
+    assert model.data_size == 16
+    with tempfile.NamedTemporaryFile() as path:
+        model.save(path.name)
+        model = XGBModel(extractor=extractor, max_history_size=8)
+        model.load(path.name)
+    assert model.data_size == 8
+    assert model.data_size == sum(len(g.features) for g in model.data.values())
+
+
 def test_meta_schedule_xgb_model_reupdate():
     extractor = RandomFeatureExtractor()
     model = XGBModel(extractor=extractor, num_warmup_samples=2)
@@ -16,8 +16,10 @@
 # under the License.
 # pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
 """Test Meta Schedule Database"""
+import os
 import os.path as osp
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, List, Optional
 
 import pytest
@@ -584,6 +586,120 @@ def test_json_database_get_top_k(k, expected):
     assert result == expected
 
 
+@pytest.mark.parametrize(
+    "k,expected",
+    [
+        (0, []),
+        (4, [[0.0, 2.0], [2.0], [1.5, 4.5], [3.0, 1e10]]),
+        (5, [[0.0, 2.0], [2.0], [1.5, 4.5], [3.0, 1e10]]),
+    ],
+)
+def test_binary_database_get_top_k(k, expected):
+    run_secs_list = [[1.5, 4.5], [], [0.0, 2.0], None, [2.0], [3.0, 1e10], [1e10]]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        result = call_get_top_k(run_secs_list, database, k)
+    assert result == expected
+
+
+@pytest.mark.parametrize("remove_index", [False, True])
+def test_binary_database_reload(remove_index):
+    mod: IRModule = Matmul
+    missing_mod: IRModule = MatmulRelu
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        result = call_get_top_k([[7.0, 8.0, 9.0], [1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], database, 2)
+        assert result == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        if remove_index:
+            os.remove(database.path_index)
+        new_database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        assert len(new_database) == 3
+        assert new_database.has_workload(mod)
+        assert not new_database.has_workload(missing_mod)
+        ret = new_database.get_top_k(new_database.commit_workload(mod), 2)
+        assert [[v.value for v in record.run_secs] for record in ret] == result
+
+
+def test_binary_database_partial_index():
+    mod: IRModule = Matmul
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        call_get_top_k([[7.0, 8.0, 9.0], [1.0, 2.0, 3.0]], database, 2)
+        # An interrupted writer leaves a partial entry at the end of the index
+        with open(database.path_index, "ab") as f:
+            f.write(b"\x00" * 5)
+        new_database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        assert len(new_database) == 2
+        call_get_top_k([[0.5]], new_database, 1)
+        # The entries appended after the partial one are still aligned
+        new_database = ms.database.BinaryDatabase(work_dir=tmpdir)
+        assert len(new_database) == 3
+        ret = new_database.get_top_k(new_database.commit_workload(mod), 3)
+        assert [[v.value for v in record.run_secs] for record in ret] == [
+            [0.5],
+            [1.0, 2.0, 3.0],
+            [7.0, 8.0, 9.0],
+        ]
+
+
+def test_binary_database_import_from_json():
+    mod: IRModule = Matmul
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_database = _create_tmp_database(tmpdir)
+        expected = call_get_top_k([[7.0, 8.0, 9.0], [1.0, 2.0, 3.0], [], None], json_database, 3)
+        database = ms.database.BinaryDatabase.import_from(json_database, work_dir=tmpdir)
+        assert len(database) == len(json_database)
+        for ret, record in zip(
+            database.get_all_tuning_records(), json_database.get_all_tuning_records()
+        ):
+            _equal_record(ret, record)
+        ret = database.get_top_k(database.commit_workload(mod), 3)
+        assert [[v.value for v in record.run_secs] for record in ret] == expected
+
+
+@pytest.mark.parametrize(
+    "k,expected",
+    [
+        (0, []),
+        (4, [[0.0, 2.0], [2.0], [1.5, 4.5], [3.0, 1e10]]),
+        (5, [[0.0, 2.0], [2.0], [1.5, 4.5], [3.0, 1e10]]),
+    ],
+)
+def test_sqlite_database_get_top_k(k, expected):
+    run_secs_list = [[1.5, 4.5], [], [0.0, 2.0], None, [2.0], [3.0, 1e10], [1e10]]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.SQLiteDatabase(work_dir=tmpdir)
+        result = call_get_top_k(run_secs_list, database, k)
+        database.close()
+    assert result == expected
+
+
+def test_sqlite_database_concurrent_writers():
+    mod: IRModule = Matmul
+    missing_mod: IRModule = MatmulRelu
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Each database holds its own connection, like separate tuning processes do
+        databases = [ms.database.SQLiteDatabase(work_dir=tmpdir) for _ in range(4)]
+        with ThreadPoolExecutor(max_workers=len(databases)) as executor:
+            list(
+                executor.map(
+                    lambda database: call_get_top_k([[1.0], [2.0], [3.0]], database, 1),
+                    databases,
+                )
+            )
+        new_database = ms.database.SQLiteDatabase(work_dir=tmpdir, allow_missing=False)
+        assert len(new_database) == 3 * len(databases)
+        assert new_database.has_workload(mod)
+        assert not new_database.has_workload(missing_mod)
+        # All writers share one workload entry, so all records are found by the top-k query
+        ret = new_database.get_top_k(new_database.commit_workload(mod), 3 * len(databases))
+        assert len(ret) == 3 * len(databases)
+        assert [v.value for v in ret[0].run_secs] == [1.0]
+        for database in databases:
+            database.close()
+        new_database.close()
+
+
 def MatmulFunc() -> IRModule:
     a = relay.var("a", relay.TensorType((1024, 1024), "float32"))
     b = relay.var("b", relay.TensorType((1024, 1024), "float32"))
@@ -612,5 +728,28 @@ def test_memory_database_commit_workload(f_mod, mod_eq):
     database.commit_workload(mod)
 
 
+@pytest.mark.parametrize("f_mod", [MatmulPrimFunc, MatmulFunc])
+@pytest.mark.parametrize("mod_eq", ["structural", "ignore-ndarray", "anchor-block"])
+def test_binary_database_commit_workload(f_mod, mod_eq):
+    mod: IRModule = f_mod()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.BinaryDatabase(work_dir=tmpdir, module_equality=mod_eq)
+        workload = database.commit_workload(mod)
+        assert database.has_workload(mod)
+        assert database.commit_workload(mod).same_as(workload)
+
+
+@pytest.mark.parametrize("f_mod", [MatmulPrimFunc, MatmulFunc])
+@pytest.mark.parametrize("mod_eq", ["structural", "ignore-ndarray", "anchor-block"])
+def test_sqlite_database_commit_workload(f_mod, mod_eq):
+    mod: IRModule = f_mod()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = ms.database.SQLiteDatabase(work_dir=tmpdir, module_equality=mod_eq)
+        workload = database.commit_workload(mod)
+        assert database.has_workload(mod)
+        assert database.commit_workload(mod).same_as(workload)
+        database.close()
+
+
 if __name__ == "__main__":
     tvm.testing.main()
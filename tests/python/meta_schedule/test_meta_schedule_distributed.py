@@ -0,0 +1,109 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring,no-member,invalid-name,unused-variable
+import tempfile
+
+import pytest
+import tvm
+import tvm.testing
+from tvm import meta_schedule as ms
+from tvm.meta_schedule.testing.local_rpc import LocalRPC
+from tvm.script import tir as T
+from tvm.target import Target
+
+
+@T.prim_func
+def matmul(a: T.handle, b: T.handle, c: T.handle) -> None:
+    A = T.match_buffer(a, [32, 32])
+    B = T.match_buffer(b, [32, 32])
+    C = T.match_buffer(c, [32, 32])
+    for i, j, k in T.grid(32, 32, 32):
+        with T.block("matmul"):
+            vi, vj, vk = T.axis.remap("SSR", [i, j, k])
+            with T.init():
+                C[vi, vj] = 0.0
+            C[vi, vj] = C[vi, vj] + A[vi, vk] * B[vj, vk]
+
+
+@T.prim_func
+def add(a: T.handle, b: T.handle, c: T.handle) -> None:
+    A = T.match_buffer(a, [1024])
+    B = T.match_buffer(b, [1024])
+    C = T.match_buffer(c, [1024])
+    for i in T.serial(1024):
+        with T.block("add"):
+            vi = T.axis.remap("S", [i])
+            C[vi] = A[vi] + B[vi]
+
+
+def test_tune_tasks_distributed():
+    target = Target("llvm --num-cores=2")
+    tasks = []
+    for name, func in [("matmul", matmul), ("add", add)]:
+        mod = tvm.IRModule({"main": func})
+        tasks.append(ms.ExtractedTask(name, mod, target, [mod], weight=1))
+    with tempfile.TemporaryDirectory() as work_dir, LocalRPC() as rpc:
+        database = ms.tune_tasks_distributed(
+            tasks=tasks,
+            work_dir=work_dir,
+            max_trials_global=16,
+            max_trials_per_task=8,
+            num_trials_per_iter=4,
+            rpc_config=ms.runner.RPCConfig(
+                tracker_host=rpc.tracker_host,
+                tracker_port=rpc.tracker_port,
+                tracker_key=rpc.tracker_key,
+                session_timeout_sec=100,
+            ),
+            evaluator_config=ms.runner.EvaluatorConfig(number=1, repeat=1, min_repeat_ms=0),
+            num_workers=2,
+            strategy="replay-trace",
+            cost_model="random",
+            num_threads=2,
+        )
+        assert 0 < len(database) <= 16
+        for task in tasks:
+            workload = database.commit_workload(task.dispatched[0])
+            assert len(database.get_top_k(workload, 16)) > 0
+
+
+def test_tune_tasks_distributed_all_failed():
+    target = Target("llvm --num-cores=2")
+    mod = tvm.IRModule({"main": add})
+    tasks = [ms.ExtractedTask("add", mod, target, [mod], weight=1)]
+    with tempfile.TemporaryDirectory() as work_dir, LocalRPC() as rpc:
+        with pytest.raises(RuntimeError, match="add"):
+            ms.tune_tasks_distributed(
+                tasks=tasks,
+                work_dir=work_dir,
+                max_trials_global=4,
+                num_trials_per_iter=4,
+                rpc_config=ms.runner.RPCConfig(
+                    tracker_host=rpc.tracker_host,
+                    tracker_port=rpc.tracker_port,
+                    tracker_key=rpc.tracker_key,
+                ),
+                num_workers=1,
+                # Every task fails to create its search strategy in the worker
+                strategy="no-such-strategy",
+                cost_model="random",
+                num_threads=1,
+            )
+
+
+if __name__ == "__main__":
+    tvm.testing.main()
@@ -1632,5 +1632,30 @@ def test_negative_extent():
     assert named_features["B0.unique_bytes"] == 0
 
 
+def test_extract_batched():
+    extractor = ms.feature_extractor.PerStoreFeature()
+    context = _make_context(tvm.target.Target("llvm"))
+    candidates = [
+        _make_candidate(lambda: tir.Schedule(matmul)),
+        _make_candidate(lambda: tir.Schedule(LayoutTransform)),
+        _make_candidate(lambda: tir.Schedule(negative_extent)),
+    ]
+    expected = extractor.extract_from(context, candidates)
+    features, offsets = extractor.extract_batched(context, candidates)
+    features = features.numpy()
+    offsets = offsets.numpy()
+    assert features.dtype == "float32"
+    assert features.shape == (sum(x.shape[0] for x in expected), N_FEATURES)
+    assert offsets.dtype == "int64"
+    assert offsets.tolist() == [sum(x.shape[0] for x in expected[:i]) for i in range(4)]
+    for i, feature in enumerate(expected):
+        assert_allclose(
+            actual=features[offsets[i] : offsets[i + 1]],
+            desired=feature.numpy(),
+            rtol=1e-5,
+            atol=1e-5,
+        )
+
+
 if __name__ == "__main__":
     tvm.testing.main()
@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 # pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+import os
 import re
 import tempfile
 from typing import List
@@ -173,9 +174,59 @@ def test_meta_schedule_measure_callback_update_cost_model_with_runtime_error():
         )
 
 
+def test_meta_schedule_measure_callback_checkpoint_cost_model():
+    @ms.derived_object
+    class ConstRunnerFuture(ms.runner.PyRunnerFuture):
+        def done(self) -> bool:
+            return True
+
+        def result(self) -> ms.runner.RunnerResult:
+            return ms.runner.RunnerResult([1.0, 1.0], None)
+
+    @ms.derived_object
+    class ConstRunner(ms.runner.PyRunner):
+        def run(self, runner_inputs: List[ms.runner.RunnerInput]) -> List[ms.runner.RunnerResult]:
+            return [ConstRunnerFuture() for _ in runner_inputs]
+
+    target = tvm.target.Target("llvm -num-cores=1")
+    with tempfile.TemporaryDirectory() as work_dir:
+        zoo_dir = os.path.join(work_dir, "zoo")
+        path = ms.cost_model.model_zoo_path(zoo_dir, target)
+        for num_measured in [8, 16]:
+            ms.tune_tasks(
+                tasks=[
+                    ms.TuneContext(
+                        mod=Matmul,
+                        target=target,
+                        space_generator="post-order-apply",
+                        search_strategy="evolutionary",
+                        task_name="main",
+                        num_threads=1,
+                    )
+                ],
+                task_weights=[1.0],
+                work_dir=work_dir,
+                max_trials_global=8,
+                num_trials_per_iter=4,
+                runner=ConstRunner(),
+                cost_model="xgb",
+                cost_model_zoo=zoo_dir,
+                cost_model_checkpoint_interval=4,
+                cost_model_max_history=12,
+            )
+            assert os.path.exists(path)
+            # The temporary files of the checkpoints are moved or removed
+            assert not any(f.endswith(".tmp") for f in os.listdir(os.path.dirname(path)))
+            model = ms.cost_model.XGBModel()
+            model.load(path)
+            # The model of the first session is fine-tuned in the second one
+            assert model.data_size == min(num_measured, 12)
+
+
 if __name__ == "__main__":
     test_meta_schedule_measure_callback()
     test_meta_schedule_measure_callback_fail()
     test_meta_schedule_measure_callback_as_string()
     test_meta_schedule_measure_callback_update_cost_model_with_zero()
     test_meta_schedule_measure_callback_update_cost_model_with_runtime_error()
+    test_meta_schedule_measure_callback_checkpoint_cost_model()
@@ -902,5 +902,74 @@ def test_meta_schedule_local_runner_add_test():
     _clean_build(builder_result.artifact_path)
 
 
+def test_meta_schedule_rpc_runner_adaptive_and_dedup():
+    """Test the adaptive evaluator and the deduplication of candidates in RPCRunner"""
+    builder = LocalBuilder()
+    (builder_result,) = builder.build([BuilderInput(MatmulModule, Target("llvm"))])
+    assert builder_result.error_msg is None
+    runner_input = RunnerInput(
+        builder_result.artifact_path,
+        "llvm",
+        [
+            TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+            TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+            TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+        ],
+    )
+    with LocalRPC() as rpc:
+        rpc_config = RPCConfig(
+            tracker_host=rpc.tracker_host,
+            tracker_port=rpc.tracker_port,
+            tracker_key=rpc.tracker_key,
+            session_priority=1,
+            session_timeout_sec=100,
+        )
+        evaluator_config = EvaluatorConfig(number=1, repeat=2, min_repeat_ms=0, max_repeat=20)
+        runner = RPCRunner(rpc_config, evaluator_config)
+        # Without a reference cost, the candidates run the minimum number of repeats
+        futures = runner.run([runner_input, runner_input])
+        results = [future.result() for future in futures]
+        assert all(result.error_msg is None for result in results)
+        assert len(results[0].run_secs) == 2
+        # The duplicate candidate is measured only once
+        assert [float(x) for x in results[0].run_secs] == [float(x) for x in results[1].run_secs]
+        # With a reference cost, the candidate runs until the result is conclusive
+        (future,) = runner.run([runner_input])
+        result = future.result()
+        assert result.error_msg is None
+        assert 2 <= len(result.run_secs) <= 20
+    _clean_build(builder_result.artifact_path)
+
+
+def test_meta_schedule_local_runner_adaptive():
+    """Test the early stopping of the adaptive evaluator in LocalRunner"""
+    builder = LocalBuilder()
+    (builder_result,) = builder.build([BuilderInput(MatmulModule, Target("llvm"))])
+    assert builder_result.error_msg is None
+    runner_input = RunnerInput(
+        builder_result.artifact_path,
+        "llvm",
+        [
+            TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+            TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+            TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+        ],
+    )
+    # The candidate is clearly faster than the reference, so it stops at the minimum repeats
+    evaluator_config = EvaluatorConfig(
+        number=1,
+        repeat=2,
+        min_repeat_ms=0,
+        max_repeat=20,
+        reference_cost=1000.0,
+    )
+    runner = LocalRunner(timeout_sec=100, evaluator_config=evaluator_config)
+    (runner_future,) = runner.run([runner_input])
+    runner_result = runner_future.result()
+    assert runner_result.error_msg is None
+    assert len(runner_result.run_secs) == 2
+    _clean_build(builder_result.artifact_path)
+
+
 if __name__ == "__main__":
     tvm.testing.main()
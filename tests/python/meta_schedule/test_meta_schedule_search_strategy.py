@@ -47,6 +47,22 @@ class Matmul:
                     C[vi, vj] = 0.0 # type: ignore
                 C[vi, vj] = C[vi, vj] + A[vi, vk] * B[vk, vj]
 
+
+@tvm.script.ir_module
+class Matmul64:
+    @T.prim_func
+    def main(a: T.handle, b: T.handle, c: T.handle) -> None: # type: ignore
+        T.func_attr({"global_symbol": "main"})
+        A = T.match_buffer(a, (64, 64), "float32")
+        B = T.match_buffer(b, (64, 64), "float32")
+        C = T.match_buffer(c, (64, 64), "float32")
+        for i, j, k in T.grid(64, 64, 64):
+            with T.block("matmul"):
+                vi, vj, vk = T.axis.remap("SSR", [i, j, k])
+                with T.init():
+                    C[vi, vj] = 0.0 # type: ignore
+                C[vi, vj] = C[vi, vj] + A[vi, vk] * B[vk, vj]
+
 # fmt: on
 # pylint: enable=missing-class-docstring,invalid-name,no-member,line-too-long,too-many-nested-blocks,no-self-argument
 
@@ -306,9 +322,73 @@ def test_meta_schedule_evolutionary_search_fail_init_population():  # pylint: di
     assert candidates is None
 
 
+def test_meta_schedule_evolutionary_search_warm_start():  # pylint: disable = invalid-name
+    def _schedule_matmul_small(sch: Schedule):
+        block = sch.get_block("matmul")
+        _, j, k = sch.get_loops(block=block)
+        _, _ = sch.split(j, sch.sample_perfect_tile(j, n=2))
+        _, _ = sch.split(k, sch.sample_perfect_tile(k, n=2))
+
+    def _num_tiles(sch: Schedule) -> int:
+        return sum(inst.kind.name == "SamplePerfectTile" for inst in sch.trace.insts)
+
+    # A record of the same operator with different shapes, scheduled differently from the space
+    target = tvm.target.Target("llvm")
+    database = ms.database.MemoryDatabase()
+    sch = Schedule(Matmul64)
+    _schedule_matmul(sch)
+    database.commit_tuning_record(
+        ms.database.TuningRecord(
+            sch.trace,
+            database.commit_workload(Matmul64),
+            [1.0],
+            target,
+            ms.arg_info.ArgInfo.from_prim_func(func=Matmul64["main"]),
+        )
+    )
+    context = ms.TuneContext(
+        mod=Matmul,
+        space_generator=ms.space_generator.ScheduleFn(
+            sch_fn=_schedule_matmul_small,
+            sch_rules=[],
+            postprocs=[],
+            mutator_probs={
+                DummyMutator(): 1.0,
+            },
+        ),
+        search_strategy=ms.search_strategy.EvolutionarySearch(
+            population_size=5,
+            init_measured_ratio=0.0,
+            init_min_unmeasured=1,
+            genetic_num_iters=3,
+            genetic_mutate_prob=0.5,
+            genetic_max_fail_count=10,
+            eps_greedy=0.0,
+            init_warm_start_ratio=0.4,
+        ),
+        target=target,
+        num_threads=1,  # because we are using a mutator from the python side
+    )
+    strategy = context.search_strategy
+    strategy.pre_tuning(
+        max_trials=100,
+        num_trials_per_iter=100,
+        design_spaces=context.space_generator.generate_design_space(context.mod),
+        database=database,
+        cost_model=ms.cost_model.RandomModel(),
+    )
+    candidates = strategy.generate_measure_candidates()
+    strategy.post_tuning()
+    # The warm-start candidate replays the trace of the similar workload, which samples the tiles
+    # of 3 loops instead of the 2 of the design space, with tile sizes adapted to the new shapes
+    assert any(_num_tiles(candidate.sch) == 3 for candidate in candidates)
+    assert all(_num_tiles(candidate.sch) in (2, 3) for candidate in candidates)
+
+
 if __name__ == "__main__":
     test_meta_schedule_replay_func(ms.search_strategy.ReplayFunc)
     test_meta_schedule_replay_func(ms.search_strategy.ReplayTrace)
     test_meta_schedule_evolutionary_search()
     test_meta_schedule_evolutionary_search_early_stop()
     test_meta_schedule_evolutionary_search_fail_init_population()
+    test_meta_schedule_evolutionary_search_warm_start()
@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """ Test Meta Schedule Task Scheduler """
+import json
 import random
 import weakref
 from typing import Set
@@ -24,7 +25,9 @@ import pytest
 import tvm
 import tvm.testing
 from tvm import meta_schedule as ms
+from tvm.meta_schedule.task_scheduler.profile_guided import _duration_by_name
 from tvm.meta_schedule.testing.dummy_object import DummyBuilder, DummyRunner
+from tvm.runtime.profiling import Report
 from tvm.script import tir as T
 from tvm.tir import Schedule
 
@@ -436,6 +439,147 @@ def test_meta_schedule_task_scheduler_gradient_based_with_null_search_strategy()
     assert len(database.get_top_k(database.commit_workload(MatmulReluModule), 100)) == 10
 
 
+@pytest.mark.parametrize(
+    "task_scheduler",
+    [
+        lambda: ms.task_scheduler.RoundRobin(pipeline_depth=2),
+        lambda: ms.task_scheduler.GradientBased(pipeline_depth=2),
+    ],
+)
+def test_meta_schedule_task_scheduler_pipelined(task_scheduler):
+    max_trials_per_task = 31
+    tasks = [
+        ms.TuneContext(
+            MatmulModule,
+            target=tvm.target.Target("llvm"),
+            space_generator=_schedule_matmul,
+            search_strategy=ms.search_strategy.ReplayTrace(),
+            task_name="Matmul",
+            rand_state=42,
+        ),
+        ms.TuneContext(
+            MatmulReluModule,
+            target=tvm.target.Target("llvm"),
+            space_generator=_schedule_matmul,
+            search_strategy=ms.search_strategy.ReplayTrace(),
+            task_name="MatmulRelu",
+            rand_state=0xDEADBEEF,
+        ),
+        ms.TuneContext(
+            BatchMatmulModule,
+            target=tvm.target.Target("llvm"),
+            space_generator=_schedule_batch_matmul,
+            search_strategy=ms.search_strategy.ReplayTrace(),
+            task_name="BatchMatmul",
+            rand_state=0x114514,
+        ),
+    ]
+    database = ms.database.MemoryDatabase()
+    scheduler = task_scheduler()
+    assert scheduler.pipeline_depth == 2
+    scheduler.tune(
+        tasks,
+        task_weights=[1.0, 1.0, 1.0],
+        builder=DummyBuilder(),
+        runner=DummyRunner(),
+        database=database,
+        measure_callbacks=[
+            ms.measure_callback.AddToDatabase(),
+            ms.measure_callback.UpdateCostModel(),
+        ],
+        max_trials_global=max_trials_per_task * len(tasks),
+        max_trials_per_task=max_trials_per_task,
+        num_trials_per_iter=6,
+        cost_model=ms.cost_model.RandomModel(),
+    )
+    assert len(database) == max_trials_per_task * len(tasks)
+    for task in tasks:
+        assert (
+            len(database.get_top_k(database.commit_workload(task.mod), 10000))
+            == max_trials_per_task
+        )
+    assert 0.0 <= scheduler.device_utilization() <= 1.0
+
+
+def test_meta_schedule_task_scheduler_profile_guided():
+    max_trials_global = 60
+    tasks = [
+        ms.TuneContext(
+            MatmulModule,
+            target=tvm.target.Target("llvm"),
+            space_generator=_schedule_matmul,
+            search_strategy=ms.search_strategy.ReplayTrace(),
+            task_name="Matmul",
+            rand_state=42,
+        ),
+        ms.TuneContext(
+            MatmulReluModule,
+            target=tvm.target.Target("llvm"),
+            space_generator=_schedule_matmul,
+            search_strategy=ms.search_strategy.ReplayTrace(),
+            task_name="MatmulRelu",
+            rand_state=0xDEADBEEF,
+        ),
+        ms.TuneContext(
+            BatchMatmulModule,
+            target=tvm.target.Target("llvm"),
+            space_generator=_schedule_batch_matmul,
+            search_strategy=ms.search_strategy.ReplayTrace(),
+            task_name="BatchMatmul",
+            rand_state=0x114514,
+        ),
+    ]
+    database = ms.database.MemoryDatabase()
+    # BatchMatmul is not in the profile, so it is only tuned for the first round
+    scheduler = ms.task_scheduler.ProfileGuided(
+        {"Matmul": 900.0, "MatmulRelu": 100.0},
+        min_headroom=1.0,
+    )
+    scheduler.tune(
+        tasks,
+        task_weights=[1.0, 1.0, 1.0],
+        builder=DummyBuilder(),
+        runner=DummyRunner(),
+        database=database,
+        measure_callbacks=[ms.measure_callback.AddToDatabase()],
+        max_trials_global=max_trials_global,
+        max_trials_per_task=max_trials_global,
+        num_trials_per_iter=6,
+        cost_model=None,
+    )
+    assert len(database) == max_trials_global
+    num_trials = [
+        len(database.get_top_k(database.commit_workload(task.mod), 10000)) for task in tasks
+    ]
+    assert num_trials[2] == 6
+    assert num_trials[0] > num_trials[1] >= 6
+
+
+def test_meta_schedule_task_scheduler_profile_guided_report():
+    def _call(name, duration_us):
+        return {
+            "Name": {"string": name},
+            "Duration (us)": {"microseconds": duration_us},
+            "Count": {"count": 1},
+        }
+
+    report = Report.from_json(
+        json.dumps(
+            {
+                "calls": [
+                    _call("Matmul", 600.0),
+                    _call("MatmulRelu", 100.0),
+                    _call("Matmul", 300.0),
+                ],
+                "device_metrics": {},
+                "configuration": {},
+            }
+        )
+    )
+    assert _duration_by_name(report) == {"Matmul": 900.0, "MatmulRelu": 100.0}
+    ms.task_scheduler.ProfileGuided(report)
+
+
 if __name__ == "__main__":
     test_meta_schedule_task_scheduler_single()
     test_meta_schedule_task_scheduler_multiple()
@@ -444,3 +588,5 @@ if __name__ == "__main__":
     test_meta_schedule_task_scheduler_override_next_task_id_only()
     test_meta_schedule_task_scheduler_multiple_gradient_based()
     test_meta_schedule_task_scheduler_gradient_based_with_null_search_strategy()
+    test_meta_schedule_task_scheduler_profile_guided()
+    test_meta_schedule_task_scheduler_profile_guided_report()
@@ -14,6 +14,8 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
+
 import tvm
 import tvm.testing
 from tvm.contrib import tvmjs, utils
@@ -188,6 +190,77 @@ def test_ndarray_cache():
         np.testing.assert_allclose(v.numpy(), v_np, atol=1e-6, rtol=1e-6)
 
 
+@pytest.mark.parametrize("encode_format", ["raw", "f32-to-bf16"])
+def test_ndarray_cache_mmap(encode_format):
+    fload = tvm.get_global_func("vm.builtin.ndarray_cache.load")
+    fget_params = tvm.get_global_func("vm.builtin.param_array_from_cache")
+    fclear = tvm.get_global_func("vm.builtin.ndarray_cache.clear")
+
+    param_dict = {
+        "x_0": np.array([1, 2, 3], dtype="int32"),
+        "x_1": np.random.uniform(size=[10, 20]).astype("float32"),
+        "x_2": np.random.uniform(size=[7]).astype("float16"),
+    }
+    if encode_format == "f32-to-bf16":
+        expected = {
+            k: tvmjs._convert_bf16_to_f32(tvmjs._convert_f32_to_bf16(v))
+            if v.dtype == "float32"
+            else v
+            for k, v in param_dict.items()
+        }
+    else:
+        expected = param_dict
+
+    temp = utils.tempdir()
+    tvmjs.dump_ndarray_cache(param_dict, temp.path, encode_format=encode_format)
+    for prefetch in [False, True]:
+        fclear()
+        fload(str(temp.path), tvm.cpu().device_type, 0, True, prefetch)
+        res = fget_params("x", -1)
+        for i, v in enumerate(res):
+            np.testing.assert_allclose(v.numpy(), expected[f"x_{i}"], atol=1e-6, rtol=1e-6)
+    # Writing to a mapped parameter never changes the shard
+    res[0].copyfrom(np.zeros(3, dtype="int32"))
+    fclear()
+    del res
+
+    loaded, _ = tvmjs.load_ndarray_cache(temp.path, tvm.cpu(), use_mmap=True)
+    for name, v_np in expected.items():
+        np.testing.assert_allclose(loaded[name].numpy(), v_np, atol=1e-6, rtol=1e-6)
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_ndarray_cache_parallel_load(num_workers):
+    fload = tvm.get_global_func("vm.builtin.ndarray_cache.load")
+    fget_params = tvm.get_global_func("vm.builtin.param_array_from_cache")
+    fclear = tvm.get_global_func("vm.builtin.ndarray_cache.clear")
+
+    # Each parameter takes more than half of the shard cap, so every one is in its own shard
+    param_dict = {
+        f"x_{i}": np.random.uniform(size=[300 * 1024]).astype("float32") for i in range(5)
+    }
+    temp = utils.tempdir()
+    tvmjs.dump_ndarray_cache(param_dict, temp.path, encode_format="f32-to-bf16", shard_cap_mb=1)
+    expected = {
+        k: tvmjs._convert_bf16_to_f32(tvmjs._convert_f32_to_bf16(v)) for k, v in param_dict.items()
+    }
+
+    fclear()
+    timings = json.loads(fload(str(temp.path), tvm.cpu().device_type, 0, False, False, num_workers))
+    assert timings["num_shards"] == len(param_dict)
+    assert timings["num_workers"] == num_workers
+    for key in ["read_sec", "read_wait_sec", "decode_sec", "copy_sec", "total_sec"]:
+        assert timings[key] >= 0
+    res = fget_params("x", -1)
+    for i, v in enumerate(res):
+        np.testing.assert_allclose(v.numpy(), expected[f"x_{i}"], atol=1e-6, rtol=1e-6)
+    fclear()
+
+    loaded, _ = tvmjs.load_ndarray_cache(temp.path, tvm.cpu(), num_workers=num_workers)
+    for name, v_np in expected.items():
+        np.testing.assert_allclose(loaded[name].numpy(), v_np, atol=1e-6, rtol=1e-6)
+
+
 def test_attention_kv_cache_window_override():
     fcreate = tvm.get_global_func("vm.builtin.attention_kv_cache_create")
     foverride = tvm.get_global_func("vm.builtin.attention_kv_cache_window_override")
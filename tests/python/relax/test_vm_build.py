@@ -16,6 +16,7 @@
 # under the License.
 
 import ctypes
+import json
 from typing import Tuple, Callable
 
 import numpy as np
@@ -182,6 +183,88 @@ def test_vm_compile_e2e(exec_mode):
     tvm.testing.assert_allclose(res.numpy(), np.tile(inp.numpy(), (1, 2)), rtol=1e-7, atol=1e-7)
 
 
+def test_vm_buddy_allocator(exec_mode):
+    @tvm.script.ir_module
+    class TestVMBuddyAllocator:
+        @R.function
+        def foo(x: R.Tensor(dtype="float32")) -> R.Tensor:
+            with R.dataflow():
+                n, m = T.int64(), T.int64()
+                _ = R.match_cast(x, R.Tensor((n, m), "float32"))
+                y = R.call_dps_packed("test.vm.tile", (x), R.Tensor((n, m * 2), dtype="float32"))
+                R.output(y)
+            return y
+
+    target = tvm.target.Target("llvm", host="llvm")
+    ex = relax.build(TestVMBuddyAllocator, target, exec_mode=exec_mode)
+    vm = relax.VirtualMachine(ex, tvm.cpu(), memory_cfg="buddy")
+    fstats = tvm.get_global_func("vm.builtin.memory_manager.stats")
+    ftrim = tvm.get_global_func("vm.builtin.memory_manager.trim")
+
+    # Dynamic shapes of different sizes reuse the blocks freed by each other
+    for n in [7, 32, 3, 100, 17]:
+        inp = tvm.nd.array(np.random.rand(n, 16).astype(np.float32))
+        res = vm["foo"](inp)
+        tvm.testing.assert_allclose(res.numpy(), np.tile(inp.numpy(), (1, 2)), rtol=1e-7)
+        del res
+
+    stats = json.loads(fstats(tvm.cpu()))["buddy"]
+    assert stats["num_arenas"] >= 1
+    assert stats["peak_reserved_bytes"] >= stats["reserved_bytes"] > 0
+    assert stats["peak_allocated_bytes"] >= stats["allocated_bytes"]
+    assert stats["allocated_bytes"] >= stats["requested_bytes"]
+    assert 0 <= stats["internal_fragmentation"] < 1
+    assert 0 <= stats["external_fragmentation"] < 1
+
+    del vm
+    released = ftrim(tvm.cpu(), 0)
+    trimmed = json.loads(fstats(tvm.cpu()))["buddy"]
+    assert trimmed["reserved_bytes"] == stats["reserved_bytes"] - released
+
+
+def test_vm_memory_tracking(exec_mode):
+    @tvm.script.ir_module
+    class TestVMMemoryTracking:
+        @R.function
+        def foo(x: R.Tensor(dtype="float32")) -> R.Tensor:
+            with R.dataflow():
+                n, m = T.int64(), T.int64()
+                _ = R.match_cast(x, R.Tensor((n, m), "float32"))
+                y = R.call_dps_packed("test.vm.tile", (x), R.Tensor((n, m * 2), dtype="float32"))
+                R.output(y)
+            return y
+
+    target = tvm.target.Target("llvm", host="llvm")
+    ex = relax.build(TestVMMemoryTracking, target, exec_mode=exec_mode)
+    vm = relax.VirtualMachine(ex, tvm.cpu(), memory_cfg="naive")
+    inp = tvm.nd.array(np.random.rand(32, 16).astype(np.float32))
+
+    tvm.runtime.reset_memory_stats()
+    tvm.runtime.enable_memory_tracking()
+    try:
+        res = vm["foo"](inp)
+        stats = tvm.runtime.memory_stats(tvm.cpu())
+    finally:
+        tvm.runtime.enable_memory_tracking(False)
+    assert stats["tracking"]
+    naive = stats["allocators"]["naive"]
+    assert naive["num_allocs"] >= 1
+    assert naive["live_bytes"] >= 32 * 32 * 4
+    assert naive["peak_bytes"] >= naive["live_bytes"]
+    assert sum(naive["allocs_by_size"].values()) == naive["num_allocs"]
+    assert sum(site["bytes"] for site in naive["live_by_site"].values()) == naive["live_bytes"]
+    if exec_mode == "bytecode":
+        assert any(site.startswith("foo@") for site in naive["live_by_site"])
+
+    # The frees of the tracked allocations are still recorded after tracking is disabled
+    del res
+    naive = tvm.runtime.memory_stats(tvm.cpu())["allocators"]["naive"]
+    assert naive["live_bytes"] == 0
+    assert naive["num_frees"] == naive["num_allocs"]
+    assert not naive["live_by_site"]
+    tvm.runtime.reset_memory_stats()
+
+
 def test_vm_compile_e2e_func_param_with_shape(exec_mode):
     @tvm.script.ir_module
     class TestVMCompileE2E2:
@@ -846,6 +929,57 @@ def test_recursion(exec_mode):
     tvm.testing.assert_allclose(res.numpy(), np.power(2.0, recursion_runs), rtol=1e-7, atol=1e-7)
 
 
+def test_vm_prelink(exec_mode):
+    @tvm.script.ir_module
+    class TestVMPrelink:
+        @R.function
+        def recursion(n: R.Tensor((1,), "float32")) -> R.Tensor:
+            cond = R.call_pure_packed(
+                "test.vm.equal_zero", n, sinfo_args=(R.Tensor(ndim=1, dtype="float32"))
+            )
+            if cond:
+                res = R.const(1.0)
+            else:
+                gv0 = R.call_pure_packed(
+                    "test.vm.subtract_one", n, sinfo_args=(R.Tensor(ndim=1, dtype="float32"))
+                )
+                tmp = TestVMPrelink.recursion(gv0)
+                res = R.call_pure_packed(
+                    "test.vm.add", tmp, tmp, sinfo_args=(R.Tensor(ndim=1, dtype="float32"))
+                )
+            return res
+
+        @R.function
+        def main(x: R.Tensor((1,), "float32"), y: R.Tensor((1,), "float32")) -> R.Tensor:
+            cls = TestVMPrelink
+            z = R.call_pure_packed(
+                "test.vm.add", x, y, sinfo_args=(R.Tensor(ndim=1, dtype="float32"))
+            )
+            res = cls.recursion(z)
+            return res
+
+    target = tvm.target.Target("llvm", host="llvm")
+    ex = relax.build(TestVMPrelink, target, exec_mode=exec_mode)
+    vm = relax.VirtualMachine(ex, tvm.cpu(), prelink=True)
+    x_inp = tvm.nd.array(np.array([1.0], dtype="float32"))
+    y_inp = tvm.nd.array(np.array([2.0], dtype="float32"))
+    res = check_saved_func(vm, "main", x_inp, y_inp)
+    tvm.testing.assert_allclose(res.numpy(), [8.0], rtol=1e-7, atol=1e-7)
+
+    # The calls are instrumented as usual after linking
+    num_calls = 0
+
+    def instrument(func, name, before_run, ret_val, *args):
+        nonlocal num_calls
+        num_calls += before_run
+
+    vm.set_instrument(instrument)
+    res = vm["main"](x_inp, y_inp)
+    tvm.testing.assert_allclose(res.numpy(), [8.0], rtol=1e-7, atol=1e-7)
+    if exec_mode == "bytecode":
+        assert num_calls > 0
+
+
 @tvm.testing.requires_gpu
 def test_vm_to_device(exec_mode):
     @tvm.script.ir_module